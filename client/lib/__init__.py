@@ -1,4 +1,4 @@
 from .objects import *
-from .gateways import *
 from .functions import *
+from .gateways import *
 from .shape_client import *
@@ -2,5 +2,7 @@ from .get_config import *
 from .log_config import *
 from .get_methods import *
 from .credentials import *
+from .shape_id_codec import *
+from .request_signature import *
 from .get_grpc_config import *
 from .get_method_choice import *
\ No newline at end of file
@@ -43,6 +43,51 @@ async def get_method_choice(methods, client: ShapeClient):
         print()
         print("Welcome to GetAreas!")
         await client.get_areas()
+    elif fxn == 'B':
+        print()
+        print()
+        print("Welcome to BatchGetShapes!")
+        await client.batch_get_shapes()
+    elif fxn == 'M':
+        print()
+        print()
+        print("Welcome to BatchCreateShapes!")
+        await client.batch_create_shapes()
+    elif fxn == 'I':
+        print()
+        print()
+        print("Welcome to IngestShapes!")
+        await client.ingest_shapes()
+    elif fxn == 'Q':
+        print()
+        print()
+        print("Welcome to QueryShapes!")
+        await client.query_shapes()
+    elif fxn == 'X':
+        print()
+        print()
+        print("Welcome to GetShapesIntersecting!")
+        await client.get_shapes_intersecting()
+    elif fxn == 'O':
+        print()
+        print()
+        print("Welcome to GetShapesContaining!")
+        await client.get_shapes_containing()
+    elif fxn == 'PB':
+        print()
+        print()
+        print("Welcome to GetPerimetersGreaterThanBatched!")
+        await client.get_perimeters_greater_than_batched()
+    elif fxn == 'AB':
+        print()
+        print()
+        print("Welcome to GetAreasBatched!")
+        await client.get_areas_batched()
+    elif fxn == 'S':
+        print()
+        print()
+        print("Welcome to GetMetrics!")
+        await client.get_metrics()
     elif fxn == 'E':
         exit()
     else:
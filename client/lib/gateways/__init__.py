@@ -1 +1,2 @@
-from .auth_gateway import *
\ No newline at end of file
+from .auth_gateway import *
+from .metrics_gateway import *
\ No newline at end of file
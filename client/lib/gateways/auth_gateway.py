@@ -1,12 +1,20 @@
+import os
+import time
 import grpc
 
+from ..functions.request_signature import format_signature, get_signing_key, sign_request
+
 class AuthGateway(grpc.AuthMetadataPlugin):
     """
-    AuthGateway assigns the provided header and signature to every grpc request so that it can be properly authenticated
+    AuthGateway signs every grpc request with an HMAC-SHA256 signature of its key id, timestamp, a random nonce and its
+    method path, and assigns it to the provided header so that it can be properly authenticated
     """
-    def __init__(self, header, signature):
+    def __init__(self, header, key_id, secret):
         self.header = header
-        self.signature = signature
+        self.key_id = key_id
+
+        # Prepare the HMAC of the secret once rather than for every request
+        self.signing_key = get_signing_key(secret)
 
     def __call__(self, context, callback):
         """
@@ -20,4 +28,11 @@ class AuthGateway(grpc.AuthMetadataPlugin):
           callback: An AuthMetadataPluginCallback to be invoked either
             synchronously or asynchronously.
         """
-        callback(((self.header, self.signature),), None)
\ No newline at end of file
+        # The service_url ends with the full name of the service, e.g. https://localhost:50051/ShapeService
+        method = f"/{context.service_url.rsplit('/', 1)[-1]}/{context.method_name}"
+        timestamp = int(time.time())
+        nonce = os.urandom(16).hex()
+
+        signature = sign_request(self.signing_key, self.key_id, timestamp, nonce, method)
+
+        callback(((self.header, format_signature(self.key_id, timestamp, nonce, signature)),), None)
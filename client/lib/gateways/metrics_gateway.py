@@ -0,0 +1,168 @@
+import time
+import grpc
+import asyncio
+from typing import AsyncIterator, Iterator, List, Set, Tuple, Union
+
+from ..objects.call_metrics import CallMetrics
+
+class MetricsGateway:
+    """
+    MetricsGateway records the CallMetrics of the calls made on the channel it intercepts: their status code and
+    latency, and the serialized size of the messages they sent and received. The channel does not expose the
+    serialized messages to interceptors, so sizes are taken from the ByteSize of each message
+
+    A call with a stream of responses is recorded once the call is done, so a stream that is cancelled before its end
+    is recorded as CANCELLED even if its response iterator is never closed. An aio channel only runs each interceptor
+    for the one kind of call it is registered for, so there is a gateway per kind of call, see get_metrics_gateways
+    """
+    def __init__(self, metrics: CallMetrics):
+        self.metrics = metrics
+
+        # The event loop only keeps weak references to tasks, so the tasks recording the end of calls are kept here
+        self._finishing: Set[asyncio.Future] = set()
+
+    def _start(self, client_call_details: grpc.aio.ClientCallDetails) -> Tuple[str, float]:
+        """
+        Records the start of a call
+
+        :param client_call_details: details of the call
+        :return: (method path of the call, perf_counter time the call started at)
+        """
+        method = client_call_details.method
+
+        # The channel passes the method path as bytes
+        if isinstance(method, bytes):
+            method = method.decode()
+
+        self.metrics.start(method)
+
+        return method, time.perf_counter()
+
+    async def _record_response(self, method: str, started: float, call):
+        """
+        Waits for the response of a call with a single response and records the end of the call
+
+        :param method: method path of the call
+        :param started: perf_counter time the call started at
+        :param call: call to wait for
+        :return: the call, errors of the call are raised as they are
+        """
+        code = "OK"
+
+        try:
+            response = await call
+            self.metrics.get(method).bytes_in += response.ByteSize()
+
+            return call
+        except grpc.RpcError as e:
+            code = e.code().name
+            raise
+        except asyncio.CancelledError:
+            code = "CANCELLED"
+            raise
+        finally:
+            self.metrics.finish(method, code, time.perf_counter() - started)
+
+    def _record_responses(self, method: str, started: float, call) -> AsyncIterator:
+        """
+        Records the end of a call with a stream of responses once the call is done, and passes on its responses,
+        counting their size
+
+        :param method: method path of the call
+        :param started: perf_counter time the call started at
+        :param call: call to read
+        :return: AsyncIterator of the responses of the call
+        """
+        def on_done(done_call):
+            finishing: asyncio.Future = asyncio.ensure_future(
+                self.__finish(method, time.perf_counter() - started, done_call)
+            )
+            self._finishing.add(finishing)
+            finishing.add_done_callback(self._finishing.discard)
+
+        call.add_done_callback(on_done)
+
+        return self.__count_responses(method, call)
+
+    async def __finish(self, method: str, elapsed: float, call):
+        """
+        Records the end of a call that is done
+
+        :param method: method path of the call
+        :param elapsed: seconds the call took
+        :param call: call that is done
+        :return: None
+        """
+        code: grpc.StatusCode = await call.code()
+
+        self.metrics.finish(method, code.name, elapsed)
+
+    async def __count_responses(self, method: str, call) -> AsyncIterator:
+        async for response in call:
+            self.metrics.get(method).bytes_in += response.ByteSize()
+            yield response
+
+    def _count_requests(self, method: str, requests: Union[Iterator, AsyncIterator]) -> Union[Iterator, AsyncIterator]:
+        """
+        Wraps the request iterator of a call to count the size of its requests, keeping it sync or async
+
+        :param method: method path of the call
+        :param requests: requests to send
+        :return: iterator of the same requests
+        """
+        if hasattr(requests, '__aiter__'):
+            return self.__count_async_requests(method, requests)
+
+        return self.__count_sync_requests(method, requests)
+
+    def __count_sync_requests(self, method: str, requests: Iterator) -> Iterator:
+        for request in requests:
+            self.metrics.get(method).bytes_out += request.ByteSize()
+            yield request
+
+    async def __count_async_requests(self, method: str, requests: AsyncIterator) -> AsyncIterator:
+        async for request in requests:
+            self.metrics.get(method).bytes_out += request.ByteSize()
+            yield request
+
+class UnaryUnaryMetricsGateway(MetricsGateway, grpc.aio.UnaryUnaryClientInterceptor):
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        method, started = self._start(client_call_details)
+        self.metrics.get(method).bytes_out += request.ByteSize()
+
+        return await self._record_response(method, started, await continuation(client_call_details, request))
+
+class UnaryStreamMetricsGateway(MetricsGateway, grpc.aio.UnaryStreamClientInterceptor):
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        method, started = self._start(client_call_details)
+        self.metrics.get(method).bytes_out += request.ByteSize()
+
+        return self._record_responses(method, started, await continuation(client_call_details, request))
+
+class StreamUnaryMetricsGateway(MetricsGateway, grpc.aio.StreamUnaryClientInterceptor):
+    async def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        method, started = self._start(client_call_details)
+        requests = self._count_requests(method, request_iterator)
+
+        return await self._record_response(method, started, await continuation(client_call_details, requests))
+
+class StreamStreamMetricsGateway(MetricsGateway, grpc.aio.StreamStreamClientInterceptor):
+    async def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        method, started = self._start(client_call_details)
+        requests = self._count_requests(method, request_iterator)
+
+        return self._record_responses(method, started, await continuation(client_call_details, requests))
+
+def get_metrics_gateways(metrics: CallMetrics) -> List[MetricsGateway]:
+    """
+    Creates a MetricsGateway for every kind of call, to pass as the interceptors of a channel
+
+    :param metrics: CallMetrics to record the calls into
+    :return: list of MetricsGateway
+    """
+    return [
+        UnaryUnaryMetricsGateway(metrics),
+        UnaryStreamMetricsGateway(metrics),
+        StreamUnaryMetricsGateway(metrics),
+        StreamStreamMetricsGateway(metrics),
+    ]
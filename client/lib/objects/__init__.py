@@ -1 +1,2 @@
-from .logger import *
\ No newline at end of file
+from .logger import *
+from .call_metrics import *
\ No newline at end of file
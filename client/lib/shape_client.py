@@ -2,15 +2,19 @@ import os
 import grpc
 import json
 import time
+import random
 import uuid
 from configparser import ConfigParser
-from typing import Iterator, List
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from grpc_health.v1 import health_pb2 as HealthService
 from grpc_health.v1 import health_pb2_grpc as HealthServiceGrpc
 
 from .objects.logger import Logger
+from .objects.call_metrics import LATENCY_BOUNDS, CallMetrics, MethodMetrics, format_prometheus, get_latency_quantile
 from .functions import credentials
+from .functions.shape_id_codec import decode_shape_id, encode_shape_id, format_shape_id, parse_shape_id
 from .gateways.auth_gateway import AuthGateway
+from .gateways.metrics_gateway import get_metrics_gateways
 import shape_service_pb2 as ShapeService
 import shape_service_pb2_grpc as ShapeServiceGrpc
 
@@ -26,13 +30,21 @@ class ShapeClient:
         self.server_host: str = config['general']['grpc_host']
         self.server_port: str = config['general']['grpc_port']
 
+        # Format of the shapes returned by the server, v2 packs the coordinates of each shape
+        self.shape_format: str = config['general']['shape_format']
+
         ROOT_CERTIFICATE = credentials.load_credential_from_file(config['general']['root_certificate'])
 
         # Setup gRPC Channel
 
-        # Attach credentials to every call to they can be authenticated server-side via expected header-value pair
+        # Sign every call so that it can be authenticated server-side via its HMAC signature header
         call_credential = grpc.metadata_call_credentials(
-            AuthGateway(config['general']['signature_header'], config['general']['signature_value']), name="auth gateway"
+            AuthGateway(
+                config['general']['signature_header'],
+                config['general']['signature_key_id'],
+                config['general']['signature_key']
+            ),
+            name="auth gateway"
         )
 
         channel_credential = grpc.ssl_channel_credentials(
@@ -58,12 +70,16 @@ class ShapeClient:
         else:
             raise ValueError(f"{service_config_path} does not exist")
 
+        # Metrics of every call made by this client, kept over the channels created after failed health checks
+        self.call_metrics: CallMetrics = CallMetrics()
+
         self.channel: grpc.aio.Channel = grpc.aio.secure_channel(
             f"{self.server_host}:{self.server_port}",
             credentials=self.credentials,
             options=[
                 ("grpc.service_config", json.dumps(self.service_config))
-            ]
+            ],
+            interceptors=get_metrics_gateways(self.call_metrics)
         )
 
         # Setup gRPC Stub
@@ -92,22 +108,14 @@ class ShapeClient:
             print()
             return
 
-        # Validate that id ends with an integer
-        try:
-            int(shape_id[2:])
-        except ValueError:
-            print(f"{shape_id} is not a valid shape_id")
-            print()
-            return
+        parsed_id: Optional[Tuple[str, int]] = parse_shape_id(shape_id)
 
-        # Validate shape_id format
-        if shape_id[1] != '-' or int(shape_id[2:]) < 0:
+        if parsed_id is None:
             print(f"{shape_id} is not a valid shape_id")
             print()
             return
 
-        # Reformat shape_id into what the server expects
-        shape_id = f"{shape_id[0].upper()}-{int(shape_id[2:])}"
+        shape_id = format_shape_id(*parsed_id)
 
         # Check service health and do not continue if the server is not healthy
         corr_id: str = str(uuid.uuid4())
@@ -118,24 +126,27 @@ class ShapeClient:
 
         try:
             response: ShapeService.GetShapeResponse = await self.stub.GetShape(
-                ShapeService.ShapeId(shape_id=shape_id),
+                encode_shape_id(shape_id),
                 wait_for_ready=True, # Wait for server to be ready
                 timeout=25, # Manually override the timeout set in the grpc_client_config.json
                 metadata=(
                     ("x-correlation-id", corr_id),
-                    ("x-method-type", "unary-unary")
+                    ("x-method-type", "unary-unary"),
+                    ("x-shape-format", self.shape_format)
                 )
             )
 
             print(f"StatusCode.{ShapeService.Code.Name(response.status_code)} - {response.message}")
 
             if response.status_code == ShapeService.Code.OK:
-                print(f"shape_id: {response.shape.shape_id}")
-                print(f"shape_type: {response.shape.shape_type}")
+                shape = self.__get_shape(response)
+
+                print(f"shape_id: {shape.shape_id}")
+                print(f"shape_type: {shape.shape_type}")
                 print("coords: [")
 
-                for c in response.shape.coords:
-                    coord_string = "{" + f"x: {c.x}, y: {c.y}" + "}"
+                for x, y in self.__get_coords(shape):
+                    coord_string = "{" + f"x: {x}, y: {y}" + "}"
                     print(coord_string)
 
                 print("]")
@@ -165,7 +176,8 @@ class ShapeClient:
         response: ShapeService.CreateShapeResponse = None
         request_metadata = (
             ("x-correlation-id", corr_id),
-            ("x-method-type", "unary-unary")
+            ("x-method-type", "unary-unary"),
+            ("x-shape-format", self.shape_format)
         )
 
         # Check service health and do not continue if the server is not healthy
@@ -236,22 +248,14 @@ class ShapeClient:
 
         # Validate and reformat each of the provided shape_ids
         for shape_id in shape_ids:
-            # Validate that id ends with an integer
-            try:
-                int(shape_id[2:])
-            except ValueError:
-                print(f"{shape_id} is not a valid shape_id")
-                print()
-                return
+            parsed_id: Optional[Tuple[str, int]] = parse_shape_id(shape_id)
 
-            # Validate shape_id format
-            if shape_id[1] != '-' or int(shape_id[2:]) < 0:
+            if parsed_id is None:
                 print(f"{shape_id} is not a valid shape_id")
                 print()
                 return
 
-            # Reformat shape_id into what the server expects
-            formatted_ids.append(f"{shape_id[0].upper()}-{int(shape_id[2:])}")
+            formatted_ids.append(format_shape_id(*parsed_id))
 
         id_iterator: Iterator[ShapeService.ShapeId] = self.__get_shape_id_iterator(formatted_ids)
 
@@ -277,11 +281,11 @@ class ShapeClient:
 
             if response.status_code == ShapeService.Code.OK:
                 print(f"total_area: {response.total_area}")
-                print(f"valid_ids: {response.valid_ids}")
-                print(f"invalid_ids: {response.invalid_ids}")
+                print(f"valid_ids: {[decode_shape_id(shape_id) for shape_id in response.valid_ids]}")
+                print(f"invalid_ids: {[decode_shape_id(shape_id) for shape_id in response.invalid_ids]}")
             elif response.status_code == ShapeService.Code.AREA_NOT_FOUND:
                 print(f"total_area: {response.total_area}")
-                print(f"invalid_ids: {response.invalid_ids}")
+                print(f"invalid_ids: {[decode_shape_id(shape_id) for shape_id in response.invalid_ids]}")
 
         except grpc.RpcError as e:
             print("Shape was not retrieved")
@@ -317,6 +321,271 @@ class ShapeClient:
             print()
             return
 
+        limit = input('Enter the maximum number of shapes to retrieve, or leave blank to retrieve all: ')
+
+        # Validate that the limit is a non-negative integer if provided
+        try:
+            limit = int(limit) if limit.strip() else None
+        except ValueError:
+            print(f"{limit} is not a valid limit")
+            print()
+            return
+
+        if limit is not None and limit < 0:
+            print(f"{limit} is not a valid limit")
+            print()
+            return
+
+        page_size = input('Enter the number of shapes to retrieve per page, or leave blank to retrieve them in one page: ')
+
+        # Validate that the page size is a positive integer if provided
+        try:
+            page_size = int(page_size) if page_size.strip() else None
+        except ValueError:
+            print(f"{page_size} is not a valid page size")
+            print()
+            return
+
+        if page_size is not None and page_size <= 0:
+            print(f"{page_size} is not a valid page size")
+            print()
+            return
+
+        # Check service health and do not continue if the server is not healthy
+        corr_id: str = str(uuid.uuid4())
+        server_healthy: bool = await self.__check_server_health(0, corr_id)
+        if not server_healthy:
+            print("Unable to reach server")
+            return
+
+        shapes: List[ShapeService.Shape] = []
+        resume_token: str = ""
+
+        while True:
+            page_shapes: int = 0
+
+            try:
+                # Iterate over the provided responses and handle them appropriately
+                async for r in self.stub.GetPerimetersGreaterThan(
+                    ShapeService.MinPerimeter(min_perimeter=min_perimeter, limit=limit, page_size=page_size,
+                                              resume_token=resume_token),
+                    wait_for_ready=True, # Wait for server connectivity
+                    timeout=10, # Method timeout in seconds
+                    metadata=(
+                        ("x-correlation-id", corr_id),
+                        ("x-method-type", "unary-stream"),
+                        ("x-shape-format", self.shape_format)
+                    )
+                ):
+                    print(f"StatusCode.{ShapeService.Code.Name(r.status_code)} - {r.message}")
+
+                    # Add the shapes to a list of shapes with perimeters above the provided value, and keep the
+                    # resume_token of the last one to continue the stream from
+                    if r.status_code == ShapeService.Code.OK:
+                        shapes.append(self.__get_shape(r))
+                        resume_token = r.resume_token
+                        page_shapes += 1
+
+            except grpc.RpcError as e:
+                # Continue from the last shape received if the stream timed out after making progress
+                if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED and page_shapes > 0:
+                    print(f"Stream timed out after {len(shapes)} shapes, resuming from the last shape received")
+                    continue
+
+                print("Shape was not retrieved")
+                print(f"Failed execute on server: {e.code()} - {e.details()}")
+
+                print()
+                print()
+                return
+
+            # A short page means there are no more shapes
+            if page_size is None or page_shapes < page_size:
+                return
+
+            if input('Enter N to stop, or anything else to retrieve the next page: ').strip().upper() == 'N':
+                return
+
+    async def get_areas(self):
+        """
+        Gets the individual area and shape of each of the provided shape_ids
+
+        :return: None
+        """
+
+        print("This method retrieves the area and shape all the provided shape_ids. Enter X to return to the main menu")
+        print("Please provide a comma separated list of all the shape_ids you wish to retrieve")
+        print("Shape_id format is: T-1, R-23, ....")
+
+        shape_ids_input = input('Enter the shape_ids you wish to have the areas of: ')
+        shape_ids: List[str] = [shape_id.strip() for shape_id in shape_ids_input.split(',')]
+        formatted_ids: List[str] = []
+
+        # Return to main menu
+        if shape_ids[0].upper() == 'X':
+            print()
+            print()
+            return
+
+        # Validate and reformat each of the provided shape_ids
+        for shape_id in shape_ids:
+            parsed_id: Optional[Tuple[str, int]] = parse_shape_id(shape_id)
+
+            if parsed_id is None:
+                print(f"{shape_id} is not a valid shape_id")
+                print()
+                return
+
+            formatted_ids.append(format_shape_id(*parsed_id))
+
+        shapes_and_areas: List[tuple] = []
+
+        # Check service health and do not continue if the server is not healthy
+        corr_id: str = str(uuid.uuid4())
+        server_healthy: bool = await self.__check_server_health(0, corr_id)
+        if not server_healthy:
+            print("Unable to reach server")
+            return
+
+        # Each response answers the next shape_id in order, so if the stream times out the shape_ids that were not
+        # answered yet are sent again in a new stream that continues from the resume_token of the last response
+        answered: int = 0
+        resume_token: str = ""
+
+        while answered < len(formatted_ids):
+            id_iterator: Iterator[ShapeService.ShapeId] = self.__get_shape_id_iterator(
+                formatted_ids[answered:], resume_token=resume_token
+            )
+            answered_before: int = answered
+
+            try:
+                async for r in self.stub.GetAreas(
+                    id_iterator,
+                    wait_for_ready=True, # Wait for server connectivity
+                    timeout=10, # Method timeout
+                    metadata=(
+                        ("x-correlation-id", corr_id),
+                        ("x-method-type", "stream-stream"),
+                        ("x-shape-format", self.shape_format)
+                    )
+                ):
+                    print(f"StatusCode.{ShapeService.Code.Name(r.status_code)} - {r.message}")
+
+                    if r.status_code == ShapeService.Code.OK:
+                        shapes_and_areas.append((self.__get_shape(r), r.area))
+
+                    if r.resume_token:
+                        resume_token = r.resume_token
+                        answered += 1
+
+            except grpc.RpcError as e:
+                if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED and answered > answered_before:
+                    print(f"Stream timed out after {answered} shape_ids, resuming with the remaining shape_ids")
+                    continue
+
+                print("Shape was not retrieved")
+                print(f"Failed execute on server: {e.code()} - {e.details()}")
+
+                print()
+                print()
+                return
+
+            # The stream ended without answering every shape_id, e.g. because of an invalid resume_token
+            if answered == answered_before:
+                return
+
+    async def batch_get_shapes(self):
+        """
+        Invokes the BatchGetShapes gRPC method
+
+        :return: None
+        """
+
+        print("This method retrieves all the provided shape_ids in a single call. Enter X to return to the main menu")
+        print("Please provide a comma separated list of all the shape_ids you wish to retrieve")
+        print("Shape_id format is: T-1, R-23, ....")
+
+        shape_ids_input = input('Enter the shape_ids you wish to retrieve: ')
+        shape_ids: List[str] = [shape_id.strip() for shape_id in shape_ids_input.split(',')]
+        formatted_ids: List[str] = []
+
+        # Return to main menu
+        if shape_ids[0].upper() == 'X':
+            print()
+            print()
+            return
+
+        # Validate and reformat each of the provided shape_ids
+        for shape_id in shape_ids:
+            parsed_id: Optional[Tuple[str, int]] = parse_shape_id(shape_id)
+
+            if parsed_id is None:
+                print(f"{shape_id} is not a valid shape_id")
+                print()
+                return
+
+            formatted_ids.append(format_shape_id(*parsed_id))
+
+        # Check service health and do not continue if the server is not healthy
+        corr_id: str = str(uuid.uuid4())
+        server_healthy: bool = await self.__check_server_health(0, corr_id)
+        if not server_healthy:
+            print("Unable to reach server")
+            return
+
+        try:
+            response: ShapeService.BatchGetShapesResponse = await self.stub.BatchGetShapes(
+                ShapeService.BatchGetShapesRequest(
+                    shape_ids=[encode_shape_id(shape_id) for shape_id in formatted_ids]
+                ),
+                wait_for_ready=True, # Wait for server to be ready
+                metadata=(
+                    ("x-correlation-id", corr_id),
+                    ("x-method-type", "unary-unary"),
+                    ("x-shape-format", self.shape_format)
+                )
+            )
+
+            print(f"StatusCode.{ShapeService.Code.Name(response.status_code)} - {response.message}")
+
+            for r in response.results:
+                print(f"StatusCode.{ShapeService.Code.Name(r.status_code)} - {r.message}")
+
+        except grpc.RpcError as e:
+            print("Shapes were not retrieved")
+            print(f"Failed execute on server: {e.code()} - {e.details()}")
+
+            print()
+            print()
+            return
+
+    async def batch_create_shapes(self):
+        """
+        Invokes the BatchCreateShapes gRPC method
+
+        :return: None
+        """
+
+        print("This method creates all the provided shapes in a single call. Enter X to return to the main menu")
+        print("Please provide a comma separated list of the shapes you wish to create")
+        print("[T] - Triangle\n[R] - Rectangle\n[P] - Pentagon")
+
+        shape_choices_input = input('Enter the shapes you would like to create: ')
+        shape_choices: List[str] = [shape_choice.strip().upper() for shape_choice in shape_choices_input.split(',')]
+        shape_types: Dict[str, str] = {'T': "Triangle", 'R': "Rectangle", 'P': "Pentagon"}
+
+        # Return to main menu
+        if shape_choices[0] == 'X':
+            print()
+            print()
+            return
+
+        for shape_choice in shape_choices:
+            if shape_choice not in shape_types:
+                print(f"{shape_choice} is an invalid shape. Please choose a valid shape.")
+                print()
+                return
+
         # Check service health and do not continue if the server is not healthy
         corr_id: str = str(uuid.uuid4())
         server_healthy: bool = await self.__check_server_health(0, corr_id)
@@ -325,35 +594,368 @@ class ShapeClient:
             return
 
         try:
-            shapes: List[ShapeService.Shape] = []
+            response: ShapeService.BatchCreateShapesResponse = await self.stub.BatchCreateShapes(
+                ShapeService.BatchCreateShapesRequest(
+                    shape_types=[ShapeService.ShapeType(shape_type=shape_types[c]) for c in shape_choices]
+                ),
+                wait_for_ready=True, # Wait for server connection
+                metadata=(
+                    ("x-correlation-id", corr_id),
+                    ("x-method-type", "unary-unary"),
+                    ("x-shape-format", self.shape_format)
+                )
+            )
+
+            print(f"StatusCode.{ShapeService.Code.Name(response.status_code)} - {response.message}")
+
+            for r in response.results:
+                print(f"StatusCode.{ShapeService.Code.Name(r.status_code)} - {r.message}")
+
+        except grpc.RpcError as e:
+            print("Shapes were not created")
+            print(f"{e.code()} - {e.details()}")
+
+            print()
+            print()
+            return
+
+    async def ingest_shapes(self):
+        """
+        Invokes the IngestShapes gRPC method, streaming the requested number of randomly chosen shapes to the server
+
+        :return: None
+        """
+
+        print("This method bulk loads shapes of a random type. Enter X to return to the main menu")
+
+        shape_count = input('Enter the number of shapes to ingest: ')
+
+        # Return to main menu
+        if shape_count.upper() == 'X':
+            print()
+            print()
+            return
+
+        # Validate that the count is a positive integer
+        try:
+            shape_count = int(shape_count)
+        except ValueError:
+            print(f"{shape_count} is not a valid number of shapes")
+            print()
+            return
+
+        if shape_count <= 0:
+            print(f"{shape_count} is not a valid number of shapes")
+            print()
+            return
+
+        # Check service health and do not continue if the server is not healthy
+        corr_id: str = str(uuid.uuid4())
+        server_healthy: bool = await self.__check_server_health(0, corr_id)
+        if not server_healthy:
+            print("Unable to reach server")
+            return
+
+        try:
+            response: ShapeService.IngestSummary = await self.stub.IngestShapes(
+                self.__get_shape_type_iterator(shape_count),
+                wait_for_ready=True, # Wait for server availability
+                metadata=(
+                    ("x-correlation-id", corr_id),
+                    ("x-method-type", "stream-unary")
+                )
+            )
+
+            print(f"StatusCode.{ShapeService.Code.Name(response.status_code)} - {response.message}")
+
+            for failure in response.failures:
+                print(f"Item {failure.index}: StatusCode.{ShapeService.Code.Name(failure.status_code)} - {failure.message}")
+
+        except grpc.RpcError as e:
+            print("Shapes were not ingested")
+            print(f"Failed execute on server: {e.code()} - {e.details()}")
+
+            print()
+            print()
+            return
+
+    async def query_shapes(self):
+        """
+        Invokes the QueryShapes gRPC method
+
+        :return: None
+        """
+
+        print("This method retrieves the shapes matching every filter you set. Leave a filter blank to skip it or "
+              "enter X to return to the main menu")
+        print("[T] - Triangle\n[R] - Rectangle\n[P] - Pentagon")
+
+        shape_choice = input('Enter the shape type to retrieve: ').strip().upper()
+        shape_types: Dict[str, str] = {'T': "Triangle", 'R': "Rectangle", 'P': "Pentagon"}
+
+        # Return to main menu
+        if shape_choice == 'X':
+            print()
+            print()
+            return
+
+        if shape_choice and shape_choice not in shape_types:
+            print(f"{shape_choice} is an invalid shape. Please choose a valid shape.")
+            print()
+            return
+
+        query: ShapeService.ShapeQuery = ShapeService.ShapeQuery()
+
+        if shape_choice:
+            query.shape_type = shape_types[shape_choice]
+
+        # Validate that every filter provided is a number
+        try:
+            for metric in ("area", "perimeter"):
+                greater_than = input(f"Enter the {metric} that shapes must be greater than: ").strip()
+                at_most = input(f"Enter the {metric} that shapes must be at most: ").strip()
+
+                if greater_than:
+                    getattr(query, metric).greater_than = float(greater_than)
+                if at_most:
+                    getattr(query, metric).at_most = float(at_most)
+
+            bounding_box = input('Enter a bounding box the shapes must be inside as min_x,min_y,max_x,max_y: ').strip()
+
+            if bounding_box:
+                min_x, min_y, max_x, max_y = [int(value) for value in bounding_box.split(',')]
+                query.within.CopyFrom(ShapeService.BoundingBox(min_x=min_x, min_y=min_y, max_x=max_x, max_y=max_y))
+
+            limit = input('Enter the maximum number of shapes to retrieve, or leave blank to retrieve all: ').strip()
+            offset = input('Enter the number of matching shapes to skip, or leave blank to skip none: ').strip()
+
+            if limit:
+                query.limit = int(limit)
+            if offset:
+                query.offset = int(offset)
+        except ValueError as e:
+            print(f"Invalid filter: {e}")
+            print()
+            return
+
+        # Check service health and do not continue if the server is not healthy
+        corr_id: str = str(uuid.uuid4())
+        server_healthy: bool = await self.__check_server_health(0, corr_id)
+        if not server_healthy:
+            print("Unable to reach server")
+            return
 
+        try:
             # Iterate over the provided responses and handle them appropriately
-            async for r in self.stub.GetPerimetersGreaterThan(
-                ShapeService.MinPerimeter(min_perimeter=min_perimeter),
+            async for r in self.stub.QueryShapes(
+                query,
                 wait_for_ready=True, # Wait for server connectivity
                 timeout=10, # Method timeout in seconds
                 metadata=(
                     ("x-correlation-id", corr_id),
-                    ("x-method-type", "unary-stream")
+                    ("x-method-type", "unary-stream"),
+                    ("x-shape-format", self.shape_format)
                 )
             ):
                 print(f"StatusCode.{ShapeService.Code.Name(r.status_code)} - {r.message}")
 
-                # Add the shapes to a list of shapes with perimeters above the provided value
                 if r.status_code == ShapeService.Code.OK:
-                    shapes.append(r.shape)
+                    print(f"Area={r.area} units^2, Perimeter={r.perimeter} units")
+
+        except grpc.RpcError as e:
+            print("Shapes were not retrieved")
+            print(f"Failed execute on server: {e.code()} - {e.details()}")
+
+            print()
+            print()
+
+    async def get_shapes_intersecting(self):
+        """
+        Invokes the GetShapesIntersecting gRPC method
+
+        :return: None
+        """
+
+        print("This method retrieves the shapes that overlap or touch a box. Enter X to return to the main menu")
+
+        bounding_box = input('Enter the box as min_x,min_y,max_x,max_y: ').strip()
+
+        # Return to main menu
+        if bounding_box.upper() == 'X':
+            print()
+            print()
+            return
+
+        # Validate that the box is four integers
+        try:
+            min_x, min_y, max_x, max_y = [int(value) for value in bounding_box.split(',')]
+        except ValueError:
+            print(f"{bounding_box} is not a valid box")
+            print()
+            return
 
+        # Check service health and do not continue if the server is not healthy
+        corr_id: str = str(uuid.uuid4())
+        server_healthy: bool = await self.__check_server_health(0, corr_id)
+        if not server_healthy:
+            print("Unable to reach server")
+            return
+
+        try:
+            # Iterate over the provided responses and handle them appropriately
+            async for r in self.stub.GetShapesIntersecting(
+                ShapeService.BoundingBox(min_x=min_x, min_y=min_y, max_x=max_x, max_y=max_y),
+                wait_for_ready=True, # Wait for server connectivity
+                timeout=10, # Method timeout in seconds
+                metadata=(
+                    ("x-correlation-id", corr_id),
+                    ("x-method-type", "unary-stream"),
+                    ("x-shape-format", self.shape_format)
+                )
+            ):
+                print(f"StatusCode.{ShapeService.Code.Name(r.status_code)} - {r.message}")
 
         except grpc.RpcError as e:
-            print("Shape was not retrieved")
+            print("Shapes were not retrieved")
             print(f"Failed execute on server: {e.code()} - {e.details()}")
 
             print()
             print()
 
-    async def get_areas(self):
+    async def get_shapes_containing(self):
         """
-        Gets the individual area and shape of each of the provided shape_ids
+        Invokes the GetShapesContaining gRPC method
+
+        :return: None
+        """
+
+        print("This method retrieves the shapes that contain a point. Enter X to return to the main menu")
+
+        point = input('Enter the point as x,y: ').strip()
+
+        # Return to main menu
+        if point.upper() == 'X':
+            print()
+            print()
+            return
+
+        # Validate that the point is two integers
+        try:
+            x, y = [int(value) for value in point.split(',')]
+        except ValueError:
+            print(f"{point} is not a valid point")
+            print()
+            return
+
+        # Check service health and do not continue if the server is not healthy
+        corr_id: str = str(uuid.uuid4())
+        server_healthy: bool = await self.__check_server_health(0, corr_id)
+        if not server_healthy:
+            print("Unable to reach server")
+            return
+
+        try:
+            # Iterate over the provided responses and handle them appropriately
+            async for r in self.stub.GetShapesContaining(
+                ShapeService.ShapeCoord(x=x, y=y),
+                wait_for_ready=True, # Wait for server connectivity
+                timeout=10, # Method timeout in seconds
+                metadata=(
+                    ("x-correlation-id", corr_id),
+                    ("x-method-type", "unary-stream"),
+                    ("x-shape-format", self.shape_format)
+                )
+            ):
+                print(f"StatusCode.{ShapeService.Code.Name(r.status_code)} - {r.message}")
+
+        except grpc.RpcError as e:
+            print("Shapes were not retrieved")
+            print(f"Failed execute on server: {e.code()} - {e.details()}")
+
+            print()
+            print()
+
+    async def get_perimeters_greater_than_batched(self):
+        """
+        Invokes the GetPerimetersGreaterThanBatched gRPC method and reports the throughput of the stream
+
+        :return: None
+        """
+
+        print("What is the minimum perimeter to retrieve? Enter - X to return to home menu")
+        print()
+
+        min_perimeter = input('Enter the minimum perimeter to retrieve: ')
+
+        # Return to main menu
+        if min_perimeter.upper() == 'X':
+            print()
+            print()
+            return
+
+        try:
+            min_perimeter = round(float(min_perimeter), 2)
+        except ValueError:
+            print(f"{min_perimeter} is not a valid min_perimeter")
+            print()
+            return
+
+        batch_size: Optional[int] = self.__get_batch_size()
+
+        if batch_size == 0:
+            return
+
+        omit_message: bool = input('Enter Y to leave out the message of each shape: ').strip().upper() == 'Y'
+
+        # Check service health and do not continue if the server is not healthy
+        corr_id: str = str(uuid.uuid4())
+        server_healthy: bool = await self.__check_server_health(0, corr_id)
+        if not server_healthy:
+            print("Unable to reach server")
+            return
+
+        results: int = 0
+        batches: int = 0
+        received_bytes: int = 0
+        started: float = time.perf_counter()
+
+        try:
+            async for batch in self.stub.GetPerimetersGreaterThanBatched(
+                ShapeService.MinPerimeter(min_perimeter=min_perimeter, batch_size=batch_size,
+                                          omit_message=omit_message),
+                wait_for_ready=True, # Wait for server connectivity
+                timeout=10, # Method timeout in seconds
+                metadata=(
+                    ("x-correlation-id", corr_id),
+                    ("x-method-type", "unary-stream"),
+                    ("x-shape-format", self.shape_format)
+                )
+            ):
+                if batch.status_code != ShapeService.Code.OK:
+                    print(f"StatusCode.{ShapeService.Code.Name(batch.status_code)} - {batch.message}")
+                    continue
+
+                batches += 1
+                results += len(batch.results)
+                received_bytes += batch.ByteSize()
+
+                for r in batch.results:
+                    if r.status_code != ShapeService.Code.OK or not omit_message:
+                        print(f"StatusCode.{ShapeService.Code.Name(r.status_code)} - {r.message}")
+
+        except grpc.RpcError as e:
+            print("Shapes were not retrieved")
+            print(f"Failed execute on server: {e.code()} - {e.details()}")
+
+            print()
+            print()
+            return
+
+        self.__print_stream_throughput(results, batches, received_bytes, time.perf_counter() - started)
+
+    async def get_areas_batched(self):
+        """
+        Invokes the GetAreasBatched gRPC method and reports the throughput of the stream
 
         :return: None
         """
@@ -374,25 +976,40 @@ class ShapeClient:
 
         # Validate and reformat each of the provided shape_ids
         for shape_id in shape_ids:
-            # Validate that id ends with an integer
-            try:
-                int(shape_id[2:])
-            except ValueError:
-                print(f"{shape_id} is not a valid shape_id")
-                print()
-                return
+            parsed_id: Optional[Tuple[str, int]] = parse_shape_id(shape_id)
 
-            # Validate shape_id format
-            if shape_id[1] != '-' or int(shape_id[2:]) < 0:
+            if parsed_id is None:
                 print(f"{shape_id} is not a valid shape_id")
                 print()
                 return
 
-            # Reformat shape_id into what the server expects
-            formatted_ids.append(f"{shape_id[0].upper()}-{int(shape_id[2:])}")
+            formatted_ids.append(format_shape_id(*parsed_id))
 
-        id_iterator: Iterator[ShapeService.ShapeId] = self.__get_shape_id_iterator(formatted_ids)
-        shapes_and_areas: List[tuple] = []
+        batch_size: Optional[int] = self.__get_batch_size()
+
+        if batch_size == 0:
+            return
+
+        omit_message: bool = input('Enter Y to leave out the message of each shape: ').strip().upper() == 'Y'
+
+        window = input('Enter the number of shape_ids to look up at a time, or leave blank to look them up one by one: ')
+
+        # Validate that the window is a positive integer if provided
+        try:
+            window = int(window) if window.strip() else None
+        except ValueError:
+            print(f"{window} is not a valid window")
+            print()
+            return
+
+        if window is not None and window <= 0:
+            print(f"{window} is not a valid window")
+            print()
+            return
+
+        unordered: bool = window is not None and input(
+            'Enter Y to receive each result as soon as it is ready rather than in order: '
+        ).strip().upper() == 'Y'
 
         # Check service health and do not continue if the server is not healthy
         corr_id: str = str(uuid.uuid4())
@@ -401,20 +1018,36 @@ class ShapeClient:
             print("Unable to reach server")
             return
 
+        results: int = 0
+        batches: int = 0
+        received_bytes: int = 0
+        started: float = time.perf_counter()
+
         try:
-            async for r in self.stub.GetAreas(
-                id_iterator,
+            # The server only sends a batch once it is full or the request stream ends, so the shape_ids are sent
+            # without the delay between them
+            async for batch in self.stub.GetAreasBatched(
+                self.__get_shape_id_iterator(formatted_ids, delay=0, batch_size=batch_size, omit_message=omit_message,
+                                             window=window, unordered=unordered),
                 wait_for_ready=True, # Wait for server connectivity
                 timeout=10, # Method timeout
                 metadata=(
                     ("x-correlation-id", corr_id),
-                    ("x-method-type", "stream-stream")
+                    ("x-method-type", "stream-stream"),
+                    ("x-shape-format", self.shape_format)
                 )
             ):
-                print(f"StatusCode.{ShapeService.Code.Name(r.status_code)} - {r.message}")
+                if batch.status_code != ShapeService.Code.OK:
+                    print(f"StatusCode.{ShapeService.Code.Name(batch.status_code)} - {batch.message}")
+                    continue
 
-                if r.status_code == ShapeService.Code.OK:
-                    shapes_and_areas.append((r.shape, r.area))
+                batches += 1
+                results += len(batch.results)
+                received_bytes += batch.ByteSize()
+
+                for r in batch.results:
+                    if r.status_code != ShapeService.Code.OK or not omit_message:
+                        print(f"#{r.sequence} StatusCode.{ShapeService.Code.Name(r.status_code)} - {r.message}")
 
         except grpc.RpcError as e:
             print("Shape was not retrieved")
@@ -424,17 +1057,191 @@ class ShapeClient:
             print()
             return
 
+        self.__print_stream_throughput(results, batches, received_bytes, time.perf_counter() - started)
+
+    async def get_metrics(self):
+        """
+        Invokes the GetMetrics gRPC method, then prints the metrics of the calls made by this client
+
+        :return: None
+        """
+
+        print("Enter P to also print the metrics in the Prometheus text format, or X to return to home menu")
+        print()
+
+        choice = input('Enter P, X, or leave blank: ').strip().upper()
+
+        # Return to main menu
+        if choice == 'X':
+            print()
+            print()
+            return
+
+        # Check service health and do not continue if the server is not healthy
+        corr_id: str = str(uuid.uuid4())
+        server_healthy: bool = await self.__check_server_health(0, corr_id)
+        if not server_healthy:
+            print("Unable to reach server")
+            return
+
+        try:
+            response: ShapeService.GetMetricsResponse = await self.stub.GetMetrics(
+                ShapeService.GetMetricsRequest(prometheus_text=choice == 'P'),
+                wait_for_ready=True, # Wait for server to be ready
+                timeout=10, # Method timeout in seconds
+                metadata=(
+                    ("x-correlation-id", corr_id),
+                    ("x-method-type", "unary-unary")
+                )
+            )
+
+            print(f"StatusCode.{ShapeService.Code.Name(response.status_code)} - {response.message}")
+            print()
+            print("Server metrics:")
+
+            for method_metrics in response.methods:
+                self.__print_method_metrics(method_metrics.method, method_metrics, response.latency_bounds)
+
+            for group in response.counters:
+                print(f"{group.name}: {dict(group.counters)}")
+
+            if response.prometheus_text:
+                print()
+                print(response.prometheus_text)
+
+        except grpc.RpcError as e:
+            print("Metrics were not retrieved")
+            print(f"Failed execute on server: {e.code()} - {e.details()}")
+
+        # Print the client side metrics even if the server could not be reached
+        client_methods: Dict[str, MethodMetrics] = self.call_metrics.get_methods()
+
+        print()
+        print("Client metrics:")
+
+        for method, metrics in client_methods.items():
+            self.__print_method_metrics(method, metrics)
+
+        if choice == 'P':
+            print()
+            print(format_prometheus("grpc_client", client_methods))
+
     @staticmethod
-    def __get_shape_id_iterator(shape_ids: List[str]) -> Iterator[ShapeService.ShapeId]:
+    def __get_batch_size() -> Optional[int]:
+        """
+        Prompts for the number of results per message of a batched stream
+
+        :return: the batch size, None to use the server's maximum, or 0 if the input is invalid
+        """
+        batch_size = input('Enter the number of results per message, or leave blank to use the server maximum: ')
+
+        # Validate that the batch size is a positive integer if provided
+        try:
+            batch_size = int(batch_size) if batch_size.strip() else None
+        except ValueError:
+            print(f"{batch_size} is not a valid batch size")
+            print()
+            return 0
+
+        if batch_size is not None and batch_size <= 0:
+            print(f"{batch_size} is not a valid batch size")
+            print()
+            return 0
+
+        return batch_size
+
+    @staticmethod
+    def __print_stream_throughput(results: int, messages: int, received_bytes: int, elapsed: float):
+        """
+        Prints the number of results and messages received by a batched stream and their rate
+
+        :param results: number of results received
+        :param messages: number of messages received
+        :param received_bytes: serialized size of the messages received
+        :param elapsed: seconds the stream took
+        :return: None
+        """
+        print(f"Received {results} results in {messages} messages ({received_bytes} bytes) in {elapsed:.3f} seconds")
+
+        if elapsed > 0:
+            print(f"{results / elapsed:.0f} results/s, {messages / elapsed:.0f} messages/s, "
+                  f"{received_bytes / elapsed:.0f} bytes/s")
+
+    @staticmethod
+    def __print_method_metrics(method: str, metrics: Union[ShapeService.MethodMetrics, MethodMetrics],
+                               latency_bounds: Sequence[float] = LATENCY_BOUNDS):
+        """
+        Prints the call counts, latency and message sizes of a method
+
+        :param method: method path
+        :param metrics: metrics of the method, as returned by the server or recorded by this client
+        :param latency_bounds: upper bounds of the latency buckets
+        :return: None
+        """
+        calls: int = sum(metrics.latency_buckets)
+
+        print(f"{method} - calls: {calls} {dict(metrics.status_counts)}, in flight: {metrics.in_flight}")
+
+        if calls > 0:
+            p50: float = get_latency_quantile(metrics.latency_buckets, 0.5, latency_bounds)
+            p99: float = get_latency_quantile(metrics.latency_buckets, 0.99, latency_bounds)
+
+            print(f"    average: {metrics.latency_sum / calls * 1000:.2f}ms, p50 <= {p50 * 1000:g}ms, "
+                  f"p99 <= {p99 * 1000:g}ms, bytes in/out: {metrics.bytes_in}/{metrics.bytes_out}")
+
+    @staticmethod
+    def __get_shape(response) -> Union[ShapeService.Shape, ShapeService.ShapeV2]:
+        """
+        Returns the shape of a response in whichever format the server returned it, servers that do not support v2
+        return a Shape even when v2 was requested
+
+        :param response: response with a shape and shape_v2 field, e.g. GetShapeResponse
+        :return: Shape or ShapeV2
+        """
+        return response.shape_v2 if response.HasField('shape_v2') else response.shape
+
+    @staticmethod
+    def __get_coords(shape: Union[ShapeService.Shape, ShapeService.ShapeV2]) -> List[Tuple[int, int]]:
+        """
+        Returns the (x, y) vertices of a Shape or ShapeV2
+
+        :param shape: shape to read
+        :return: (x, y) vertices of the shape
+        """
+        if isinstance(shape, ShapeService.ShapeV2):
+            return list(zip(shape.xs, shape.ys))
+
+        return [(c.x, c.y) for c in shape.coords]
+
+    @staticmethod
+    def __get_shape_type_iterator(shape_count: int) -> Iterator[ShapeService.ShapeType]:
+        """
+        Creates an iterator of randomly chosen shape_types to pass to the grpc server stub
+
+        :param shape_count: number of shape_types to yield
+        :return: Iterator[ShapeService.ShapeType]
+        """
+        for _ in range(shape_count):
+            yield ShapeService.ShapeType(shape_type=random.choice(("Triangle", "Rectangle", "Pentagon")))
+
+    @staticmethod
+    def __get_shape_id_iterator(shape_ids: List[str], delay: float = 0.5, **stream_fields) -> Iterator[ShapeService.ShapeId]:
         """
         Creates an iterator from the provided list to pass to the grpc server stub
 
         :param shape_ids: list of ids to turn to an iterator
+        :param delay: seconds to wait after each id
+        :param stream_fields: fields of the stream to set on the first id, e.g. the resume_token of an earlier stream
         :return: Iterator[GrpcServer.ShapeId]
         """
-        for shape_id in shape_ids:
-            yield ShapeService.ShapeId(shape_id=shape_id)
-            time.sleep(0.5)  # Add in time-delay so user can see the operation of the iterator server-side
+        for index, shape_id in enumerate(shape_ids):
+            if index == 0:
+                yield encode_shape_id(shape_id, **stream_fields)
+            else:
+                yield encode_shape_id(shape_id)
+
+            if delay > 0:
+                time.sleep(delay)  # Add in time-delay so user can see the operation of the iterator server-side
 
     async def __check_server_health(self, hc_counter: int, corr_id: str) -> bool:
         """
@@ -469,7 +1276,8 @@ class ShapeClient:
                     credentials=self.credentials,
                     options=[
                         ("grpc.service_config", json.dumps(self.service_config))
-                    ]
+                    ],
+                    interceptors=get_metrics_gateways(self.call_metrics)
                 )
 
                 self.stub: ShapeServiceGrpc.ShapeServiceStub = ShapeServiceGrpc.ShapeServiceStub(self.channel)
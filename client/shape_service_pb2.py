@@ -24,35 +24,85 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13shape_service.proto\"h\n\x13\x43reateShapeResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1a\n\x05shape\x18\x03 \x01(\x0b\x32\x06.ShapeH\x00\x88\x01\x01\x42\x08\n\x06_shape\"e\n\x10GetShapeResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1a\n\x05shape\x18\x03 \x01(\x0b\x32\x06.ShapeH\x00\x88\x01\x01\x42\x08\n\x06_shape\"\x9b\x01\n GetPerimetersGreaterThanResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\tperimeter\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\x1a\n\x05shape\x18\x04 \x01(\x0b\x32\x06.ShapeH\x01\x88\x01\x01\x42\x0c\n\n_perimeterB\x08\n\x06_shape\"\xa7\x01\n\x14GetTotalAreaResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x17\n\ntotal_area\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\x1b\n\tvalid_ids\x18\x04 \x03(\x0b\x32\x08.ShapeId\x12\x1d\n\x0binvalid_ids\x18\x05 \x03(\x0b\x32\x08.ShapeIdB\r\n\x0b_total_area\"\x81\x01\n\x10GetAreasResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x11\n\x04\x61rea\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\x1a\n\x05shape\x18\x04 \x01(\x0b\x32\x06.ShapeH\x01\x88\x01\x01\x42\x07\n\x05_areaB\x08\n\x06_shape\"%\n\x0cMinPerimeter\x12\x15\n\rmin_perimeter\x18\x01 \x01(\x01\"\x1f\n\tShapeType\x12\x12\n\nshape_type\x18\x01 \x01(\t\"\x1b\n\x07ShapeId\x12\x10\n\x08shape_id\x18\x01 \x01(\t\"J\n\x05Shape\x12\x10\n\x08shape_id\x18\x01 \x01(\t\x12\x12\n\nshape_type\x18\x02 \x01(\t\x12\x1b\n\x06\x63oords\x18\x03 \x03(\x0b\x32\x0b.ShapeCoord\"8\n\nShapeCoord\x12\x0e\n\x01x\x18\x01 \x01(\x05H\x00\x88\x01\x01\x12\x0e\n\x01y\x18\x02 \x01(\x05H\x01\x88\x01\x01\x42\x04\n\x02_xB\x04\n\x02_y*w\n\x04\x43ode\x12\x06\n\x02OK\x10\x00\x12\x11\n\rINVALID_SHAPE\x10\x64\x12\x15\n\x11INVALID_PERIMETER\x10\x65\x12\x14\n\x10INVALID_SHAPE_ID\x10\x66\x12\x13\n\x0fSHAPE_NOT_FOUND\x10g\x12\x12\n\x0e\x41REA_NOT_FOUND\x10h2\xa2\x02\n\x0cShapeService\x12\x31\n\x0b\x43reateShape\x12\n.ShapeType\x1a\x14.CreateShapeResponse\"\x00\x12)\n\x08GetShape\x12\x08.ShapeId\x1a\x11.GetShapeResponse\"\x00\x12P\n\x18GetPerimetersGreaterThan\x12\r.MinPerimeter\x1a!.GetPerimetersGreaterThanResponse\"\x00\x30\x01\x12\x33\n\x0cGetTotalArea\x12\x08.ShapeId\x1a\x15.GetTotalAreaResponse\"\x00(\x01\x12-\n\x08GetAreas\x12\x08.ShapeId\x1a\x11.GetAreasResponse\"\x00(\x01\x30\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13shape_service.proto\"\x96\x01\n\x13\x43reateShapeResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1a\n\x05shape\x18\x03 \x01(\x0b\x32\x06.ShapeH\x00\x88\x01\x01\x12\x1f\n\x08shape_v2\x18\x04 \x01(\x0b\x32\x08.ShapeV2H\x01\x88\x01\x01\x42\x08\n\x06_shapeB\x0b\n\t_shape_v2\"\x93\x01\n\x10GetShapeResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1a\n\x05shape\x18\x03 \x01(\x0b\x32\x06.ShapeH\x00\x88\x01\x01\x12\x1f\n\x08shape_v2\x18\x04 \x01(\x0b\x32\x08.ShapeV2H\x01\x88\x01\x01\x42\x08\n\x06_shapeB\x0b\n\t_shape_v2\"\xdf\x01\n GetPerimetersGreaterThanResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\tperimeter\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\x1a\n\x05shape\x18\x04 \x01(\x0b\x32\x06.ShapeH\x01\x88\x01\x01\x12\x14\n\x0cresume_token\x18\x05 \x01(\t\x12\x1f\n\x08shape_v2\x18\x06 \x01(\x0b\x32\x08.ShapeV2H\x02\x88\x01\x01\x42\x0c\n\n_perimeterB\x08\n\x06_shapeB\x0b\n\t_shape_v2\"\xa7\x01\n\x14GetTotalAreaResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x17\n\ntotal_area\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\x1b\n\tvalid_ids\x18\x04 \x03(\x0b\x32\x08.ShapeId\x12\x1d\n\x0binvalid_ids\x18\x05 \x03(\x0b\x32\x08.ShapeIdB\r\n\x0b_total_area\"\xd7\x01\n\x10GetAreasResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x11\n\x04\x61rea\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\x1a\n\x05shape\x18\x04 \x01(\x0b\x32\x06.ShapeH\x01\x88\x01\x01\x12\x14\n\x0cresume_token\x18\x05 \x01(\t\x12\x10\n\x08sequence\x18\x06 \x01(\x04\x12\x1f\n\x08shape_v2\x18\x07 \x01(\x0b\x32\x08.ShapeV2H\x02\x88\x01\x01\x42\x07\n\x05_areaB\x08\n\x06_shapeB\x0b\n\t_shape_v2\"i\n\x16\x42\x61tchGetShapesResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\"\n\x07results\x18\x03 \x03(\x0b\x32\x11.GetShapeResponse\"\x80\x01\n\x1dGetPerimetersGreaterThanBatch\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x32\n\x07results\x18\x03 \x03(\x0b\x32!.GetPerimetersGreaterThanResponse\"`\n\rGetAreasBatch\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\"\n\x07results\x18\x03 \x03(\x0b\x32\x11.GetAreasResponse\"o\n\x19\x42\x61tchCreateShapesResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12%\n\x07results\x18\x03 \x03(\x0b\x32\x14.CreateShapeResponse\"\xd6\x01\n\rIngestSummary\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x10\n\x08received\x18\x03 \x01(\x04\x12\x0f\n\x07\x63reated\x18\x04 \x01(\x04\x12\x0e\n\x06\x66\x61iled\x18\x05 \x01(\x04\x12\x0f\n\x07\x63ommits\x18\x06 \x01(\x04\x12\x17\n\x0f\x65lapsed_seconds\x18\x07 \x01(\x01\x12\x19\n\x11shapes_per_second\x18\x08 \x01(\x01\x12 \n\x08\x66\x61ilures\x18\t \x03(\x0b\x32\x0e.IngestFailure\"K\n\rIngestFailure\x12\r\n\x05index\x18\x01 \x01(\x04\x12\x1a\n\x0bstatus_code\x18\x02 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x03 \x01(\t\"\xd8\x01\n\x13QueryShapesResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1a\n\x05shape\x18\x03 \x01(\x0b\x32\x06.ShapeH\x00\x88\x01\x01\x12\x11\n\x04\x61rea\x18\x04 \x01(\x01H\x01\x88\x01\x01\x12\x16\n\tperimeter\x18\x05 \x01(\x01H\x02\x88\x01\x01\x12\x1f\n\x08shape_v2\x18\x06 \x01(\x0b\x32\x08.ShapeV2H\x03\x88\x01\x01\x42\x08\n\x06_shapeB\x07\n\x05_areaB\x0c\n\n_perimeterB\x0b\n\t_shape_v2\"\xa0\x01\n\x1dGetShapesIntersectingResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1a\n\x05shape\x18\x03 \x01(\x0b\x32\x06.ShapeH\x00\x88\x01\x01\x12\x1f\n\x08shape_v2\x18\x04 \x01(\x0b\x32\x08.ShapeV2H\x01\x88\x01\x01\x42\x08\n\x06_shapeB\x0b\n\t_shape_v2\"\x9e\x01\n\x1bGetShapesContainingResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1a\n\x05shape\x18\x03 \x01(\x0b\x32\x06.ShapeH\x00\x88\x01\x01\x12\x1f\n\x08shape_v2\x18\x04 \x01(\x0b\x32\x08.ShapeV2H\x01\x88\x01\x01\x42\x08\n\x06_shapeB\x0b\n\t_shape_v2\"\xb4\x01\n\x12GetMetricsResponse\x12\x1a\n\x0bstatus_code\x18\x01 \x01(\x0e\x32\x05.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0elatency_bounds\x18\x03 \x03(\x01\x12\x1f\n\x07methods\x18\x04 \x03(\x0b\x32\x0e.MethodMetrics\x12\x1f\n\x08\x63ounters\x18\x05 \x03(\x0b\x32\r.CounterGroup\x12\x17\n\x0fprometheus_text\x18\x06 \x01(\t\"\xf3\x01\n\rMethodMetrics\x12\x0e\n\x06method\x18\x01 \x01(\t\x12\x37\n\rstatus_counts\x18\x02 \x03(\x0b\x32 .MethodMetrics.StatusCountsEntry\x12\x11\n\tin_flight\x18\x03 \x01(\x04\x12\x17\n\x0flatency_buckets\x18\x04 \x03(\x04\x12\x13\n\x0blatency_sum\x18\x05 \x01(\x01\x12\x10\n\x08\x62ytes_in\x18\x06 \x01(\x04\x12\x11\n\tbytes_out\x18\x07 \x01(\x04\x1a\x33\n\x11StatusCountsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x04:\x02\x38\x01\"|\n\x0c\x43ounterGroup\x12\x0c\n\x04name\x18\x01 \x01(\t\x12-\n\x08\x63ounters\x18\x02 \x03(\x0b\x32\x1b.CounterGroup.CountersEntry\x1a/\n\rCountersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"4\n\x15\x42\x61tchGetShapesRequest\x12\x1b\n\tshape_ids\x18\x01 \x03(\x0b\x32\x08.ShapeId\";\n\x18\x42\x61tchCreateShapesRequest\x12\x1f\n\x0bshape_types\x18\x01 \x03(\x0b\x32\n.ShapeType\",\n\x11GetMetricsRequest\x12\x17\n\x0fprometheus_text\x18\x01 \x01(\x08\"\xbd\x01\n\x0cMinPerimeter\x12\x15\n\rmin_perimeter\x18\x01 \x01(\x01\x12\x12\n\x05limit\x18\x02 \x01(\rH\x00\x88\x01\x01\x12\x16\n\tpage_size\x18\x03 \x01(\rH\x01\x88\x01\x01\x12\x14\n\x0cresume_token\x18\x04 \x01(\t\x12\x17\n\nbatch_size\x18\x05 \x01(\rH\x02\x88\x01\x01\x12\x14\n\x0comit_message\x18\x06 \x01(\x08\x42\x08\n\x06_limitB\x0c\n\n_page_sizeB\r\n\x0b_batch_size\"\xbd\x01\n\nShapeQuery\x12\x17\n\nshape_type\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x1a\n\x04\x61rea\x18\x02 \x01(\x0b\x32\x0c.MetricRange\x12\x1f\n\tperimeter\x18\x03 \x01(\x0b\x32\x0c.MetricRange\x12\x1c\n\x06within\x18\x04 \x01(\x0b\x32\x0c.BoundingBox\x12\x12\n\x05limit\x18\x05 \x01(\rH\x01\x88\x01\x01\x12\x0e\n\x06offset\x18\x06 \x01(\rB\r\n\x0b_shape_typeB\x08\n\x06_limit\"[\n\x0bMetricRange\x12\x19\n\x0cgreater_than\x18\x01 \x01(\x01H\x00\x88\x01\x01\x12\x14\n\x07\x61t_most\x18\x02 \x01(\x01H\x01\x88\x01\x01\x42\x0f\n\r_greater_thanB\n\n\x08_at_most\"I\n\x0b\x42oundingBox\x12\r\n\x05min_x\x18\x01 \x01(\x05\x12\r\n\x05min_y\x18\x02 \x01(\x05\x12\r\n\x05max_x\x18\x03 \x01(\x05\x12\r\n\x05max_y\x18\x04 \x01(\x05\"\x1f\n\tShapeType\x12\x12\n\nshape_type\x18\x01 \x01(\t\"\xed\x01\n\x07ShapeId\x12\x10\n\x08shape_id\x18\x01 \x01(\t\x12\x16\n\tpage_size\x18\x02 \x01(\rH\x00\x88\x01\x01\x12\x14\n\x0cresume_token\x18\x03 \x01(\t\x12\x17\n\nbatch_size\x18\x04 \x01(\rH\x01\x88\x01\x01\x12\x14\n\x0comit_message\x18\x05 \x01(\x08\x12\x13\n\x06window\x18\x06 \x01(\rH\x02\x88\x01\x01\x12\x11\n\tunordered\x18\x07 \x01(\x08\x12#\n\nnumeric_id\x18\x08 \x01(\x0b\x32\x0f.NumericShapeIdB\x0c\n\n_page_sizeB\r\n\x0b_batch_sizeB\t\n\x07_window\"7\n\x0eNumericShapeId\x12\x18\n\x04kind\x18\x01 \x01(\x0e\x32\n.ShapeKind\x12\x0b\n\x03seq\x18\x02 \x01(\x04\"J\n\x05Shape\x12\x10\n\x08shape_id\x18\x01 \x01(\t\x12\x12\n\nshape_type\x18\x02 \x01(\t\x12\x1b\n\x06\x63oords\x18\x03 \x03(\x0b\x32\x0b.ShapeCoord\"8\n\nShapeCoord\x12\x0e\n\x01x\x18\x01 \x01(\x05H\x00\x88\x01\x01\x12\x0e\n\x01y\x18\x02 \x01(\x05H\x01\x88\x01\x01\x42\x04\n\x02_xB\x04\n\x02_y\"G\n\x07ShapeV2\x12\x10\n\x08shape_id\x18\x01 \x01(\t\x12\x12\n\nshape_type\x18\x02 \x01(\t\x12\n\n\x02xs\x18\x03 \x03(\x11\x12\n\n\x02ys\x18\x04 \x03(\x11*R\n\tShapeKind\x12\x1a\n\x16SHAPE_KIND_UNSPECIFIED\x10\x00\x12\x0c\n\x08TRIANGLE\x10\x01\x12\r\n\tRECTANGLE\x10\x02\x12\x0c\n\x08PENTAGON\x10\x03*\xcc\x01\n\x04\x43ode\x12\x06\n\x02OK\x10\x00\x12\x11\n\rINVALID_SHAPE\x10\x64\x12\x15\n\x11INVALID_PERIMETER\x10\x65\x12\x14\n\x10INVALID_SHAPE_ID\x10\x66\x12\x13\n\x0fSHAPE_NOT_FOUND\x10g\x12\x12\n\x0e\x41REA_NOT_FOUND\x10h\x12\x13\n\x0f\x42\x41TCH_TOO_LARGE\x10i\x12\x11\n\rSTORAGE_ERROR\x10j\x12\x11\n\rINVALID_QUERY\x10k\x12\x18\n\x14INVALID_RESUME_TOKEN\x10l2\xee\x06\n\x0cShapeService\x12\x31\n\x0b\x43reateShape\x12\n.ShapeType\x1a\x14.CreateShapeResponse\"\x00\x12)\n\x08GetShape\x12\x08.ShapeId\x1a\x11.GetShapeResponse\"\x00\x12P\n\x18GetPerimetersGreaterThan\x12\r.MinPerimeter\x1a!.GetPerimetersGreaterThanResponse\"\x00\x30\x01\x12\x33\n\x0cGetTotalArea\x12\x08.ShapeId\x1a\x15.GetTotalAreaResponse\"\x00(\x01\x12-\n\x08GetAreas\x12\x08.ShapeId\x1a\x11.GetAreasResponse\"\x00(\x01\x30\x01\x12\x43\n\x0e\x42\x61tchGetShapes\x12\x16.BatchGetShapesRequest\x1a\x17.BatchGetShapesResponse\"\x00\x12L\n\x11\x42\x61tchCreateShapes\x12\x19.BatchCreateShapesRequest\x1a\x1a.BatchCreateShapesResponse\"\x00\x12.\n\x0cIngestShapes\x12\n.ShapeType\x1a\x0e.IngestSummary\"\x00(\x01\x12\x34\n\x0bQueryShapes\x12\x0b.ShapeQuery\x1a\x14.QueryShapesResponse\"\x00\x30\x01\x12I\n\x15GetShapesIntersecting\x12\x0c.BoundingBox\x1a\x1e.GetShapesIntersectingResponse\"\x00\x30\x01\x12\x44\n\x13GetShapesContaining\x12\x0b.ShapeCoord\x1a\x1c.GetShapesContainingResponse\"\x00\x30\x01\x12T\n\x1fGetPerimetersGreaterThanBatched\x12\r.MinPerimeter\x1a\x1e.GetPerimetersGreaterThanBatch\"\x00\x30\x01\x12\x31\n\x0fGetAreasBatched\x12\x08.ShapeId\x1a\x0e.GetAreasBatch\"\x00(\x01\x30\x01\x12\x37\n\nGetMetrics\x12\x12.GetMetricsRequest\x1a\x13.GetMetricsResponse\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'shape_service_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_CODE']._serialized_start=927
-  _globals['_CODE']._serialized_end=1046
-  _globals['_CREATESHAPERESPONSE']._serialized_start=23
-  _globals['_CREATESHAPERESPONSE']._serialized_end=127
-  _globals['_GETSHAPERESPONSE']._serialized_start=129
-  _globals['_GETSHAPERESPONSE']._serialized_end=230
-  _globals['_GETPERIMETERSGREATERTHANRESPONSE']._serialized_start=233
-  _globals['_GETPERIMETERSGREATERTHANRESPONSE']._serialized_end=388
-  _globals['_GETTOTALAREARESPONSE']._serialized_start=391
-  _globals['_GETTOTALAREARESPONSE']._serialized_end=558
-  _globals['_GETAREASRESPONSE']._serialized_start=561
-  _globals['_GETAREASRESPONSE']._serialized_end=690
-  _globals['_MINPERIMETER']._serialized_start=692
-  _globals['_MINPERIMETER']._serialized_end=729
-  _globals['_SHAPETYPE']._serialized_start=731
-  _globals['_SHAPETYPE']._serialized_end=762
-  _globals['_SHAPEID']._serialized_start=764
-  _globals['_SHAPEID']._serialized_end=791
-  _globals['_SHAPE']._serialized_start=793
-  _globals['_SHAPE']._serialized_end=867
-  _globals['_SHAPECOORD']._serialized_start=869
-  _globals['_SHAPECOORD']._serialized_end=925
-  _globals['_SHAPESERVICE']._serialized_start=1049
-  _globals['_SHAPESERVICE']._serialized_end=1339
+  _globals['_METHODMETRICS_STATUSCOUNTSENTRY']._loaded_options = None
+  _globals['_METHODMETRICS_STATUSCOUNTSENTRY']._serialized_options = b'8\001'
+  _globals['_COUNTERGROUP_COUNTERSENTRY']._loaded_options = None
+  _globals['_COUNTERGROUP_COUNTERSENTRY']._serialized_options = b'8\001'
+  _globals['_SHAPEKIND']._serialized_start=4031
+  _globals['_SHAPEKIND']._serialized_end=4113
+  _globals['_CODE']._serialized_start=4116
+  _globals['_CODE']._serialized_end=4320
+  _globals['_CREATESHAPERESPONSE']._serialized_start=24
+  _globals['_CREATESHAPERESPONSE']._serialized_end=174
+  _globals['_GETSHAPERESPONSE']._serialized_start=177
+  _globals['_GETSHAPERESPONSE']._serialized_end=324
+  _globals['_GETPERIMETERSGREATERTHANRESPONSE']._serialized_start=327
+  _globals['_GETPERIMETERSGREATERTHANRESPONSE']._serialized_end=550
+  _globals['_GETTOTALAREARESPONSE']._serialized_start=553
+  _globals['_GETTOTALAREARESPONSE']._serialized_end=720
+  _globals['_GETAREASRESPONSE']._serialized_start=723
+  _globals['_GETAREASRESPONSE']._serialized_end=938
+  _globals['_BATCHGETSHAPESRESPONSE']._serialized_start=940
+  _globals['_BATCHGETSHAPESRESPONSE']._serialized_end=1045
+  _globals['_GETPERIMETERSGREATERTHANBATCH']._serialized_start=1048
+  _globals['_GETPERIMETERSGREATERTHANBATCH']._serialized_end=1176
+  _globals['_GETAREASBATCH']._serialized_start=1178
+  _globals['_GETAREASBATCH']._serialized_end=1274
+  _globals['_BATCHCREATESHAPESRESPONSE']._serialized_start=1276
+  _globals['_BATCHCREATESHAPESRESPONSE']._serialized_end=1387
+  _globals['_INGESTSUMMARY']._serialized_start=1390
+  _globals['_INGESTSUMMARY']._serialized_end=1604
+  _globals['_INGESTFAILURE']._serialized_start=1606
+  _globals['_INGESTFAILURE']._serialized_end=1681
+  _globals['_QUERYSHAPESRESPONSE']._serialized_start=1684
+  _globals['_QUERYSHAPESRESPONSE']._serialized_end=1900
+  _globals['_GETSHAPESINTERSECTINGRESPONSE']._serialized_start=1903
+  _globals['_GETSHAPESINTERSECTINGRESPONSE']._serialized_end=2063
+  _globals['_GETSHAPESCONTAININGRESPONSE']._serialized_start=2066
+  _globals['_GETSHAPESCONTAININGRESPONSE']._serialized_end=2224
+  _globals['_GETMETRICSRESPONSE']._serialized_start=2227
+  _globals['_GETMETRICSRESPONSE']._serialized_end=2407
+  _globals['_METHODMETRICS']._serialized_start=2410
+  _globals['_METHODMETRICS']._serialized_end=2653
+  _globals['_METHODMETRICS_STATUSCOUNTSENTRY']._serialized_start=2602
+  _globals['_METHODMETRICS_STATUSCOUNTSENTRY']._serialized_end=2653
+  _globals['_COUNTERGROUP']._serialized_start=2655
+  _globals['_COUNTERGROUP']._serialized_end=2779
+  _globals['_COUNTERGROUP_COUNTERSENTRY']._serialized_start=2732
+  _globals['_COUNTERGROUP_COUNTERSENTRY']._serialized_end=2779
+  _globals['_BATCHGETSHAPESREQUEST']._serialized_start=2781
+  _globals['_BATCHGETSHAPESREQUEST']._serialized_end=2833
+  _globals['_BATCHCREATESHAPESREQUEST']._serialized_start=2835
+  _globals['_BATCHCREATESHAPESREQUEST']._serialized_end=2894
+  _globals['_GETMETRICSREQUEST']._serialized_start=2896
+  _globals['_GETMETRICSREQUEST']._serialized_end=2940
+  _globals['_MINPERIMETER']._serialized_start=2943
+  _globals['_MINPERIMETER']._serialized_end=3132
+  _globals['_SHAPEQUERY']._serialized_start=3135
+  _globals['_SHAPEQUERY']._serialized_end=3324
+  _globals['_METRICRANGE']._serialized_start=3326
+  _globals['_METRICRANGE']._serialized_end=3417
+  _globals['_BOUNDINGBOX']._serialized_start=3419
+  _globals['_BOUNDINGBOX']._serialized_end=3492
+  _globals['_SHAPETYPE']._serialized_start=3494
+  _globals['_SHAPETYPE']._serialized_end=3525
+  _globals['_SHAPEID']._serialized_start=3528
+  _globals['_SHAPEID']._serialized_end=3765
+  _globals['_NUMERICSHAPEID']._serialized_start=3767
+  _globals['_NUMERICSHAPEID']._serialized_end=3822
+  _globals['_SHAPE']._serialized_start=3824
+  _globals['_SHAPE']._serialized_end=3898
+  _globals['_SHAPECOORD']._serialized_start=3900
+  _globals['_SHAPECOORD']._serialized_end=3956
+  _globals['_SHAPEV2']._serialized_start=3958
+  _globals['_SHAPEV2']._serialized_end=4029
+  _globals['_SHAPESERVICE']._serialized_start=4323
+  _globals['_SHAPESERVICE']._serialized_end=5201
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,19 @@
+import argparse
+
+from lib.repositories.snapshot_converter import convert_json_to_snapshot, convert_snapshot_to_json
+
+if __name__ == "__main__":
+    # Converts the shape database between the JSON file used by the json backend and the binary snapshot used by the
+    # binary backend, e.g. python convert_snapshot.py to-binary data.json data.shapes
+    parser = argparse.ArgumentParser(description="Convert the shape database between JSON and binary snapshots")
+    parser.add_argument("direction", choices=("to-binary", "to-json"))
+    parser.add_argument("source", help="file to read")
+    parser.add_argument("destination", help="file to write")
+    args = parser.parse_args()
+
+    if args.direction == "to-binary":
+        converted: int = convert_json_to_snapshot(args.source, args.destination)
+    else:
+        converted: int = convert_snapshot_to_json(args.source, args.destination)
+
+    print(f"Converted {converted} shapes from {args.source} to {args.destination}")
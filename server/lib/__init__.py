@@ -2,3 +2,4 @@ from .objects import *
 from .services import *
 from .functions import *
 from .interceptors import *
+from .repositories import *
@@ -2,3 +2,9 @@ from .get_config import *
 from .log_config import *
 from .credentials import *
 from .correlation_id_context import *
+from .shape_format_context import *
+from .geometry import *
+from .resume_token import *
+from .shape_id_codec import *
+
+from .request_signature import *
\ No newline at end of file
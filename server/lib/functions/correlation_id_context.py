@@ -13,4 +13,9 @@ def set_correlation_id(correlation_id_var):
     try:
         yield
     finally:
-        correlation_id.reset(token)
+        # An async generator that is closed after its call was cancelled is finalized in a different context, which
+        # never saw the correlation_id being set so there is nothing to reset
+        try:
+            correlation_id.reset(token)
+        except ValueError:
+            pass
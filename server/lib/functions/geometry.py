@@ -0,0 +1,153 @@
+import math
+from typing import List, Sequence, Tuple
+
+def get_perimeter(coords: Sequence[Tuple[int, int]]) -> float:
+    """
+    Calculates the perimeter of the polygon with the given vertices
+
+    :param coords: (x, y) vertices of the polygon in order
+    :return: float - the perimeter of the polygon
+    """
+    perimeter: float = 0.0
+
+    n: int = len(coords)  # Number of coordinates in the shape
+
+    # Calculate the distance between each set of points and add them up. i+1 % n connects the first point back to the last point
+    for i in range(n):
+        x_sq_diff: float = (coords[(i + 1) % n][0] - coords[i][0]) ** 2
+        y_sq_diff: float = (coords[(i + 1) % n][1] - coords[i][1]) ** 2
+
+        perimeter += math.sqrt(x_sq_diff + y_sq_diff)
+
+    return perimeter
+
+def get_area(coords: Sequence[Tuple[int, int]]) -> float:
+    """
+    Calculates the area of the polygon with the given vertices using Gauss's Area formula for a polygon
+
+    A = 1/2*abs(sum((x_i*y_i+1 - y_i*x_i+1)) + (x_n*y_1+y_n*x_1))
+
+    :param coords: (x, y) vertices of the polygon in order
+    :return: float - the area of the polygon
+    """
+    area: float = 0.0
+
+    n: int = len(coords)  # Number of coordinates in the shape
+
+    # Calculate the area of the shape using Gauss's area formula. i+1 % n connects the first point back to the last point
+    for i in range(n):
+        x1_y2: float = coords[i][0] * coords[(i + 1) % n][1]
+        x2_y1: float = coords[(i + 1) % n][0] * coords[i][1]
+
+        area += x1_y2 - x2_y1
+
+    return abs(area) / 2
+
+def get_bounds(coords: Sequence[Tuple[int, int]]) -> Tuple[int, int, int, int]:
+    """
+    Calculates the bounding box of the polygon with the given vertices
+
+    :param coords: (x, y) vertices of the polygon
+    :return: (min_x, min_y, max_x, max_y)
+    """
+    xs: List[int] = [x for x, _ in coords]
+    ys: List[int] = [y for _, y in coords]
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+def contains_point(coords: Sequence[Tuple[int, int]], x: int, y: int) -> bool:
+    """
+    Checks whether the polygon with the given vertices contains a point, counting points on its edges as inside. Uses
+    the even-odd rule, casting a ray from the point towards positive x and counting the edges it crosses
+
+    :param coords: (x, y) vertices of the polygon in order
+    :param x: x of the point
+    :param y: y of the point
+    :return: True if the point is inside or on the polygon
+    """
+    inside: bool = False
+
+    n: int = len(coords)  # Number of coordinates in the shape
+
+    for i in range(n):
+        x1, y1 = coords[i]
+        x2, y2 = coords[(i + 1) % n]
+
+        if _is_on_segment(x1, y1, x2, y2, x, y):
+            return True
+
+        # Only count edges that straddle the ray, treating each vertex as lying just above it so that the ray passing
+        # through a vertex is counted once
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+
+    return inside
+
+def intersects_box(coords: Sequence[Tuple[int, int]], min_x: int, min_y: int, max_x: int, max_y: int) -> bool:
+    """
+    Checks whether the polygon with the given vertices and a box share at least one point, including their edges. The
+    box may be a point or a line when its min and max are equal
+
+    :param coords: (x, y) vertices of the polygon in order
+    :param min_x: left edge of the box
+    :param min_y: bottom edge of the box
+    :param max_x: right edge of the box
+    :param max_y: top edge of the box
+    :return: True if the polygon and the box intersect
+    """
+    shape_min_x, shape_min_y, shape_max_x, shape_max_y = get_bounds(coords)
+
+    if shape_min_x > max_x or shape_max_x < min_x or shape_min_y > max_y or shape_max_y < min_y:
+        return False
+
+    # A vertex of the polygon inside the box
+    for x, y in coords:
+        if min_x <= x <= max_x and min_y <= y <= max_y:
+            return True
+
+    # The box inside the polygon
+    if contains_point(coords, min_x, min_y):
+        return True
+
+    corners: List[Tuple[int, int]] = [(min_x, min_y), (min_x, max_y), (max_x, max_y), (max_x, min_y)]
+
+    # Otherwise an edge of the polygon must cross an edge of the box
+    n: int = len(coords)  # Number of coordinates in the shape
+
+    for i in range(n):
+        for j in range(4):
+            if _segments_intersect(coords[i], coords[(i + 1) % n], corners[j], corners[(j + 1) % 4]):
+                return True
+
+    return False
+
+def _orientation(x1: int, y1: int, x2: int, y2: int, x3: int, y3: int) -> int:
+    """
+    Returns the sign of the cross product of (x2 - x1, y2 - y1) and (x3 - x1, y3 - y1): 1 if the three points turn
+    counter-clockwise, -1 if they turn clockwise and 0 if they are collinear
+    """
+    cross: int = (x2 - x1) * (y3 - y1) - (y2 - y1) * (x3 - x1)
+
+    return (cross > 0) - (cross < 0)
+
+def _is_on_segment(x1: int, y1: int, x2: int, y2: int, x: int, y: int) -> bool:
+    """
+    Checks whether the point (x, y) lies on the segment from (x1, y1) to (x2, y2), end points included
+    """
+    return (_orientation(x1, y1, x2, y2, x, y) == 0 and
+            min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2))
+
+def _segments_intersect(a: Tuple[int, int], b: Tuple[int, int], c: Tuple[int, int], d: Tuple[int, int]) -> bool:
+    """
+    Checks whether the segments a-b and c-d share at least one point, including when they touch or overlap
+    """
+    o1: int = _orientation(*a, *b, *c)
+    o2: int = _orientation(*a, *b, *d)
+    o3: int = _orientation(*c, *d, *a)
+    o4: int = _orientation(*c, *d, *b)
+
+    if o1 != o2 and o3 != o4:
+        return True
+
+    return (_is_on_segment(*a, *b, *c) or _is_on_segment(*a, *b, *d) or
+            _is_on_segment(*c, *d, *a) or _is_on_segment(*c, *d, *b))
@@ -0,0 +1,35 @@
+import json
+import base64
+import binascii
+
+def encode_resume_token(method: str, position: dict) -> str:
+    """
+    Encodes a position in the stream of a method as an opaque resume_token. Tokens are URL safe base64 JSON, so clients
+    can store and pass them back unchanged but should not build or parse them
+
+    :param method: gRPC method the token resumes, so that tokens cannot be passed to a different method
+    :param position: JSON serializable fields describing the position to resume after
+    :return: resume_token
+    """
+    token_json: str = json.dumps([method, position], separators=(',', ':'))
+
+    return base64.urlsafe_b64encode(token_json.encode('utf-8')).decode('ascii')
+
+def decode_resume_token(method: str, resume_token: str) -> dict:
+    """
+    Decodes a resume_token created by encode_resume_token
+
+    :param method: gRPC method the token was passed to
+    :param resume_token: token to decode
+    :return: the position the token was encoded with
+    :raises ValueError: if the token is malformed or was created for a different method
+    """
+    try:
+        token_method, position = json.loads(base64.urlsafe_b64decode(resume_token.encode('ascii')))
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise ValueError("resume_token is malformed")
+
+    if token_method != method or not isinstance(position, dict):
+        raise ValueError(f"resume_token was not created by {method}")
+
+    return position
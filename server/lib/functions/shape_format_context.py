@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+from typing import Optional
+
+from lib.objects.context_vars import shape_format
+
+# Formats a call can ask for in its x-shape-format metadata. v1 is the Shape message with a ShapeCoord per vertex and
+# v2 is the ShapeV2 message with packed coordinates
+SHAPE_FORMATS = ('v1', 'v2')
+
+@contextmanager
+def set_shape_format(shape_format_var: Optional[str]):
+    """
+    Set the Shape message format for the context. Calls without the metadata, or with a format this server does not
+    know, get v1 so that older clients keep working
+
+    :param shape_format_var: x-shape-format metadata of the call, if any
+    :return:
+    """
+    token = shape_format.set(shape_format_var if shape_format_var in SHAPE_FORMATS else 'v1')
+    try:
+        yield
+    finally:
+        # Same as the correlation_id, an async generator closed after cancellation is finalized in another context
+        try:
+            shape_format.reset(token)
+        except ValueError:
+            pass
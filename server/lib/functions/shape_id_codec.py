@@ -0,0 +1,67 @@
+from typing import Dict, Optional, Tuple
+
+import shape_service_pb2 as ShapeService
+
+# First letter of the string shape_ids of each ShapeKind, e.g. T-12 is the TRIANGLE with seq 12
+SHAPE_ID_PREFIXES: Dict[int, str] = {
+    ShapeService.ShapeKind.TRIANGLE: "T",
+    ShapeService.ShapeKind.RECTANGLE: "R",
+    ShapeService.ShapeKind.PENTAGON: "P"
+}
+SHAPE_ID_KINDS: Dict[str, int] = {prefix: kind for kind, prefix in SHAPE_ID_PREFIXES.items()}
+
+def parse_shape_id(shape_id: str) -> Optional[Tuple[str, int]]:
+    """
+    Splits a string shape_id into its upper case prefix and seq, e.g. ("T", 12) for t-12 or T-012. The prefix is not
+    checked against the supported shape kinds
+
+    :param shape_id: shape_id to parse
+    :return: (prefix, seq), or None if the shape_id is not a letter, a dash and a non negative integer
+    """
+    prefix, digits = shape_id[:1], shape_id[2:]
+
+    if not prefix.isalpha() or shape_id[1:2] != '-' or not digits.isdigit() or not digits.isascii():
+        return None
+
+    return prefix.upper(), int(digits)
+
+def format_shape_id(prefix: str, seq: int) -> str:
+    """
+    Builds the string shape_id of a prefix and seq, e.g. T-12
+
+    :param prefix: first letter of the shape_id
+    :param seq: position of the shape within its kind
+    :return: shape_id
+    """
+    return f"{prefix}-{seq}"
+
+def encode_shape_id(shape_id: str, **fields) -> ShapeService.ShapeId:
+    """
+    Builds the ShapeId request for a string shape_id, using the numeric_id when the shape_id is of a supported kind
+    and the string form otherwise, so that the server reports it as invalid
+
+    :param shape_id: shape_id to encode
+    :param fields: other fields of the ShapeId to set, e.g. the page_size of a stream
+    :return: ShapeId
+    """
+    parsed: Optional[Tuple[str, int]] = parse_shape_id(shape_id)
+
+    if parsed is None or parsed[0] not in SHAPE_ID_KINDS:
+        return ShapeService.ShapeId(shape_id=shape_id, **fields)
+
+    return ShapeService.ShapeId(
+        numeric_id=ShapeService.NumericShapeId(kind=SHAPE_ID_KINDS[parsed[0]], seq=parsed[1]),
+        **fields
+    )
+
+def decode_shape_id(shape_id: ShapeService.ShapeId) -> str:
+    """
+    Returns the string form of a ShapeId, e.g. for logs and messages. A numeric_id of an unknown kind has a ? prefix
+
+    :param shape_id: ShapeId to decode
+    :return: shape_id
+    """
+    if not shape_id.HasField('numeric_id'):
+        return shape_id.shape_id
+
+    return format_shape_id(SHAPE_ID_PREFIXES.get(shape_id.numeric_id.kind, "?"), shape_id.numeric_id.seq)
@@ -1 +1,4 @@
-from .signature_validation_interceptor import *
\ No newline at end of file
+from .method_registry import *
+from .interceptor_chain import *
+from .signature_validation_interceptor import *
+from .metrics_interceptor import *
\ No newline at end of file
@@ -0,0 +1,97 @@
+import grpc
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Optional, Sequence, Tuple, Union
+
+from .method_registry import MethodRegistry, RegisteredMethod
+
+class InterceptedCall:
+    """
+    Incoming call as seen by the interceptors of an InterceptorChain. The invocation metadata is parsed once and shared
+    by every interceptor of the chain
+    """
+    __slots__ = ('method', 'metadata')
+
+    def __init__(self, method: RegisteredMethod, metadata: Dict[str, Union[str, bytes]]):
+        self.method: RegisteredMethod = method
+        self.metadata: Dict[str, Union[str, bytes]] = metadata
+
+class ChainedInterceptor(ABC):
+    """
+    Interceptor run by an InterceptorChain
+    """
+
+    @abstractmethod
+    def intercept(self, call: InterceptedCall) -> Optional[Tuple[grpc.StatusCode, str]]:
+        """
+        Checks an incoming call before it is handled
+
+        :param call: call to check
+        :return: None to let the call continue, or the status code and details to abort it with
+        """
+        ...
+
+class InterceptorChain(grpc.aio.ServerInterceptor):
+    """
+    Server interceptor that runs a chain of ChainedInterceptors, in order, on every call of a registered method. The
+    kind of each call comes from the MethodRegistry, so a rejected call is aborted with a handler of the right kind.
+    Calls of unregistered methods are passed on untouched so that the server answers them with UNIMPLEMENTED
+    """
+
+    def __init__(self, registry: MethodRegistry, interceptors: Sequence[ChainedInterceptor]):
+        self.registry: MethodRegistry = registry
+        self.interceptors: Tuple[ChainedInterceptor, ...] = tuple(interceptors)
+
+    def intercept_service(self, continuation: Callable[
+            [grpc.HandlerCallDetails], Awaitable[grpc.RpcMethodHandler]
+        ], handler_call_details: grpc.HandlerCallDetails) -> Awaitable[Optional[grpc.RpcMethodHandler]]:
+        """
+        Runs the chain on an incoming call. Accepted calls return the awaitable of the continuation as is, rather than
+        awaiting it in a coroutine of their own, to keep the overhead per call down
+
+        :param continuation: method to continue the call once every interceptor accepted it
+        :param handler_call_details: incoming call
+        :return: Awaitable[grpc.RpcMethodHandler | None]
+        """
+        method: Optional[RegisteredMethod] = self.registry.get(handler_call_details.method)
+
+        if method is None:
+            return continuation(handler_call_details)
+
+        call: InterceptedCall = InterceptedCall(method, dict(handler_call_details.invocation_metadata or ()))
+
+        for interceptor in self.interceptors:
+            rejection: Optional[Tuple[grpc.StatusCode, str]] = interceptor.intercept(call)
+
+            if rejection is not None:
+                return self.__abort(method.kind, *rejection)
+
+        return continuation(handler_call_details)
+
+    @staticmethod
+    async def __abort(kind: str, code: grpc.StatusCode, details: str) -> grpc.RpcMethodHandler:
+        """
+        Returns a handler of the given kind that aborts the call
+
+        :param kind: kind of the rejected method
+        :param code: status code to abort with
+        :param details: details to abort with
+        :return: grpc.RpcMethodHandler
+        """
+        async def abort(ignored_request, context: grpc.aio.ServicerContext):
+            """
+            Abort the current request when invoked
+
+            :param ignored_request: request, or request iterator, being ignored
+            :param context: context to abort
+            :return: None
+            """
+            await context.abort(code, details)
+
+        if kind == MethodRegistry.UNARY_UNARY:
+            return grpc.unary_unary_rpc_method_handler(abort)
+        elif kind == MethodRegistry.UNARY_STREAM:
+            return grpc.unary_stream_rpc_method_handler(abort)
+        elif kind == MethodRegistry.STREAM_UNARY:
+            return grpc.stream_unary_rpc_method_handler(abort)
+        else:
+            return grpc.stream_stream_rpc_method_handler(abort)
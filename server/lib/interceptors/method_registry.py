@@ -0,0 +1,56 @@
+from typing import Dict, Iterable, Optional
+
+from google.protobuf.descriptor import MethodDescriptor, ServiceDescriptor
+
+class RegisteredMethod:
+    """
+    RPC method served by the server, as described by its service descriptor
+    """
+    __slots__ = ('path', 'service', 'name', 'kind')
+
+    def __init__(self, service: str, name: str, kind: str):
+        self.path: str = f"/{service}/{name}"
+        self.service: str = service
+        self.name: str = name
+        self.kind: str = kind
+
+class MethodRegistry:
+    """
+    Registry of every RPC method served, keyed by the method path of its calls, e.g. /ShapeService/GetShape. It is
+    built once from the service descriptors so that interceptors know the service and kind of a call from its
+    HandlerCallDetails, without relying on any client supplied metadata
+    """
+    UNARY_UNARY: str = "unary-unary"
+    UNARY_STREAM: str = "unary-stream"
+    STREAM_UNARY: str = "stream-unary"
+    STREAM_STREAM: str = "stream-stream"
+
+    def __init__(self, services: Iterable[ServiceDescriptor]):
+        registered: Iterable[RegisteredMethod] = (
+            RegisteredMethod(service.full_name, method.name, self.__get_kind(method))
+            for service in services
+            for method in service.methods
+        )
+        self.methods: Dict[str, RegisteredMethod] = {method.path: method for method in registered}
+
+    def get(self, method: str) -> Optional[RegisteredMethod]:
+        """
+        Returns the registered method of a call
+
+        :param method: method path of the call, as in its HandlerCallDetails
+        :return: RegisteredMethod, or None if the server does not serve the method
+        """
+        return self.methods.get(method)
+
+    @classmethod
+    def __get_kind(cls, method: MethodDescriptor) -> str:
+        """
+        Returns the kind of a method, e.g. unary-stream for a method with a single request and a stream of responses
+
+        :param method: method descriptor
+        :return: kind of the method
+        """
+        if method.client_streaming:
+            return cls.STREAM_STREAM if method.server_streaming else cls.STREAM_UNARY
+
+        return cls.UNARY_STREAM if method.server_streaming else cls.UNARY_UNARY
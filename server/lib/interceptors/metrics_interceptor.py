@@ -0,0 +1,187 @@
+import time
+import grpc
+import asyncio
+import inspect
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from ..objects.call_metrics import CallMetrics
+from .method_registry import MethodRegistry
+
+# The context of an aio call holds its status code as the integer value of the code
+STATUS_CODE_NAMES: Dict[int, str] = {code.value[0]: code.name for code in grpc.StatusCode}
+
+class MetricsInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Server interceptor that records the CallMetrics of every call of a registered method: its status code and latency,
+    and the serialized size of the messages it received and sent, which are counted by wrapping the deserializer and
+    serializer of its handler so that no message is serialized twice
+
+    The handler of each method is wrapped once and reused for every call. It must be the first interceptor of the
+    server so that calls rejected by the interceptors after it are recorded as well
+    """
+
+    def __init__(self, registry: MethodRegistry, metrics: CallMetrics):
+        self.registry: MethodRegistry = registry
+        self.metrics: CallMetrics = metrics
+
+        # Method path to its last handler and the wrapped handler, rejected calls get a new abort handler every time
+        self._handlers: Dict[str, Tuple[grpc.RpcMethodHandler, grpc.RpcMethodHandler]] = {}
+
+    async def intercept_service(self, continuation: Callable[
+            [grpc.HandlerCallDetails], Awaitable[grpc.RpcMethodHandler]
+        ], handler_call_details: grpc.HandlerCallDetails) -> Optional[grpc.RpcMethodHandler]:
+        """
+        Wraps the handler of an incoming call so that the call is recorded
+
+        :param continuation: method to continue the call
+        :param handler_call_details: incoming call
+        :return: grpc.RpcMethodHandler | None
+        """
+        handler: Optional[grpc.RpcMethodHandler] = await continuation(handler_call_details)
+        method: str = handler_call_details.method
+
+        # Calls of unregistered methods are left alone, so that arbitrary method paths do not add metrics
+        if handler is None or self.registry.get(method) is None:
+            return handler
+
+        cached: Optional[Tuple[grpc.RpcMethodHandler, grpc.RpcMethodHandler]] = self._handlers.get(method)
+
+        if cached is not None and cached[0] is handler:
+            return cached[1]
+
+        wrapped: grpc.RpcMethodHandler = self.__wrap_handler(method, handler)
+        self._handlers[method] = (handler, wrapped)
+
+        return wrapped
+
+    def __wrap_handler(self, method: str, handler: grpc.RpcMethodHandler) -> grpc.RpcMethodHandler:
+        """
+        Wraps the behavior, request deserializer and response serializer of a handler
+
+        :param method: method path of the handler
+        :param handler: handler to wrap
+        :return: grpc.RpcMethodHandler of the same kind
+        """
+        metrics: CallMetrics = self.metrics
+        request_deserializer: Optional[Callable[[bytes], object]] = handler.request_deserializer
+        response_serializer: Optional[Callable[[object], bytes]] = handler.response_serializer
+
+        def deserialize(data: bytes):
+            metrics.get(method).bytes_in += len(data)
+            return data if request_deserializer is None else request_deserializer(data)
+
+        def serialize(response) -> bytes:
+            data: bytes = response if response_serializer is None else response_serializer(response)
+            metrics.get(method).bytes_out += len(data)
+            return data
+
+        if handler.request_streaming and handler.response_streaming:
+            behavior_field: str = 'stream_stream'
+        elif handler.request_streaming:
+            behavior_field: str = 'stream_unary'
+        elif handler.response_streaming:
+            behavior_field: str = 'unary_stream'
+        else:
+            behavior_field: str = 'unary_unary'
+
+        return handler._replace(**{
+            behavior_field: self.__wrap_behavior(method, getattr(handler, behavior_field)),
+            'request_deserializer': deserialize,
+            'response_serializer': serialize,
+        })
+
+    def __wrap_behavior(self, method: str, behavior: Callable) -> Callable:
+        """
+        Wraps the behavior of a handler to record its calls. The wrapper is of the same kind as the behavior, since the
+        server runs coroutines and async generators on the event loop, and plain functions and generators on its
+        executor
+
+        :param method: method path of the handler
+        :param behavior: behavior to wrap
+        :return: wrapped behavior
+        """
+        metrics: CallMetrics = self.metrics
+        get_code: Callable[[BaseException, grpc.aio.ServicerContext], str] = self.__get_code
+
+        if inspect.isasyncgenfunction(behavior):
+            async def record_async_stream(request, context: grpc.aio.ServicerContext):
+                metrics.start(method)
+                started: float = time.perf_counter()
+                code: str = "OK"
+
+                try:
+                    async for response in behavior(request, context):
+                        yield response
+                except BaseException as e:
+                    code = get_code(e, context)
+                    raise
+                finally:
+                    metrics.finish(method, code, time.perf_counter() - started)
+
+            return record_async_stream
+
+        if inspect.iscoroutinefunction(behavior):
+            async def record_async(request, context: grpc.aio.ServicerContext):
+                metrics.start(method)
+                started: float = time.perf_counter()
+                code: str = "OK"
+
+                try:
+                    return await behavior(request, context)
+                except BaseException as e:
+                    code = get_code(e, context)
+                    raise
+                finally:
+                    metrics.finish(method, code, time.perf_counter() - started)
+
+            return record_async
+
+        if inspect.isgeneratorfunction(behavior):
+            def record_stream(request, context: grpc.aio.ServicerContext):
+                metrics.start(method)
+                started: float = time.perf_counter()
+                code: str = "OK"
+
+                try:
+                    yield from behavior(request, context)
+                except BaseException as e:
+                    code = get_code(e, context)
+                    raise
+                finally:
+                    metrics.finish(method, code, time.perf_counter() - started)
+
+            return record_stream
+
+        def record(request, context: grpc.aio.ServicerContext):
+            metrics.start(method)
+            started: float = time.perf_counter()
+            code: str = "OK"
+
+            try:
+                return behavior(request, context)
+            except BaseException as e:
+                code = get_code(e, context)
+                raise
+            finally:
+                metrics.finish(method, code, time.perf_counter() - started)
+
+        return record
+
+    @staticmethod
+    def __get_code(error: BaseException, context: grpc.aio.ServicerContext) -> str:
+        """
+        Returns the name of the status code a call ends with when its behavior raises
+
+        :param error: exception raised by the behavior
+        :param context: context of the call, which holds the code of an aborted call
+        :return: name of the status code, e.g. UNAUTHENTICATED
+        """
+        if isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+            return "CANCELLED"
+
+        code = context.code()
+
+        if isinstance(code, grpc.StatusCode):
+            return code.name
+
+        return STATUS_CODE_NAMES.get(code, "UNKNOWN")
@@ -1,57 +1,71 @@
+import hmac
+import time
 import grpc
-from typing import Awaitable, Callable
+from typing import Dict, Iterable, Optional, Tuple
 
-class SignatureValidationInterceptor(grpc.aio.ServerInterceptor):
+from ..objects.nonce_cache import NonceCache
+from .interceptor_chain import ChainedInterceptor, InterceptedCall
+from ..functions.request_signature import get_signing_key, parse_signature, sign_request
+
+class SignatureValidationInterceptor(ChainedInterceptor):
     """
-    Signature Validation Interceptor used to intercept the incoming request and authenticate it with an expected
-    header-value pair
+    Signature Validation Interceptor used to intercept the incoming request and authenticate it with the HMAC-SHA256
+    signature in its signature header, which signs the key id, timestamp, nonce and method path of the call
+
+    A call is only accepted if its timestamp is within window seconds of the server time and its nonce was not used by
+    the same key within the window. Nonces of verified calls are kept in a NonceCache, so a replayed call is rejected
+    before its signature is calculated, and the HMAC of every key is prepared once when the interceptor is created.
+    The workers of a multi-process server must share a nonce_cache, e.g. a SqliteNonceCache, or a call could be replayed
+    once on every worker
     """
-    def __init__(self, sig_header: str, sig_value: str):
-        def abort(ignored_request, context):
-            """
-            Abort the current request when invoked
-
-            :param ignored_request: request being ignored
-            :param context: context to abort
-            :return: None
-            """
-            context.abort(grpc.StatusCode.UNAUTHENTICATED, "Invalid signature")
-
-        self.signature_header = sig_header
-        self.signature = sig_value
-        self._abort_unary_unary = grpc.unary_unary_rpc_method_handler(abort)
-        self._abort_unary_stream = grpc.unary_stream_rpc_method_handler(abort)
-        self._abort_stream_unary = grpc.stream_unary_rpc_method_handler(abort)
-        self._abort_stream_stream = grpc.stream_stream_rpc_method_handler(abort)
-
-    def intercept_service(self, continuation: Callable[
-            [grpc.HandlerCallDetails], Awaitable[grpc.RpcMethodHandler]
-        ], handler_call_details: grpc.HandlerCallDetails):
+    def __init__(self, sig_header: str, keys: Dict[str, str], window: int, max_nonces: int,
+                 exempt_services: Iterable[str] = (), nonce_cache: NonceCache = None):
+        self.signature_header: str = sig_header
+        self.window: int = window
+
+        # Key id to the precomputed HMAC hash states of its secret
+        self.signing_keys: Dict[str, tuple] = {key_id: get_signing_key(secret) for key_id, secret in keys.items()}
+        self.nonce_cache: NonceCache = nonce_cache if nonce_cache is not None else NonceCache(max_nonces)
+
+        # Services whose calls are not signed, e.g. the health service that is probed without any metadata
+        self.exempt_services: frozenset = frozenset(exempt_services)
+
+    def intercept(self, call: InterceptedCall) -> Optional[Tuple[grpc.StatusCode, str]]:
         """
         Intercepts incoming request and attempts to authenticate it
 
-        :param continuation: method to continue request once it has been validated
-        :param handler_call_details: incoming request to validate
-        :return: Awaitable[grpc.RpcMethodHandler] | None
+        :param call: incoming call to validate
+        :return: None if the call is authenticated, otherwise the status to abort it with
         """
+        if call.method.service in self.exempt_services:
+            return None
+
+        value = call.metadata.get(self.signature_header)
+        parsed: Optional[Tuple[str, int, str, str]] = parse_signature(value) if isinstance(value, str) else None
+
+        if parsed is None or parsed[0] not in self.signing_keys:
+            return grpc.StatusCode.UNAUTHENTICATED, "Invalid signature"
+
+        key_id, timestamp, nonce, signature = parsed
+        now: float = time.time()
+
+        if abs(now - timestamp) > self.window:
+            return grpc.StatusCode.UNAUTHENTICATED, "Expired signature"
+
+        # A nonce cache shared by the workers can be busy, the call is refused as it cannot be checked for a replay
+        try:
+            if self.nonce_cache.seen((key_id, nonce)):
+                return grpc.StatusCode.UNAUTHENTICATED, "Replayed signature"
+
+            expected: str = sign_request(self.signing_keys[key_id], key_id, timestamp, nonce, call.method.path)
+
+            if not hmac.compare_digest(signature.encode(), expected.encode()):
+                return grpc.StatusCode.UNAUTHENTICATED, "Invalid signature"
+
+            # Keep the nonce until the timestamp leaves the window, a concurrent call with the same nonce may have won
+            if not self.nonce_cache.add((key_id, nonce), timestamp + self.window, now):
+                return grpc.StatusCode.UNAUTHENTICATED, "Replayed signature"
+        except IOError:
+            return grpc.StatusCode.UNAVAILABLE, "Could not check signature nonce"
 
-        expected_metadata: tuple = (self.signature_header, self.signature)
-
-        # Extract the method type from the metatdata to invoke the proper abortion method
-        method_type: str = dict(handler_call_details.invocation_metadata)['x-method-type']
-
-        if expected_metadata in handler_call_details.invocation_metadata:
-            return continuation(handler_call_details)
-
-        # If unauthenticated, abort based on method_type
-        else:
-            if method_type == 'unary-unary':
-                self._abort_unary_unary()
-            elif method_type == 'unary-stream':
-                self._abort_unary_stream()
-            elif method_type == 'stream-unary':
-                self._abort_stream_unary()
-            elif method_type == 'stream-stream':
-                self._abort_stream_stream()
-            else:
-                raise ValueError(f"Invalid method type provided {method_type}")
\ No newline at end of file
+        return None
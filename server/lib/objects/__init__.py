@@ -1,2 +1,16 @@
 from .logger import *
 from .context_vars import *
+from .shape_log import *
+from .coordinate_batch import *
+from .shape_record import *
+from .sorted_index import *
+from .response_cache import *
+from .nonce_cache import *
+from .sqlite_nonce_cache import *
+from .shape_columns import *
+from .shape_snapshot import *
+from .shape_filter import *
+from .spatial_index import *
+from .worker_supervisor import *
+from .geometry_pool import *
+from .call_metrics import *
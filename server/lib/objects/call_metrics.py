@@ -0,0 +1,209 @@
+import bisect
+import threading
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Upper bounds in seconds of the latency buckets, the last bucket counts the calls slower than every bound
+LATENCY_BOUNDS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+class MethodMetrics:
+    """
+    Counters of the calls of one method: the calls started, the calls finished by status code, a histogram of their
+    latencies over LATENCY_BOUNDS and the serialized size of the messages received and sent
+    """
+    __slots__ = ('started', 'status_counts', 'latency_buckets', 'latency_sum', 'bytes_in', 'bytes_out')
+
+    def __init__(self):
+        self.started: int = 0
+        self.status_counts: Dict[str, int] = {}
+        self.latency_buckets: List[int] = [0] * (len(LATENCY_BOUNDS) + 1)
+        self.latency_sum: float = 0.0
+        self.bytes_in: int = 0
+        self.bytes_out: int = 0
+
+    @property
+    def finished(self) -> int:
+        return sum(self.status_counts.values())
+
+    @property
+    def in_flight(self) -> int:
+        # A call may be started and finished on different threads, whose accumulators are not read at the same time
+        return max(self.started - self.finished, 0)
+
+    def merge(self, other: 'MethodMetrics'):
+        """
+        Adds the counters of another MethodMetrics to these
+
+        :param other: counters to add, which may still be recorded into by their thread
+        :return: None
+        """
+        self.started += other.started
+
+        # Copy the items first, the recording thread may add a status code while they are being read
+        for code, count in list(other.status_counts.items()):
+            self.status_counts[code] = self.status_counts.get(code, 0) + count
+
+        self.latency_buckets = [a + b for a, b in zip(self.latency_buckets, other.latency_buckets)]
+        self.latency_sum += other.latency_sum
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+
+class CallMetrics:
+    """
+    Per-method metrics of the calls made or served by this process
+
+    Recording a sample takes no lock. Every thread records into accumulators of its own, which are registered under a
+    lock once, when the thread records its first sample, and get_methods merges the accumulators of every thread when
+    the metrics are read. A read may miss the samples being recorded at that moment, but never holds up a call
+    """
+
+    def __init__(self):
+        self._local: threading.local = threading.local()
+        self._lock: threading.Lock = threading.Lock()
+        self._accumulators: List[Dict[str, MethodMetrics]] = []
+
+    def get(self, method: str) -> MethodMetrics:
+        """
+        Returns the accumulator of a method for the calling thread, which only that thread may record into
+
+        :param method: method path, e.g. /ShapeService/GetShape
+        :return: MethodMetrics
+        """
+        try:
+            methods: Dict[str, MethodMetrics] = self._local.methods
+        except AttributeError:
+            methods = self._local.methods = {}
+
+            with self._lock:
+                self._accumulators.append(methods)
+
+        metrics: Optional[MethodMetrics] = methods.get(method)
+
+        if metrics is None:
+            metrics = methods[method] = MethodMetrics()
+
+        return metrics
+
+    def start(self, method: str):
+        """
+        Records the start of a call
+
+        :param method: method path of the call
+        :return: None
+        """
+        self.get(method).started += 1
+
+    def finish(self, method: str, code: str, elapsed: float):
+        """
+        Records the end of a call
+
+        :param method: method path of the call
+        :param code: name of the status code the call ended with, e.g. OK
+        :param elapsed: seconds since the call started
+        :return: None
+        """
+        metrics: MethodMetrics = self.get(method)
+
+        metrics.status_counts[code] = metrics.status_counts.get(code, 0) + 1
+        metrics.latency_buckets[bisect.bisect_left(LATENCY_BOUNDS, elapsed)] += 1
+        metrics.latency_sum += elapsed
+
+    def get_methods(self) -> Dict[str, MethodMetrics]:
+        """
+        Merges the accumulators of every thread
+
+        :return: method path to its MethodMetrics, sorted by method path
+        """
+        with self._lock:
+            accumulators: List[Dict[str, MethodMetrics]] = list(self._accumulators)
+
+        merged: Dict[str, MethodMetrics] = {}
+
+        for methods in accumulators:
+            for method, metrics in list(methods.items()):
+                merged.setdefault(method, MethodMetrics()).merge(metrics)
+
+        return dict(sorted(merged.items()))
+
+def get_latency_quantile(latency_buckets: Sequence[int], quantile: float,
+                         bounds: Sequence[float] = LATENCY_BOUNDS) -> Optional[float]:
+    """
+    Estimates a latency quantile from a histogram as the upper bound of the bucket it falls in
+
+    :param latency_buckets: calls per bucket of bounds
+    :param quantile: quantile to estimate, e.g. 0.99
+    :param bounds: upper bounds of the buckets, e.g. the latency_bounds of a GetMetricsResponse
+    :return: seconds, inf if it falls in the last bucket, or None if the histogram is empty
+    """
+    total: int = sum(latency_buckets)
+
+    if total == 0:
+        return None
+
+    rank: float = quantile * total
+    cumulative: int = 0
+
+    for bound, count in zip(tuple(bounds) + (float('inf'),), latency_buckets):
+        cumulative += count
+
+        if cumulative >= rank:
+            return bound
+
+    return float('inf')
+
+def format_prometheus(prefix: str, methods: Mapping[str, MethodMetrics],
+                      counters: Optional[Mapping[str, Mapping[str, float]]] = None) -> str:
+    """
+    Renders metrics in the Prometheus text exposition format, e.g. grpc_server_calls_total{method="...",code="OK"} 3
+
+    :param prefix: prefix of every metric name, e.g. grpc_server
+    :param methods: method path to its MethodMetrics
+    :param counters: group name to the counters of the group, each exported as a gauge named prefix_group_counter
+    :return: metrics text, ending with a newline
+    """
+    lines: List[str] = []
+
+    def add_family(name: str, metric_type: str, description: str, samples: List[str]):
+        lines.append(f"# HELP {prefix}_{name} {description}")
+        lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+        lines.extend(samples)
+
+    add_family("calls_total", "counter", "Finished calls by method and status code", [
+        f'{prefix}_calls_total{{method="{method}",code="{code}"}} {count}'
+        for method, metrics in methods.items()
+        for code, count in sorted(metrics.status_counts.items())
+    ])
+
+    add_family("in_flight", "gauge", "Calls started and not yet finished", [
+        f'{prefix}_in_flight{{method="{method}"}} {metrics.in_flight}' for method, metrics in methods.items()
+    ])
+
+    latency_samples: List[str] = []
+
+    for method, metrics in methods.items():
+        cumulative: int = 0
+
+        for bound, count in zip(LATENCY_BOUNDS + (float('inf'),), metrics.latency_buckets):
+            cumulative += count
+            le: str = "+Inf" if bound == float('inf') else repr(bound)
+            latency_samples.append(f'{prefix}_latency_seconds_bucket{{method="{method}",le="{le}"}} {cumulative}')
+
+        latency_samples.append(f'{prefix}_latency_seconds_sum{{method="{method}"}} {metrics.latency_sum!r}')
+        latency_samples.append(f'{prefix}_latency_seconds_count{{method="{method}"}} {cumulative}')
+
+    add_family("latency_seconds", "histogram", "Latency of the finished calls", latency_samples)
+
+    add_family("received_bytes_total", "counter", "Serialized size of the messages received", [
+        f'{prefix}_received_bytes_total{{method="{method}"}} {metrics.bytes_in}' for method, metrics in methods.items()
+    ])
+
+    add_family("sent_bytes_total", "counter", "Serialized size of the messages sent", [
+        f'{prefix}_sent_bytes_total{{method="{method}"}} {metrics.bytes_out}' for method, metrics in methods.items()
+    ])
+
+    for group, group_counters in (counters or {}).items():
+        for name, value in group_counters.items():
+            add_family(f"{group}_{name}", "gauge", f"{name} of the {group}", [f"{prefix}_{group}_{name} {value}"])
+
+    return "\n".join(lines) + "\n"
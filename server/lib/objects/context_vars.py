@@ -2,3 +2,6 @@ import contextvars
 
 # Define the context variable for the correlation ID globally
 correlation_id = contextvars.ContextVar('correlation_id', default='')
+
+# Define the context variable for the Shape message format negotiated by the call
+shape_format = contextvars.ContextVar('shape_format', default='v1')
@@ -0,0 +1,90 @@
+import numpy as np
+from typing import Sequence, Tuple
+
+class CoordinateBatch:
+    """
+    Vertices of many shapes stored in contiguous NumPy arrays. The vertices of shape i are
+    xs[offsets[i]:offsets[i + 1]] and ys[offsets[i]:offsets[i + 1]], so shapes with different numbers of vertices can
+    share the same arrays and have their areas and perimeters calculated in a single vectorized pass
+    """
+
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, offsets: np.ndarray):
+        self.xs: np.ndarray = xs
+        self.ys: np.ndarray = ys
+        self.offsets: np.ndarray = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @classmethod
+    def from_coords(cls, shapes: Sequence[Sequence[Tuple[int, int]]]) -> 'CoordinateBatch':
+        """
+        Builds a batch from the (x, y) vertices of each shape
+
+        :param shapes: list of the vertices of each shape
+        :return: CoordinateBatch
+        """
+        counts: np.ndarray = np.fromiter((len(coords) for coords in shapes), dtype=np.int64, count=len(shapes))
+        offsets: np.ndarray = np.zeros(len(shapes) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        vertices: np.ndarray = np.array(
+            [vertex for coords in shapes for vertex in coords],
+            dtype=np.int64
+        ).reshape(-1, 2)
+
+        return cls(vertices[:, 0].copy(), vertices[:, 1].copy(), offsets)
+
+    def get_areas(self) -> np.ndarray:
+        """
+        Calculates the area of every shape in the batch using Gauss's Area formula for a polygon
+
+        :return: np.ndarray of the area of each shape
+        """
+        next_vertex, starts, non_empty = self.__get_next_vertex()
+
+        cross: np.ndarray = self.xs * self.ys[next_vertex] - self.xs[next_vertex] * self.ys
+
+        return np.abs(self.__sum_per_shape(cross.astype(np.float64), starts, non_empty)) / 2
+
+    def get_perimeters(self) -> np.ndarray:
+        """
+        Calculates the perimeter of every shape in the batch
+
+        :return: np.ndarray of the perimeter of each shape
+        """
+        next_vertex, starts, non_empty = self.__get_next_vertex()
+
+        dx: np.ndarray = (self.xs[next_vertex] - self.xs).astype(np.float64)
+        dy: np.ndarray = (self.ys[next_vertex] - self.ys).astype(np.float64)
+
+        return self.__sum_per_shape(np.sqrt(dx * dx + dy * dy), starts, non_empty)
+
+    def __get_next_vertex(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the index of the vertex following each vertex in its shape, with the last vertex of each shape
+        wrapping back to the first, along with the start of each shape and a mask of the shapes that have vertices
+
+        :return: (next_vertex, starts, non_empty)
+        """
+        starts: np.ndarray = self.offsets[:-1]
+        ends: np.ndarray = self.offsets[1:]
+        non_empty: np.ndarray = ends > starts
+
+        next_vertex: np.ndarray = np.arange(1, len(self.xs) + 1, dtype=np.int64)
+        next_vertex[ends[non_empty] - 1] = starts[non_empty]
+
+        return next_vertex, starts, non_empty
+
+    def __sum_per_shape(self, values: np.ndarray, starts: np.ndarray, non_empty: np.ndarray) -> np.ndarray:
+        """
+        Sums the per-vertex values of each shape
+
+        :return: np.ndarray of the sum for each shape, 0 for shapes without vertices
+        """
+        sums: np.ndarray = np.zeros(len(self), dtype=np.float64)
+
+        if len(values) > 0:
+            sums[non_empty] = np.add.reduceat(values, starts[non_empty])
+
+        return sums
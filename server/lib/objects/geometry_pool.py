@@ -0,0 +1,194 @@
+import multiprocessing
+from collections import deque
+from itertools import islice
+from multiprocessing.shared_memory import SharedMemory
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import shape_service_pb2 as ShapeService
+from ..objects.shape_record import ShapeRecord
+
+class GeometryPool:
+    """
+    Process pool that runs the geometry checks of large sets of candidate shapes, e.g. the shapes near the box of a
+    GetShapesIntersecting call, outside of the server process so that they do not hold its GIL while other calls are
+    served
+
+    Candidates are handed over in batches of batch_size. Each batch is written once into shared memory as the stored
+    ShapeV2 bytes of its records, which the pool process decodes and checks in place, and only a byte per record is
+    sent back. Up to one batch per pool process is checked at a time. Batches of fewer than min_batch_size records,
+    and every batch when the pool has no processes, are checked inline where the handover would cost more than it saves
+    """
+
+    def __init__(self, processes: int, batch_size: int, min_batch_size: int):
+        if processes < 0:
+            raise ValueError(f"Invalid number of geometry processes provided {processes}")
+
+        self.processes: int = processes
+        self.batch_size: int = batch_size
+        self.min_batch_size: int = min_batch_size
+
+        # Spawn rather than fork so that no gRPC state of the server is inherited by the pool processes
+        self.executor: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn")
+        ) if processes > 0 else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.executor is not None
+
+    def filter(self, records: Iterable[ShapeRecord], predicate: Callable[..., bool], *args) -> Iterator[ShapeRecord]:
+        """
+        Yields the records whose vertices satisfy the predicate, in the order of the given records
+
+        :param records: candidate records
+        :param predicate: module level geometry function called with the (x, y) vertices of a shape followed by args,
+                          e.g. intersects_box
+        :param args: other arguments of the predicate
+        :return: Iterator[ShapeRecord]
+        """
+        if not self.enabled:
+            yield from (record for record in records if predicate(record.coords, *args))
+
+            return
+
+        records = iter(records)
+        pending: Deque[Tuple[List[ShapeRecord], Optional[Future], Optional[SharedMemory]]] = deque()
+
+        try:
+            while True:
+                batch: List[ShapeRecord] = list(islice(records, self.batch_size))
+
+                if len(batch) == 0:
+                    break
+
+                if len(batch) < self.min_batch_size:
+                    pending.append((batch, None, None))
+                else:
+                    pending.append((batch, *self.__submit(batch, predicate, args)))
+
+                # Read the next batch while the pool processes check the previous ones
+                while len(pending) > self.processes:
+                    yield from self.__collect(pending.popleft(), predicate, args)
+
+            while len(pending) > 0:
+                yield from self.__collect(pending.popleft(), predicate, args)
+        finally:
+            # Release the shared memory of any batches left behind when the stream ends early, e.g. on cancellation
+            for _, future, shared_memory in pending:
+                if future is not None:
+                    future.cancel()
+                    self.__release(future, shared_memory)
+
+    def close(self):
+        """
+        Stops the pool processes
+
+        :return: None
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def __submit(self, batch: List[ShapeRecord], predicate: Callable[..., bool],
+                 args: tuple) -> Tuple[Future, SharedMemory]:
+        """
+        Writes the ShapeV2 bytes of a batch into shared memory, behind the offset of each record's bytes, and submits
+        the check of the batch to the pool
+
+        :param batch: records to check
+        :param predicate: geometry function to check the records with
+        :param args: other arguments of the predicate
+        :return: (future of the mask of the batch, shared memory holding the batch)
+        """
+        offsets: np.ndarray = np.zeros(len(batch) + 1, dtype=np.int64)
+        np.cumsum([len(record.shape_v2_bytes) for record in batch], out=offsets[1:])
+
+        header_size: int = offsets.nbytes
+        shared_memory: SharedMemory = SharedMemory(create=True, size=header_size + int(offsets[-1]))
+
+        try:
+            shared_memory.buf[:header_size] = offsets.tobytes()
+            shared_memory.buf[header_size:header_size + int(offsets[-1])] = b"".join(
+                record.shape_v2_bytes for record in batch
+            )
+
+            future: Future = self.executor.submit(_check_batch, shared_memory.name, len(batch), predicate, args)
+        except BaseException:
+            shared_memory.close()
+            shared_memory.unlink()
+            raise
+
+        return future, shared_memory
+
+    def __collect(self, entry: Tuple[List[ShapeRecord], Optional[Future], Optional[SharedMemory]],
+                  predicate: Callable[..., bool], args: tuple) -> Iterator[ShapeRecord]:
+        """
+        Yields the records of a batch that satisfy the predicate, checking them inline if the batch was not submitted
+
+        :param entry: (batch, future of its mask or None, shared memory holding it or None)
+        :param predicate: geometry function to check inline batches with
+        :param args: other arguments of the predicate
+        :return: Iterator[ShapeRecord]
+        """
+        batch, future, shared_memory = entry
+
+        if future is None:
+            yield from (record for record in batch if predicate(record.coords, *args))
+
+            return
+
+        try:
+            mask: bytes = future.result()
+        finally:
+            self.__release(future, shared_memory)
+
+        yield from (record for record, matches in zip(batch, mask) if matches)
+
+    @staticmethod
+    def __release(future: Future, shared_memory: SharedMemory):
+        """
+        Frees the shared memory of a batch once the pool process is done with it
+
+        :param future: future of the check of the batch
+        :param shared_memory: shared memory holding the batch
+        :return: None
+        """
+        if not future.cancelled():
+            # A running check still reads the shared memory, wait for it before unlinking
+            try:
+                future.exception()
+            except BaseException:
+                pass
+
+        shared_memory.close()
+        shared_memory.unlink()
+
+def _check_batch(shared_memory_name: str, count: int, predicate: Callable[..., bool], args: tuple) -> bytes:
+    """
+    Runs in a pool process. Decodes each record of a batch written by GeometryPool from shared memory and checks it
+
+    :param shared_memory_name: name of the shared memory holding the batch
+    :param count: number of records in the batch
+    :param predicate: geometry function called with the (x, y) vertices of a shape followed by args
+    :param args: other arguments of the predicate
+    :return: one byte per record, 1 if the record satisfies the predicate and 0 otherwise
+    """
+    shared_memory: SharedMemory = SharedMemory(name=shared_memory_name)
+
+    try:
+        header_size: int = (count + 1) * 8
+        offsets: List[int] = np.frombuffer(shared_memory.buf[:header_size], dtype=np.int64).tolist()
+        mask: bytearray = bytearray(count)
+        shape: ShapeService.ShapeV2 = ShapeService.ShapeV2()
+
+        with shared_memory.buf[header_size:] as data:
+            for i in range(count):
+                shape.ParseFromString(data[offsets[i]:offsets[i + 1]])
+                mask[i] = predicate(list(zip(shape.xs, shape.ys)), *args)
+
+        return bytes(mask)
+    finally:
+        shared_memory.close()
@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable
+
+class NonceCache:
+    """
+    Bounded cache of the nonces of recently verified signatures, each kept until the signature leaves the replay window.
+    A nonce that is still cached is a replay and can be rejected without verifying its signature again
+
+    Entries expire in about the order they are added, so expired entries are dropped from the oldest end as new ones
+    are added. Once max_entries is reached the oldest entries are evicted early, and their nonces could be replayed
+    for the rest of their window, so max_entries should cover the calls expected within a window
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries: int = max_entries
+
+        self.replays: int = 0
+        self.evictions: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def seen(self, key: Hashable) -> bool:
+        """
+        Checks whether a nonce was already verified within its replay window, counting it as a replay if so
+
+        :param key: (key_id, nonce) of the signature
+        :return: True if the nonce is cached
+        """
+        with self._lock:
+            if key in self._entries:
+                self.replays += 1
+                return True
+
+            return False
+
+    def add(self, key: Hashable, expires_at: float, now: float) -> bool:
+        """
+        Adds a verified nonce, unless it was added by a concurrent call since it was checked
+
+        :param key: (key_id, nonce) of the verified signature
+        :param expires_at: time at which the signature leaves the replay window
+        :param now: current time, in the same clock as expires_at
+        :return: True if the nonce was added, False if it is a replay
+        """
+        with self._lock:
+            if key in self._entries:
+                self.replays += 1
+                return False
+
+            self._entries[key] = expires_at
+
+            while len(self._entries) > 0 and next(iter(self._entries.values())) <= now:
+                self._entries.popitem(last=False)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+            return True
+
+    def get_stats(self) -> dict:
+        """
+        Returns the cache counters
+
+        :return: dict of the cache counters
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "replays": self.replays,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,115 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from google.protobuf.message import Message
+
+class ResponseCache:
+    """
+    Bounded least recently used cache of fully built response messages. The cache is bounded both by the number of
+    entries and by the total serialized size of the cached messages, and either limit set to 0 disables the cache
+
+    Cached messages are shared between calls and must not be modified once they have been added
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.enabled: bool = max_entries > 0 and max_bytes > 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.size_bytes: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Message]:
+        """
+        Returns the cached message for the key and marks it as most recently used
+
+        :param key: cache key
+        :return: the cached message, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry: tuple = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+    def put(self, key: Hashable, message: Message):
+        """
+        Adds a message to the cache, evicting the least recently used entries until both limits are met
+
+        :param key: cache key
+        :param message: message to cache
+        :return: None
+        """
+        if not self.enabled:
+            return
+
+        size: int = message.ByteSize()
+
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous: tuple = self._entries.pop(key, None)
+
+            if previous is not None:
+                self.size_bytes -= previous[1]
+
+            self._entries[key] = (message, size)
+            self.size_bytes += size
+
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """
+        Removes the entry for the key if it is cached
+
+        :param key: cache key
+        :return: None
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            entry: tuple = self._entries.pop(key, None)
+
+            if entry is not None:
+                self.size_bytes -= entry[1]
+
+    def get_stats(self) -> dict:
+        """
+        Returns the cache counters
+
+        :return: dict of the cache counters
+        """
+        with self._lock:
+            lookups: int = self.hits + self.misses
+
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups > 0 else 0.0
+            }
@@ -0,0 +1,99 @@
+from array import array
+from typing import Dict, List, Tuple
+
+class ShapeColumns:
+    """
+    Column store of shapes. Every shape is a row, and instead of an object per shape or per vertex the rows are kept
+    in flat parallel arrays:
+
+        type_ids    - index of the shape_type of each row in types, so every shape_type string is stored once
+        seqs        - position of each row within its shape key, from which the shape_id is derived
+        areas       - precomputed area of each row
+        perimeters  - precomputed perimeter of each row
+        offsets     - the vertices of row i are xs[offsets[i]:offsets[i + 1]] and ys[offsets[i]:offsets[i + 1]]
+        xs, ys      - vertices of every row, one after another
+    """
+
+    def __init__(self):
+        self.types: List[str] = []
+        self.type_codes: Dict[str, int] = {}
+
+        self.type_ids: array = array('B')
+        self.seqs: array = array('q')
+        self.areas: array = array('d')
+        self.perimeters: array = array('d')
+        self.offsets: array = array('q', [0])
+        self.xs: array = array('i')
+        self.ys: array = array('i')
+
+    def __len__(self) -> int:
+        return len(self.type_ids)
+
+    def append(self, shape_type: str, seq: int, coords: List[Tuple[int, int]], area: float, perimeter: float) -> int:
+        """
+        Appends a shape as a new row
+
+        :param shape_type: shape_type of the shape, e.g. Triangle
+        :param seq: position of the shape within its shape key
+        :param coords: (x, y) vertices of the shape
+        :param area: precomputed area of the shape
+        :param perimeter: precomputed perimeter of the shape
+        :return: the row of the shape
+        """
+        row: int = len(self.type_ids)
+
+        self.type_ids.append(self.get_type_id(shape_type))
+        self.seqs.append(seq)
+        self.areas.append(area)
+        self.perimeters.append(perimeter)
+
+        self.xs.extend(x for x, _ in coords)
+        self.ys.extend(y for _, y in coords)
+        self.offsets.append(len(self.xs))
+
+        return row
+
+    def get_type_id(self, shape_type: str) -> int:
+        """
+        Returns the interned id of a shape_type, adding it to the type table if it has not been seen before
+
+        :param shape_type: shape_type to intern
+        :return: index of the shape_type in types
+        """
+        type_id: int = self.type_codes.get(shape_type)
+
+        if type_id is None:
+            if len(self.types) > 255:
+                raise ValueError(f"Too many shape types to store {shape_type}")
+
+            type_id = len(self.types)
+            self.types.append(shape_type)
+            self.type_codes[shape_type] = type_id
+
+        return type_id
+
+    def get_shape_type(self, row: int) -> str:
+        return self.types[self.type_ids[row]]
+
+    def get_coords(self, row: int) -> List[Tuple[int, int]]:
+        """
+        Returns the (x, y) vertices of a row
+
+        :param row: row to read
+        :return: (x, y) vertices of the shape
+        """
+        start: int = self.offsets[row]
+        end: int = self.offsets[row + 1]
+
+        return list(zip(self.xs[start:end], self.ys[start:end]))
+
+    def get_size_bytes(self) -> int:
+        """
+        Returns the number of bytes held by the column buffers
+
+        :return: size of the columns in bytes
+        """
+        columns: Tuple[array, ...] = (self.type_ids, self.seqs, self.areas, self.perimeters, self.offsets, self.xs,
+                                      self.ys)
+
+        return sum(column.itemsize * len(column) for column in columns)
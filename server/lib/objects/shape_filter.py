@@ -0,0 +1,63 @@
+from typing import Optional, Tuple
+
+from ..objects.shape_record import ShapeRecord
+
+class ShapeFilter:
+    """
+    Conjunction of optional filters on a shape. A range of (low, high) matches values greater than low and less than
+    or equal to high, the same bounds as ShapeRepository.range, and either side may be None to leave it open
+
+    shape_type is matched ignoring case, like the shape key partition the QueryPlanner reads for it, so that shapes
+    stored with a lower case shape_type, e.g. rectangle, match whichever plan is chosen
+    """
+    __slots__ = ('shape_type', 'area', 'perimeter', 'within', '_shape_type_key')
+
+    def __init__(self, shape_type: str = None, area: Tuple[Optional[float], Optional[float]] = None,
+                 perimeter: Tuple[Optional[float], Optional[float]] = None, within: Tuple[int, int, int, int] = None):
+        self.shape_type: Optional[str] = shape_type
+        self.area: Optional[Tuple[Optional[float], Optional[float]]] = area
+        self.perimeter: Optional[Tuple[Optional[float], Optional[float]]] = perimeter
+        self.within: Optional[Tuple[int, int, int, int]] = within
+        self._shape_type_key: Optional[str] = None if shape_type is None else shape_type.lower()
+
+    def __repr__(self) -> str:
+        return (f"ShapeFilter(shape_type={self.shape_type}, area={self.area}, perimeter={self.perimeter}, "
+                f"within={self.within})")
+
+    def get_range(self, metric: str) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """
+        Returns the range filter on a metric
+
+        :param metric: one of ShapeRepository.METRICS
+        :return: (low, high), or None if the metric is not filtered
+        """
+        return getattr(self, metric)
+
+    def matches(self, record: ShapeRecord) -> bool:
+        """
+        Checks whether a record matches every filter
+
+        :param record: record to check
+        :return: True if the record matches
+        """
+        if self._shape_type_key is not None and record.shape_type.lower() != self._shape_type_key:
+            return False
+
+        for metric in ('area', 'perimeter'):
+            bounds: Optional[Tuple[Optional[float], Optional[float]]] = getattr(self, metric)
+
+            if bounds is not None and not self.__in_range(getattr(record, metric), *bounds):
+                return False
+
+        if self.within is not None:
+            min_x, min_y, max_x, max_y = record.get_bounds()
+
+            if (min_x < self.within[0] or min_y < self.within[1] or
+                    max_x > self.within[2] or max_y > self.within[3]):
+                return False
+
+        return True
+
+    @staticmethod
+    def __in_range(value: float, low: Optional[float], high: Optional[float]) -> bool:
+        return (low is None or value > low) and (high is None or value <= high)
@@ -0,0 +1,207 @@
+import os
+import json
+import threading
+from typing import Iterator, List, Tuple
+
+from ..objects.logger import Logger
+
+class ShapeLog:
+    """
+    Append-only write-ahead log of created shapes. Each shape is written as a single JSON line so that the cost of
+    persisting a shape does not depend on the number of shapes already stored
+
+    Supported fsync policies:
+        always   - fsync after every appended record
+        interval - fsync from a background thread every fsync_interval_ms when there are unsynced records
+        os       - never fsync explicitly, leave flushing to the operating system
+    """
+    FSYNC_ALWAYS: str = "always"
+    FSYNC_INTERVAL: str = "interval"
+    FSYNC_OS: str = "os"
+
+    def __init__(self, path: str, fsync_policy: str, fsync_interval_ms: int, logger: Logger):
+        if fsync_policy not in (self.FSYNC_ALWAYS, self.FSYNC_INTERVAL, self.FSYNC_OS):
+            raise ValueError(f"Invalid fsync policy provided {fsync_policy}")
+
+        self.logger: Logger = logger
+        self.path: str = path
+        self.fsync_policy: str = fsync_policy
+        self.fsync_interval: float = fsync_interval_ms / 1000
+
+        self._lock: threading.Lock = threading.Lock()
+        self._dirty: bool = False
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+        # Use a daemon thread to periodically fsync the log when running with the interval policy
+        if self.fsync_policy == self.FSYNC_INTERVAL:
+            self._stop: threading.Event = threading.Event()
+            fsync_thread = threading.Thread(target=self.__fsync_periodically, daemon=True)
+            fsync_thread.start()
+
+    def append(self, shape_key: str, shape_json: dict):
+        """
+        Append a single shape to the end of the log
+
+        :param shape_key: key of the shape list the shape belongs to, e.g. Triangles
+        :param shape_json: serializable shape
+        :return: None
+        """
+        self.append_many([(shape_key, shape_json)])
+
+    def append_many(self, shapes: List[Tuple[str, dict]]):
+        """
+        Append many shapes to the end of the log with a single write and, under the always policy, a single fsync.
+        If the append fails the log is cut back to where it ended, so that the shapes of a failed append, whose
+        shape_ids are given to the next shapes created, are not replayed
+
+        :param shapes: (shape_key, shape_json) of each shape to append
+        :return: None
+        """
+        lines: str = "".join(
+            json.dumps({"key": shape_key, "shape": shape_json}, separators=(',', ':')) + "\n"
+            for shape_key, shape_json in shapes
+        )
+
+        with self._lock:
+            # The log is reopened if cutting back a failed append closed it
+            if self._file.closed:
+                self._file = open(self.path, 'a', encoding='utf-8')
+
+            # Every append is flushed, so the size of the file is where the log ends
+            end: int = os.fstat(self._file.fileno()).st_size
+
+            try:
+                self._file.write(lines)
+                self._file.flush()
+
+                if self.fsync_policy == self.FSYNC_ALWAYS:
+                    os.fsync(self._file.fileno())
+                else:
+                    self._dirty = True
+            except BaseException:
+                self.__cut_back(end)
+                raise
+
+    def replay(self) -> Iterator[Tuple[str, dict]]:
+        """
+        Reads back every complete record in the log in the order it was written. A partially written final record,
+        e.g. from a crash mid-write, is skipped and cut off the end of the log once the replay is done, so that the next
+        append starts on a line of its own rather than being joined onto it
+
+        :return: Iterator of (shape_key, shape_json) tuples
+        """
+        with self._lock:
+            self._file.flush()
+
+        # Byte offset of the end of the last record that was read back, whether it ended with a newline and whether
+        # any unreadable record follows it
+        good_end: int = 0
+        good_newline: bool = True
+        torn: bool = False
+        end: int = 0
+
+        with open(self.path, 'rb') as log_file:
+            for line_number, line in enumerate(log_file, start=1):
+                end += len(line)
+
+                if not line.strip():
+                    continue
+
+                try:
+                    record: dict = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    self.logger.warning(f"Skipping unreadable record on line {line_number} of {self.path}")
+                    torn = True
+                    continue
+
+                good_end = end
+                good_newline = line.endswith(b"\n")
+                torn = False
+
+                yield record['key'], record['shape']
+
+        if torn or not good_newline:
+            self.__repair_tail(good_end, good_newline)
+
+    def __repair_tail(self, good_end: int, good_newline: bool):
+        """
+        Cuts the unreadable records off the end of the log and ends the last record with a newline
+
+        :param good_end: byte offset of the end of the last readable record
+        :param good_newline: whether the last readable record ends with a newline
+        :return: None
+        """
+        with self._lock:
+            self._file.flush()
+            self._file.truncate(good_end)
+
+            if not good_newline:
+                self._file.write("\n")
+                self._file.flush()
+
+            os.fsync(self._file.fileno())
+
+        self.logger.warning(f"Truncated the unreadable end of {self.path} at byte {good_end}")
+
+    def __cut_back(self, end: int):
+        """
+        Cuts a failed append off the end of the log. The file is closed first to drop any part of the append still
+        buffered, and then reopened
+
+        :param end: size of the log before the append
+        :return: None
+        """
+        try:
+            self._file.close()
+        except OSError:
+            pass
+
+        try:
+            os.truncate(self.path, end)
+        except OSError as e:
+            self.logger.error(f"Could not cut a failed append off {self.path}: {e}")
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def truncate(self):
+        """
+        Discards every record in the log, used once the records have been folded into a snapshot
+
+        :return: None
+        """
+        with self._lock:
+            self._file.truncate(0)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._dirty = False
+
+    def sync(self):
+        """
+        Flush and fsync any records that have not yet been synced to disk
+
+        :return: None
+        """
+        with self._lock:
+            if self._dirty:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._dirty = False
+
+    def close(self):
+        """
+        Sync any outstanding records and close the log
+
+        :return: None
+        """
+        if self.fsync_policy == self.FSYNC_INTERVAL:
+            self._stop.set()
+
+        self.sync()
+        self._file.close()
+
+    def __fsync_periodically(self):
+        while not self._stop.wait(self.fsync_interval):
+            try:
+                self.sync()
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Error syncing {self.path}: {e}")
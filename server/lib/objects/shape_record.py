@@ -0,0 +1,140 @@
+from typing import List, Tuple
+
+import shape_service_pb2 as ShapeService
+from ..objects.coordinate_batch import CoordinateBatch
+from ..functions.geometry import get_area, get_bounds, get_perimeter
+
+class ShapeRecord:
+    """
+    Stored representation of a shape. The shape is kept as its serialized gRPC Shape and ShapeV2, next to an area and
+    perimeter that are calculated once when the record is created, so that read paths never have to recompute the
+    metrics or rebuild the Shape message vertex by vertex
+    """
+    __slots__ = ('shape_id', 'shape_type', 'shape_bytes', 'shape_v2_bytes', 'area', 'perimeter')
+
+    def __init__(self, shape_id: str, shape_type: str, coords: List[Tuple[int, int]], area: float = None,
+                 perimeter: float = None):
+        self.shape_id: str = shape_id
+        self.shape_type: str = shape_type
+        self.shape_bytes: bytes = self.__serialize_shape(shape_id, shape_type, coords)
+        self.shape_v2_bytes: bytes = self.__serialize_shape_v2(shape_id, shape_type, coords)
+        self.area: float = get_area(coords) if area is None else area
+        self.perimeter: float = get_perimeter(coords) if perimeter is None else perimeter
+
+    @property
+    def coords(self) -> List[Tuple[int, int]]:
+        """
+        Decodes the (x, y) vertices of the shape from the stored ShapeV2, which parses without an object per vertex
+
+        :return: (x, y) vertices of the shape
+        """
+        shape: ShapeService.ShapeV2 = ShapeService.ShapeV2.FromString(self.shape_v2_bytes)
+
+        return list(zip(shape.xs, shape.ys))
+
+    @classmethod
+    def from_json(cls, shape_json: dict, shape_type: str = None) -> 'ShapeRecord':
+        """
+        Takes a JSON object as stored in the database file and converts it to a ShapeRecord
+
+        :param shape_json: JSON object to convert
+        :param shape_type: shape_type of the shape, or None to use the stored shape_type
+        :return: ShapeRecord
+        """
+        return cls(
+            shape_id=shape_json['shape_id'],
+            shape_type=shape_json['shape_type'] if shape_type is None else shape_type,
+            coords=[(int(c['x']), int(c['y'])) for c in shape_json['coords']]
+        )
+
+    @classmethod
+    def from_json_many(cls, shape_jsons: List[dict], shape_type: str = None) -> List['ShapeRecord']:
+        """
+        Converts many JSON objects to ShapeRecords, calculating the area and perimeter of every shape in a single
+        vectorized pass
+
+        :param shape_jsons: JSON objects to convert
+        :param shape_type: shape_type of every shape, or None to use the stored shape_type of each shape
+        :return: List[ShapeRecord]
+        """
+        shape_coords: List[List[Tuple[int, int]]] = [
+            [(int(c['x']), int(c['y'])) for c in shape_json['coords']] for shape_json in shape_jsons
+        ]
+
+        batch: CoordinateBatch = CoordinateBatch.from_coords(shape_coords)
+        areas: List[float] = batch.get_areas().tolist()
+        perimeters: List[float] = batch.get_perimeters().tolist()
+
+        return [
+            cls(
+                shape_id=shape_json['shape_id'],
+                shape_type=shape_json['shape_type'] if shape_type is None else shape_type,
+                coords=coords,
+                area=area,
+                perimeter=perimeter
+            )
+            for shape_json, coords, area, perimeter in zip(shape_jsons, shape_coords, areas, perimeters)
+        ]
+
+    def get_bounds(self) -> Tuple[int, int, int, int]:
+        """
+        Returns the bounding box of the shape
+
+        :return: (min_x, min_y, max_x, max_y)
+        """
+        return get_bounds(self.coords)
+
+    def to_json(self) -> dict:
+        """
+        Returns a serializable object in the format stored in the database file
+
+        :return: serializable object
+        """
+        return {
+            "shape_id": self.shape_id,
+            "shape_type": self.shape_type,
+            "coords": [{"x": x, "y": y} for x, y in self.coords]
+        }
+
+    def to_shape(self) -> ShapeService.Shape:
+        """
+        Builds the gRPC Shape for this record
+
+        :return: gRPC Shape
+        """
+        return ShapeService.Shape.FromString(self.shape_bytes)
+
+    def write_shape(self, shape: ShapeService.Shape):
+        """
+        Fills in an empty Shape field of a response straight from the stored bytes, without building an intermediate
+        Shape
+
+        :param shape: Shape field to fill in, e.g. response.shape
+        :return: None
+        """
+        shape.MergeFromString(self.shape_bytes)
+
+    def write_shape_v2(self, shape: ShapeService.ShapeV2):
+        """
+        Fills in an empty ShapeV2 field of a response straight from the stored bytes
+
+        :param shape: ShapeV2 field to fill in, e.g. response.shape_v2
+        :return: None
+        """
+        shape.MergeFromString(self.shape_v2_bytes)
+
+    @staticmethod
+    def __serialize_shape(shape_id: str, shape_type: str, coords: List[Tuple[int, int]]) -> bytes:
+        shape: ShapeService.Shape = ShapeService.Shape(shape_id=shape_id, shape_type=shape_type)
+        shape.coords.extend([ShapeService.ShapeCoord(x=x, y=y) for x, y in coords])
+
+        return shape.SerializeToString()
+
+    @staticmethod
+    def __serialize_shape_v2(shape_id: str, shape_type: str, coords: List[Tuple[int, int]]) -> bytes:
+        return ShapeService.ShapeV2(
+            shape_id=shape_id,
+            shape_type=shape_type,
+            xs=[x for x, _ in coords],
+            ys=[y for _, y in coords]
+        ).SerializeToString()
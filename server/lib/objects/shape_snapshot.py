@@ -0,0 +1,256 @@
+import os
+import sys
+import mmap
+import struct
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..objects.shape_columns import ShapeColumns
+
+class ShapeSnapshot(ShapeColumns):
+    """
+    Read only ShapeColumns backed by a memory mapped binary snapshot file. Opening a snapshot only parses the header
+    and type table, every column is a memoryview over the file so rows are paged in from disk as they are read and the
+    time to open a snapshot does not depend on the number of shapes it holds
+
+    File layout, little-endian, with every column starting on an 8 byte boundary:
+
+        header          - magic, version, type count, row count, vertex count
+        type table      - first row, row count and name of each shape_type
+        type_ids        - uint8 per row
+        seqs            - int64 per row
+        areas           - float64 per row
+        perimeters      - float64 per row
+        offsets         - int64 per row, plus one
+        xs, ys          - int32 per vertex
+        per metric      - float64 sorted values and int64 rows of every row sorted on area, then on perimeter
+
+    Rows are grouped by shape_type in type table order and in seq order within each shape_type, so the row of a shape
+    is the first row of its shape_type plus its seq
+    """
+    MAGIC: bytes = b"SHAPESNP"
+    VERSION: int = 1
+
+    METRICS: Tuple[str, ...] = ("area", "perimeter")
+
+    HEADER: struct.Struct = struct.Struct("<8sIIQQ")
+    TYPE_ENTRY: struct.Struct = struct.Struct("<QQH")
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Binary snapshots can only be memory mapped on little-endian hosts")
+
+        self.path: str = path
+        self._file = open(path, 'rb')
+        self._mmap: mmap.mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = [memoryview(self._mmap)]
+
+        magic, version, type_count, row_count, vertex_count = self.HEADER.unpack_from(self._mmap, 0)
+
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {self.VERSION} shape snapshot")
+
+        # Type table
+        position: int = self.HEADER.size
+        self.types: List[str] = []
+        self.type_codes: Dict[str, int] = {}
+        self.type_rows: Dict[str, Tuple[int, int]] = {}
+
+        for type_id in range(type_count):
+            first_row, count, name_length = self.TYPE_ENTRY.unpack_from(self._mmap, position)
+            position += self.TYPE_ENTRY.size
+
+            shape_type: str = self._mmap[position:position + name_length].decode('utf-8')
+            position += name_length
+
+            self.types.append(shape_type)
+            self.type_codes[shape_type] = type_id
+            self.type_rows[shape_type] = (first_row, count)
+
+        # Columns
+        position = self.__align(position)
+
+        self.type_ids, position = self.__map_column(position, 'B', row_count)
+        self.seqs, position = self.__map_column(position, 'q', row_count)
+        self.areas, position = self.__map_column(position, 'd', row_count)
+        self.perimeters, position = self.__map_column(position, 'd', row_count)
+        self.offsets, position = self.__map_column(position, 'q', row_count + 1)
+        self.xs, position = self.__map_column(position, 'i', vertex_count)
+        self.ys, position = self.__map_column(position, 'i', vertex_count)
+
+        self.sorted_values: Dict[str, memoryview] = {}
+        self.sorted_rows: Dict[str, memoryview] = {}
+
+        for metric in self.METRICS:
+            self.sorted_values[metric], position = self.__map_column(position, 'd', row_count)
+            self.sorted_rows[metric], position = self.__map_column(position, 'q', row_count)
+
+    def append(self, shape_type: str, seq: int, coords: List[Tuple[int, int]], area: float, perimeter: float) -> int:
+        raise TypeError(f"Snapshot {self.path} is read only")
+
+    def rename_types(self, names: Dict[str, str]):
+        """
+        Renames shape_types of the type table in memory, e.g. to read a lower case shape_type as the supported
+        shape_type. The file is not changed, the new names are written the next time its rows are written to a snapshot
+
+        :param names: shape_type in the file to its new name
+        :return: None
+        """
+        types: List[str] = [names.get(shape_type, shape_type) for shape_type in self.types]
+
+        if len(set(types)) != len(types):
+            raise ValueError(f"{self.path} holds more than one shape_type named {types}")
+
+        self.type_rows = {new: self.type_rows[old] for old, new in zip(self.types, types)}
+        self.type_codes = {shape_type: type_id for type_id, shape_type in enumerate(types)}
+        self.types = types
+
+    def close(self):
+        """
+        Releases the column views and unmaps the file
+
+        :return: None
+        """
+        for view in reversed(self._views):
+            view.release()
+
+        self._views = []
+        self._mmap.close()
+        self._file.close()
+
+    @classmethod
+    def write(cls, path: str, sources: List[ShapeColumns]):
+        """
+        Writes the rows of one or more column stores to a new snapshot file. The file is written to a temporary file
+        first and then moved into place so that a crash mid-write cannot leave a truncated snapshot behind
+
+        Within each shape_type the seqs of the combined rows must run from 0 with no gaps or duplicates
+
+        :param path: path of the snapshot to write
+        :param sources: column stores to write, e.g. an open snapshot and the rows added since it was written
+        :return: None
+        """
+        types: List[str] = []
+
+        for source in sources:
+            types.extend(shape_type for shape_type in source.types if shape_type not in types)
+
+        type_ids: List[np.ndarray] = []
+        seqs: List[np.ndarray] = []
+        areas: List[np.ndarray] = []
+        perimeters: List[np.ndarray] = []
+        counts: List[np.ndarray] = []
+        xs: List[np.ndarray] = []
+        ys: List[np.ndarray] = []
+
+        for source in sources:
+            # Map the type ids of the source onto the combined type table
+            type_map: np.ndarray = np.array([types.index(shape_type) for shape_type in source.types], dtype=np.uint8)
+
+            type_ids.append(type_map[cls.__to_numpy(source.type_ids, np.uint8)])
+            seqs.append(cls.__to_numpy(source.seqs, np.int64))
+            areas.append(cls.__to_numpy(source.areas, np.float64))
+            perimeters.append(cls.__to_numpy(source.perimeters, np.float64))
+            counts.append(np.diff(cls.__to_numpy(source.offsets, np.int64)))
+            xs.append(cls.__to_numpy(source.xs, np.int32))
+            ys.append(cls.__to_numpy(source.ys, np.int32))
+
+        all_type_ids: np.ndarray = np.concatenate(type_ids)
+        all_seqs: np.ndarray = np.concatenate(seqs)
+        all_counts: np.ndarray = np.concatenate(counts)
+        all_starts: np.ndarray = np.concatenate(([0], np.cumsum(all_counts))).astype(np.int64)[:-1]
+
+        # Group the rows by shape_type in seq order
+        order: np.ndarray = np.lexsort((all_seqs, all_type_ids))
+        row_type_ids: np.ndarray = all_type_ids[order]
+        row_seqs: np.ndarray = all_seqs[order]
+
+        type_entries: List[Tuple[int, int, str]] = []
+        first_row: int = 0
+
+        for type_id, shape_type in enumerate(types):
+            count: int = int(np.count_nonzero(row_type_ids == type_id))
+
+            if not np.array_equal(row_seqs[first_row:first_row + count], np.arange(count)):
+                raise ValueError(f"{shape_type} seqs must run from 0 to {count - 1} without gaps or duplicates")
+
+            type_entries.append((first_row, count, shape_type))
+            first_row += count
+
+        # Move the vertices of each row to the row's new position
+        row_counts: np.ndarray = all_counts[order]
+        row_offsets: np.ndarray = np.zeros(len(order) + 1, dtype=np.int64)
+        np.cumsum(row_counts, out=row_offsets[1:])
+
+        vertex_index: np.ndarray = (np.repeat(all_starts[order] - row_offsets[:-1], row_counts)
+                                    + np.arange(row_offsets[-1], dtype=np.int64))
+
+        row_areas: np.ndarray = np.concatenate(areas)[order]
+        row_perimeters: np.ndarray = np.concatenate(perimeters)[order]
+
+        columns: List[np.ndarray] = [
+            row_type_ids.astype('<u1'),
+            row_seqs.astype('<i8'),
+            row_areas.astype('<f8'),
+            row_perimeters.astype('<f8'),
+            row_offsets.astype('<i8'),
+            np.concatenate(xs)[vertex_index].astype('<i4'),
+            np.concatenate(ys)[vertex_index].astype('<i4')
+        ]
+
+        for values in (row_areas, row_perimeters):
+            sorted_rows: np.ndarray = np.argsort(values, kind='stable')
+            columns.append(values[sorted_rows].astype('<f8'))
+            columns.append(sorted_rows.astype('<i8'))
+
+        tmp_path: str = f"{path}.tmp"
+
+        with open(tmp_path, 'wb') as snapshot_file:
+            snapshot_file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(types), len(order), int(row_offsets[-1])))
+
+            for first_row, count, shape_type in type_entries:
+                name: bytes = shape_type.encode('utf-8')
+                snapshot_file.write(cls.TYPE_ENTRY.pack(first_row, count, len(name)))
+                snapshot_file.write(name)
+
+            for column in columns:
+                snapshot_file.write(b"\0" * (cls.__align(snapshot_file.tell()) - snapshot_file.tell()))
+                snapshot_file.write(column.tobytes())
+
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+
+        os.replace(tmp_path, path)
+
+    def __map_column(self, position: int, type_code: str, length: int) -> Tuple[memoryview, int]:
+        """
+        Maps a column of the file
+
+        :param position: byte offset of the column
+        :param type_code: array type code of the column values
+        :param length: number of values in the column
+        :return: (view of the column, aligned byte offset following the column)
+        """
+        end: int = position + struct.calcsize(type_code) * length
+
+        if end > len(self._mmap):
+            self.close()
+            raise ValueError(f"Snapshot {self.path} is truncated")
+
+        view: memoryview = self._views[0][position:end]
+        column: memoryview = view.cast(type_code)
+        self._views.extend((view, column))
+
+        return column, self.__align(end)
+
+    @staticmethod
+    def __align(position: int) -> int:
+        return (position + 7) & ~7
+
+    @staticmethod
+    def __to_numpy(column, dtype) -> np.ndarray:
+        # Copy the column through bytes so NumPy does not hold a view that would stop an array from growing or a
+        # snapshot from being closed
+        return np.frombuffer(column.tobytes(), dtype=dtype)
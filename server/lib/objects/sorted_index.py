@@ -0,0 +1,167 @@
+import heapq
+from array import array
+from bisect import bisect_right
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, List, MutableSequence, Sequence, Tuple
+
+from ..objects.shape_record import ShapeRecord
+
+class SortedIndex:
+    """
+    Index of items kept sorted on one of the metrics of a shape, e.g. perimeter. Range queries use a binary search to
+    seek straight to the first item in range instead of scanning every stored shape. Items with equal values are kept
+    in the order they were added
+
+    The index is copy-on-write. Its current version is an immutable large base and a small delta of recently added
+    items, each a pair of sorted keys and items. Adding to the index builds and publishes a new version, copying only
+    the delta until the delta outgrows the square root of the base, when it is merged into a new base. A range query
+    iterates the version that was current when it started, so it never blocks writers or sees a partially added batch.
+    Writers must be serialized by the caller
+
+    The items are ShapeRecords by default. Any sequence types that support slicing, e.g. arrays of rows, can be used
+    for the keys and items instead
+    """
+
+    # Smallest delta that is merged into the base
+    MIN_DELTA_SIZE: int = 1024
+
+    def __init__(self, metric: str, keys: Sequence[float] = None, items: Sequence[Any] = None):
+        self.metric: str = metric
+
+        base_keys: Sequence[float] = array('d') if keys is None else keys
+        base_items: Sequence[Any] = [] if items is None else items
+
+        # (base keys, base items, delta keys, delta items)
+        self.version: Tuple[Sequence[float], Sequence[Any], Sequence[float], Sequence[Any]] = (
+            base_keys, base_items, base_keys[:0], base_items[:0]
+        )
+
+    def __len__(self) -> int:
+        base_keys, _, delta_keys, _ = self.version
+
+        return len(base_keys) + len(delta_keys)
+
+    def add(self, record: ShapeRecord):
+        """
+        Adds a single record to the index in sorted position
+
+        :param record: record to add
+        :return: None
+        """
+        self.extend([record])
+
+    def extend(self, records: Iterable[ShapeRecord]):
+        """
+        Adds many records to the index at once, publishing a single new version
+
+        :param records: records to add
+        :return: None
+        """
+        self.merge((getattr(record, self.metric), record) for record in records)
+
+    def merge(self, entries: Iterable[Tuple[float, Any]]):
+        """
+        Merges (value, item) entries into the index and publishes the new version
+
+        :param entries: (value, item) of each entry to add
+        :return: None
+        """
+        new_entries: List[Tuple[float, Any]] = sorted(entries, key=itemgetter(0))
+
+        if len(new_entries) == 0:
+            return
+
+        base_keys, base_items, delta_keys, delta_items = self.version
+        delta_keys, delta_items = self.__merge(delta_keys, delta_items, new_entries)
+
+        if len(delta_keys) >= max(self.MIN_DELTA_SIZE, int(len(base_keys) ** 0.5)):
+            base_keys, base_items = self.__merge(base_keys, base_items, list(zip(delta_keys, delta_items)))
+            delta_keys, delta_items = base_keys[:0], base_items[:0]
+
+        self.version = (base_keys, base_items, delta_keys, delta_items)
+
+    def count(self, low: float = None, high: float = None) -> int:
+        """
+        Counts the items that range would return, using only binary searches
+
+        :param low: exclusive lower bound, None for no lower bound
+        :param high: inclusive upper bound, None for no upper bound
+        :return: number of items in range
+        """
+        base_keys, _, delta_keys, _ = self.version
+
+        return self.__count(base_keys, low, high) + self.__count(delta_keys, low, high)
+
+    def range(self, low: float = None, high: float = None) -> Iterator[Any]:
+        """
+        Iterates over the items whose metric is greater than low and less than or equal to high in ascending order
+
+        :param low: exclusive lower bound, None for no lower bound
+        :param high: inclusive upper bound, None for no upper bound
+        :return: Iterator of the items in range
+        """
+        base_keys, base_items, delta_keys, delta_items = self.version
+
+        if len(delta_keys) == 0:
+            yield from self.__range(base_keys, base_items, low, high)
+            return
+
+        # Base items come first when values are equal since they were added first
+        for _, item in heapq.merge(self.__range_entries(base_keys, base_items, low, high),
+                                   self.__range_entries(delta_keys, delta_items, low, high),
+                                   key=itemgetter(0)):
+            yield item
+
+    @staticmethod
+    def __merge(keys: Sequence[float], items: Sequence[Any],
+                new_entries: List[Tuple[float, Any]]) -> Tuple[Sequence[float], Sequence[Any]]:
+        """
+        Builds new sorted keys and items from existing ones and sorted new entries. The existing keys and items are
+        copied in chunks between the positions of the new entries, so the cost is a single copy plus a binary search
+        per new entry
+
+        :return: (merged keys, merged items)
+        """
+        # Empty sequences of the same types as the existing ones
+        merged_keys: MutableSequence[float] = keys[:0]
+        merged_items: MutableSequence[Any] = items[:0]
+        start: int = 0
+
+        for value, item in new_entries:
+            position: int = bisect_right(keys, value, start)
+
+            merged_keys += keys[start:position]
+            merged_items += items[start:position]
+            merged_keys.append(value)
+            merged_items.append(item)
+
+            start = position
+
+        merged_keys += keys[start:]
+        merged_items += items[start:]
+
+        return merged_keys, merged_items
+
+    @staticmethod
+    def __count(keys: Sequence[float], low: float, high: float) -> int:
+        start: int = 0 if low is None else bisect_right(keys, low)
+        end: int = len(keys) if high is None else bisect_right(keys, high)
+
+        return max(end - start, 0)
+
+    @staticmethod
+    def __range(keys: Sequence[float], items: Sequence[Any], low: float, high: float) -> Iterator[Any]:
+        start: int = 0 if low is None else bisect_right(keys, low)
+        end: int = len(keys) if high is None else bisect_right(keys, high)
+
+        for position in range(start, end):
+            yield items[position]
+
+    @staticmethod
+    def __range_entries(keys: Sequence[float], items: Sequence[Any], low: float,
+                        high: float) -> Iterator[Tuple[float, Any]]:
+        start: int = 0 if low is None else bisect_right(keys, low)
+        end: int = len(keys) if high is None else bisect_right(keys, high)
+
+        for position in range(start, end):
+            yield keys[position], items[position]
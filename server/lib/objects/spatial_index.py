@@ -0,0 +1,181 @@
+from array import array
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, MutableSequence, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+class SpatialIndex:
+    """
+    Uniform grid index over the bounding boxes of shapes. The plane is divided into square cells of CELL_SIZE units and
+    each item is added to every cell that its bounding box overlaps, so a box or point query only reads the items of
+    the cells it overlaps instead of every stored shape. Queries return candidates: every item whose bounding box
+    intersects the query box, along with items that only share a cell with it, which the caller checks exactly
+
+    Cells are append-only and a query reads each cell up to the length it had when the query reached it, so queries
+    take no locks and never see a partially added item. Writers must be serialized by the caller
+
+    The items are ShapeRecords by default. Any sequence type, e.g. an array of rows, can be used for the cells instead
+    """
+
+    # Width and height of a cell. Generated shapes are up to 100 units across, so most of them overlap a few cells
+    CELL_SIZE: int = 32
+
+    def __init__(self, items: Sequence[Any] = None):
+        # Empty sequence of the type used for the items of each cell
+        self.items: Sequence[Any] = [] if items is None else items
+        self.cells: Dict[Tuple[int, int], MutableSequence[Any]] = {}
+
+        # (min cell x, min cell y, max cell x, max cell y) of every cell in use, so that queries larger than the
+        # stored shapes only visit cells that exist
+        self.extent: Optional[Tuple[int, int, int, int]] = None
+
+    @classmethod
+    def from_bounds(cls, min_xs: np.ndarray, min_ys: np.ndarray, max_xs: np.ndarray, max_ys: np.ndarray,
+                    items: np.ndarray) -> 'SpatialIndex':
+        """
+        Builds an index of integer items, e.g. rows, in bulk with NumPy. The cells are arrays of the items, in the
+        order they are given
+
+        :param min_xs: left edge of the bounding box of each item
+        :param min_ys: bottom edge of the bounding box of each item
+        :param max_xs: right edge of the bounding box of each item
+        :param max_ys: top edge of the bounding box of each item
+        :param items: items to index
+        :return: SpatialIndex
+        """
+        spatial_index: SpatialIndex = cls(array('q'))
+
+        if len(items) == 0:
+            return spatial_index
+
+        cell_min_xs: np.ndarray = np.floor_divide(min_xs, cls.CELL_SIZE).astype(np.int64)
+        cell_min_ys: np.ndarray = np.floor_divide(min_ys, cls.CELL_SIZE).astype(np.int64)
+        widths: np.ndarray = np.floor_divide(max_xs, cls.CELL_SIZE).astype(np.int64) - cell_min_xs + 1
+        heights: np.ndarray = np.floor_divide(max_ys, cls.CELL_SIZE).astype(np.int64) - cell_min_ys + 1
+
+        # Expand every item into one entry per cell it overlaps, numbering the cells of an item row by row
+        cell_counts: np.ndarray = widths * heights
+        entry_items: np.ndarray = np.repeat(np.arange(len(items)), cell_counts)
+        first_entries: np.ndarray = np.cumsum(cell_counts) - cell_counts
+        positions: np.ndarray = np.arange(len(entry_items)) - np.repeat(first_entries, cell_counts)
+        entry_widths: np.ndarray = widths[entry_items]
+
+        entry_xs: np.ndarray = cell_min_xs[entry_items] + positions % entry_widths
+        entry_ys: np.ndarray = cell_min_ys[entry_items] + positions // entry_widths
+
+        # Group the entries by cell with a stable sort on a single key per cell, which keeps the items of each cell in
+        # the order they were given
+        cell_keys: np.ndarray = (entry_xs - entry_xs.min()) * (entry_ys.max() - entry_ys.min() + 1) + entry_ys
+        order: np.ndarray = np.argsort(cell_keys, kind='stable')
+        cell_keys, entry_xs, entry_ys = cell_keys[order], entry_xs[order], entry_ys[order]
+        entry_items = np.asarray(items, dtype=np.int64)[entry_items[order]]
+
+        starts: np.ndarray = np.flatnonzero(np.r_[True, cell_keys[1:] != cell_keys[:-1]])
+        ends: np.ndarray = np.r_[starts[1:], len(entry_items)]
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            cell: array = array('q')
+            cell.frombytes(entry_items[start:end].tobytes())
+
+            spatial_index.cells[(int(entry_xs[start]), int(entry_ys[start]))] = cell
+
+        spatial_index.extent = (int(entry_xs.min()), int(entry_ys.min()), int(entry_xs.max()), int(entry_ys.max()))
+
+        return spatial_index
+
+    def merge(self, entries: Iterable[Tuple[Tuple[int, int, int, int], Any]]):
+        """
+        Adds (bounds, item) entries to the cells their bounding boxes overlap
+
+        :param entries: ((min_x, min_y, max_x, max_y), item) of each entry to add
+        :return: None
+        """
+        for (min_x, min_y, max_x, max_y), item in entries:
+            cell_min_x, cell_min_y, cell_max_x, cell_max_y = self.__get_cell_range(min_x, min_y, max_x, max_y)
+
+            for cell_x in range(cell_min_x, cell_max_x + 1):
+                for cell_y in range(cell_min_y, cell_max_y + 1):
+                    cell: Optional[MutableSequence[Any]] = self.cells.get((cell_x, cell_y))
+
+                    if cell is None:
+                        cell = self.items[:0]
+                        cell.append(item)
+                        self.cells[(cell_x, cell_y)] = cell
+                    else:
+                        cell.append(item)
+
+            if self.extent is None:
+                self.extent = (cell_min_x, cell_min_y, cell_max_x, cell_max_y)
+            else:
+                self.extent = (min(self.extent[0], cell_min_x), min(self.extent[1], cell_min_y),
+                               max(self.extent[2], cell_max_x), max(self.extent[3], cell_max_y))
+
+    def count(self, min_x: int, min_y: int, max_x: int, max_y: int) -> int:
+        """
+        Counts the entries of the cells that a query for the box would read. Items that overlap several of those cells
+        are counted once per cell, so this is an upper bound of the number of items the query returns
+
+        :return: number of entries in the cells overlapping the box
+        """
+        return sum(len(cell) for cell in self.__get_cells(min_x, min_y, max_x, max_y))
+
+    def intersecting(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Iterator[Any]:
+        """
+        Iterates over the items of every cell overlapping the box, each item once
+
+        :param min_x: left edge of the box
+        :param min_y: bottom edge of the box
+        :param max_x: right edge of the box
+        :param max_y: top edge of the box
+        :return: Iterator of the candidate items
+        """
+        cells: list = list(self.__get_cells(min_x, min_y, max_x, max_y))
+
+        # Items only need deduplicating when they can be in more than one of the cells read
+        if len(cells) == 1:
+            yield from islice(cells[0], len(cells[0]))
+            return
+
+        seen: Set[Any] = set()
+
+        for cell in cells:
+            for item in islice(cell, len(cell)):
+                if item not in seen:
+                    seen.add(item)
+                    yield item
+
+    def __get_cells(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Iterator[MutableSequence[Any]]:
+        """
+        Iterates over the cells in use that overlap the box
+        """
+        extent: Optional[Tuple[int, int, int, int]] = self.extent
+
+        if extent is None:
+            return
+
+        cell_min_x, cell_min_y, cell_max_x, cell_max_y = self.__get_cell_range(min_x, min_y, max_x, max_y)
+        cell_min_x, cell_min_y = max(cell_min_x, extent[0]), max(cell_min_y, extent[1])
+        cell_max_x, cell_max_y = min(cell_max_x, extent[2]), min(cell_max_y, extent[3])
+
+        # When the box covers more cells than are in use, e.g. sparse shapes far apart, check the cells in use instead
+        if (cell_max_x - cell_min_x + 1) * (cell_max_y - cell_min_y + 1) > len(self.cells):
+            for (cell_x, cell_y), cell in sorted(list(self.cells.items()), key=itemgetter(0)):
+                if cell_min_x <= cell_x <= cell_max_x and cell_min_y <= cell_y <= cell_max_y:
+                    yield cell
+
+            return
+
+        for cell_x in range(cell_min_x, cell_max_x + 1):
+            for cell_y in range(cell_min_y, cell_max_y + 1):
+                cell: Optional[MutableSequence[Any]] = self.cells.get((cell_x, cell_y))
+
+                if cell is not None:
+                    yield cell
+
+    def __get_cell_range(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Tuple[int, int, int, int]:
+        """
+        Returns the (min cell x, min cell y, max cell x, max cell y) of the cells that a box overlaps
+        """
+        return (min_x // self.CELL_SIZE, min_y // self.CELL_SIZE,
+                max_x // self.CELL_SIZE, max_y // self.CELL_SIZE)
@@ -0,0 +1,157 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Tuple
+
+from ..objects.nonce_cache import NonceCache
+
+class SqliteNonceCache(NonceCache):
+    """
+    NonceCache kept in a table of a SQLite database, so that the worker processes of a multi-process server share their
+    nonces and a call replayed on a connection to another worker is rejected as well
+
+    The database is a file of its own rather than the shape database, so that adding a nonce never waits for the write
+    lock of a shape insert. A call only runs a single upsert in autocommit mode: the primary key of the table makes
+    adding a nonce atomic across the processes, an expired nonce is replaced when it is added again, and seen does not
+    query the table, so a replay is caught by add once its signature is verified. Expired nonces are deleted by a
+    background thread every expire_interval_s, which also counts the entries. Entries are only dropped once they
+    expire, so max_entries is not enforced and no nonce is evicted early. The replays counted are those of this process
+
+    Like the in-memory NonceCache, the nonces do not outlive the server, see reset, so the database is not synced to
+    disk. Calls are checked on the event loop, so a busy database is waited for at most BUSY_TIMEOUT_S before the nonce
+    check fails with an IOError
+    """
+    BUSY_TIMEOUT_S: float = 0.1
+
+    def __init__(self, sqlite_path: str, max_entries: int, expire_interval_s: float = 0):
+        super().__init__(max_entries)
+        self.sqlite_path: str = sqlite_path
+        self.expire_interval: float = expire_interval_s
+
+        # Number of entries as of the last expiry
+        self.entries: int = 0
+
+        self._local: threading.local = threading.local()
+
+        self.__get_connection().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS nonces (
+                key_id TEXT NOT NULL,
+                nonce TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (key_id, nonce)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS nonces_expires_at ON nonces (expires_at);
+            """
+        )
+
+        # Use a daemon thread to periodically delete the expired nonces, none are deleted if the interval is 0
+        self._stop: threading.Event = threading.Event()
+
+        if self.expire_interval > 0:
+            expire_thread = threading.Thread(target=self.__expire_periodically, daemon=True)
+            expire_thread.start()
+
+    def __len__(self) -> int:
+        return self.entries
+
+    def seen(self, key: Tuple[str, str]) -> bool:
+        # Replays are rare, so rather than query the table on every call they are caught by add
+        return False
+
+    def add(self, key: Tuple[str, str], expires_at: float, now: float) -> bool:
+        connection: sqlite3.Connection = self.__get_connection()
+
+        try:
+            added: bool = connection.execute(
+                """
+                INSERT INTO nonces (key_id, nonce, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT (key_id, nonce) DO UPDATE SET expires_at = excluded.expires_at
+                WHERE nonces.expires_at <= ?
+                """,
+                (*key, expires_at, now)
+            ).rowcount == 1
+        except sqlite3.Error as e:
+            raise IOError(f"Could not add nonce to {self.sqlite_path}: {e}") from e
+
+        if not added:
+            with self._lock:
+                self.replays += 1
+
+        return added
+
+    def expire(self, now: float):
+        """
+        Deletes the expired nonces and counts the entries left
+
+        :param now: current time, in the same clock as the expiry times
+        :return: None
+        """
+        connection: sqlite3.Connection = self.__get_connection()
+
+        try:
+            connection.execute("DELETE FROM nonces WHERE expires_at <= ?", (now,))
+            self.entries = connection.execute("SELECT COUNT(*) FROM nonces").fetchone()[0]
+        except sqlite3.Error as e:
+            raise IOError(f"Could not expire nonces in {self.sqlite_path}: {e}") from e
+
+    def get_stats(self) -> dict:
+        return {
+            "entries": self.entries,
+            "replays": self.replays,
+            "evictions": self.evictions
+        }
+
+    def close(self):
+        """
+        Stops the expiry thread and closes the connection of the current thread
+
+        :return: None
+        """
+        self._stop.set()
+
+        connection: sqlite3.Connection = getattr(self._local, 'connection', None)
+
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @classmethod
+    def reset(cls, sqlite_path: str):
+        """
+        Deletes the database of a previous run, which is not synced to disk and could be corrupt after a crash of the
+        machine. Only called while no process has the database open
+
+        :param sqlite_path: path of the database
+        :return: None
+        """
+        for path in (sqlite_path, f"{sqlite_path}-wal", f"{sqlite_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __get_connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection for the current thread, opening one if needed
+
+        :return: sqlite3.Connection
+        """
+        connection: sqlite3.Connection = getattr(self._local, 'connection', None)
+
+        if connection is None:
+            connection = sqlite3.connect(
+                self.sqlite_path, timeout=self.BUSY_TIMEOUT_S, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            self._local.connection = connection
+
+        return connection
+
+    def __expire_periodically(self):
+        while not self._stop.wait(self.expire_interval):
+            try:
+                self.expire(time.time())
+            except IOError:
+                # The database is busy, the expired nonces are deleted on the next pass
+                pass
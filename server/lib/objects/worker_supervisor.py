@@ -0,0 +1,118 @@
+import time
+import signal
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Callable, Dict, List
+
+from ..objects.logger import Logger
+
+class WorkerSupervisor:
+    """
+    Runs the server in several worker processes that all bind the same port with SO_REUSEPORT, so that the kernel
+    spreads new connections across the workers and each worker has its own GIL. The supervisor only watches the
+    workers and replaces any worker that exits until it is stopped with SIGINT or SIGTERM
+
+    Workers are spawned rather than forked so that no gRPC state of the supervisor is inherited by the workers
+    """
+    # Workers that exit sooner than this after starting are replaced after RESTART_DELAY so that a worker that fails
+    # on startup, e.g. because of a bad config, does not restart in a tight loop
+    MIN_UPTIME: float = 5.0
+    RESTART_DELAY: float = 1.0
+
+    # How long stopped workers get to close their repositories before they are killed
+    STOP_TIMEOUT: float = 10.0
+
+    def __init__(self, logger: Logger, target: Callable[[], None], workers: int):
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers provided {workers}")
+
+        self.logger: Logger = logger
+        self.target: Callable[[], None] = target
+        self.workers: int = workers
+
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._started: Dict[int, float] = {}
+        self._stopping: bool = False
+
+    def run(self):
+        """
+        Starts the workers and restarts any that exit, returning once the supervisor is stopped and every worker has
+        exited
+
+        :return: None
+        """
+        for shutdown_signal in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(shutdown_signal, self.__stop)
+
+        for slot in range(self.workers):
+            self.__start_worker(slot)
+
+        try:
+            while not self._stopping:
+                # Wake up periodically so that a stop signal is handled even while every worker is healthy
+                wait([process.sentinel for process in self._processes.values()], timeout=0.5)
+
+                for slot, process in list(self._processes.items()):
+                    if process.is_alive() or self._stopping:
+                        continue
+
+                    uptime: float = time.monotonic() - self._started[slot]
+                    self.logger.error(f"Worker {process.pid} exited with code {process.exitcode} after {uptime:.1f}s")
+
+                    if uptime < self.MIN_UPTIME:
+                        time.sleep(self.RESTART_DELAY)
+
+                    if not self._stopping:
+                        self.__start_worker(slot)
+        finally:
+            self.__stop_workers()
+
+    def __start_worker(self, slot: int):
+        """
+        Starts the worker process of a slot
+
+        :param slot: index of the worker
+        :return: None
+        """
+        process: multiprocessing.Process = self._context.Process(target=self.target, name=f"worker-{slot}")
+        process.start()
+
+        self._processes[slot] = process
+        self._started[slot] = time.monotonic()
+        self.logger.info(f"Started worker {process.pid}")
+
+    def __stop(self, signum: int, frame):
+        """
+        Signal handler that makes the supervisor stop its workers and return
+
+        :param signum: received signal
+        :param frame: current stack frame
+        :return: None
+        """
+        self._stopping = True
+
+    def __stop_workers(self):
+        """
+        Sends SIGTERM to every worker so that it stops gracefully and closes its repository, then waits for them,
+        killing any worker that does not exit within STOP_TIMEOUT
+
+        :return: None
+        """
+        processes: List[multiprocessing.Process] = list(self._processes.values())
+
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+        deadline: float = time.monotonic() + self.STOP_TIMEOUT
+
+        for process in processes:
+            process.join(max(deadline - time.monotonic(), 0))
+
+            if process.is_alive():
+                self.logger.error(f"Worker {process.pid} did not stop within {self.STOP_TIMEOUT}s, killing it")
+                process.kill()
+                process.join()
+
+        self.logger.info(f"Stopped {len(processes)} workers")
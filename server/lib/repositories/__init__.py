@@ -0,0 +1,9 @@
+from .shape_repository import *
+from .memory_shape_repository import *
+from .json_shape_repository import *
+from .sqlite_shape_repository import *
+from .columnar_shape_repository import *
+from .binary_shape_repository import *
+from .snapshot_converter import *
+from .query_planner import *
+from .repository_factory import *
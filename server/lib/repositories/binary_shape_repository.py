@@ -0,0 +1,84 @@
+import os
+from typing import Dict, List, Tuple
+
+from ..objects.logger import Logger
+from ..objects.shape_log import ShapeLog
+from ..objects.shape_record import ShapeRecord
+from ..objects.shape_snapshot import ShapeSnapshot
+from .columnar_shape_repository import ColumnarShapeRepository
+
+class BinaryShapeRepository(ColumnarShapeRepository):
+    """
+    Shape repository that serves shapes from a memory mapped binary ShapeSnapshot, so startup time does not grow with
+    the number of stored shapes. Newly created shapes are kept in memory and appended to a ShapeLog
+
+    On startup any shapes in the log, e.g. after a crash, are replayed into memory on top of the snapshot. When the
+    repository is closed the shapes created since startup are folded into a new snapshot and the log is truncated
+    """
+    # Rows of the snapshot are paged in from disk as they are read
+    BLOCKING_READS: bool = True
+    BLOCKING_WRITES: bool = True
+
+    def __init__(self, logger: Logger, snapshot_path: str, shape_log: ShapeLog):
+        super().__init__(logger, ShapeSnapshot(snapshot_path) if os.path.exists(snapshot_path) else None)
+        self.snapshot_path: str = snapshot_path
+        self.shape_log: ShapeLog = shape_log
+
+        if self.snapshot is not None:
+            logger.info(f"Mapped {len(self.snapshot)} shapes from {self.snapshot_path}")
+
+        replayed_shapes: Dict[str, List[dict]] = {key: [] for key in self.rows}
+
+        for shape_key, shape_json in self.shape_log.replay():
+            replayed_shapes[shape_key].append(shape_json)
+
+        replayed: int = 0
+
+        for shape_key, shape_jsons in replayed_shapes.items():
+            # Skip shapes that were already folded into the snapshot, e.g. by a crash before the log was truncated
+            shape_jsons = [
+                shape_json for shape_json in shape_jsons
+                if self.get(shape_key, int(shape_json['shape_id'][2:])) is None
+            ]
+
+            self._add_many(ShapeRecord.from_json_many(shape_jsons, self.KEY_SHAPE_TYPES[shape_key]))
+            replayed += len(shape_jsons)
+
+        if replayed > 0:
+            logger.info(f"Replayed {replayed} shapes from {self.shape_log.path}")
+
+    def insert_many(self, shapes: List[Tuple[str, List[Tuple[int, int]]]]) -> List[ShapeRecord]:
+        # Hold the write lock until the shapes are logged so that they are logged in shape_id order. The shapes are only
+        # added to memory once they are logged, so a failed append is neither served nor folded into the snapshot
+        with self._write_lock:
+            records: List[ShapeRecord] = self._new_records(shapes)
+
+            try:
+                self.shape_log.append_many([
+                    (self.SHAPE_KEYS[record.shape_type], record.to_json()) for record in records
+                ])
+                self.logger.info(f"{len(records)} shapes successfully appended to {self.shape_log.path}")
+            except IOError as e:
+                self.logger.error(f"Error writing to file: {e}")
+                raise
+
+            self._add_many(records)
+
+        return records
+
+    def close(self):
+        """
+        Folds the shapes created since startup into a new snapshot, then truncates and closes the log
+
+        :return: None
+        """
+        with self._write_lock:
+            if len(self.columns) > 0:
+                sources: list = [self.columns] if self.snapshot is None else [self.snapshot, self.columns]
+                ShapeSnapshot.write(self.snapshot_path, sources)
+
+                self.logger.info(f"Folded {len(self.columns)} shapes into {self.snapshot_path}")
+                self.shape_log.truncate()
+
+            super().close()
+            self.shape_log.close()
@@ -0,0 +1,268 @@
+import heapq
+from array import array
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..objects.logger import Logger
+from ..functions.geometry import get_bounds
+from ..objects.sorted_index import SortedIndex
+from ..objects.spatial_index import SpatialIndex
+from ..objects.shape_columns import ShapeColumns
+from ..objects.shape_record import ShapeRecord
+from ..objects.shape_snapshot import ShapeSnapshot
+from .shape_repository import ShapeRepository
+
+class ColumnarShapeRepository(ShapeRepository):
+    """
+    Shape repository that keeps shapes in memory in a ShapeColumns column store rather than as a record per shape, so
+    the memory used per shape is a few flat array slots instead of Python objects. ShapeRecords are only built for the
+    shapes a read returns. Nothing is persisted between runs
+
+    Each shape key keeps the rows of its shapes in shape_id order, so a shape_id resolves to its row by position, and
+    each metric keeps a SortedIndex of every row so that range queries seek straight to the first row in range. A
+    SpatialIndex of every row serves box and point queries
+
+    Columns and rows are append-only and a row is only published to the shape key rows and sorted indexes once all of
+    its columns have been written, so reads take no locks and never see a partially written row
+
+    Optionally the columns are layered on top of a read only ShapeSnapshot, whose shapes come before the shapes added
+    in memory. The SpatialIndex of the snapshot rows is built with NumPy on the first box or point query rather than
+    on startup, so mapping a snapshot stays instant
+    """
+    BLOCKING_READS: bool = False
+    BLOCKING_WRITES: bool = False
+
+    def __init__(self, logger: Logger, snapshot: ShapeSnapshot = None):
+        super().__init__(logger)
+        self.snapshot: ShapeSnapshot = snapshot
+        self.columns: ShapeColumns = ShapeColumns()
+        self.rows: Dict[str, array] = {key: array('q') for key in self.SHAPE_KEYS.values()}
+
+        # Rows sorted on each metric
+        self.sorted_indexes: Dict[str, SortedIndex] = {
+            metric: SortedIndex(metric, array('d'), array('q')) for metric in self.METRICS
+        }
+        self.spatial_index: SpatialIndex = SpatialIndex(array('q'))
+
+        # First row and number of rows of each shape key in the snapshot, and the snapshot rows sorted on each metric
+        self.snapshot_rows: Dict[str, Tuple[int, int]] = {key: (0, 0) for key in self.SHAPE_KEYS.values()}
+        self.snapshot_indexes: Dict[str, SortedIndex] = {}
+        self.snapshot_spatial_index: Optional[SpatialIndex] = None
+
+        if self.snapshot is not None:
+            self.snapshot_indexes = {
+                metric: SortedIndex(metric, self.snapshot.sorted_values[metric], self.snapshot.sorted_rows[metric])
+                for metric in self.METRICS
+            }
+
+            # Snapshots converted from older databases hold lower case shape types. Unsupported shape types are
+            # refused rather than skipped, as skipping their rows would hand out their shape_ids again
+            self.snapshot.rename_types({
+                shape_type: self.get_shape_type(shape_type, self.snapshot.path) for shape_type in self.snapshot.types
+            })
+
+            for shape_type, type_rows in self.snapshot.type_rows.items():
+                self.snapshot_rows[self.SHAPE_KEYS[shape_type]] = type_rows
+
+    def get(self, shape_key: str, seq: int) -> Optional[ShapeRecord]:
+        first_row, snapshot_count = self.snapshot_rows[shape_key]
+
+        if seq < snapshot_count:
+            return self.__get_record(self.snapshot, first_row + seq)
+
+        seq -= snapshot_count
+
+        if seq >= len(self.rows[shape_key]):
+            return None
+
+        return self.__get_record(self.columns, self.rows[shape_key][seq])
+
+    def insert_many(self, shapes: List[Tuple[str, List[Tuple[int, int]]]]) -> List[ShapeRecord]:
+        with self._write_lock:
+            records: List[ShapeRecord] = self._new_records(shapes)
+            self._add_many(records)
+
+        return records
+
+    def scan(self, shape_key: str) -> Iterator[ShapeRecord]:
+        first_row, snapshot_count = self.snapshot_rows[shape_key]
+
+        for row in range(first_row, first_row + snapshot_count):
+            yield self.__get_record(self.snapshot, row)
+
+        rows: array = self.rows[shape_key]
+
+        for position in range(len(rows)):
+            yield self.__get_record(self.columns, rows[position])
+
+    def range(self, metric: str, low: float = None, high: float = None) -> Iterator[ShapeRecord]:
+        self._validate_metric(metric)
+
+        in_memory: Iterator[ShapeRecord] = self.__get_records(
+            self.columns, self.sorted_indexes[metric].range(low, high)
+        )
+
+        if self.snapshot is None:
+            return in_memory
+
+        # Both sources are sorted on the metric, so merge them. Snapshot shapes come first when values are equal
+        return heapq.merge(
+            self.__get_records(self.snapshot, self.snapshot_indexes[metric].range(low, high)),
+            in_memory,
+            key=lambda record: getattr(record, metric)
+        )
+
+    def count(self, shape_key: str) -> int:
+        return self.__get_count(shape_key)
+
+    def count_range(self, metric: str, low: float = None, high: float = None) -> int:
+        self._validate_metric(metric)
+
+        count: int = self.sorted_indexes[metric].count(low, high)
+
+        if self.snapshot is not None:
+            count += self.snapshot_indexes[metric].count(low, high)
+
+        return count
+
+    def intersecting(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Iterator[ShapeRecord]:
+        in_memory: Iterator[ShapeRecord] = self.__get_records(
+            self.columns, self.spatial_index.intersecting(min_x, min_y, max_x, max_y)
+        )
+
+        if self.snapshot is None:
+            return in_memory
+
+        return chain(
+            self.__get_records(self.snapshot,
+                               self.__get_snapshot_spatial_index().intersecting(min_x, min_y, max_x, max_y)),
+            in_memory
+        )
+
+    def count_intersecting(self, min_x: int, min_y: int, max_x: int, max_y: int) -> int:
+        count: int = self.spatial_index.count(min_x, min_y, max_x, max_y)
+
+        if self.snapshot is not None:
+            count += self.__get_snapshot_spatial_index().count(min_x, min_y, max_x, max_y)
+
+        return count
+
+    def close(self):
+        if self.snapshot is not None:
+            # Drop the snapshot indexes first since their views of the snapshot would stop it from being unmapped
+            self.snapshot_indexes = {}
+            self.snapshot_spatial_index = None
+            self.snapshot.close()
+
+    def _add_many(self, records: List[ShapeRecord]):
+        """
+        Adds many records, e.g. new shapes or the shapes of a store being loaded. Each record must be the next shape_id
+        of its shape key. Each sorted index publishes a single new version rather than one per row
+
+        :param records: records to add, of any shape keys
+        :return: None
+        """
+        rows: List[int] = []
+        bounds: List[Tuple[int, int, int, int]] = []
+
+        with self._write_lock:
+            counts: Dict[str, int] = {}
+
+            # Check every record before adding any, so that a bad record leaves the columns as they were
+            for record in records:
+                shape_key: str = self.get_shape_key(record.shape_id)
+
+                if shape_key is None:
+                    raise ValueError(f"Unsupported shape_id {record.shape_id}")
+
+                seq: int = counts.get(shape_key, self.__get_count(shape_key))
+
+                if record.shape_id != f"{shape_key[0]}-{seq}":
+                    raise ValueError(f"Expected shape_id {shape_key[0]}-{seq} but got {record.shape_id}")
+
+                counts[shape_key] = seq + 1
+
+            for record in records:
+                shape_key: str = self.get_shape_key(record.shape_id)
+                coords: List[Tuple[int, int]] = record.coords
+
+                row: int = self.columns.append(
+                    record.shape_type, self.__get_count(shape_key), coords, record.area, record.perimeter
+                )
+                self.rows[shape_key].append(row)
+                rows.append(row)
+                bounds.append(get_bounds(coords))
+
+            for metric, sorted_index in self.sorted_indexes.items():
+                sorted_index.merge((getattr(record, metric), row) for record, row in zip(records, rows))
+
+            self.spatial_index.merge(zip(bounds, rows))
+
+    def __get_count(self, shape_key: str) -> int:
+        """
+        Returns the number of shapes stored under a shape key, which is also the seq of the next shape
+
+        :param shape_key: shape key to count
+        :return: number of shapes
+        """
+        return self.snapshot_rows[shape_key][1] + len(self.rows[shape_key])
+
+    def __get_snapshot_spatial_index(self) -> SpatialIndex:
+        """
+        Returns the SpatialIndex of the snapshot rows, building it on first use
+
+        :return: SpatialIndex
+        """
+        if self.snapshot_spatial_index is None:
+            with self._write_lock:
+                if self.snapshot_spatial_index is None:
+                    self.snapshot_spatial_index = self.__build_snapshot_spatial_index()
+
+        return self.snapshot_spatial_index
+
+    def __build_snapshot_spatial_index(self) -> SpatialIndex:
+        """
+        Builds the SpatialIndex of the snapshot rows from the bounding box of every row, computed with NumPy. The arrays
+        viewing the snapshot are dropped once the index is built so that they do not stop it from being unmapped
+
+        :return: SpatialIndex
+        """
+        if len(self.snapshot) == 0:
+            return SpatialIndex(array('q'))
+
+        starts: np.ndarray = np.frombuffer(self.snapshot.offsets, dtype=np.int64)[:-1]
+        xs: np.ndarray = np.frombuffer(self.snapshot.xs, dtype=np.int32)
+        ys: np.ndarray = np.frombuffer(self.snapshot.ys, dtype=np.int32)
+
+        spatial_index: SpatialIndex = SpatialIndex.from_bounds(
+            np.minimum.reduceat(xs, starts), np.minimum.reduceat(ys, starts),
+            np.maximum.reduceat(xs, starts), np.maximum.reduceat(ys, starts),
+            np.arange(len(self.snapshot))
+        )
+        self.logger.info(f"Built the spatial index of {len(self.snapshot)} shapes in {self.snapshot.path}")
+
+        return spatial_index
+
+    def __get_records(self, columns: ShapeColumns, rows: Iterator[int]) -> Iterator[ShapeRecord]:
+        for row in rows:
+            yield self.__get_record(columns, row)
+
+    def __get_record(self, columns: ShapeColumns, row: int) -> ShapeRecord:
+        """
+        Builds the ShapeRecord of a row
+
+        :param columns: columns the row is stored in
+        :param row: row to read
+        :return: ShapeRecord
+        """
+        shape_type: str = columns.get_shape_type(row)
+
+        return ShapeRecord(
+            shape_id=f"{self.SHAPE_KEYS[shape_type][0]}-{columns.seqs[row]}",
+            shape_type=shape_type,
+            coords=columns.get_coords(row),
+            area=columns.areas[row],
+            perimeter=columns.perimeters[row]
+        )
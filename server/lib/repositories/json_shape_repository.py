@@ -0,0 +1,108 @@
+import os
+import json
+from typing import Dict, List, Tuple
+
+from ..objects.logger import Logger
+from ..objects.shape_log import ShapeLog
+from ..objects.shape_record import ShapeRecord
+from .memory_shape_repository import MemoryShapeRepository
+
+class JsonShapeRepository(MemoryShapeRepository):
+    """
+    Shape repository that serves shapes from memory and persists them to a JSON file
+
+    In snapshot mode every insert rewrites the whole JSON file. In log mode every insert is appended to a ShapeLog, and
+    on startup the log is replayed on top of the JSON snapshot and then folded back into it
+    """
+    BLOCKING_WRITES: bool = True
+
+    def __init__(self, logger: Logger, json_path: str, shape_log: ShapeLog = None):
+        super().__init__(logger)
+        self.json_path: str = json_path
+        self.shape_log: ShapeLog = shape_log
+
+        # If database .json exists use that file, otherwise start with an empty database
+        if os.path.exists(self.json_path):
+            try:
+                with open(self.json_path, 'r') as json_file:
+                    data: dict = json.load(json_file)
+
+                # The shape key decides the shape_type, as older files hold lower case shape types
+                for shape_key, shape_jsons in data.items():
+                    self._add_many(ShapeRecord.from_json_many(shape_jsons, self.KEY_SHAPE_TYPES[shape_key]))
+            except IOError as e:
+                logger.error(f"Could not load json file: {e}")
+
+        if self.shape_log is not None:
+            replayed_shapes: Dict[str, List[dict]] = {key: [] for key in self.data}
+
+            for shape_key, shape_json in self.shape_log.replay():
+                replayed_shapes[shape_key].append(shape_json)
+
+            replayed: int = 0
+
+            for shape_key, shape_jsons in replayed_shapes.items():
+                # Skip shapes that were already written to the JSON file, e.g. by a crash before the log was truncated
+                shape_jsons = [
+                    shape_json for shape_json in shape_jsons
+                    if self.get(shape_key, int(shape_json['shape_id'][2:])) is None
+                ]
+
+                self._add_many(ShapeRecord.from_json_many(shape_jsons, self.KEY_SHAPE_TYPES[shape_key]))
+                replayed += len(shape_jsons)
+
+            if replayed > 0:
+                logger.info(f"Replayed {replayed} shapes from {self.shape_log.path}")
+                self.__write_snapshot()
+
+            # The log is emptied even when every shape in it was skipped, so they are not read again on every start
+            if any(replayed_shapes.values()):
+                self.shape_log.truncate()
+
+    def insert_many(self, shapes: List[Tuple[str, List[Tuple[int, int]]]]) -> List[ShapeRecord]:
+        # Hold the write lock until the shapes are persisted so that they are written in shape_id order. The shapes are
+        # only added to memory once they are persisted, so a failed write neither serves them nor uses up their
+        # shape_ids, which would leave a gap that stops the log from being replayed
+        with self._write_lock:
+            records: List[ShapeRecord] = self._new_records(shapes)
+
+            try:
+                if self.shape_log is not None:
+                    self.shape_log.append_many([
+                        (self.SHAPE_KEYS[record.shape_type], record.to_json()) for record in records
+                    ])
+                    self.logger.info(f"{len(records)} shapes successfully appended to {self.shape_log.path}")
+                else:
+                    self.__write_snapshot(records)
+            except IOError as e:
+                self.logger.error(f"Error writing to file: {e}")
+                raise
+
+            self._add_many(records)
+
+        return records
+
+    def close(self):
+        if self.shape_log is not None:
+            with self._write_lock:
+                self.shape_log.close()
+
+    def __write_snapshot(self, new_records: List[ShapeRecord] = ()):
+        """
+        Write the whole database back to the JSON file. The data is written to a temporary file first and then moved
+        into place so that a crash mid-write cannot leave a truncated database behind
+
+        :param new_records: records being inserted, which are written after the stored ones
+        :return: None
+        """
+        tmp_path: str = f"{self.json_path}.tmp"
+        data: dict = {key: [record.to_json() for record in records] for key, records in self.data.items()}
+
+        for record in new_records:
+            data[self.SHAPE_KEYS[record.shape_type]].append(record.to_json())
+
+        with open(tmp_path, 'w') as json_file:
+            json.dump(data, json_file, indent=4)
+        os.replace(tmp_path, self.json_path)
+
+        self.logger.info(f"Data successfully written to {self.json_path}")
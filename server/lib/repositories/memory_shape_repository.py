@@ -0,0 +1,98 @@
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..objects.logger import Logger
+from ..objects.shape_record import ShapeRecord
+from ..objects.sorted_index import SortedIndex
+from ..objects.spatial_index import SpatialIndex
+from .shape_repository import ShapeRepository
+
+class MemoryShapeRepository(ShapeRepository):
+    """
+    Shape repository that only keeps shapes in memory. Nothing is persisted between runs
+
+    Each shape key partition keeps its records in shape_id order, so a lookup indexes straight into the partition.
+    Alongside the partitions, a SortedIndex per metric lets range queries seek straight to the first shape in range,
+    and a SpatialIndex lets box and point queries only read nearby shapes
+
+    The partitions and spatial index cells are append-only and reads stop at the length they had when they started, and
+    the sorted indexes are copy-on-write, so reads never block on or observe an in-progress insert
+    """
+    BLOCKING_READS: bool = False
+    BLOCKING_WRITES: bool = False
+
+    def __init__(self, logger: Logger):
+        super().__init__(logger)
+        self.data: Dict[str, List[ShapeRecord]] = {key: [] for key in self.SHAPE_KEYS.values()}
+        self.sorted_indexes: Dict[str, SortedIndex] = {metric: SortedIndex(metric) for metric in self.METRICS}
+        self.spatial_index: SpatialIndex = SpatialIndex()
+
+    def get(self, shape_key: str, seq: int) -> Optional[ShapeRecord]:
+        records: List[ShapeRecord] = self.data[shape_key]
+
+        return records[seq] if seq < len(records) else None
+
+    def insert_many(self, shapes: List[Tuple[str, List[Tuple[int, int]]]]) -> List[ShapeRecord]:
+        with self._write_lock:
+            records: List[ShapeRecord] = self._new_records(shapes)
+            self._add_many(records)
+
+        return records
+
+    def scan(self, shape_key: str) -> Iterator[ShapeRecord]:
+        records: List[ShapeRecord] = self.data[shape_key]
+
+        return islice(records, len(records))
+
+    def range(self, metric: str, low: float = None, high: float = None) -> Iterator[ShapeRecord]:
+        self._validate_metric(metric)
+
+        return self.sorted_indexes[metric].range(low, high)
+
+    def intersecting(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Iterator[ShapeRecord]:
+        return self.spatial_index.intersecting(min_x, min_y, max_x, max_y)
+
+    def count_intersecting(self, min_x: int, min_y: int, max_x: int, max_y: int) -> int:
+        return self.spatial_index.count(min_x, min_y, max_x, max_y)
+
+    def count(self, shape_key: str) -> int:
+        return len(self.data[shape_key])
+
+    def count_range(self, metric: str, low: float = None, high: float = None) -> int:
+        self._validate_metric(metric)
+
+        return self.sorted_indexes[metric].count(low, high)
+
+    def _add_many(self, records: List[ShapeRecord]):
+        """
+        Adds many records to the in-memory partitions and indexes without persisting them. Each record must be the
+        next shape_id of its shape key. Each sorted index publishes a single new version, which keeps loading a large
+        store fast
+
+        :param records: records to add, of any shape keys
+        :return: None
+        """
+        with self._write_lock:
+            counts: Dict[str, int] = {}
+
+            # Check every record before adding any, so that a bad record leaves the partitions as they were
+            for record in records:
+                shape_key: str = self.get_shape_key(record.shape_id)
+
+                if shape_key is None:
+                    raise ValueError(f"Unsupported shape_id {record.shape_id}")
+
+                seq: int = counts.get(shape_key, len(self.data[shape_key]))
+
+                if record.shape_id != f"{shape_key[0]}-{seq}":
+                    raise ValueError(f"Expected shape_id {shape_key[0]}-{seq} but got {record.shape_id}")
+
+                counts[shape_key] = seq + 1
+
+            for record in records:
+                self.data[self.get_shape_key(record.shape_id)].append(record)
+
+            for sorted_index in self.sorted_indexes.values():
+                sorted_index.extend(records)
+
+            self.spatial_index.merge((record.get_bounds(), record) for record in records)
@@ -0,0 +1,118 @@
+import heapq
+from itertools import chain, islice
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from ..functions.shape_id_codec import parse_shape_id
+from ..objects.logger import Logger
+from ..objects.shape_filter import ShapeFilter
+from ..objects.shape_record import ShapeRecord
+from .shape_repository import ShapeRepository
+
+class QueryPlan:
+    """
+    A way of reading the candidate shapes of a query: the index it reads, the number of shapes it is estimated to read,
+    and a callable that iterates over them
+    """
+    __slots__ = ('index', 'estimate', 'records')
+
+    def __init__(self, index: str, estimate: int, records: Callable[[], Iterator[ShapeRecord]]):
+        self.index: str = index
+        self.estimate: int = estimate
+        self.records: Callable[[], Iterator[ShapeRecord]] = records
+
+    def __repr__(self) -> str:
+        return f"QueryPlan(index={self.index}, estimate={self.estimate})"
+
+class QueryPlanner:
+    """
+    Chooses how to read the shapes matching a ShapeFilter. Every filter that a repository can serve from an index is a
+    candidate plan, i.e. the shape key partition for shape_type, the sorted index of each filtered metric and the
+    spatial index for within, along with a full scan of every partition. The repository counts the shapes each
+    candidate would read, and the plan that reads the fewest is executed. Every filter is then checked on each shape it
+    reads
+    """
+
+    def __init__(self, repository: ShapeRepository, logger: Logger):
+        self.repository: ShapeRepository = repository
+        self.logger: Logger = logger
+
+    def plan(self, shape_filter: ShapeFilter) -> QueryPlan:
+        """
+        Chooses the candidate plan that reads the fewest shapes. Ties go to the earlier candidate, so the shape key
+        partition, then area, then perimeter, then the spatial index, then a full scan
+
+        :param shape_filter: filters to plan for
+        :return: the chosen QueryPlan
+        """
+        return min(self.__get_candidates(shape_filter), key=lambda candidate: candidate.estimate)
+
+    def execute(self, shape_filter: ShapeFilter, limit: Optional[int] = None, offset: int = 0) -> Iterator[ShapeRecord]:
+        """
+        Iterates over the shapes matching every filter. Without a limit or offset they are returned as the chosen plan
+        reads them. Otherwise the plan order would decide which shapes a page holds, and it changes as the counts of
+        the indexes do, so the matches are ordered by shape_id before the page is taken, and consecutive pages neither
+        skip nor repeat a shape
+
+        :param shape_filter: filters the shapes must match
+        :param limit: maximum number of shapes to return, None for no limit
+        :param offset: number of matching shapes to skip
+        :return: Iterator of the matching shapes
+        """
+        plan: QueryPlan = self.plan(shape_filter)
+        self.logger.info(f"Executing {plan} for {shape_filter}")
+
+        matches: Iterator[ShapeRecord] = filter(shape_filter.matches, plan.records())
+
+        if limit is None and offset == 0:
+            return matches
+
+        # Only the shapes up to the end of the page are kept when there is a limit
+        if limit is None:
+            ordered: List[ShapeRecord] = sorted(matches, key=self.__get_order)
+        else:
+            ordered: List[ShapeRecord] = heapq.nsmallest(offset + limit, matches, key=self.__get_order)
+
+        return islice(ordered, offset, None)
+
+    @staticmethod
+    def __get_order(record: ShapeRecord) -> Tuple[str, int]:
+        """
+        Sort key of a shape by shape_id, so that T-2 comes before T-10
+
+        :param record: shape to sort
+        :return: (prefix, seq)
+        """
+        return parse_shape_id(record.shape_id)
+
+    def __get_candidates(self, shape_filter: ShapeFilter) -> List[QueryPlan]:
+        repository: ShapeRepository = self.repository
+        candidates: List[QueryPlan] = []
+
+        if shape_filter.shape_type is not None:
+            shape_key: str = repository.SHAPE_KEYS[shape_filter.shape_type]
+            candidates.append(QueryPlan(
+                shape_key, repository.count(shape_key), lambda: repository.scan(shape_key)
+            ))
+
+        for metric in repository.METRICS:
+            bounds = shape_filter.get_range(metric)
+
+            if bounds is not None:
+                candidates.append(QueryPlan(
+                    metric, repository.count_range(metric, *bounds),
+                    lambda metric=metric, bounds=bounds: repository.range(metric, *bounds)
+                ))
+
+        if shape_filter.within is not None:
+            within: Tuple[int, int, int, int] = shape_filter.within
+            candidates.append(QueryPlan(
+                "spatial", repository.count_intersecting(*within), lambda: repository.intersecting(*within)
+            ))
+
+        shape_keys: List[str] = list(repository.SHAPE_KEYS.values())
+        candidates.append(QueryPlan(
+            "scan", sum(repository.count(shape_key) for shape_key in shape_keys),
+            lambda: chain.from_iterable(repository.scan(shape_key) for shape_key in shape_keys)
+        ))
+
+        return candidates
@@ -0,0 +1,61 @@
+from configparser import ConfigParser
+
+from ..objects.logger import Logger
+from ..objects.shape_log import ShapeLog
+from .shape_repository import ShapeRepository
+from .json_shape_repository import JsonShapeRepository
+from .memory_shape_repository import MemoryShapeRepository
+from .columnar_shape_repository import ColumnarShapeRepository
+from .binary_shape_repository import BinaryShapeRepository
+from .sqlite_shape_repository import SqliteShapeRepository
+
+def get_shape_repository(config: ConfigParser, logger: Logger) -> ShapeRepository:
+    """
+    Creates the shape repository selected by the backend option of the [storage] config section
+
+    :param config: app configuration
+    :param logger: logger passed to the repository
+    :return: ShapeRepository
+    """
+    backend: str = config['storage']['backend']
+
+    if backend == "memory":
+        return MemoryShapeRepository(logger)
+
+    elif backend == "columnar":
+        return ColumnarShapeRepository(logger)
+
+    elif backend == "json":
+        storage_mode: str = config['storage']['mode']
+        shape_log: ShapeLog = None
+
+        if storage_mode == "log":
+            shape_log = _get_shape_log(config, logger)
+        elif storage_mode != "snapshot":
+            raise ValueError(f"Invalid storage mode provided {storage_mode}")
+
+        return JsonShapeRepository(logger, config['general']['json_path'], shape_log)
+
+    elif backend == "binary":
+        return BinaryShapeRepository(logger, config['storage']['snapshot_path'], _get_shape_log(config, logger))
+
+    elif backend == "sqlite":
+        return SqliteShapeRepository(logger, config['storage']['sqlite_path'])
+
+    else:
+        raise ValueError(f"Invalid storage backend provided {backend}")
+
+def _get_shape_log(config: ConfigParser, logger: Logger) -> ShapeLog:
+    """
+    Opens the ShapeLog configured in the [storage] config section
+
+    :param config: app configuration
+    :param logger: logger passed to the log
+    :return: ShapeLog
+    """
+    return ShapeLog(
+        path=config['storage']['log_path'],
+        fsync_policy=config['storage']['fsync_policy'],
+        fsync_interval_ms=int(config['storage']['fsync_interval_ms']),
+        logger=logger
+    )
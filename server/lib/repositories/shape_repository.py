@@ -0,0 +1,206 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..objects.logger import Logger
+from ..objects.shape_record import ShapeRecord
+
+class ShapeRepository(ABC):
+    """
+    Storage interface used by the ShapeServer. Shapes are partitioned by shape key, e.g. Triangles, and each shape_id is
+    the first letter of its shape key followed by its position in that partition, e.g. T-3
+
+    Repositories are shared by every thread of the server. Writes are serialized with _write_lock so that shape_ids are
+    allocated and persisted in order, while reads take no locks and never see a partially applied write
+    """
+
+    # Maps the shape_type accepted by CreateShape to the key its shapes are stored under
+    SHAPE_KEYS: Dict[str, str] = {
+        "Triangle": "Triangles",
+        "Rectangle": "Rectangles",
+        "Pentagon": "Pentagons"
+    }
+
+    # Maps each shape key to the shape_type of its shapes, and each shape_type in lower case to the supported
+    # shape_type. Databases written before shape types were validated hold lower case shape types, e.g. rectangle,
+    # which are read back as the supported shape_type
+    KEY_SHAPE_TYPES: Dict[str, str] = {shape_key: shape_type for shape_type, shape_key in SHAPE_KEYS.items()}
+    SHAPE_TYPES: Dict[str, str] = {shape_type.lower(): shape_type for shape_type in SHAPE_KEYS}
+
+    # Metrics that can be range queried
+    METRICS: Tuple[str, ...] = ("area", "perimeter")
+
+    # Whether reads and writes may block on I/O. The AsyncShapeServer moves blocking calls off the event loop
+    BLOCKING_READS: bool = True
+    BLOCKING_WRITES: bool = True
+
+    def __init__(self, logger: Logger):
+        self.logger: Logger = logger
+        self._write_lock: threading.RLock = threading.RLock()
+        self.id_prefixes: Dict[str, str] = {key[0]: key for key in self.SHAPE_KEYS.values()}
+
+    def get_shape_key(self, shape_id: str) -> Optional[str]:
+        """
+        Returns the shape key that the given shape_id belongs to
+
+        :param shape_id: shape_id to resolve
+        :return: shape key, or None if the shape_id does not match a supported shape type
+        """
+        return self.id_prefixes.get(shape_id[:1])
+
+    @abstractmethod
+    def get(self, shape_key: str, seq: int) -> Optional[ShapeRecord]:
+        """
+        Retrieves the shape at the given position of a shape key, e.g. Triangles and 3 for T-3. Positions are dense, so
+        repositories can look shapes up by index rather than by hashing the string shape_id
+
+        :param shape_key: shape key the shape belongs to
+        :param seq: position of the shape within the shape key
+        :return: ShapeRecord, or None if the shape does not exist
+        """
+
+    def get_many(self, keys: List[Tuple[str, int]]) -> List[Optional[ShapeRecord]]:
+        """
+        Retrieves the shapes at the given positions
+
+        :param keys: (shape key, seq) of each shape to lookup
+        :return: ShapeRecord, or None if the shape does not exist, for each key in order
+        """
+        return [self.get(shape_key, seq) for shape_key, seq in keys]
+
+    def insert(self, shape_type: str, coords: List[Tuple[int, int]]) -> ShapeRecord:
+        """
+        Stores a new shape, assigning it the next shape_id for its shape type
+
+        :param shape_type: supported shape_type, e.g. Triangle
+        :param coords: (x, y) vertices of the shape
+        :return: the stored ShapeRecord
+        """
+        return self.insert_many([(shape_type, coords)])[0]
+
+    @abstractmethod
+    def insert_many(self, shapes: List[Tuple[str, List[Tuple[int, int]]]]) -> List[ShapeRecord]:
+        """
+        Stores many new shapes with a single commit, assigning each the next shape_id for its shape type
+
+        :param shapes: (shape_type, coords) of each shape to store
+        :return: the stored ShapeRecords in order
+        """
+
+    @abstractmethod
+    def scan(self, shape_key: str) -> Iterator[ShapeRecord]:
+        """
+        Iterates over every shape stored under the given shape key in shape_id order
+
+        :param shape_key: shape key to scan, e.g. Triangles
+        :return: Iterator[ShapeRecord]
+        """
+
+    @abstractmethod
+    def range(self, metric: str, low: float = None, high: float = None) -> Iterator[ShapeRecord]:
+        """
+        Iterates over every shape whose metric is greater than low and less than or equal to high, in ascending order
+        of the metric. A bound of None leaves that side of the range open
+
+        :param metric: one of ShapeRepository.METRICS
+        :param low: exclusive lower bound
+        :param high: inclusive upper bound
+        :return: Iterator[ShapeRecord]
+        """
+
+    def intersecting(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Iterator[ShapeRecord]:
+        """
+        Iterates over the candidate shapes of a box query: every shape whose bounding box intersects the box, edges
+        included, possibly along with other shapes near the box. Callers check the geometry of each shape returned.
+        Implementations should override this with a spatial index rather than checking every shape
+
+        :param min_x: left edge of the box
+        :param min_y: bottom edge of the box
+        :param max_x: right edge of the box
+        :param max_y: top edge of the box
+        :return: Iterator of the candidate shapes
+        """
+        for shape_key in self.SHAPE_KEYS.values():
+            for record in self.scan(shape_key):
+                shape_min_x, shape_min_y, shape_max_x, shape_max_y = record.get_bounds()
+
+                if shape_min_x <= max_x and shape_max_x >= min_x and shape_min_y <= max_y and shape_max_y >= min_y:
+                    yield record
+
+    def count_intersecting(self, min_x: int, min_y: int, max_x: int, max_y: int) -> int:
+        """
+        Counts the shapes that intersecting would return for the same box, or an upper bound of it
+
+        :return: number of candidate shapes
+        """
+        return sum(1 for _ in self.intersecting(min_x, min_y, max_x, max_y))
+
+    def count(self, shape_key: str) -> int:
+        """
+        Counts the shapes stored under the given shape key. Implementations should override this with a method that
+        does not read every shape
+
+        :param shape_key: shape key to count, e.g. Triangles
+        :return: number of shapes
+        """
+        return sum(1 for _ in self.scan(shape_key))
+
+    def count_range(self, metric: str, low: float = None, high: float = None) -> int:
+        """
+        Counts the shapes that range would return for the same arguments. Implementations should override this with a
+        method that does not read every shape in range
+
+        :param metric: one of ShapeRepository.METRICS
+        :param low: exclusive lower bound
+        :param high: inclusive upper bound
+        :return: number of shapes
+        """
+        return sum(1 for _ in self.range(metric, low, high))
+
+    @classmethod
+    def get_shape_type(cls, shape_type: str, source: str) -> str:
+        """
+        Returns the supported shape_type of a stored shape_type, ignoring case
+
+        :param shape_type: shape_type as stored, e.g. rectangle
+        :param source: file the shape_type was read from, for the error message
+        :return: supported shape_type, e.g. Rectangle
+        """
+        supported: Optional[str] = cls.SHAPE_TYPES.get(shape_type.lower())
+
+        if supported is None:
+            raise ValueError(f"Unsupported shape_type {shape_type} in {source}")
+
+        return supported
+
+    def _new_records(self, shapes: List[Tuple[str, List[Tuple[int, int]]]]) -> List[ShapeRecord]:
+        """
+        Builds the records of new shapes with the next shape_ids of their shape keys, without storing them. The caller
+        holds _write_lock until the records are stored, so that no other insert is given the same shape_ids, and a
+        failed insert gives its shape_ids to the next one rather than leaving a gap
+
+        :param shapes: (shape_type, coords) of each shape
+        :return: ShapeRecords in order
+        """
+        counts: Dict[str, int] = {}
+        records: List[ShapeRecord] = []
+
+        for shape_type, coords in shapes:
+            shape_key: str = self.SHAPE_KEYS[shape_type]
+            seq: int = counts[shape_key] if shape_key in counts else self.count(shape_key)
+            counts[shape_key] = seq + 1
+
+            records.append(ShapeRecord(shape_id=f"{shape_key[0]}-{seq}", shape_type=shape_type, coords=coords))
+
+        return records
+
+    def close(self):
+        """
+        Release any resources held by the repository
+
+        :return: None
+        """
+
+    def _validate_metric(self, metric: str):
+        if metric not in self.METRICS:
+            raise ValueError(f"Invalid metric provided {metric}")
@@ -0,0 +1,84 @@
+import os
+import json
+from typing import Dict, List, Tuple
+
+from ..objects.shape_columns import ShapeColumns
+from ..objects.shape_snapshot import ShapeSnapshot
+from ..objects.coordinate_batch import CoordinateBatch
+from .shape_repository import ShapeRepository
+
+def convert_json_to_snapshot(json_path: str, snapshot_path: str) -> int:
+    """
+    Converts a JSON database file, as written by the JsonShapeRepository, to a binary ShapeSnapshot
+
+    :param json_path: JSON database file to read
+    :param snapshot_path: binary snapshot to write
+    :return: number of shapes converted
+    """
+    with open(json_path, 'r') as json_file:
+        data: dict = json.load(json_file)
+
+    columns: ShapeColumns = ShapeColumns()
+
+    for shape_key, shape_jsons in data.items():
+        # The shape key decides the shape_type, as older databases hold lower case shape types
+        if shape_key not in ShapeRepository.KEY_SHAPE_TYPES:
+            raise ValueError(f"Unsupported shape key {shape_key} in {json_path}")
+
+        shape_type: str = ShapeRepository.KEY_SHAPE_TYPES[shape_key]
+
+        shape_coords: List[List[Tuple[int, int]]] = [
+            [(int(c['x']), int(c['y'])) for c in shape_json['coords']] for shape_json in shape_jsons
+        ]
+
+        batch: CoordinateBatch = CoordinateBatch.from_coords(shape_coords)
+        areas: List[float] = batch.get_areas().tolist()
+        perimeters: List[float] = batch.get_perimeters().tolist()
+
+        for seq, (shape_json, coords, area, perimeter) in enumerate(zip(shape_jsons, shape_coords, areas, perimeters)):
+            if shape_json['shape_id'] != f"{shape_key[0]}-{seq}":
+                raise ValueError(f"Expected shape_id {shape_key[0]}-{seq} but got {shape_json['shape_id']}")
+
+            columns.append(shape_type, seq, coords, area, perimeter)
+
+    ShapeSnapshot.write(snapshot_path, [columns])
+
+    return len(columns)
+
+def convert_snapshot_to_json(snapshot_path: str, json_path: str) -> int:
+    """
+    Converts a binary ShapeSnapshot to a JSON database file that can be loaded by the JsonShapeRepository
+
+    :param snapshot_path: binary snapshot to read
+    :param json_path: JSON database file to write
+    :return: number of shapes converted
+    """
+    snapshot: ShapeSnapshot = ShapeSnapshot(snapshot_path)
+
+    try:
+        snapshot.rename_types({
+            shape_type: ShapeRepository.get_shape_type(shape_type, snapshot_path) for shape_type in snapshot.types
+        })
+
+        data: Dict[str, List[dict]] = {key: [] for key in ShapeRepository.SHAPE_KEYS.values()}
+
+        for shape_type, (first_row, count) in snapshot.type_rows.items():
+            shape_key: str = ShapeRepository.SHAPE_KEYS[shape_type]
+
+            for row in range(first_row, first_row + count):
+                data[shape_key].append({
+                    "shape_id": f"{shape_key[0]}-{snapshot.seqs[row]}",
+                    "shape_type": shape_type,
+                    "coords": [{"x": x, "y": y} for x, y in snapshot.get_coords(row)]
+                })
+    finally:
+        snapshot.close()
+
+    # Write to a temporary file first so that a crash mid-write cannot leave a truncated database behind
+    tmp_path: str = f"{json_path}.tmp"
+
+    with open(tmp_path, 'w') as json_file:
+        json.dump(data, json_file, indent=4)
+    os.replace(tmp_path, json_path)
+
+    return sum(len(shapes) for shapes in data.values())
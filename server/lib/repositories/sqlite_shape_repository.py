@@ -0,0 +1,305 @@
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..objects.logger import Logger
+from ..functions.geometry import get_bounds
+from ..objects.shape_record import ShapeRecord
+from .shape_repository import ShapeRepository
+
+class SqliteShapeRepository(ShapeRepository):
+    """
+    Shape repository backed by a SQLite database in WAL mode. The shape_id, area and perimeter columns are indexed so
+    lookups and range queries do not require the dataset to fit in memory, and the bounding box of every shape is kept
+    in an R*Tree table for box and point queries
+
+    Each thread uses its own connection so that readers do not block each other, and inserts are serialized with the
+    repository write lock so that shape_ids are allocated without conflicts
+    """
+
+    # Number of rows fetched per query when iterating. Iteration is paged on the indexed columns so that a generator
+    # can be resumed from any thread without holding a cursor open
+    PAGE_SIZE: int = 500
+
+    # Largest seq a SQLite INTEGER holds. Shape ids of any length are accepted, so larger seqs are simply not found
+    MAX_SEQ: int = 2 ** 63 - 1
+
+    def __init__(self, logger: Logger, sqlite_path: str):
+        super().__init__(logger)
+        self.sqlite_path: str = sqlite_path
+
+        self._local: threading.local = threading.local()
+
+        connection: sqlite3.Connection = self.__get_connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS shapes (
+                shape_id TEXT PRIMARY KEY,
+                shape_key TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                shape_type TEXT NOT NULL,
+                coords TEXT NOT NULL,
+                area REAL NOT NULL,
+                perimeter REAL NOT NULL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS shapes_shape_key_seq ON shapes (shape_key, seq);
+            CREATE INDEX IF NOT EXISTS shapes_area ON shapes (area, shape_id);
+            CREATE INDEX IF NOT EXISTS shapes_perimeter ON shapes (perimeter, shape_id);
+            CREATE VIRTUAL TABLE IF NOT EXISTS shape_bounds USING rtree(id, min_x, max_x, min_y, max_y);
+            """
+        )
+
+        self.__add_missing_bounds(connection)
+
+    def get(self, shape_key: str, seq: int) -> Optional[ShapeRecord]:
+        if seq > self.MAX_SEQ:
+            return None
+
+        row: tuple = self.__get_connection().execute(
+            "SELECT shape_id, shape_type, coords, area, perimeter FROM shapes WHERE shape_key = ? AND seq = ?",
+            (shape_key, seq)
+        ).fetchone()
+
+        return None if row is None else self.__get_record_from_row(row)
+
+    def get_many(self, keys: List[Tuple[str, int]]) -> List[Optional[ShapeRecord]]:
+        shape_ids: List[str] = [f"{shape_key[0]}-{seq}" for shape_key, seq in keys]
+        records: Dict[str, ShapeRecord] = {}
+        connection: sqlite3.Connection = self.__get_connection()
+
+        # Look the shapes up a page at a time to stay under SQLite's limit on query parameters
+        for start in range(0, len(shape_ids), self.PAGE_SIZE):
+            page: List[str] = shape_ids[start:start + self.PAGE_SIZE]
+            rows: List[tuple] = connection.execute(
+                f"SELECT shape_id, shape_type, coords, area, perimeter FROM shapes "
+                f"WHERE shape_id IN ({', '.join('?' * len(page))})",
+                page
+            ).fetchall()
+
+            records.update((row[0], self.__get_record_from_row(row)) for row in rows)
+
+        return [records.get(shape_id) for shape_id in shape_ids]
+
+    def insert_many(self, shapes: List[Tuple[str, List[Tuple[int, int]]]]) -> List[ShapeRecord]:
+        connection: sqlite3.Connection = self.__get_connection()
+        records: List[ShapeRecord] = []
+        rows: List[tuple] = []
+        bounds_rows: List[tuple] = []
+
+        with self._write_lock:
+            connection.execute("BEGIN IMMEDIATE")
+
+            try:
+                next_seqs: Dict[str, int] = {}
+
+                for shape_type, coords in shapes:
+                    shape_key: str = self.SHAPE_KEYS[shape_type]
+
+                    if shape_key not in next_seqs:
+                        next_seqs[shape_key] = connection.execute(
+                            "SELECT COALESCE(MAX(seq) + 1, 0) FROM shapes WHERE shape_key = ?",
+                            (shape_key,)
+                        ).fetchone()[0]
+
+                    seq: int = next_seqs[shape_key]
+                    next_seqs[shape_key] += 1
+
+                    record: ShapeRecord = ShapeRecord(
+                        shape_id=f"{shape_key[0]}-{seq}",
+                        shape_type=shape_type,
+                        coords=coords
+                    )
+                    records.append(record)
+                    rows.append((record.shape_id, shape_key, seq, record.shape_type, json.dumps(coords),
+                                 record.area, record.perimeter))
+
+                    min_x, min_y, max_x, max_y = get_bounds(coords)
+                    bounds_rows.append((min_x, max_x, min_y, max_y, record.shape_id))
+
+                connection.executemany(
+                    "INSERT INTO shapes (shape_id, shape_key, seq, shape_type, coords, area, perimeter) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                connection.executemany(
+                    "INSERT INTO shape_bounds (id, min_x, max_x, min_y, max_y) "
+                    "SELECT rowid, ?, ?, ?, ? FROM shapes WHERE shape_id = ?",
+                    bounds_rows
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                # Any error must end the transaction, or the write lock of the database stays held by this connection
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+
+        return records
+
+    def scan(self, shape_key: str) -> Iterator[ShapeRecord]:
+        last_seq: int = -1
+
+        while True:
+            rows: List[tuple] = self.__get_connection().execute(
+                "SELECT shape_id, shape_type, coords, area, perimeter, seq FROM shapes "
+                "WHERE shape_key = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (shape_key, last_seq, self.PAGE_SIZE)
+            ).fetchall()
+
+            for row in rows:
+                yield self.__get_record_from_row(row)
+
+            if len(rows) < self.PAGE_SIZE:
+                return
+
+            last_seq = rows[-1][5]
+
+    def range(self, metric: str, low: float = None, high: float = None) -> Iterator[ShapeRecord]:
+        self._validate_metric(metric)
+
+        conditions, bounds = self.__get_range_conditions(metric, low, high)
+        last_position: tuple = None
+
+        while True:
+            page_conditions: List[str] = list(conditions)
+            parameters: list = list(bounds)
+
+            # Continue from the last row of the previous page
+            if last_position is not None:
+                page_conditions.append(f"({metric}, shape_id) > (?, ?)")
+                parameters.extend(last_position)
+
+            where: str = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+            rows: List[tuple] = self.__get_connection().execute(
+                f"SELECT shape_id, shape_type, coords, area, perimeter FROM shapes {where} "
+                f"ORDER BY {metric}, shape_id LIMIT ?",
+                (*parameters, self.PAGE_SIZE)
+            ).fetchall()
+
+            for row in rows:
+                yield self.__get_record_from_row(row)
+
+            if len(rows) < self.PAGE_SIZE:
+                return
+
+            last_record: ShapeRecord = self.__get_record_from_row(rows[-1])
+            last_position = (getattr(last_record, metric), last_record.shape_id)
+
+    def intersecting(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Iterator[ShapeRecord]:
+        last_id: int = 0
+
+        while True:
+            rows: List[tuple] = self.__get_connection().execute(
+                "SELECT shapes.shape_id, shapes.shape_type, shapes.coords, shapes.area, shapes.perimeter, "
+                "shape_bounds.id FROM shape_bounds JOIN shapes ON shapes.rowid = shape_bounds.id "
+                "WHERE shape_bounds.min_x <= ? AND shape_bounds.max_x >= ? AND shape_bounds.min_y <= ? "
+                "AND shape_bounds.max_y >= ? AND shape_bounds.id > ? ORDER BY shape_bounds.id LIMIT ?",
+                (max_x, min_x, max_y, min_y, last_id, self.PAGE_SIZE)
+            ).fetchall()
+
+            for row in rows:
+                yield self.__get_record_from_row(row)
+
+            if len(rows) < self.PAGE_SIZE:
+                return
+
+            last_id = rows[-1][5]
+
+    def count_intersecting(self, min_x: int, min_y: int, max_x: int, max_y: int) -> int:
+        return self.__get_connection().execute(
+            "SELECT COUNT(*) FROM shape_bounds WHERE min_x <= ? AND max_x >= ? AND min_y <= ? AND max_y >= ?",
+            (max_x, min_x, max_y, min_y)
+        ).fetchone()[0]
+
+    def count(self, shape_key: str) -> int:
+        return self.__get_connection().execute(
+            "SELECT COUNT(*) FROM shapes WHERE shape_key = ?",
+            (shape_key,)
+        ).fetchone()[0]
+
+    def count_range(self, metric: str, low: float = None, high: float = None) -> int:
+        self._validate_metric(metric)
+
+        conditions, bounds = self.__get_range_conditions(metric, low, high)
+        where: str = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        return self.__get_connection().execute(f"SELECT COUNT(*) FROM shapes {where}", bounds).fetchone()[0]
+
+    def close(self):
+        connection: sqlite3.Connection = getattr(self._local, 'connection', None)
+
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def __add_missing_bounds(self, connection: sqlite3.Connection):
+        """
+        Adds the bounding boxes of shapes stored before the shape_bounds table existed, computing them from the coords
+        JSON inside SQLite
+
+        :param connection: connection to write with
+        :return: None
+        """
+        with self._write_lock:
+            missing: int = connection.execute(
+                "SELECT (SELECT COUNT(*) FROM shapes) - (SELECT COUNT(*) FROM shape_bounds)"
+            ).fetchone()[0]
+
+            if missing <= 0:
+                return
+
+            connection.execute(
+                "INSERT INTO shape_bounds (id, min_x, max_x, min_y, max_y) "
+                "SELECT shapes.rowid, "
+                "MIN(json_extract(coord.value, '$[0]')), MAX(json_extract(coord.value, '$[0]')), "
+                "MIN(json_extract(coord.value, '$[1]')), MAX(json_extract(coord.value, '$[1]')) "
+                "FROM shapes, json_each(shapes.coords) AS coord "
+                "WHERE shapes.rowid NOT IN (SELECT id FROM shape_bounds) GROUP BY shapes.rowid"
+            )
+            self.logger.info(f"Added the bounding boxes of {missing} shapes to {self.sqlite_path}")
+
+    @staticmethod
+    def __get_range_conditions(metric: str, low: Optional[float], high: Optional[float]) -> Tuple[List[str], List[float]]:
+        """
+        Builds the WHERE conditions and parameters that select the rows of a range query
+
+        :return: (conditions, parameters)
+        """
+        conditions: List[str] = []
+        bounds: List[float] = []
+
+        if low is not None:
+            conditions.append(f"{metric} > ?")
+            bounds.append(low)
+
+        if high is not None:
+            conditions.append(f"{metric} <= ?")
+            bounds.append(high)
+
+        return conditions, bounds
+
+    def __get_connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection for the current thread, opening one if needed
+
+        :return: sqlite3.Connection
+        """
+        connection: sqlite3.Connection = getattr(self._local, 'connection', None)
+
+        if connection is None:
+            connection = sqlite3.connect(self.sqlite_path, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+
+        return connection
+
+    @staticmethod
+    def __get_record_from_row(row: tuple) -> ShapeRecord:
+        return ShapeRecord(
+            shape_id=row[0],
+            shape_type=row[1],
+            coords=[(x, y) for x, y in json.loads(row[2])],
+            area=row[3],
+            perimeter=row[4]
+        )
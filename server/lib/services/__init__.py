@@ -1,2 +1,3 @@
 from .shape_service import *
+from .async_shape_service import *
 from .health_check_service import *
@@ -0,0 +1,680 @@
+import time
+import asyncio
+import contextvars
+from itertools import islice
+from contextlib import aclosing
+from functools import partial
+from concurrent import futures
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from ..objects.logger import Logger
+from ..objects.call_metrics import CallMetrics
+import shape_service_pb2 as ShapeService
+from .shape_service import ShapeServer
+from ..objects.shape_record import ShapeRecord
+from ..functions.resume_token import encode_resume_token
+from ..functions.correlation_id_context import set_correlation_id
+from ..functions.shape_format_context import set_shape_format
+
+T = TypeVar('T')
+
+class AsyncShapeServer(ShapeServer):
+    """
+    Async Shape Server - native asyncio implementation of the ShapeServer. Every method is a coroutine or async
+    generator so an in-flight RPC does not hold a thread while it waits on the client. Repository calls that may block
+    on I/O are run on a dedicated storage executor instead of the event loop
+    """
+
+    # Number of items pulled from a blocking iterator per trip to the storage executor
+    STREAM_CHUNK_SIZE: int = 100
+
+    def __init__(self, logger: Logger, config: dict, call_metrics: Optional[CallMetrics] = None):
+        super().__init__(logger, config, call_metrics)
+
+        self.storage_executor: futures.ThreadPoolExecutor = futures.ThreadPoolExecutor(
+            max_workers=int(self.config['general']['storage_threads']),
+            thread_name_prefix="storage"
+        )
+
+    async def CreateShape(self, request: ShapeService.ShapeType, context) -> ShapeService.CreateShapeResponse:
+        """
+        Create the shape specified by the user, giving it an id and coordinates
+
+        :param request: The type of shape to create
+        :param context: context to support error codes
+        :return: CreateShapeResponse - pre-defined proto response to this method containing a status code, message
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"CreateShape called with request: {request}")
+
+            return await self._run(self.repository.BLOCKING_WRITES, self._create_shape, request)
+
+    async def GetShape(self, request: ShapeService.ShapeId, context) -> ShapeService.GetShapeResponse:
+        """
+        Retrieves the requested shape from the database using the shape_id and returns it to the user if present
+
+        :param request: gRPC Request containing the id to lookup
+        :param context:
+        :return: GetShapeResponse - pre-defined proto response to this method containing a status code, message, and shape
+                 if a shape was found
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"GetShape called with request: {request}")
+
+            # Cache hits are served straight from the event loop
+            response: ShapeService.GetShapeResponse = self._get_cached_shape(request)
+
+            if response is not None:
+                return response
+
+            return await self._run(self.repository.BLOCKING_READS, self._load_shape, request)
+
+    async def GetPerimetersGreaterThan(self, request: ShapeService.MinPerimeter, context) -> AsyncIterator[ShapeService.GetPerimetersGreaterThanResponse]:
+        """
+        Retrieves all the shapes with a perimeter greater than the specified value and returns them to the user in
+        ascending order of perimeter, up to the optional limit
+
+        :param request: minimum perimeter value and optional limit
+        :param context:
+        :return: async iterator of all the shapes with a perimeter greater than the provided value
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"GetPerimetersGreaterThan called with {request}")
+
+            async for response in self._iterate(self._get_perimeter_responses(request)):
+                yield response
+
+                if self.stream_delay > 0:
+                    await asyncio.sleep(self.stream_delay)
+
+    async def GetTotalArea(self, request: AsyncIterator[ShapeService.ShapeId], context) -> ShapeService.GetTotalAreaResponse:
+        """
+        Given a stream of shape_id, calculate and add up all the areas of all the existing shapes provided, and note
+        which of the shape_ids requested do not exist
+
+        :param request: stream of shape_ids to sum the areas of
+        :param context:
+        :return: ShapeService.GetTotalAreaResponse - the total area of all the existing shape_ids provided
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"GetTotalArea called with a ShapeService.ShapeId iterator")
+
+            total_area: float = 0.0
+            invalid_ids: List[ShapeService.ShapeId] = []
+            valid_ids: List[ShapeService.ShapeId] = []
+
+            async for shape_id in request:
+                record: ShapeRecord = await self._run(self.repository.BLOCKING_READS, self._find_shape, shape_id)
+
+                if record is not None:
+                    total_area += record.area
+                    valid_ids.append(shape_id)
+
+                    self.logger.info(f"{record.shape_id}: A={record.area} square units")
+                else:
+                    invalid_ids.append(shape_id)
+
+                self.logger.info(f"Total area at {total_area} square units")
+
+            return self._get_total_area_response(total_area, valid_ids, invalid_ids)
+
+    async def GetAreas(self, request: AsyncIterator[ShapeService.ShapeId], context) -> AsyncIterator[ShapeService.GetAreasResponse]:
+        """
+        Given a stream of shape_ids, return a stream of the corresponding shape and it's area
+
+        :param request: stream of shape_ids
+        :param context:
+        :return: AsyncIterator[ShapeService.GetAreasResponse]
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info('GetAreas called with ShapeService.ShapeId iterator')
+
+            # Close the responses as soon as the call ends, so that a pipelined lookup is stopped then rather than
+            # when the generator is collected
+            async with aclosing(self.__get_area_responses(request)) as responses:
+                async for response in responses:
+                    yield response
+
+                    if self.stream_delay > 0:
+                        await asyncio.sleep(self.stream_delay)
+
+    async def BatchGetShapes(self, request: ShapeService.BatchGetShapesRequest, context) -> ShapeService.BatchGetShapesResponse:
+        """
+        Retrieves many shapes in a single call
+
+        :param request: shape_ids to lookup
+        :param context:
+        :return: BatchGetShapesResponse - a GetShapeResponse for each requested shape_id in order
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"BatchGetShapes called with {len(request.shape_ids)} shape_ids")
+
+            return await self._run(self.repository.BLOCKING_READS, self._batch_get_shapes, request)
+
+    async def BatchCreateShapes(self, request: ShapeService.BatchCreateShapesRequest, context) -> ShapeService.BatchCreateShapesResponse:
+        """
+        Creates many shapes in a single call, storing all of them with a single commit
+
+        :param request: shape_types to create
+        :param context:
+        :return: BatchCreateShapesResponse - a CreateShapeResponse for each requested shape_type in order
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"BatchCreateShapes called with {len(request.shape_types)} shape_types")
+
+            return await self._run(self.repository.BLOCKING_WRITES, self._batch_create_shapes, request)
+
+    async def IngestShapes(self, request: AsyncIterator[ShapeService.ShapeType], context) -> ShapeService.IngestSummary:
+        """
+        Bulk loads a stream of shapes. Incoming shapes are buffered and committed to storage in groups, either once
+        ingest_group_size shapes are buffered or once the oldest buffered shape has waited ingest_group_window_ms, even
+        if the client has not sent anything since
+
+        :param request: stream of shape_types to create
+        :param context:
+        :return: IngestSummary - counts, throughput and the items that failed
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info("IngestShapes called with a ShapeService.ShapeType iterator")
+
+            summary: ShapeService.IngestSummary = ShapeService.IngestSummary(status_code=ShapeService.Code.OK)
+            started: float = time.perf_counter()
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+            # The request stream is read by a separate task so that a group can be committed when its window expires
+            # while waiting on the client. The bounded queue stops reading from the client while a commit is running
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.ingest_group_size)
+            reader: asyncio.Task = asyncio.create_task(self.__read_into_queue(request, queue))
+
+            group: List[Tuple[int, ShapeService.ShapeType]] = []
+            group_deadline: float = 0.0
+
+            try:
+                while True:
+                    timeout: float = None if len(group) == 0 else max(0.0, group_deadline - loop.time())
+
+                    try:
+                        # Buffered items are taken without wait_for, which loses a cancellation of the call that
+                        # arrives once the item it waits for is ready
+                        if queue.empty():
+                            shape_type: ShapeService.ShapeType = await asyncio.wait_for(queue.get(), timeout)
+                        else:
+                            shape_type: ShapeService.ShapeType = queue.get_nowait()
+                    except asyncio.TimeoutError:
+                        await self._run(self.repository.BLOCKING_WRITES, self._commit_ingest_group, group, summary)
+                        group = []
+                        continue
+
+                    # End of the request stream
+                    if shape_type is None:
+                        break
+
+                    if len(group) == 0:
+                        group_deadline = loop.time() + self.ingest_group_window
+
+                    group.append((summary.received, shape_type))
+                    summary.received += 1
+
+                    if len(group) >= self.ingest_group_size:
+                        await self._run(self.repository.BLOCKING_WRITES, self._commit_ingest_group, group, summary)
+                        group = []
+
+                if len(group) > 0:
+                    await self._run(self.repository.BLOCKING_WRITES, self._commit_ingest_group, group, summary)
+
+                # Raise any error hit while reading the request stream
+                await reader
+            finally:
+                # Stop reading the request stream if the call ended early, e.g. it was cancelled by the client
+                if not reader.done():
+                    reader.cancel()
+                    await asyncio.gather(reader, return_exceptions=True)
+
+            return self._finish_ingest_summary(summary, started)
+
+    async def QueryShapes(self, request: ShapeService.ShapeQuery, context) -> AsyncIterator[ShapeService.QueryShapesResponse]:
+        """
+        Retrieves all the shapes matching every filter set in the query and returns them to the user as they are found
+
+        :param request: optional shape_type, area and perimeter ranges, bounding box, limit and offset
+        :param context:
+        :return: async iterator of all the shapes matching the query
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"QueryShapes called with {request}")
+
+            async for response in self._iterate(self._get_query_responses(request)):
+                yield response
+
+                if self.stream_delay > 0:
+                    await asyncio.sleep(self.stream_delay)
+
+    async def GetShapesIntersecting(self, request: ShapeService.BoundingBox, context) -> AsyncIterator[ShapeService.GetShapesIntersectingResponse]:
+        """
+        Retrieves all the shapes that share at least one point with the box and returns them to the user as they are
+        found
+
+        :param request: box to intersect with
+        :param context:
+        :return: async iterator of all the shapes intersecting the box
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"GetShapesIntersecting called with {request}")
+
+            async for response in self._iterate(self._get_intersecting_responses(request), self.__spatial_reads_block()):
+                yield response
+
+                if self.stream_delay > 0:
+                    await asyncio.sleep(self.stream_delay)
+
+    async def GetShapesContaining(self, request: ShapeService.ShapeCoord, context) -> AsyncIterator[ShapeService.GetShapesContainingResponse]:
+        """
+        Retrieves all the shapes that contain the point and returns them to the user as they are found
+
+        :param request: x and y of the point
+        :param context:
+        :return: async iterator of all the shapes containing the point
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"GetShapesContaining called with {request}")
+
+            async for response in self._iterate(self._get_containing_responses(request), self.__spatial_reads_block()):
+                yield response
+
+                if self.stream_delay > 0:
+                    await asyncio.sleep(self.stream_delay)
+
+    async def GetPerimetersGreaterThanBatched(self, request: ShapeService.MinPerimeter, context) -> AsyncIterator[ShapeService.GetPerimetersGreaterThanBatch]:
+        """
+        Batched GetPerimetersGreaterThan, each streamed message carries up to batch_size of its responses
+
+        :param request: minimum perimeter value, optional limit, page_size, resume_token and batch_size, and omit_message
+        :param context:
+        :return: stream of batches of the shapes with a perimeter greater than the provided value
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"GetPerimetersGreaterThanBatched called with {request}")
+
+            async for batch in self._iterate(self._get_perimeter_batches(request)):
+                yield batch
+
+                if self.stream_delay > 0:
+                    await asyncio.sleep(self.stream_delay)
+
+    async def GetAreasBatched(self, request: AsyncIterator[ShapeService.ShapeId], context) -> AsyncIterator[ShapeService.GetAreasBatch]:
+        """
+        Batched GetAreas, each streamed message carries up to batch_size of its responses. A batch is sent once it is
+        full or the request stream ends, so the client must not wait for a batch before sending the rest of its
+        shape_ids
+
+        :param request: stream of shape_ids, the first one optionally setting the batch_size and omit_message
+        :param context:
+        :return: AsyncIterator[ShapeService.GetAreasBatch]
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info('GetAreasBatched called with ShapeService.ShapeId iterator')
+
+            shape_ids: AsyncIterator[ShapeService.ShapeId] = aiter(request)
+            first_id: Optional[ShapeService.ShapeId] = await anext(shape_ids, None)
+
+            if first_id is None:
+                return
+
+            try:
+                batch_size: int = self._get_stream_batch_size(first_id)
+            except ValueError as e:
+                yield ShapeService.GetAreasBatch(status_code=e.args[0], message=e.args[1])
+
+                # Read the rest of the stream so that the client can finish sending normally
+                async for _ in shape_ids:
+                    pass
+
+                return
+
+            batch: ShapeService.GetAreasBatch = ShapeService.GetAreasBatch(status_code=ShapeService.Code.OK)
+
+            async with aclosing(self.__get_area_responses(self.__prepend(first_id, shape_ids))) as responses:
+                async for response in responses:
+                    batch.results.append(response)
+
+                    if len(batch.results) >= batch_size:
+                        yield batch
+                        batch = ShapeService.GetAreasBatch(status_code=ShapeService.Code.OK)
+
+                        if self.stream_delay > 0:
+                            await asyncio.sleep(self.stream_delay)
+
+            if len(batch.results) > 0:
+                yield batch
+
+    async def GetMetrics(self, request: ShapeService.GetMetricsRequest, context) -> ShapeService.GetMetricsResponse:
+        """
+        Returns the metrics of the calls served by this server process, along with the counters of its caches
+
+        :param request: whether to also render the metrics in the Prometheus text format
+        :param context:
+        :return: GetMetricsResponse - per-method call counts, status codes, latency histograms and message sizes
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']):
+            self.logger.info(f"GetMetrics called with request: {request}")
+
+            # Merging the metrics only takes the locks of the caches briefly, so it is served from the event loop
+            return self._get_metrics(request)
+
+    async def _run(self, blocking: bool, function: Callable[..., T], *args) -> T:
+        """
+        Calls the given function, on the storage executor if it may block and inline otherwise. The current context is
+        copied to the executor thread so that logs keep the correlation_id of the call
+
+        :param blocking: whether the function may block on I/O
+        :param function: function to call
+        :param args: arguments to call the function with
+        :return: the result of the function
+        """
+        if not blocking:
+            return function(*args)
+
+        context: contextvars.Context = contextvars.copy_context()
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.storage_executor,
+            partial(context.run, function, *args)
+        )
+
+    async def _iterate(self, iterator: Iterator[T], blocking: bool = None) -> AsyncIterator[T]:
+        """
+        Iterates over a synchronous iterator backed by the repository. When repository reads may block, items are
+        pulled in chunks on the storage executor
+
+        :param iterator: iterator to consume
+        :param blocking: whether the iterator may block, defaults to whether repository reads may block
+        :return: AsyncIterator
+        """
+        if not (self.repository.BLOCKING_READS if blocking is None else blocking):
+            for item in iterator:
+                yield item
+
+            return
+
+        while True:
+            chunk: List[T] = await self._run(True, lambda: list(islice(iterator, self.STREAM_CHUNK_SIZE)))
+
+            for item in chunk:
+                yield item
+
+            if len(chunk) < self.STREAM_CHUNK_SIZE:
+                return
+
+    async def __get_area_responses(self, request: AsyncIterator[ShapeService.ShapeId]) -> AsyncIterator[ShapeService.GetAreasResponse]:
+        """
+        Answers each shape_id of a GetAreas request stream, without any delay between them. The first shape_id carries
+        the page_size, resume_token, omit_message, window and unordered of the stream. Once the stream is answered, i.e.
+        after page_size shape_ids or an invalid first shape_id, the rest of it is read without answering it so that the
+        client can finish sending normally
+
+        With a window the shape_ids are looked up concurrently. Without one, or when repository reads do not block and
+        so are run on the event loop where they cannot overlap, they are looked up one at a time and in order
+
+        :param request: stream of shape_ids
+        :return: AsyncIterator[ShapeService.GetAreasResponse]
+        """
+        shape_ids: AsyncIterator[ShapeService.ShapeId] = aiter(request)
+        first_id: Optional[ShapeService.ShapeId] = await anext(shape_ids, None)
+
+        if first_id is None:
+            return
+
+        try:
+            page_size, position = self._get_areas_page(first_id)
+            window: Optional[int] = self._get_pipeline_window(first_id)
+        except ValueError as e:
+            yield ShapeService.GetAreasResponse(status_code=e.args[0], message=e.args[1])
+
+            async for _ in shape_ids:
+                pass
+
+            return
+
+        if window is not None and self.repository.BLOCKING_READS:
+            async with aclosing(self.__get_pipelined_area_responses(
+                first_id, shape_ids, page_size, position, window
+            )) as responses:
+                async for response in responses:
+                    yield response
+
+            return
+
+        answered: int = 0
+
+        async for shape_id in self.__prepend(first_id, shape_ids):
+            if page_size is not None and answered >= page_size:
+                continue
+
+            answered += 1
+            position += 1
+            yield await self._run(
+                self.repository.BLOCKING_READS, self._get_area_response, shape_id, position, first_id.omit_message
+            )
+
+    async def __get_pipelined_area_responses(self, first_id: ShapeService.ShapeId, shape_ids: AsyncIterator[ShapeService.ShapeId],
+                                             page_size: Optional[int], position: int,
+                                             window: int) -> AsyncIterator[ShapeService.GetAreasResponse]:
+        """
+        Answers a GetAreas request stream with up to window shape_ids looked up concurrently on the storage executor.
+        A separate task reads the request stream and starts a lookup for each shape_id, and each lookup holds one of
+        window slots from when it is started until its result has been sent. So the server stops reading from a client
+        that sends faster than its shape_ids are answered, and stops looking them up while the client is not reading
+        the results
+
+        Results are returned in request order, or as soon as they are ready for an unordered stream. The sequence of
+        each result is the position of its shape_id. The resume_token of an unordered result is the position up to
+        which every shape_id has been answered, so resuming from it may answer some shape_ids again
+
+        :param first_id: first shape_id of the stream, already read from it
+        :param shape_ids: rest of the stream
+        :param page_size: maximum number of shape_ids to answer, None for no maximum
+        :param position: position of the first shape_id minus 1
+        :param window: maximum number of shape_ids looked up or waiting to be sent at a time
+        :return: AsyncIterator[ShapeService.GetAreasResponse]
+        """
+        slots: asyncio.Semaphore = asyncio.Semaphore(window)
+
+        # Lookups that were started and whose results have not been sent, and the queue they are passed to the sender
+        # in, either as they are started for an ordered stream or as they finish for an unordered one. None marks the
+        # end of the request stream
+        lookups: Set[asyncio.Task] = set()
+        finished: asyncio.Queue = asyncio.Queue()
+
+        reader: asyncio.Task = asyncio.create_task(self.__start_area_lookups(
+            self.__prepend(first_id, shape_ids), page_size, position, first_id, slots, lookups, finished
+        ))
+
+        # Positions answered out of order, and the position up to which every shape_id has been answered
+        answered_positions: Set[int] = set()
+        answered_up_to: int = position
+        reading: bool = True
+
+        try:
+            while reading or len(lookups) > 0:
+                lookup: Optional[asyncio.Task] = await finished.get()
+
+                if lookup is None:
+                    reading = False
+                    continue
+
+                lookups.discard(lookup)
+                response: ShapeService.GetAreasResponse = await lookup
+
+                if first_id.unordered:
+                    answered_positions.add(response.sequence)
+
+                    while answered_up_to + 1 in answered_positions:
+                        answered_positions.remove(answered_up_to + 1)
+                        answered_up_to += 1
+
+                    response.resume_token = encode_resume_token("GetAreas", {"position": answered_up_to})
+
+                yield response
+                slots.release()
+
+            # Raise any error hit while reading the request stream
+            await reader
+        finally:
+            # Stop reading and looking up if the call ended early, e.g. it was cancelled by the client, and wait for the
+            # tasks to end so that none is left pending with an exception that is never retrieved
+            tasks: List[asyncio.Task] = [reader, *lookups]
+
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __start_area_lookups(self, shape_ids: AsyncIterator[ShapeService.ShapeId], page_size: Optional[int],
+                                   position: int, first_id: ShapeService.ShapeId, slots: asyncio.Semaphore,
+                                   lookups: Set[asyncio.Task], finished: asyncio.Queue):
+        """
+        Reads a pipelined GetAreas request stream, starting a lookup for each shape_id once a slot is free
+
+        :param shape_ids: request stream
+        :param page_size: maximum number of shape_ids to look up, None for no maximum
+        :param position: position of the first shape_id minus 1
+        :param first_id: first shape_id of the stream, carrying its omit_message and unordered
+        :param slots: slots of the window, released by the sender once a result is sent
+        :param lookups: set of the lookups that were started and whose results have not been sent
+        :param finished: queue the lookups are passed to the sender in, followed by None once the stream ends
+        :return: None
+        """
+        started: int = 0
+
+        try:
+            async for shape_id in shape_ids:
+                if page_size is not None and started >= page_size:
+                    continue
+
+                await slots.acquire()
+                started += 1
+                position += 1
+
+                lookup: asyncio.Task = asyncio.create_task(self._run(
+                    True, self._get_area_response, shape_id, position, first_id.omit_message
+                ))
+                lookups.add(lookup)
+
+                if first_id.unordered:
+                    lookup.add_done_callback(finished.put_nowait)
+                else:
+                    finished.put_nowait(lookup)
+        finally:
+            finished.put_nowait(None)
+
+    @staticmethod
+    async def __prepend(item: T, iterator: AsyncIterator[T]) -> AsyncIterator[T]:
+        """
+        Iterates over an item followed by the rest of a stream, e.g. the first item of a stream that was read ahead
+
+        :param item: item to yield first
+        :param iterator: stream to continue with
+        :return: AsyncIterator
+        """
+        yield item
+
+        async for item in iterator:
+            yield item
+
+    @staticmethod
+    async def __read_into_queue(request: AsyncIterator[T], queue: asyncio.Queue):
+        """
+        Reads every item of a request stream into the queue, followed by None once the stream ends
+
+        :param request: request stream to read
+        :param queue: queue to fill
+        :return: None
+        """
+        try:
+            async for item in request:
+                await queue.put(item)
+        except Exception:
+            # A cancelled reader is not caught here, as the queue is no longer read and waiting for room could hang
+            await queue.put(None)
+            raise
+
+        await queue.put(None)
+
+    def __spatial_reads_block(self) -> bool:
+        """
+        Whether the spatial queries may block, either on repository reads or on the geometry pool, in which case they
+        must not run on the event loop
+
+        :return: bool
+        """
+        return self.repository.BLOCKING_READS or self.geometry_pool.enabled
@@ -1,36 +1,92 @@
-import os
-import json
-import time
 import math
+import time
 import random
-from typing import Iterator, List
+import threading
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from ..objects.logger import Logger
 import shape_service_pb2 as ShapeService
+from ..objects.shape_record import ShapeRecord
+from ..functions.geometry import contains_point, intersects_box
+from ..functions.resume_token import decode_resume_token, encode_resume_token
+from ..functions.shape_id_codec import SHAPE_ID_PREFIXES, decode_shape_id, format_shape_id, parse_shape_id
+from ..objects.context_vars import shape_format
+from ..objects.response_cache import ResponseCache
+from ..objects.geometry_pool import GeometryPool
+from ..objects.call_metrics import LATENCY_BOUNDS, CallMetrics, MethodMetrics, format_prometheus
 import shape_service_pb2_grpc as ShapeServiceGrpc
 from ..functions.correlation_id_context import set_correlation_id
+from ..functions.shape_format_context import SHAPE_FORMATS, set_shape_format
+from ..objects.shape_filter import ShapeFilter
+from ..repositories.query_planner import QueryPlanner
+from ..repositories.shape_repository import ShapeRepository
+from ..repositories.repository_factory import get_shape_repository
 
 class ShapeServer(ShapeServiceGrpc.ShapeService):
     """
     Shape Server - gRPC server serving all the methods defined in proto/shape_service.proto
+
+    Each method only extracts the correlation_id and paces streamed responses, the work itself is done by the
+    protected helpers below so that it can be shared with the AsyncShapeServer
     """
 
-    def __init__(self, logger: Logger, config: dict):
+    def __init__(self, logger: Logger, config: dict, call_metrics: Optional[CallMetrics] = None):
         self.logger: Logger = logger
         self.config: dict = config
-        self.db_path: str = self.config['general']['json_path']
         self.max_height: int = int(self.config['shape']['max_height'])
         self.max_width: int = int(self.config['shape']['max_width'])
 
-        # If database .json exists use that file, otherwise create a new one
-        if os.path.exists(self.db_path):
-            try:
-                with open(self.db_path, 'r') as json_file:
-                    self.data = json.load(json_file)
-            except IOError as e:
-                logger.error(f"Could not load json file: {e}")
-        else:
-            self.data = {"Triangles": [], "Rectangles": [], "Pentagons":[]}
+        # Optional delay in seconds between streamed responses to visually see that the results are returned to the
+        # user as they become available, 0 disables the delay
+        self.stream_delay: float = float(self.config['general']['stream_delay'])
+
+        # Maximum number of items accepted by a single batch call
+        self.max_batch_size: int = int(self.config['general']['max_batch_size'])
+
+        # Maximum number of results per message of a batched stream, also used when the client does not set a size
+        self.max_stream_batch_size: int = int(self.config['general']['max_stream_batch_size'])
+
+        # Maximum number of shape_ids of a GetAreas stream that are looked up concurrently
+        self.max_pipeline_window: int = int(self.config['general']['max_pipeline_window'])
+
+        # IngestShapes commits buffered shapes once either limit is reached
+        self.ingest_group_size: int = int(self.config['general']['ingest_group_size'])
+        self.ingest_group_window: float = int(self.config['general']['ingest_group_window_ms']) / 1000
+
+        self.repository: ShapeRepository = get_shape_repository(config, logger)
+        self.query_planner: QueryPlanner = QueryPlanner(self.repository, logger)
+
+        # Shape key of each ShapeKind, None if the repository does not support it, so that numeric shape_ids resolve
+        # without any string handling
+        self.kind_keys: Dict[int, Optional[str]] = {
+            kind: self.repository.get_shape_key(prefix) for kind, prefix in SHAPE_ID_PREFIXES.items()
+        }
+
+        # Successful GetShape responses are cached by shape format and shape_id, every mutation goes through
+        # _store_shapes which invalidates the shape_ids it writes
+        self.response_cache: ResponseCache = ResponseCache(
+            max_entries=int(self.config['cache']['max_entries']),
+            max_bytes=int(self.config['cache']['max_bytes'])
+        )
+        self.cache_stats_interval: float = float(self.config['cache']['stats_interval'])
+
+        # Geometry checks of large candidate sets run on a process pool so that they do not hold the GIL of the server
+        self.geometry_pool: GeometryPool = GeometryPool(
+            processes=int(self.config['compute']['processes']),
+            batch_size=int(self.config['compute']['batch_size']),
+            min_batch_size=int(self.config['compute']['min_batch_size'])
+        )
+
+        # Metrics of the calls served, recorded by the MetricsInterceptor of the server, and the counters reported
+        # next to them by GetMetrics, keyed by the name of their group
+        self.call_metrics: CallMetrics = call_metrics if call_metrics is not None else CallMetrics()
+        self.metric_counters: Dict[str, Callable[[], dict]] = {"response_cache": self.response_cache.get_stats}
+
+        # Use a daemon thread to periodically log the cache counters so that the cache can be sized
+        if self.response_cache.enabled and self.cache_stats_interval > 0:
+            stats_thread = threading.Thread(target=self.__log_cache_stats_periodically, daemon=True)
+            stats_thread.start()
 
     def CreateShape(self, request: ShapeService.ShapeType, context) -> ShapeService.CreateShapeResponse:
         """
@@ -45,69 +101,10 @@ class ShapeServer(ShapeServiceGrpc.ShapeService):
         # the correlation_id of the call
         metadata = {key: value for key, value in context.invocation_metadata()}
 
-        with set_correlation_id(metadata['x-correlation-id']):
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
             self.logger.info(f"CreateShape called with request: {request}")
 
-            response: ShapeService.CreateShapeResponse = ShapeService.CreateShapeResponse(
-                status_code=ShapeService.Code.OK,
-                message=""
-            )
-
-            if request.shape_type == "Triangle":
-                self.logger.info("Generating Triangle...")
-
-                # Generate Triangle
-                shape: ShapeService.Shape = self.__get_triangle()
-                shape_json: dict = self.__get_json_from_shape(shape)
-                self.data["Triangles"].extend([shape_json])
-
-                self.logger.info(f"Triangle: {shape}")
-
-                response.status_code = ShapeService.Code.OK
-                response.message = f"Successfully Created Triangle: {shape_json}"
-                response.shape.CopyFrom(shape)
-
-            elif request.shape_type == "Rectangle":
-                self.logger.info("Generating Rectangle...")
-
-                # Generate Rectangle
-                shape: ShapeService.Shape = self.__get_rectangle()
-                shape_json: dict = self.__get_json_from_shape(shape)
-                self.data["Rectangles"].extend([shape_json])
-
-                self.logger.info(f"Rectangle: {shape}")
-
-                response.status_code = ShapeService.Code.OK
-                response.message = f"Successfully Created Rectangle: {shape_json}"
-                response.shape.CopyFrom(shape)
-
-            elif request.shape_type == "Pentagon":
-                self.logger.info("Generating Pentagon...")
-
-                # Generate Pentagon
-                shape: ShapeService.Shape = self.__get_pentagon()
-                shape_json: dict = self.__get_json_from_shape(shape)
-                self.data["Pentagons"].extend([shape_json])
-
-                self.logger.info(f"Pentagon: {shape}")
-
-                response.status_code = ShapeService.Code.OK
-                response.message = f"Successfully Created Pentagon: {shape_json}"
-                response.shape.CopyFrom(shape)
-
-            else:
-                response.status_code = ShapeService.Code.INVALID_SHAPE
-                response.message = f"shape_type {request.shape_type} is not supported at this time"
-
-            # Write data back to db file
-            try:
-                with open(self.db_path, 'w') as json_file:
-                    json.dump(self.data, json_file, indent=4)
-                self.logger.info(f"Data successfully written to {self.db_path}")
-            except IOError as e:
-                self.logger.error(f"Error writing to file: {e}")
-
-            return response
+            return self._create_shape(request)
 
     def GetShape(self, request: ShapeService.ShapeId, context) -> ShapeService.GetShapeResponse:
         """
@@ -124,40 +121,17 @@ class ShapeServer(ShapeServiceGrpc.ShapeService):
         # the correlation_id of the call
         metadata = {key: value for key, value in context.invocation_metadata()}
 
-        with set_correlation_id(metadata['x-correlation-id']):
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
             self.logger.info(f"GetShape called with request: {request}")
 
-            response: ShapeService.GetShapeResponse = ShapeService.GetShapeResponse(
-                status_code=ShapeService.Code.OK,
-                message=""
-            )
-
-            try:
-                # Attempt to locate the given shape_id, if not found, ShapeService.Code statuses are used to record
-                # the appropriate error
-                shape: ShapeService.Shape = self.__get_shape_from_id(request.shape_id)
-
-                response.status_code = ShapeService.Code.OK
-                response.message = f"Successfully retrieved {request.shape_id}"
-                response.shape.CopyFrom(shape)
-
-            except LookupError as error:
-
-                if int(str(error)) == ShapeService.Code.INVALID_SHAPE:
-                    response.status_code = ShapeService.Code.INVALID_SHAPE
-                    response.message = f"shape_id {request.shape_id} is not a valid shape_id"
-
-                elif int(str(error)) == ShapeService.Code.SHAPE_NOT_FOUND:
-                    response.status_code = ShapeService.Code.SHAPE_NOT_FOUND
-                    response.message = f"shape_id {request.shape_id} not found in database"
-
-            return response
+            return self._get_shape(request)
 
     def GetPerimetersGreaterThan(self, request: ShapeService.MinPerimeter, context) -> Iterator[ShapeService.GetPerimetersGreaterThanResponse]:
         """
-        Retrieves all the shapes with a perimeter greater than the specified value and returns them to the user
+        Retrieves all the shapes with a perimeter greater than the specified value and returns them to the user in
+        ascending order of perimeter, up to the optional limit
 
-        :param request: minimum perimeter value
+        :param request: minimum perimeter value and optional limit
         :param context:
         :return: iterable object of all the shapes with a perimeter greater than the provided value
         """
@@ -166,46 +140,14 @@ class ShapeServer(ShapeServiceGrpc.ShapeService):
         # the correlation_id of the call
         metadata = {key: value for key, value in context.invocation_metadata()}
 
-        with set_correlation_id(metadata['x-correlation-id']):
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
             self.logger.info(f"GetPerimetersGreaterThan called with {request}")
 
-            if request.min_perimeter < 0:
-                yield ShapeService.GetPerimetersGreaterThanResponse(
-                    status_code=ShapeService.Code.INVALID_PERIMETER,
-                    message=f"{request.min_perimeter} is an invalid perimeter value. Perimeters must be greater than or equal to 0"
-                )
-
-                return
-
-            found_shape: bool = False
-
-            for shape_type in self.data:
-                self.logger.info(f"Calculating perimeters of {shape_type}.....")
-
-                for s in self.data[shape_type]:
-                    shape: ShapeService.Shape = self.__get_shape_from_json(s)
-                    perimeter: float = round(self.__get_perimeter(shape), 2)
-
-                    self.logger.info(f"{shape.shape_id} - P={perimeter} units")
-
-                    if perimeter > request.min_perimeter:
-                        found_shape = True
-
-                        yield ShapeService.GetPerimetersGreaterThanResponse(
-                            status_code=ShapeService.Code.OK,
-                            message=f"{shape.shape_id} has a perimeter of {perimeter} units",
-                            perimeter=perimeter,
-                            shape=shape
-                        )
-
-                        time.sleep(1) # Added delay to visually see that the results are returned to the user as they become available
+            for response in self._get_perimeter_responses(request):
+                yield response
 
-            # If no shapes found with perimeter greater than the specified minimum
-            if not found_shape:
-                yield ShapeService.GetPerimetersGreaterThanResponse(
-                    status_code=ShapeService.Code.SHAPE_NOT_FOUND,
-                    message=f"No shapes found with perimeter greater than {request.min_perimeter}."
-                )
+                if self.stream_delay > 0:
+                    time.sleep(self.stream_delay)
 
     def GetTotalArea(self, request: Iterator[ShapeService.ShapeId], context) -> ShapeService.GetTotalAreaResponse:
         """
@@ -221,48 +163,27 @@ class ShapeServer(ShapeServiceGrpc.ShapeService):
         # the correlation_id of the call
         metadata = {key: value for key, value in context.invocation_metadata()}
 
-        with set_correlation_id(metadata['x-correlation-id']):
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
             self.logger.info(f"GetTotalArea called with a ShapeService.ShapeId iterator")
 
             total_area: float = 0.0
             invalid_ids: List[ShapeService.ShapeId] = []
             valid_ids: List[ShapeService.ShapeId] = []
 
-            response: ShapeService.GetTotalAreaResponse = ShapeService.GetTotalAreaResponse(
-                status_code=ShapeService.Code.OK,
-                message=""
-            )
-
             for shape_id in request:
-                try:
-                    # Attempt to locate the given shape_id, if not found, ShapeService.Code statuses are used to record
-                    # the appropriate error
-                    shape: ShapeService.Shape = self.__get_shape_from_id(shape_id.shape_id)
-                    area = self.__get_area(shape)
+                record: ShapeRecord = self._find_shape(shape_id)
 
-                    total_area += area
+                if record is not None:
+                    total_area += record.area
                     valid_ids.append(shape_id)
 
-                    self.logger.info(f"{shape_id.shape_id}: A={area} square units")
-                except LookupError as error:
-                    self.logger.error(f"{shape_id.shape_id} not in database")
-                    if int(str(error)) == ShapeService.Code.INVALID_SHAPE or int(str(error)) == ShapeService.Code.SHAPE_NOT_FOUND:
-                        invalid_ids.append(shape_id)
+                    self.logger.info(f"{record.shape_id}: A={record.area} square units")
+                else:
+                    invalid_ids.append(shape_id)
 
                 self.logger.info(f"Total area at {total_area} square units")
 
-            if total_area > 0:
-                response.status_code = ShapeService.Code.OK
-                response.message = f"Total area of shapes {total_area} square units."
-                response.total_area = total_area
-                response.valid_ids.extend(valid_ids)
-                response.invalid_ids.extend(invalid_ids)
-            else:
-                response.status_code = ShapeService.Code.AREA_NOT_FOUND
-                response.message = f"Invalid Area: {total_area}."
-                response.invalid_ids.extend(invalid_ids)
-
-            return response
+            return self._get_total_area_response(total_area, valid_ids, invalid_ids)
 
     def GetAreas(self, request: Iterator[ShapeService.ShapeId], context) -> Iterator[ShapeService.GetAreasResponse]:
         """
@@ -277,232 +198,1198 @@ class ShapeServer(ShapeServiceGrpc.ShapeService):
         # the correlation_id of the call
         metadata = {key: value for key, value in context.invocation_metadata()}
 
-        with set_correlation_id(metadata['x-correlation-id']):
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
             self.logger.info('GetAreas called with ShapeService.ShapeId iterator')
 
-            for shape_id in request:
-                response: ShapeService.GetAreasResponse = ShapeService.GetAreasResponse(
-                    status_code=ShapeService.Code.OK,
-                    message=""
-                )
+            for response in self.__get_area_responses(request):
+                yield response
 
-                try:
-                    # Attempt to locate the given shape_id, if not found, ShapeService.Code statuses are used to record
-                    # the appropriate error
-                    shape: ShapeService.Shape = self.__get_shape_from_id(shape_id.shape_id)
-                    area = self.__get_area(shape)
-
-                    response.status_code = ShapeService.Code.OK
-                    response.message = f"{shape.shape_id}: A={area} square units"
-                    response.area = area
-                    response.shape.CopyFrom(shape)
-
-                    self.logger.info(f"{shape_id.shape_id}: A={area} square units")
-                except LookupError as error:
-                    self.logger.error(f"{shape_id.shape_id} not in database")
-                    if int(str(error)) == ShapeService.Code.INVALID_SHAPE or int(str(error)) == ShapeService.Code.SHAPE_NOT_FOUND:
-                        response.status_code = ShapeService.Code.AREA_NOT_FOUND
-                        response.message = f"{shape_id.shape_id} does not exist"
+                if self.stream_delay > 0:
+                    time.sleep(self.stream_delay)
 
-                yield response
+    def BatchGetShapes(self, request: ShapeService.BatchGetShapesRequest, context) -> ShapeService.BatchGetShapesResponse:
+        """
+        Retrieves many shapes in a single call
+
+        :param request: shape_ids to lookup
+        :param context:
+        :return: BatchGetShapesResponse - a GetShapeResponse for each requested shape_id in order
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
 
-                time.sleep(1)
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"BatchGetShapes called with {len(request.shape_ids)} shape_ids")
 
-    def __get_shape_from_id(self, shape_id: str) -> ShapeService.Shape:
+            return self._batch_get_shapes(request)
+
+    def BatchCreateShapes(self, request: ShapeService.BatchCreateShapesRequest, context) -> ShapeService.BatchCreateShapesResponse:
         """
-        Provided a shape_id attempt to locate it in the database, otherwise throw a LookupError with the appropriate
-        ShapeService.Code status code to indicate why the shape was not found
+        Creates many shapes in a single call, storing all of them with a single commit
 
-        :param shape_id: shape to lookup
-        :return: ShapeService.Shape
+        :param request: shape_types to create
+        :param context:
+        :return: BatchCreateShapesResponse - a CreateShapeResponse for each requested shape_type in order
         """
-        shape: ShapeService.Shape = None
 
-        shape_id: str = f"{shape_id[0].upper()}{shape_id[1:]}"  # Reformat shape_id
-        shape_key: str = ""
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
 
-        # Iterate over database trying to match the shape_type of the id to a shape_type in the database
-        for key in self.data:
-            if key[0] == shape_id[0]:
-                shape_key = key
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"BatchCreateShapes called with {len(request.shape_types)} shape_types")
 
-        if shape_key == "":
-            raise LookupError(f"{ShapeService.Code.INVALID_SHAPE}")
+            return self._batch_create_shapes(request)
 
-        # Once the proper shape_type has been identified, search for the shape_id in that list of shapes
-        for s in self.data[shape_key]:
-            if s['shape_id'] == shape_id:
-                shape = self.__get_shape_from_json(s)
+    def IngestShapes(self, request: Iterator[ShapeService.ShapeType], context) -> ShapeService.IngestSummary:
+        """
+        Bulk loads a stream of shapes. Incoming shapes are buffered and committed to storage in groups, either once
+        ingest_group_size shapes are buffered or once the oldest buffered shape has waited ingest_group_window_ms
 
-        # Raise LookupError if a shape is not found in the database
-        if shape is None:
-            raise LookupError(f"{ShapeService.Code.SHAPE_NOT_FOUND}")
+        :param request: stream of shape_types to create
+        :param context:
+        :return: IngestSummary - counts, throughput and the items that failed
+        """
 
-        return shape
-    
-    def __get_triangle (self) -> ShapeService.Shape:
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info("IngestShapes called with a ShapeService.ShapeType iterator")
+
+            summary: ShapeService.IngestSummary = ShapeService.IngestSummary(status_code=ShapeService.Code.OK)
+            started: float = time.perf_counter()
+
+            group: List[Tuple[int, ShapeService.ShapeType]] = []
+            group_started: float = 0.0
+
+            for index, shape_type in enumerate(request):
+                if len(group) == 0:
+                    group_started = time.perf_counter()
+
+                group.append((index, shape_type))
+                summary.received += 1
+
+                # The window can only be checked as shapes arrive since reading the request stream blocks
+                if len(group) >= self.ingest_group_size or time.perf_counter() - group_started >= self.ingest_group_window:
+                    self._commit_ingest_group(group, summary)
+                    group = []
+
+            if len(group) > 0:
+                self._commit_ingest_group(group, summary)
+
+            return self._finish_ingest_summary(summary, started)
+
+    def QueryShapes(self, request: ShapeService.ShapeQuery, context) -> Iterator[ShapeService.QueryShapesResponse]:
         """
-        Generates a triangle with a random width and height
-    
-        :return: ShapeService.Shape that is a triangle
+        Retrieves all the shapes matching every filter set in the query, e.g. Triangles with an area between 10 and 20
+        inside a bounding box, and returns them to the user as they are found
+
+        :param request: optional shape_type, area and perimeter ranges, bounding box, limit and offset
+        :param context:
+        :return: iterable object of all the shapes matching the query
         """
-        width: int = 2*random.randint(1, self.max_width) # double the width to make division easy for middle point
-        height: int = random.randint(1, self.max_height)
-    
-        coordinates: List[ShapeService.ShapeCoord] = [
-            ShapeService.ShapeCoord(x=0, y=0),
-            ShapeService.ShapeCoord(x=int(width/2), y=height),
-            ShapeService.ShapeCoord(x=width, y=0)
-        ]
-    
-        triangle: ShapeService.Shape = ShapeService.Shape(
-            shape_id=f"T-{len(self.data['Triangles'])}",
-            shape_type="Triangle"
-        )
-        triangle.coords.extend(coordinates)
-    
-        return triangle
 
-    def __get_rectangle(self) -> ShapeService.Shape:
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"QueryShapes called with {request}")
+
+            for response in self._get_query_responses(request):
+                yield response
+
+                if self.stream_delay > 0:
+                    time.sleep(self.stream_delay)
+
+    def GetShapesIntersecting(self, request: ShapeService.BoundingBox, context) -> Iterator[ShapeService.GetShapesIntersectingResponse]:
         """
-        Generates a rectangle with a random width and height
+        Retrieves all the shapes that share at least one point with the box, including shapes that only touch its
+        edges, and returns them to the user as they are found
 
-        :return: ShapeService.Shape that is a rectangle
+        :param request: box to intersect with
+        :param context:
+        :return: iterable object of all the shapes intersecting the box
         """
-        width: int = random.randint(1, self.max_width)  # double the height to make division easy for middle point
-        height: int = random.randint(1, self.max_height)
 
-        coordinates: List[ShapeService.ShapeCoord] = [
-            ShapeService.ShapeCoord(x=0, y=0),
-            ShapeService.ShapeCoord(x=0, y=height),
-            ShapeService.ShapeCoord(x=width, y=height),
-            ShapeService.ShapeCoord(x=width, y=0)
-        ]
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
 
-        rectangle: ShapeService.Shape = ShapeService.Shape(
-            shape_id=f"R-{len(self.data['Rectangles'])}",
-            shape_type="rectangle"
-        )
-        rectangle.coords.extend(coordinates)
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"GetShapesIntersecting called with {request}")
+
+            for response in self._get_intersecting_responses(request):
+                yield response
 
-        return rectangle
+                if self.stream_delay > 0:
+                    time.sleep(self.stream_delay)
 
-    def __get_pentagon(self) -> ShapeService.Shape:
+    def GetShapesContaining(self, request: ShapeService.ShapeCoord, context) -> Iterator[ShapeService.GetShapesContainingResponse]:
         """
-        Generates a pentagon with a random width and height
+        Retrieves all the shapes that contain the point, including shapes with the point on one of their edges, and
+        returns them to the user as they are found
 
-        :return: ShapeService.Shape that is a pentagon
+        :param request: x and y of the point
+        :param context:
+        :return: iterable object of all the shapes containing the point
         """
-        width: int = 2 * random.randint(1, self.max_width)  # double the width to make division easy for middle point
-        height: int = 2 * random.randint(1,
-                                         self.max_height)  # double the height to make integer division easier for middle height
 
-        coordinates: List[ShapeService.ShapeCoord] = [
-            ShapeService.ShapeCoord(x=0, y=0),
-            ShapeService.ShapeCoord(x=0, y=int(height / 2)),
-            ShapeService.ShapeCoord(x=int(width / 2), y=height),
-            ShapeService.ShapeCoord(x=width, y=int(height / 2)),
-            ShapeService.ShapeCoord(x=width, y=0)
-        ]
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
 
-        pentagon: ShapeService.Shape = ShapeService.Shape(
-            shape_id=f"P-{len(self.data['Pentagons'])}",
-            shape_type="pentagon"
-        )
-        pentagon.coords.extend(coordinates)
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"GetShapesContaining called with {request}")
+
+            for response in self._get_containing_responses(request):
+                yield response
 
-        return pentagon
+                if self.stream_delay > 0:
+                    time.sleep(self.stream_delay)
 
-    @staticmethod
-    def __get_json_from_shape(shape: ShapeService.Shape) -> dict:
+    def GetPerimetersGreaterThanBatched(self, request: ShapeService.MinPerimeter, context) -> Iterator[ShapeService.GetPerimetersGreaterThanBatch]:
         """
-        Takes a gRCP server Shape and returns a serializable object
+        Batched GetPerimetersGreaterThan, each streamed message carries up to batch_size of its responses
 
-        :param shape: gRPC Shape
-        :return: serializable object
+        :param request: minimum perimeter value, optional limit, page_size, resume_token and batch_size, and omit_message
+        :param context:
+        :return: iterable object of batches of the shapes with a perimeter greater than the provided value
         """
-        shape_json: dict = {
-            "shape_id": shape.shape_id,
-            "shape_type": shape.shape_type,
-            "coords": []
-        }
 
-        json_coords: List[dict] = []
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
 
-        for c in shape.coords:
-            json_coords.append({
-                "x": c.x,
-                "y": c.y
-            })
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info(f"GetPerimetersGreaterThanBatched called with {request}")
 
-        shape_json["coords"].extend(json_coords)
+            for batch in self._get_perimeter_batches(request):
+                yield batch
 
-        return shape_json
+                if self.stream_delay > 0:
+                    time.sleep(self.stream_delay)
 
-    @staticmethod
-    def __get_shape_from_json(json_shape: dict) -> ShapeService.Shape:
+    def GetAreasBatched(self, request: Iterator[ShapeService.ShapeId], context) -> Iterator[ShapeService.GetAreasBatch]:
         """
-        Takes a JSON object and converts it back to a gRPC Shape
+        Batched GetAreas, each streamed message carries up to batch_size of its responses. A batch is sent once it is
+        full or the request stream ends, so the client must not wait for a batch before sending the rest of its
+        shape_ids
 
-        :param json_shape: JSON object to convert back to gRPC Shape
-        :return: gRPC Shape
+        :param request: iterator of shape_ids, the first one optionally setting the batch_size and omit_message
+        :param context:
+        :return: Iterator[ShapeService.GetAreasBatch]
         """
-        shape: ShapeService.Shape = ShapeService.Shape(
-            shape_id=json_shape['shape_id'],
-            shape_type=json_shape['shape_type']
-        )
 
-        shape_coords: List[ShapeService.ShapeCoord] = []
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']), set_shape_format(metadata.get('x-shape-format')):
+            self.logger.info('GetAreasBatched called with ShapeService.ShapeId iterator')
+
+            shape_ids: Iterator[ShapeService.ShapeId] = iter(request)
+            first_id: Optional[ShapeService.ShapeId] = next(shape_ids, None)
+
+            if first_id is None:
+                return
+
+            try:
+                batch_size: int = self._get_stream_batch_size(first_id)
+            except ValueError as e:
+                yield ShapeService.GetAreasBatch(status_code=e.args[0], message=e.args[1])
+
+                # Read the rest of the stream so that the client can finish sending normally
+                for _ in shape_ids:
+                    pass
+
+                return
+
+            responses: Iterator[ShapeService.GetAreasResponse] = self.__get_area_responses(chain([first_id], shape_ids))
+
+            for batch in self._get_batches(responses, ShapeService.GetAreasBatch, batch_size):
+                yield batch
+
+                if self.stream_delay > 0:
+                    time.sleep(self.stream_delay)
+
+    def GetMetrics(self, request: ShapeService.GetMetricsRequest, context) -> ShapeService.GetMetricsResponse:
+        """
+        Returns the metrics of the calls served by this server process, along with the counters of its caches
+
+        :param request: whether to also render the metrics in the Prometheus text format
+        :param context:
+        :return: GetMetricsResponse - per-method call counts, status codes, latency histograms and message sizes
+        """
+
+        # Extract metadata from context and set the correlation_id so that all logs from this invocation contain
+        # the correlation_id of the call
+        metadata = {key: value for key, value in context.invocation_metadata()}
+
+        with set_correlation_id(metadata['x-correlation-id']):
+            self.logger.info(f"GetMetrics called with request: {request}")
+
+            return self._get_metrics(request)
+
+    def _create_shape(self, request: ShapeService.ShapeType) -> ShapeService.CreateShapeResponse:
+        """
+        Generates and stores the requested shape. Stores the shape in the repository, which may block on I/O
+
+        :param request: The type of shape to create
+        :return: CreateShapeResponse
+        """
+        return self._create_shapes([request])[0]
+
+    def _create_shapes(self, requests: List[ShapeService.ShapeType]) -> List[ShapeService.CreateShapeResponse]:
+        """
+        Generates the requested shapes and stores all of them with a single repository commit, which may block on I/O
 
-        for c in json_shape['coords']:
-            shape_coords.append(
-                ShapeService.ShapeCoord(x=int(c['x']), y=int(c['y']))
+        :param requests: The types of shape to create
+        :return: CreateShapeResponse for each request in order
+        """
+        responses: List[ShapeService.CreateShapeResponse] = []
+        created: List[ShapeService.CreateShapeResponse] = []
+        shapes: List[Tuple[str, List[Tuple[int, int]]]] = []
+
+        for request in requests:
+            response: ShapeService.CreateShapeResponse = ShapeService.CreateShapeResponse(
+                status_code=ShapeService.Code.OK,
+                message=""
             )
 
-        shape.coords.extend(shape_coords)
+            coords: List[Tuple[int, int]] = self.__generate_shape(request.shape_type)
 
-        return shape
+            if coords is not None:
+                self.logger.info(f"Generating {request.shape_type}...")
+                shapes.append((request.shape_type, coords))
+                created.append(response)
 
-    @staticmethod
-    def __get_perimeter(shape: ShapeService.Shape) -> float:
+            else:
+                response.status_code = ShapeService.Code.INVALID_SHAPE
+                response.message = f"shape_type {request.shape_type} is not supported at this time"
+
+            responses.append(response)
+
+        if len(shapes) > 0:
+            try:
+                records: List[ShapeRecord] = self._store_shapes(shapes)
+            except Exception as e:
+                self.logger.error(f"Error storing {len(shapes)} shapes: {e}")
+
+                for response in created:
+                    response.status_code = ShapeService.Code.STORAGE_ERROR
+                    response.message = f"Shape could not be stored: {e}"
+
+                return responses
+
+            for response, record in zip(created, records):
+                self.logger.info(f"{record.shape_type}: {record.to_json()}")
+
+                response.status_code = ShapeService.Code.OK
+                response.message = f"Successfully Created {record.shape_type}: {record.to_json()}"
+                self._write_shape(record, response)
+
+        return responses
+
+    def _store_shapes(self, shapes: List[Tuple[str, List[Tuple[int, int]]]]) -> List[ShapeRecord]:
         """
-        Calculates the perimeter of the given shape
+        Stores new shapes with a single repository commit, which may block on I/O, and invalidates any cached responses
+        for the shape_ids written. Every write to the repository goes through here
 
-        :param shape: shape to calculate the perimeter of
-        :return: float - the perimeter of the provided shape
+        :param shapes: (shape_type, coords) of each shape to store
+        :return: the stored ShapeRecords in order
         """
-        perimeter: float = 0.0
+        records: List[ShapeRecord] = self.repository.insert_many(shapes)
+
+        for record in records:
+            for cached_format in SHAPE_FORMATS:
+                self.response_cache.invalidate((cached_format, record.shape_id))
 
-        n: int = len(shape.coords)  # Number of coordinates in the shape
+        return records
 
-        # Calculate the distance between each set of points and add them up. i+1 % n connects the first point back to the last point
-        for i in range(n):
-            x_sq_diff: float = (shape.coords[(i + 1) % n].x - shape.coords[i].x) ** 2
-            y_sq_diff: float = (shape.coords[(i + 1) % n].y - shape.coords[i].y) ** 2
+    def _get_shape(self, request: ShapeService.ShapeId) -> ShapeService.GetShapeResponse:
+        """
+        Returns the cached GetShape response for the requested shape, looking the shape up on a miss
 
-            perimeter += math.sqrt(x_sq_diff + y_sq_diff)
+        :param request: gRPC Request containing the id to lookup
+        :return: GetShapeResponse
+        """
+        response: Optional[ShapeService.GetShapeResponse] = self._get_cached_shape(request)
 
-        return perimeter
+        return response if response is not None else self._load_shape(request)
 
-    @staticmethod
-    def __get_area(shape: ShapeService.Shape) -> float:
+    def _get_cached_shape(self, request: ShapeService.ShapeId) -> Optional[ShapeService.GetShapeResponse]:
+        """
+        Returns the cached GetShape response for the requested shape without touching the repository
+
+        :param request: gRPC Request containing the id to lookup
+        :return: GetShapeResponse, or None on a cache miss
+        """
+        cache_key: Optional[tuple] = self.__get_cache_key(request)
+
+        return None if cache_key is None else self.response_cache.get(cache_key)
+
+    def _load_shape(self, request: ShapeService.ShapeId) -> ShapeService.GetShapeResponse:
+        """
+        Looks up the requested shape, which may block on I/O, and caches the response if the shape was found
+
+        :param request: gRPC Request containing the id to lookup
+        :return: GetShapeResponse
         """
-        Calculates the area of the given shape using Gauss's Area formula for a polygon
+        response: ShapeService.GetShapeResponse = self._get_shapes([request])[0]
+
+        if response.status_code == ShapeService.Code.OK:
+            self.response_cache.put(self.__get_cache_key(request), response)
 
-        A = 1/2*abs(sum((x_i*y_i+1 - y_i*x_i+1)) + (x_n*y_1+y_n*x_1))
+        return response
+
+    def _get_shapes(self, requests: List[ShapeService.ShapeId]) -> List[ShapeService.GetShapeResponse]:
+        """
+        Looks up the requested shapes with a single repository read and builds a GetShape response for each
 
-        :param shape: shape to calculate the area of
-        :return: float - the area of the provided shape
+        :param requests: shape_ids to lookup
+        :return: GetShapeResponse for each request in order
         """
-        area: float = 0.0
+        keys: List[Optional[Tuple[str, int]]] = [self.__resolve_shape_id(request) for request in requests]
+
+        # Only shape_ids that match a shape_type in the database are looked up
+        valid_keys: List[Tuple[str, int]] = [key for key in keys if key is not None]
+        records: dict = dict(zip(valid_keys, self.repository.get_many(valid_keys)))
+
+        responses: List[ShapeService.GetShapeResponse] = []
+
+        for request, key in zip(requests, keys):
+            response: ShapeService.GetShapeResponse = ShapeService.GetShapeResponse(
+                status_code=ShapeService.Code.OK,
+                message=""
+            )
+
+            if key is None:
+                response.status_code = ShapeService.Code.INVALID_SHAPE
+                response.message = f"shape_id {decode_shape_id(request)} is not a valid shape_id"
+
+            elif records[key] is None:
+                response.status_code = ShapeService.Code.SHAPE_NOT_FOUND
+                response.message = f"shape_id {decode_shape_id(request)} not found in database"
 
-        n: int = len(shape.coords)  # Number of coordinates in the shape
+            else:
+                response.status_code = ShapeService.Code.OK
+                response.message = f"Successfully retrieved {records[key].shape_id}"
+                self._write_shape(records[key], response)
 
-        # Calculate the area of the shape using Gauss's area formula. i+1 % n connects the first point back to the last point
-        for i in range(n):
-            x1_y2: float = shape.coords[i].x * shape.coords[(i + 1) % n].y
-            x2_y1: float = shape.coords[(i + 1) % n].x * shape.coords[i].y
+            responses.append(response)
 
-            area += x1_y2 - x2_y1
+        return responses
 
-        return abs(area) / 2
+    def _batch_get_shapes(self, request: ShapeService.BatchGetShapesRequest) -> ShapeService.BatchGetShapesResponse:
+        """
+        Builds the BatchGetShapes response, each shape_id gets its own GetShapeResponse
+
+        :param request: shape_ids to lookup
+        :return: BatchGetShapesResponse
+        """
+        if len(request.shape_ids) > self.max_batch_size:
+            return ShapeService.BatchGetShapesResponse(
+                status_code=ShapeService.Code.BATCH_TOO_LARGE,
+                message=f"Batches are limited to {self.max_batch_size} shape_ids, {len(request.shape_ids)} provided"
+            )
+
+        results: List[ShapeService.GetShapeResponse] = self._get_shapes(list(request.shape_ids))
+        found: int = sum(1 for result in results if result.status_code == ShapeService.Code.OK)
+
+        return ShapeService.BatchGetShapesResponse(
+            status_code=ShapeService.Code.OK,
+            message=f"Retrieved {found} of {len(results)} shapes",
+            results=results
+        )
+
+    def _batch_create_shapes(self, request: ShapeService.BatchCreateShapesRequest) -> ShapeService.BatchCreateShapesResponse:
+        """
+        Builds the BatchCreateShapes response, each shape_type gets its own CreateShapeResponse and every created shape
+        is stored with a single repository commit
+
+        :param request: shape_types to create
+        :return: BatchCreateShapesResponse
+        """
+        if len(request.shape_types) > self.max_batch_size:
+            return ShapeService.BatchCreateShapesResponse(
+                status_code=ShapeService.Code.BATCH_TOO_LARGE,
+                message=f"Batches are limited to {self.max_batch_size} shapes, {len(request.shape_types)} provided"
+            )
+
+        results: List[ShapeService.CreateShapeResponse] = self._create_shapes(list(request.shape_types))
+        created: int = sum(1 for result in results if result.status_code == ShapeService.Code.OK)
+
+        return ShapeService.BatchCreateShapesResponse(
+            status_code=ShapeService.Code.OK,
+            message=f"Created {created} of {len(results)} shapes",
+            results=results
+        )
+
+    def _get_metrics(self, request: ShapeService.GetMetricsRequest) -> ShapeService.GetMetricsResponse:
+        """
+        Builds the GetMetrics response from the call metrics and the metric counters
+
+        :param request: GetMetrics request
+        :return: GetMetricsResponse
+        """
+        methods: Dict[str, MethodMetrics] = self.call_metrics.get_methods()
+        counters: Dict[str, dict] = {name: get_counters() for name, get_counters in self.metric_counters.items()}
+
+        response: ShapeService.GetMetricsResponse = ShapeService.GetMetricsResponse(
+            status_code=ShapeService.Code.OK,
+            message=f"Metrics of {len(methods)} methods",
+            latency_bounds=LATENCY_BOUNDS
+        )
+
+        for method, metrics in methods.items():
+            response.methods.add(
+                method=method,
+                status_counts=metrics.status_counts,
+                in_flight=metrics.in_flight,
+                latency_buckets=metrics.latency_buckets,
+                latency_sum=metrics.latency_sum,
+                bytes_in=metrics.bytes_in,
+                bytes_out=metrics.bytes_out
+            )
+
+        for name, group_counters in counters.items():
+            response.counters.add(name=name, counters=group_counters)
+
+        if request.prometheus_text:
+            response.prometheus_text = format_prometheus("grpc_server", methods, counters)
+
+        return response
+
+    def _commit_ingest_group(self, group: List[Tuple[int, ShapeService.ShapeType]], summary: ShapeService.IngestSummary):
+        """
+        Generates the shapes of a group of ingested items and stores them with a single repository commit, which may
+        block on I/O. Counts and failures are recorded on the summary
+
+        :param group: (index in the request stream, shape_type) of each buffered item
+        :param summary: summary of the ingest so far
+        :return: None
+        """
+        shapes: List[Tuple[str, List[Tuple[int, int]]]] = []
+        indexes: List[int] = []
+
+        for index, request in group:
+            coords: List[Tuple[int, int]] = self.__generate_shape(request.shape_type)
+
+            if coords is None:
+                self.__add_ingest_failure(
+                    summary, index, ShapeService.Code.INVALID_SHAPE,
+                    f"shape_type {request.shape_type} is not supported at this time"
+                )
+            else:
+                shapes.append((request.shape_type, coords))
+                indexes.append(index)
+
+        if len(shapes) == 0:
+            return
+
+        try:
+            self._store_shapes(shapes)
+        except Exception as e:
+            self.logger.error(f"Error committing {len(shapes)} ingested shapes: {e}")
+
+            for index in indexes:
+                self.__add_ingest_failure(summary, index, ShapeService.Code.STORAGE_ERROR, f"Shape could not be stored: {e}")
+
+            return
+
+        summary.created += len(shapes)
+        summary.commits += 1
+
+        self.logger.info(f"Committed {len(shapes)} ingested shapes, {summary.created} created so far")
+
+    def _finish_ingest_summary(self, summary: ShapeService.IngestSummary, started: float) -> ShapeService.IngestSummary:
+        """
+        Fills in the throughput and message of an ingest summary once the request stream has been read
+
+        :param summary: summary of the ingest
+        :param started: time.perf_counter() when the ingest started
+        :return: ShapeService.IngestSummary
+        """
+        summary.elapsed_seconds = time.perf_counter() - started
+        summary.shapes_per_second = summary.created / summary.elapsed_seconds if summary.elapsed_seconds > 0 else 0.0
+        summary.message = (f"Created {summary.created} of {summary.received} shapes in {summary.commits} commits, "
+                           f"{round(summary.shapes_per_second, 2)} shapes/second")
+
+        self.logger.info(summary.message)
+
+        return summary
+
+    def __add_ingest_failure(self, summary: ShapeService.IngestSummary, index: int, status_code: int, message: str):
+        """
+        Records a failed ingest item, only the first max_batch_size failures are returned to the client
+
+        :return: None
+        """
+        summary.failed += 1
+
+        if len(summary.failures) < self.max_batch_size:
+            summary.failures.append(ShapeService.IngestFailure(index=index, status_code=status_code, message=message))
+
+    def _get_perimeter_responses(self, request: ShapeService.MinPerimeter) -> Iterator[ShapeService.GetPerimetersGreaterThanResponse]:
+        """
+        Builds the GetPerimetersGreaterThan responses for the given request without any delay between them
+
+        Each shape is returned with a resume_token holding its position in the perimeter index, i.e. its perimeter and
+        shape_id, and the number of shapes returned so far, so that a stream that was cut off or ended at page_size
+        can be continued from the shape after it with the limit still counted over every page
+
+        :param request: minimum perimeter value, optional limit and page_size, resume_token and omit_message
+        :return: Iterator[ShapeService.GetPerimetersGreaterThanResponse]
+        """
+        if request.min_perimeter < 0:
+            yield ShapeService.GetPerimetersGreaterThanResponse(
+                status_code=ShapeService.Code.INVALID_PERIMETER,
+                message=f"{request.min_perimeter} is an invalid perimeter value. Perimeters must be greater than or equal to 0"
+            )
+
+            return
+
+        if request.HasField('page_size') and request.page_size == 0:
+            yield ShapeService.GetPerimetersGreaterThanResponse(
+                status_code=ShapeService.Code.INVALID_QUERY,
+                message="page_size must be greater than 0"
+            )
+
+            return
+
+        # (perimeter, shape_id, shapes returned so far) of the shape the stream is resumed after
+        resume_after: Optional[Tuple[float, str, int]] = None
+
+        if request.resume_token:
+            try:
+                position: dict = decode_resume_token("GetPerimetersGreaterThan", request.resume_token)
+
+                if position.get('min_perimeter') != request.min_perimeter:
+                    raise ValueError(f"resume_token was created for a min_perimeter of {position.get('min_perimeter')}, "
+                                     f"not {request.min_perimeter}")
+
+                resume_after = (float(position['perimeter']), str(position['shape_id']), int(position['returned']))
+            except (KeyError, TypeError, ValueError) as e:
+                yield ShapeService.GetPerimetersGreaterThanResponse(
+                    status_code=ShapeService.Code.INVALID_RESUME_TOKEN,
+                    message=f"Invalid resume_token: {e}"
+                )
+
+                return
+
+        found_shapes: int = 0 if resume_after is None else resume_after[2]
+        page_end: Optional[int] = None
+
+        if request.HasField('limit'):
+            page_end = request.limit
+
+        if request.HasField('page_size') and (page_end is None or found_shapes + request.page_size < page_end):
+            page_end = found_shapes + request.page_size
+
+        # Perimeters are calculated when shapes are stored, so the perimeter index seeks straight to the first
+        # shape above the minimum, or to the shape after the one the stream is resumed from
+        if resume_after is None:
+            records: Iterator[ShapeRecord] = self.repository.range("perimeter", low=request.min_perimeter)
+        else:
+            records: Iterator[ShapeRecord] = self.__resume_range("perimeter", resume_after[0], resume_after[1])
+
+        for record in records:
+            if page_end is not None and found_shapes >= page_end:
+                break
+
+            perimeter: float = round(record.perimeter, 2)
+
+            if perimeter <= request.min_perimeter:
+                continue
+
+            self.logger.debug(f"{record.shape_id} - P={perimeter} units")
+
+            found_shapes += 1
+
+            response: ShapeService.GetPerimetersGreaterThanResponse = ShapeService.GetPerimetersGreaterThanResponse(
+                status_code=ShapeService.Code.OK,
+                message="" if request.omit_message else f"{record.shape_id} has a perimeter of {perimeter} units",
+                perimeter=perimeter,
+                resume_token=encode_resume_token("GetPerimetersGreaterThan", {
+                    "min_perimeter": request.min_perimeter,
+                    "perimeter": record.perimeter,
+                    "shape_id": record.shape_id,
+                    "returned": found_shapes
+                })
+            )
+            self._write_shape(record, response)
+
+            yield response
+
+        # If no shapes found with perimeter greater than the specified minimum
+        if resume_after is None and found_shapes == 0:
+            yield ShapeService.GetPerimetersGreaterThanResponse(
+                status_code=ShapeService.Code.SHAPE_NOT_FOUND,
+                message=f"No shapes found with perimeter greater than {request.min_perimeter}."
+            )
+        elif resume_after is not None and found_shapes == resume_after[2]:
+            yield ShapeService.GetPerimetersGreaterThanResponse(
+                status_code=ShapeService.Code.SHAPE_NOT_FOUND,
+                message=f"No more shapes found with perimeter greater than {request.min_perimeter}."
+            )
+
+    def _get_perimeter_batches(self, request: ShapeService.MinPerimeter) -> Iterator[ShapeService.GetPerimetersGreaterThanBatch]:
+        """
+        Builds the GetPerimetersGreaterThanBatched responses for the given request without any delay between them
+
+        :param request: minimum perimeter value, optional limit, page_size, resume_token and batch_size, and omit_message
+        :return: Iterator[ShapeService.GetPerimetersGreaterThanBatch]
+        """
+        try:
+            batch_size: int = self._get_stream_batch_size(request)
+        except ValueError as e:
+            yield ShapeService.GetPerimetersGreaterThanBatch(status_code=e.args[0], message=e.args[1])
+
+            return
+
+        yield from self._get_batches(
+            self._get_perimeter_responses(request), ShapeService.GetPerimetersGreaterThanBatch, batch_size
+        )
+
+    def _get_query_responses(self, request: ShapeService.ShapeQuery) -> Iterator[ShapeService.QueryShapesResponse]:
+        """
+        Builds the QueryShapes responses for the given request without any delay between them
+
+        :param request: optional shape_type, area and perimeter ranges, bounding box, limit and offset
+        :return: Iterator[ShapeService.QueryShapesResponse]
+        """
+        # Shapes are matched ignoring the case of their shape_type, so a query for rectangle is as valid as one for
+        # Rectangle
+        shape_type: Optional[str] = None
+
+        if request.HasField('shape_type'):
+            shape_type = self.repository.SHAPE_TYPES.get(request.shape_type.lower())
+
+            if shape_type is None:
+                yield ShapeService.QueryShapesResponse(
+                    status_code=ShapeService.Code.INVALID_SHAPE,
+                    message=f"shape_type {request.shape_type} is not supported at this time"
+                )
+
+                return
+
+        try:
+            shape_filter: ShapeFilter = self.__get_shape_filter(request, shape_type)
+        except ValueError as e:
+            yield ShapeService.QueryShapesResponse(status_code=ShapeService.Code.INVALID_QUERY, message=str(e))
+
+            return
+
+        found_shapes: int = 0
+
+        for record in self.query_planner.execute(shape_filter, request.limit if request.HasField('limit') else None,
+                                                 request.offset):
+            self.logger.debug(f"{record.shape_id} - A={record.area} units^2, P={record.perimeter} units")
+
+            found_shapes += 1
+
+            response: ShapeService.QueryShapesResponse = ShapeService.QueryShapesResponse(
+                status_code=ShapeService.Code.OK,
+                message=f"{record.shape_id} matches the query",
+                area=round(record.area, 2),
+                perimeter=round(record.perimeter, 2)
+            )
+            self._write_shape(record, response)
+
+            yield response
+
+        # If no shapes match every filter
+        if found_shapes == 0:
+            yield ShapeService.QueryShapesResponse(
+                status_code=ShapeService.Code.SHAPE_NOT_FOUND,
+                message="No shapes found matching the query."
+            )
+
+    def _get_intersecting_responses(self, request: ShapeService.BoundingBox) -> Iterator[ShapeService.GetShapesIntersectingResponse]:
+        """
+        Builds the GetShapesIntersecting responses for the given request without any delay between them
+
+        :param request: box to intersect with
+        :return: Iterator[ShapeService.GetShapesIntersectingResponse]
+        """
+        try:
+            box: Tuple[int, int, int, int] = self.__get_box(request)
+        except ValueError as e:
+            yield ShapeService.GetShapesIntersectingResponse(status_code=ShapeService.Code.INVALID_QUERY, message=str(e))
+
+            return
+
+        found_shapes: int = 0
+
+        # The spatial index only narrows the search down to shapes near the box, so check the geometry of each one
+        for record in self.geometry_pool.filter(self.repository.intersecting(*box), intersects_box, *box):
+            found_shapes += 1
+
+            response: ShapeService.GetShapesIntersectingResponse = ShapeService.GetShapesIntersectingResponse(
+                status_code=ShapeService.Code.OK,
+                message=f"{record.shape_id} intersects the box"
+            )
+            self._write_shape(record, response)
+
+            yield response
+
+        # If no shapes intersect the box
+        if found_shapes == 0:
+            yield ShapeService.GetShapesIntersectingResponse(
+                status_code=ShapeService.Code.SHAPE_NOT_FOUND,
+                message=f"No shapes found intersecting ({box[0]}, {box[1]}) to ({box[2]}, {box[3]})."
+            )
+
+    def _get_containing_responses(self, request: ShapeService.ShapeCoord) -> Iterator[ShapeService.GetShapesContainingResponse]:
+        """
+        Builds the GetShapesContaining responses for the given request without any delay between them
+
+        :param request: x and y of the point
+        :return: Iterator[ShapeService.GetShapesContainingResponse]
+        """
+        if not request.HasField('x') or not request.HasField('y'):
+            yield ShapeService.GetShapesContainingResponse(
+                status_code=ShapeService.Code.INVALID_QUERY,
+                message="Both x and y of the point must be provided"
+            )
+
+            return
+
+        found_shapes: int = 0
+
+        # The spatial index only narrows the search down to shapes near the point, so check the geometry of each one
+        candidates: Iterator[ShapeRecord] = self.repository.intersecting(request.x, request.y, request.x, request.y)
+
+        for record in self.geometry_pool.filter(candidates, contains_point, request.x, request.y):
+            found_shapes += 1
+
+            response: ShapeService.GetShapesContainingResponse = ShapeService.GetShapesContainingResponse(
+                status_code=ShapeService.Code.OK,
+                message=f"{record.shape_id} contains ({request.x}, {request.y})"
+            )
+            self._write_shape(record, response)
+
+            yield response
+
+        # If no shapes contain the point
+        if found_shapes == 0:
+            yield ShapeService.GetShapesContainingResponse(
+                status_code=ShapeService.Code.SHAPE_NOT_FOUND,
+                message=f"No shapes found containing ({request.x}, {request.y})."
+            )
+
+    def _find_shape(self, shape_id: ShapeService.ShapeId) -> Optional[ShapeRecord]:
+        """
+        Looks up the given shape_id, logging an error if it is invalid or not in the database
+
+        :param shape_id: shape to lookup
+        :return: ShapeRecord, or None if the shape could not be found
+        """
+        try:
+            # Attempt to locate the given shape_id, if not found, ShapeService.Code statuses are used to record
+            # the appropriate error
+            return self.__get_shape_from_id(shape_id)
+        except LookupError:
+            self.logger.error(f"{decode_shape_id(shape_id)} not in database")
+            return None
+
+    @staticmethod
+    def _write_shape(record: ShapeRecord, response):
+        """
+        Fills in the shape of a response in the format negotiated by the call, i.e. shape_v2 for calls that sent
+        x-shape-format: v2 and shape otherwise
+
+        :param record: shape to write
+        :param response: response with a shape and shape_v2 field, e.g. GetShapeResponse
+        :return: None
+        """
+        if shape_format.get() == 'v2':
+            record.write_shape_v2(response.shape_v2)
+        else:
+            record.write_shape(response.shape)
+
+    @staticmethod
+    def _get_total_area_response(total_area: float, valid_ids: List[ShapeService.ShapeId],
+                                 invalid_ids: List[ShapeService.ShapeId]) -> ShapeService.GetTotalAreaResponse:
+        """
+        Builds the GetTotalArea response once every shape_id in the request stream has been read
+
+        :param total_area: sum of the areas of the valid shapes
+        :param valid_ids: shape_ids that were found
+        :param invalid_ids: shape_ids that were invalid or not found
+        :return: ShapeService.GetTotalAreaResponse
+        """
+        response: ShapeService.GetTotalAreaResponse = ShapeService.GetTotalAreaResponse(
+            status_code=ShapeService.Code.OK,
+            message=""
+        )
+
+        if total_area > 0:
+            response.status_code = ShapeService.Code.OK
+            response.message = f"Total area of shapes {total_area} square units."
+            response.total_area = total_area
+            response.valid_ids.extend(valid_ids)
+            response.invalid_ids.extend(invalid_ids)
+        else:
+            response.status_code = ShapeService.Code.AREA_NOT_FOUND
+            response.message = f"Invalid Area: {total_area}."
+            response.invalid_ids.extend(invalid_ids)
+
+        return response
+
+    def _get_areas_page(self, shape_id: ShapeService.ShapeId) -> Tuple[Optional[int], int]:
+        """
+        Reads the page_size and resume_token of a GetAreas stream from its first shape_id
+
+        :param shape_id: first shape_id of the stream
+        :return: (maximum number of shape_ids to answer or None for no maximum, position of the first shape_id minus 1)
+        :raises ValueError: with the status code and message to return if the page_size or resume_token are invalid
+        """
+        if shape_id.HasField('page_size') and shape_id.page_size == 0:
+            raise ValueError(ShapeService.Code.INVALID_QUERY, "page_size must be greater than 0")
+
+        page_size: Optional[int] = shape_id.page_size if shape_id.HasField('page_size') else None
+        position: int = 0
+
+        if shape_id.resume_token:
+            try:
+                position = int(decode_resume_token("GetAreas", shape_id.resume_token)['position'])
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(ShapeService.Code.INVALID_RESUME_TOKEN, f"Invalid resume_token: {e}")
+
+        return page_size, position
+
+    def _get_area_response(self, shape_id: ShapeService.ShapeId, position: int,
+                           omit_message: bool = False) -> ShapeService.GetAreasResponse:
+        """
+        Looks up a single shape_id from a GetAreas request stream and builds its response
+
+        :param shape_id: shape_id to lookup
+        :param position: position of the shape_id in the stream, counting from 1 and continuing over resumed streams
+        :param omit_message: leave the message of the response empty if the shape is found
+        :return: ShapeService.GetAreasResponse
+        """
+        response: ShapeService.GetAreasResponse = ShapeService.GetAreasResponse(
+            status_code=ShapeService.Code.OK,
+            message="",
+            resume_token=encode_resume_token("GetAreas", {"position": position}),
+            sequence=position
+        )
+
+        record: ShapeRecord = self._find_shape(shape_id)
+
+        if record is not None:
+            response.status_code = ShapeService.Code.OK
+            response.area = record.area
+            self._write_shape(record, response)
+
+            if not omit_message:
+                response.message = f"{record.shape_id}: A={record.area} square units"
+
+            self.logger.info(f"{record.shape_id}: A={record.area} square units")
+        else:
+            response.status_code = ShapeService.Code.AREA_NOT_FOUND
+            response.message = f"{decode_shape_id(shape_id)} does not exist"
+
+        return response
+
+    def _get_stream_batch_size(self, request) -> int:
+        """
+        Reads the batch_size of a batched stream from its request, or from the first shape_id of a request stream
+
+        :param request: MinPerimeter or ShapeId with an optional batch_size
+        :return: number of results per message, capped at max_stream_batch_size
+        :raises ValueError: with the status code and message to return if the batch_size is invalid
+        """
+        if not request.HasField('batch_size'):
+            return self.max_stream_batch_size
+
+        if request.batch_size == 0:
+            raise ValueError(ShapeService.Code.INVALID_QUERY, "batch_size must be greater than 0")
+
+        return min(request.batch_size, self.max_stream_batch_size)
+
+    def _get_pipeline_window(self, shape_id: ShapeService.ShapeId) -> Optional[int]:
+        """
+        Reads the window of a pipelined GetAreas stream from its first shape_id
+
+        :param shape_id: first shape_id of the stream
+        :return: number of shape_ids to look up concurrently, capped at max_pipeline_window, or None if not pipelined
+        :raises ValueError: with the status code and message to return if the window is invalid
+        """
+        if not shape_id.HasField('window'):
+            return None
+
+        if shape_id.window == 0:
+            raise ValueError(ShapeService.Code.INVALID_QUERY, "window must be greater than 0")
+
+        return min(shape_id.window, self.max_pipeline_window)
+
+    @staticmethod
+    def _get_batches(responses: Iterator, batch_type: type, batch_size: int) -> Iterator:
+        """
+        Groups the responses of a stream into messages of the batch type, each holding up to batch_size of them as its
+        results. Each message is sent as soon as it is full and the last one holds whatever is left
+
+        :param responses: responses of the unbatched stream
+        :param batch_type: batch message type with a status_code and repeated results, e.g. GetAreasBatch
+        :param batch_size: maximum number of results per message
+        :return: Iterator of batch_type
+        """
+        batch = batch_type(status_code=ShapeService.Code.OK)
+
+        for response in responses:
+            batch.results.append(response)
+
+            if len(batch.results) >= batch_size:
+                yield batch
+                batch = batch_type(status_code=ShapeService.Code.OK)
+
+        if len(batch.results) > 0:
+            yield batch
+
+    def __get_area_responses(self, request: Iterator[ShapeService.ShapeId]) -> Iterator[ShapeService.GetAreasResponse]:
+        """
+        Answers each shape_id of a GetAreas request stream in order, without any delay between them. The first shape_id
+        carries the page_size, resume_token and omit_message of the stream. Once the stream is answered, i.e. after
+        page_size shape_ids or an invalid first shape_id, the rest of it is read without answering it so that the
+        client can finish sending normally
+
+        A window is validated but the shape_ids are still looked up one at a time, since reading the request stream
+        blocks the thread of the call. In-order results are valid for unordered streams too
+
+        :param request: iterator of shape_ids
+        :return: Iterator[ShapeService.GetAreasResponse]
+        """
+        page_size: Optional[int] = None
+        position: int = 0
+        omit_message: bool = False
+        answered: bool = False
+
+        for index, shape_id in enumerate(request):
+            if answered:
+                continue
+
+            if index == 0:
+                try:
+                    page_size, position = self._get_areas_page(shape_id)
+                    self._get_pipeline_window(shape_id)
+                    omit_message = shape_id.omit_message
+                except ValueError as e:
+                    yield ShapeService.GetAreasResponse(status_code=e.args[0], message=e.args[1])
+                    answered = True
+                    continue
+
+            position += 1
+            yield self._get_area_response(shape_id, position, omit_message)
+
+            if page_size is not None and index + 1 >= page_size:
+                answered = True
+
+    def __resume_range(self, metric: str, value: float, shape_id: str) -> Iterator[ShapeRecord]:
+        """
+        Iterates over the shapes of a metric's index after the shape at the given position. Shapes with equal values
+        are always returned by the repository in the same order, so the shapes with the same value up to and including
+        the position are skipped
+
+        :param metric: one of ShapeRepository.METRICS
+        :param value: metric value of the shape to resume after
+        :param shape_id: shape_id of the shape to resume after
+        :return: Iterator of the shapes after the position in ascending order of the metric
+        """
+        records: Iterator[ShapeRecord] = self.repository.range(metric, low=math.nextafter(value, -math.inf))
+
+        for record in records:
+            if record.shape_id == shape_id:
+                break
+
+            # The shape at the position was passed without being seen, so every shape from here on is after it
+            if getattr(record, metric) != value:
+                yield record
+                break
+
+        yield from records
+
+    def __get_shape_from_id(self, shape_id: ShapeService.ShapeId) -> ShapeRecord:
+        """
+        Provided a shape_id attempt to locate it in the database, otherwise throw a LookupError with the appropriate
+        ShapeService.Code status code to indicate why the shape was not found
+
+        :param shape_id: shape to lookup
+        :return: ShapeRecord
+        """
+        key: Optional[Tuple[str, int]] = self.__resolve_shape_id(shape_id)
+
+        # Match the shape_type of the id to a shape_type in the database
+        if key is None:
+            raise LookupError(f"{ShapeService.Code.INVALID_SHAPE}")
+
+        record: ShapeRecord = self.repository.get(*key)
+
+        # Raise LookupError if a shape is not found in the database
+        if record is None:
+            raise LookupError(f"{ShapeService.Code.SHAPE_NOT_FOUND}")
+
+        return record
+
+    @staticmethod
+    def __get_shape_filter(request: ShapeService.ShapeQuery, shape_type: Optional[str]) -> ShapeFilter:
+        """
+        Builds the ShapeFilter for the filters set in a query
+
+        :param request: query to convert
+        :param shape_type: supported shape_type of the query, None if it is not filtered on
+        :return: ShapeFilter
+        :raises ValueError: if a range or the bounding box is empty
+        """
+        ranges: dict = {}
+
+        for metric in ShapeRepository.METRICS:
+            if not request.HasField(metric):
+                continue
+
+            metric_range: ShapeService.MetricRange = getattr(request, metric)
+            low: Optional[float] = metric_range.greater_than if metric_range.HasField('greater_than') else None
+            high: Optional[float] = metric_range.at_most if metric_range.HasField('at_most') else None
+
+            if low is not None and high is not None and low >= high:
+                raise ValueError(f"{metric} range is empty, greater_than {low} must be less than at_most {high}")
+
+            ranges[metric] = (low, high)
+
+        within: Optional[Tuple[int, int, int, int]] = None
+
+        if request.HasField('within'):
+            within = ShapeServer.__get_box(request.within)
+
+        return ShapeFilter(
+            shape_type=shape_type,
+            area=ranges.get('area'),
+            perimeter=ranges.get('perimeter'),
+            within=within
+        )
+
+    @staticmethod
+    def __get_box(box: ShapeService.BoundingBox) -> Tuple[int, int, int, int]:
+        """
+        Converts a BoundingBox to a tuple
+
+        :param box: box to convert
+        :return: (min_x, min_y, max_x, max_y)
+        :raises ValueError: if the box is empty
+        """
+        if box.min_x > box.max_x or box.min_y > box.max_y:
+            raise ValueError(f"Bounding box ({box.min_x}, {box.min_y}) to ({box.max_x}, {box.max_y}) is empty, "
+                             f"min_x and min_y must not be greater than max_x and max_y")
+
+        return box.min_x, box.min_y, box.max_x, box.max_y
+
+    def __log_cache_stats_periodically(self):
+        while True:
+            time.sleep(self.cache_stats_interval)
+            self.logger.info(f"GetShape response cache: {self.response_cache.get_stats()}")
+
+    def __generate_shape(self, shape_type: str) -> Optional[List[Tuple[int, int]]]:
+        """
+        Generates the vertices of a shape of the given shape_type
+
+        :param shape_type: shape_type to generate, e.g. Triangle
+        :return: (x, y) vertices of the shape, or None if the shape_type is not supported
+        """
+        if shape_type == "Triangle":
+            return self.__get_triangle()
+        elif shape_type == "Rectangle":
+            return self.__get_rectangle()
+        elif shape_type == "Pentagon":
+            return self.__get_pentagon()
+        else:
+            return None
+
+    def __get_cache_key(self, request: ShapeService.ShapeId) -> Optional[tuple]:
+        """
+        Returns the key of the cached GetShape response for a request, the same for the string and numeric forms of a
+        shape_id
+
+        :param request: gRPC Request containing the id to lookup
+        :return: (shape format, shape_id), or None if the shape_id is not valid
+        """
+        key: Optional[Tuple[str, int]] = self.__resolve_shape_id(request)
+
+        return None if key is None else (shape_format.get(), format_shape_id(key[0][0], key[1]))
+
+    def __resolve_shape_id(self, shape_id: ShapeService.ShapeId) -> Optional[Tuple[str, int]]:
+        """
+        Resolves a requested shape_id to the shape key and seq it is stored under, from its numeric_id when set and
+        from its string form otherwise, e.g. t-1 to (Triangles, 1)
+
+        :param shape_id: shape_id to resolve
+        :return: (shape key, seq), or None if the shape_id is malformed or not of a supported shape type
+        """
+        if shape_id.HasField('numeric_id'):
+            numeric_id: ShapeService.NumericShapeId = shape_id.numeric_id
+            shape_key: Optional[str] = self.kind_keys.get(numeric_id.kind)
+
+            return None if shape_key is None else (shape_key, numeric_id.seq)
+
+        parsed: Optional[Tuple[str, int]] = parse_shape_id(shape_id.shape_id)
+
+        if parsed is None:
+            return None
+
+        shape_key = self.repository.get_shape_key(parsed[0])
+
+        return None if shape_key is None else (shape_key, parsed[1])
+
+    def __get_triangle (self) -> List[Tuple[int, int]]:
+        """
+        Generates a triangle with a random width and height
+    
+        :return: (x, y) vertices of a triangle
+        """
+        width: int = 2*random.randint(1, self.max_width) # double the width to make division easy for middle point
+        height: int = random.randint(1, self.max_height)
+    
+        return [
+            (0, 0),
+            (int(width/2), height),
+            (width, 0)
+        ]
+
+    def __get_rectangle(self) -> List[Tuple[int, int]]:
+        """
+        Generates a rectangle with a random width and height
+
+        :return: (x, y) vertices of a rectangle
+        """
+        width: int = random.randint(1, self.max_width)  # double the height to make division easy for middle point
+        height: int = random.randint(1, self.max_height)
+
+        return [
+            (0, 0),
+            (0, height),
+            (width, height),
+            (width, 0)
+        ]
+
+    def __get_pentagon(self) -> List[Tuple[int, int]]:
+        """
+        Generates a pentagon with a random width and height
+
+        :return: (x, y) vertices of a pentagon
+        """
+        width: int = 2 * random.randint(1, self.max_width)  # double the width to make division easy for middle point
+        height: int = 2 * random.randint(1,
+                                         self.max_height)  # double the height to make integer division easier for middle height
+
+        return [
+            (0, 0),
+            (0, int(height / 2)),
+            (int(width / 2), height),
+            (width, int(height / 2)),
+            (width, 0)
+        ]
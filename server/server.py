@@ -1,14 +1,24 @@
+import os
 import grpc
+import signal
 import asyncio
 import contextvars
 from concurrent import futures
 
 import lib.functions as helpers
 from lib.objects.logger import Logger
+from lib.objects.call_metrics import CallMetrics
+from lib.objects.nonce_cache import NonceCache
+from lib.objects.sqlite_nonce_cache import SqliteNonceCache
+from lib.objects.worker_supervisor import WorkerSupervisor
 import lib.interceptors as interceptors
+import shape_service_pb2 as ShapeService
 import shape_service_pb2_grpc as ShapeServiceGrpc
+from grpc_health.v1 import health_pb2 as HealthService
 from lib.services.shape_service import ShapeServer
+from lib.services.async_shape_service import AsyncShapeServer
 from lib.services.health_check_service import configure_health_server
+from lib.repositories.repository_factory import get_shape_repository
 
 async def serve(logger, config):
 
@@ -16,22 +26,68 @@ async def serve(logger, config):
     server_cert = helpers.credentials.load_credential_from_file(config['general']['server_certificate'])
     server_key = helpers.credentials.load_credential_from_file(config['general']['server_key'])
 
-    # Create server and bind interceptors
+    # Create server and bind interceptors, the health service is left unsigned so that it can be probed freely
+    method_registry = interceptors.MethodRegistry((
+        ShapeService.DESCRIPTOR.services_by_name['ShapeService'],
+        HealthService.DESCRIPTOR.services_by_name['Health'],
+    ))
+
+    # The workers of a multi-process server share their nonces through a SQLite database, so that a call cannot be
+    # replayed once on every worker
+    max_nonces: int = int(config['general']['signature_max_nonces'])
+
+    if get_workers(config) == 1:
+        nonce_cache: NonceCache = NonceCache(max_nonces)
+    else:
+        nonce_cache: NonceCache = SqliteNonceCache(
+            config['storage']['nonce_path'], max_nonces, float(config['general']['signature_expire_interval_s'])
+        )
+
     signature_interceptor = interceptors.SignatureValidationInterceptor(
                 sig_header=config['general']['signature_header'],
-                sig_value=config['general']['signature_value']
+                keys=dict(config['signature_keys']),
+                window=int(config['general']['signature_window_s']),
+                max_nonces=max_nonces,
+                exempt_services=(HealthService.DESCRIPTOR.services_by_name['Health'].full_name,),
+                nonce_cache=nonce_cache
     )
 
-    # When adding interceptors to the server, remember that they are evaluated in the order that they are added
+    # Metrics of every call this process serves, reported by GetMetrics
+    call_metrics = CallMetrics()
+
+    # When adding interceptors to the chain, remember that they are evaluated in the order that they are added. The
+    # metrics interceptor comes first so that calls rejected by the chain are recorded too. The workers of a
+    # multi-process server all bind the same port, and the kernel spreads new connections across them. A single worker
+    # does not share its port, so that a second server started on the same port fails to bind rather than silently
+    # taking half of the connections
     server = grpc.aio.server(
         futures.ThreadPoolExecutor(max_workers=int(config['general']['max_threads'])),
         interceptors=(
-            signature_interceptor,
+            interceptors.MetricsInterceptor(method_registry, call_metrics),
+            interceptors.InterceptorChain(method_registry, (
+                signature_interceptor,
+            )),
+        ),
+        options=(
+            ("grpc.so_reuseport", int(get_workers(config) > 1)),
         ),
     )
 
-    # Add GRPC Service to Server
-    ShapeServiceGrpc.add_ShapeServiceServicer_to_server(ShapeServer(logger, config), server)
+    # Add GRPC Service to Server. The async servicer runs every method on the event loop, while the sync servicer
+    # runs each method on a thread from the ThreadPoolExecutor above
+    servicer_type: str = config['general']['servicer']
+
+    if servicer_type == "async":
+        servicer: ShapeServer = AsyncShapeServer(logger, config, call_metrics)
+    elif servicer_type == "sync":
+        servicer: ShapeServer = ShapeServer(logger, config, call_metrics)
+    else:
+        raise ValueError(f"Invalid servicer provided {servicer_type}")
+
+    # Report the replays caught by the signature interceptor next to the call metrics
+    servicer.metric_counters["nonce_cache"] = signature_interceptor.nonce_cache.get_stats
+
+    ShapeServiceGrpc.add_ShapeServiceServicer_to_server(servicer, server)
 
     # Attach Credentials to Server
     server_credentials = grpc.ssl_server_credentials(
@@ -51,9 +107,46 @@ async def serve(logger, config):
     # Add Health Check Service
     configure_health_server(server, logger)
 
-    # Start Async Server
+    # Start Async Server, the repository is closed on shutdown so that it can flush anything it holds in memory
     await server.start()
-    await server.wait_for_termination()
+
+    # Stop the server gracefully on SIGINT and SIGTERM so that the repository is always closed
+    loop = asyncio.get_running_loop()
+
+    for shutdown_signal in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(shutdown_signal, lambda: asyncio.ensure_future(server.stop(grace=None)))
+        except NotImplementedError:
+            # Signal handlers are not supported by the event loop on Windows
+            pass
+
+    try:
+        await server.wait_for_termination()
+    finally:
+        servicer.repository.close()
+        servicer.geometry_pool.close()
+
+def get_workers(config) -> int:
+    """
+    Returns the number of worker processes to serve with, 0 in the config starts one worker per CPU core
+
+    :param config: server config
+    :return: number of workers
+    """
+    return int(config['general']['workers']) or os.cpu_count()
+
+def run_worker():
+    """
+    Entry point of the worker processes started by the WorkerSupervisor, each of which loads its own configuration and
+    serves until it receives SIGINT or SIGTERM
+    """
+    worker_config = helpers.get_config()
+
+    correlation_id = contextvars.ContextVar('correlation_id', default='')
+
+    worker_logger = Logger(worker_config, correlation_id)
+
+    asyncio.run(serve(worker_logger, worker_config))
 
 if __name__ == "__main__":
     # Setup Configuration and Logging
@@ -65,4 +158,23 @@ if __name__ == "__main__":
     helpers.log_config(server_logger, server_config)
 
     # Start Server
-    asyncio.run(serve(server_logger, server_config))
\ No newline at end of file
+    workers: int = get_workers(server_config)
+
+    if workers == 1:
+        asyncio.run(serve(server_logger, server_config))
+    else:
+        # Workers only see each other's shapes through a store outside of their own memory
+        backend: str = server_config['storage']['backend']
+
+        if backend != "sqlite":
+            raise ValueError(f"Running {workers} workers requires backend=sqlite, got {backend}")
+
+        # Create or migrate the database and the nonce database once here rather than concurrently in every worker.
+        # Nonces are not kept across restarts, as with a single worker, so the nonce database starts empty
+        get_shape_repository(server_config, server_logger).close()
+        SqliteNonceCache.reset(server_config['storage']['nonce_path'])
+        SqliteNonceCache(
+            server_config['storage']['nonce_path'], int(server_config['general']['signature_max_nonces'])
+        ).close()
+
+        WorkerSupervisor(server_logger, run_worker, workers).run()
\ No newline at end of file
@@ -6,6 +6,13 @@ from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Map
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
+class ShapeKind(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    SHAPE_KIND_UNSPECIFIED: _ClassVar[ShapeKind]
+    TRIANGLE: _ClassVar[ShapeKind]
+    RECTANGLE: _ClassVar[ShapeKind]
+    PENTAGON: _ClassVar[ShapeKind]
+
 class Code(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     __slots__ = ()
     OK: _ClassVar[Code]
@@ -14,44 +21,64 @@ class Code(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     INVALID_SHAPE_ID: _ClassVar[Code]
     SHAPE_NOT_FOUND: _ClassVar[Code]
     AREA_NOT_FOUND: _ClassVar[Code]
+    BATCH_TOO_LARGE: _ClassVar[Code]
+    STORAGE_ERROR: _ClassVar[Code]
+    INVALID_QUERY: _ClassVar[Code]
+    INVALID_RESUME_TOKEN: _ClassVar[Code]
+SHAPE_KIND_UNSPECIFIED: ShapeKind
+TRIANGLE: ShapeKind
+RECTANGLE: ShapeKind
+PENTAGON: ShapeKind
 OK: Code
 INVALID_SHAPE: Code
 INVALID_PERIMETER: Code
 INVALID_SHAPE_ID: Code
 SHAPE_NOT_FOUND: Code
 AREA_NOT_FOUND: Code
+BATCH_TOO_LARGE: Code
+STORAGE_ERROR: Code
+INVALID_QUERY: Code
+INVALID_RESUME_TOKEN: Code
 
 class CreateShapeResponse(_message.Message):
-    __slots__ = ("status_code", "message", "shape")
+    __slots__ = ("status_code", "message", "shape", "shape_v2")
     STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
     SHAPE_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_V2_FIELD_NUMBER: _ClassVar[int]
     status_code: Code
     message: str
     shape: Shape
-    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ...) -> None: ...
+    shape_v2: ShapeV2
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ..., shape_v2: _Optional[_Union[ShapeV2, _Mapping]] = ...) -> None: ...
 
 class GetShapeResponse(_message.Message):
-    __slots__ = ("status_code", "message", "shape")
+    __slots__ = ("status_code", "message", "shape", "shape_v2")
     STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
     SHAPE_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_V2_FIELD_NUMBER: _ClassVar[int]
     status_code: Code
     message: str
     shape: Shape
-    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ...) -> None: ...
+    shape_v2: ShapeV2
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ..., shape_v2: _Optional[_Union[ShapeV2, _Mapping]] = ...) -> None: ...
 
 class GetPerimetersGreaterThanResponse(_message.Message):
-    __slots__ = ("status_code", "message", "perimeter", "shape")
+    __slots__ = ("status_code", "message", "perimeter", "shape", "resume_token", "shape_v2")
     STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
     PERIMETER_FIELD_NUMBER: _ClassVar[int]
     SHAPE_FIELD_NUMBER: _ClassVar[int]
+    RESUME_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_V2_FIELD_NUMBER: _ClassVar[int]
     status_code: Code
     message: str
     perimeter: float
     shape: Shape
-    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., perimeter: _Optional[float] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ...) -> None: ...
+    resume_token: str
+    shape_v2: ShapeV2
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., perimeter: _Optional[float] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ..., resume_token: _Optional[str] = ..., shape_v2: _Optional[_Union[ShapeV2, _Mapping]] = ...) -> None: ...
 
 class GetTotalAreaResponse(_message.Message):
     __slots__ = ("status_code", "message", "total_area", "valid_ids", "invalid_ids")
@@ -68,22 +95,260 @@ class GetTotalAreaResponse(_message.Message):
     def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., total_area: _Optional[float] = ..., valid_ids: _Optional[_Iterable[_Union[ShapeId, _Mapping]]] = ..., invalid_ids: _Optional[_Iterable[_Union[ShapeId, _Mapping]]] = ...) -> None: ...
 
 class GetAreasResponse(_message.Message):
-    __slots__ = ("status_code", "message", "area", "shape")
+    __slots__ = ("status_code", "message", "area", "shape", "resume_token", "sequence", "shape_v2")
     STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
     AREA_FIELD_NUMBER: _ClassVar[int]
     SHAPE_FIELD_NUMBER: _ClassVar[int]
+    RESUME_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    SEQUENCE_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_V2_FIELD_NUMBER: _ClassVar[int]
+    status_code: Code
+    message: str
+    area: float
+    shape: Shape
+    resume_token: str
+    sequence: int
+    shape_v2: ShapeV2
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., area: _Optional[float] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ..., resume_token: _Optional[str] = ..., sequence: _Optional[int] = ..., shape_v2: _Optional[_Union[ShapeV2, _Mapping]] = ...) -> None: ...
+
+class BatchGetShapesResponse(_message.Message):
+    __slots__ = ("status_code", "message", "results")
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    RESULTS_FIELD_NUMBER: _ClassVar[int]
+    status_code: Code
+    message: str
+    results: _containers.RepeatedCompositeFieldContainer[GetShapeResponse]
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., results: _Optional[_Iterable[_Union[GetShapeResponse, _Mapping]]] = ...) -> None: ...
+
+class GetPerimetersGreaterThanBatch(_message.Message):
+    __slots__ = ("status_code", "message", "results")
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    RESULTS_FIELD_NUMBER: _ClassVar[int]
+    status_code: Code
+    message: str
+    results: _containers.RepeatedCompositeFieldContainer[GetPerimetersGreaterThanResponse]
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., results: _Optional[_Iterable[_Union[GetPerimetersGreaterThanResponse, _Mapping]]] = ...) -> None: ...
+
+class GetAreasBatch(_message.Message):
+    __slots__ = ("status_code", "message", "results")
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    RESULTS_FIELD_NUMBER: _ClassVar[int]
+    status_code: Code
+    message: str
+    results: _containers.RepeatedCompositeFieldContainer[GetAreasResponse]
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., results: _Optional[_Iterable[_Union[GetAreasResponse, _Mapping]]] = ...) -> None: ...
+
+class BatchCreateShapesResponse(_message.Message):
+    __slots__ = ("status_code", "message", "results")
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    RESULTS_FIELD_NUMBER: _ClassVar[int]
+    status_code: Code
+    message: str
+    results: _containers.RepeatedCompositeFieldContainer[CreateShapeResponse]
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., results: _Optional[_Iterable[_Union[CreateShapeResponse, _Mapping]]] = ...) -> None: ...
+
+class IngestSummary(_message.Message):
+    __slots__ = ("status_code", "message", "received", "created", "failed", "commits", "elapsed_seconds", "shapes_per_second", "failures")
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    RECEIVED_FIELD_NUMBER: _ClassVar[int]
+    CREATED_FIELD_NUMBER: _ClassVar[int]
+    FAILED_FIELD_NUMBER: _ClassVar[int]
+    COMMITS_FIELD_NUMBER: _ClassVar[int]
+    ELAPSED_SECONDS_FIELD_NUMBER: _ClassVar[int]
+    SHAPES_PER_SECOND_FIELD_NUMBER: _ClassVar[int]
+    FAILURES_FIELD_NUMBER: _ClassVar[int]
+    status_code: Code
+    message: str
+    received: int
+    created: int
+    failed: int
+    commits: int
+    elapsed_seconds: float
+    shapes_per_second: float
+    failures: _containers.RepeatedCompositeFieldContainer[IngestFailure]
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., received: _Optional[int] = ..., created: _Optional[int] = ..., failed: _Optional[int] = ..., commits: _Optional[int] = ..., elapsed_seconds: _Optional[float] = ..., shapes_per_second: _Optional[float] = ..., failures: _Optional[_Iterable[_Union[IngestFailure, _Mapping]]] = ...) -> None: ...
+
+class IngestFailure(_message.Message):
+    __slots__ = ("index", "status_code", "message")
+    INDEX_FIELD_NUMBER: _ClassVar[int]
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    index: int
+    status_code: Code
+    message: str
+    def __init__(self, index: _Optional[int] = ..., status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ...) -> None: ...
+
+class QueryShapesResponse(_message.Message):
+    __slots__ = ("status_code", "message", "shape", "area", "perimeter", "shape_v2")
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_FIELD_NUMBER: _ClassVar[int]
+    AREA_FIELD_NUMBER: _ClassVar[int]
+    PERIMETER_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_V2_FIELD_NUMBER: _ClassVar[int]
     status_code: Code
     message: str
+    shape: Shape
     area: float
+    perimeter: float
+    shape_v2: ShapeV2
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ..., area: _Optional[float] = ..., perimeter: _Optional[float] = ..., shape_v2: _Optional[_Union[ShapeV2, _Mapping]] = ...) -> None: ...
+
+class GetShapesIntersectingResponse(_message.Message):
+    __slots__ = ("status_code", "message", "shape", "shape_v2")
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_V2_FIELD_NUMBER: _ClassVar[int]
+    status_code: Code
+    message: str
     shape: Shape
-    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., area: _Optional[float] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ...) -> None: ...
+    shape_v2: ShapeV2
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ..., shape_v2: _Optional[_Union[ShapeV2, _Mapping]] = ...) -> None: ...
+
+class GetShapesContainingResponse(_message.Message):
+    __slots__ = ("status_code", "message", "shape", "shape_v2")
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_V2_FIELD_NUMBER: _ClassVar[int]
+    status_code: Code
+    message: str
+    shape: Shape
+    shape_v2: ShapeV2
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., shape: _Optional[_Union[Shape, _Mapping]] = ..., shape_v2: _Optional[_Union[ShapeV2, _Mapping]] = ...) -> None: ...
+
+class GetMetricsResponse(_message.Message):
+    __slots__ = ("status_code", "message", "latency_bounds", "methods", "counters", "prometheus_text")
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    LATENCY_BOUNDS_FIELD_NUMBER: _ClassVar[int]
+    METHODS_FIELD_NUMBER: _ClassVar[int]
+    COUNTERS_FIELD_NUMBER: _ClassVar[int]
+    PROMETHEUS_TEXT_FIELD_NUMBER: _ClassVar[int]
+    status_code: Code
+    message: str
+    latency_bounds: _containers.RepeatedScalarFieldContainer[float]
+    methods: _containers.RepeatedCompositeFieldContainer[MethodMetrics]
+    counters: _containers.RepeatedCompositeFieldContainer[CounterGroup]
+    prometheus_text: str
+    def __init__(self, status_code: _Optional[_Union[Code, str]] = ..., message: _Optional[str] = ..., latency_bounds: _Optional[_Iterable[float]] = ..., methods: _Optional[_Iterable[_Union[MethodMetrics, _Mapping]]] = ..., counters: _Optional[_Iterable[_Union[CounterGroup, _Mapping]]] = ..., prometheus_text: _Optional[str] = ...) -> None: ...
+
+class MethodMetrics(_message.Message):
+    __slots__ = ("method", "status_counts", "in_flight", "latency_buckets", "latency_sum", "bytes_in", "bytes_out")
+    class StatusCountsEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: int
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[int] = ...) -> None: ...
+    METHOD_FIELD_NUMBER: _ClassVar[int]
+    STATUS_COUNTS_FIELD_NUMBER: _ClassVar[int]
+    IN_FLIGHT_FIELD_NUMBER: _ClassVar[int]
+    LATENCY_BUCKETS_FIELD_NUMBER: _ClassVar[int]
+    LATENCY_SUM_FIELD_NUMBER: _ClassVar[int]
+    BYTES_IN_FIELD_NUMBER: _ClassVar[int]
+    BYTES_OUT_FIELD_NUMBER: _ClassVar[int]
+    method: str
+    status_counts: _containers.ScalarMap[str, int]
+    in_flight: int
+    latency_buckets: _containers.RepeatedScalarFieldContainer[int]
+    latency_sum: float
+    bytes_in: int
+    bytes_out: int
+    def __init__(self, method: _Optional[str] = ..., status_counts: _Optional[_Mapping[str, int]] = ..., in_flight: _Optional[int] = ..., latency_buckets: _Optional[_Iterable[int]] = ..., latency_sum: _Optional[float] = ..., bytes_in: _Optional[int] = ..., bytes_out: _Optional[int] = ...) -> None: ...
+
+class CounterGroup(_message.Message):
+    __slots__ = ("name", "counters")
+    class CountersEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: float
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[float] = ...) -> None: ...
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    COUNTERS_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    counters: _containers.ScalarMap[str, float]
+    def __init__(self, name: _Optional[str] = ..., counters: _Optional[_Mapping[str, float]] = ...) -> None: ...
+
+class BatchGetShapesRequest(_message.Message):
+    __slots__ = ("shape_ids",)
+    SHAPE_IDS_FIELD_NUMBER: _ClassVar[int]
+    shape_ids: _containers.RepeatedCompositeFieldContainer[ShapeId]
+    def __init__(self, shape_ids: _Optional[_Iterable[_Union[ShapeId, _Mapping]]] = ...) -> None: ...
+
+class BatchCreateShapesRequest(_message.Message):
+    __slots__ = ("shape_types",)
+    SHAPE_TYPES_FIELD_NUMBER: _ClassVar[int]
+    shape_types: _containers.RepeatedCompositeFieldContainer[ShapeType]
+    def __init__(self, shape_types: _Optional[_Iterable[_Union[ShapeType, _Mapping]]] = ...) -> None: ...
+
+class GetMetricsRequest(_message.Message):
+    __slots__ = ("prometheus_text",)
+    PROMETHEUS_TEXT_FIELD_NUMBER: _ClassVar[int]
+    prometheus_text: bool
+    def __init__(self, prometheus_text: bool = ...) -> None: ...
 
 class MinPerimeter(_message.Message):
-    __slots__ = ("min_perimeter",)
+    __slots__ = ("min_perimeter", "limit", "page_size", "resume_token", "batch_size", "omit_message")
     MIN_PERIMETER_FIELD_NUMBER: _ClassVar[int]
+    LIMIT_FIELD_NUMBER: _ClassVar[int]
+    PAGE_SIZE_FIELD_NUMBER: _ClassVar[int]
+    RESUME_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    BATCH_SIZE_FIELD_NUMBER: _ClassVar[int]
+    OMIT_MESSAGE_FIELD_NUMBER: _ClassVar[int]
     min_perimeter: float
-    def __init__(self, min_perimeter: _Optional[float] = ...) -> None: ...
+    limit: int
+    page_size: int
+    resume_token: str
+    batch_size: int
+    omit_message: bool
+    def __init__(self, min_perimeter: _Optional[float] = ..., limit: _Optional[int] = ..., page_size: _Optional[int] = ..., resume_token: _Optional[str] = ..., batch_size: _Optional[int] = ..., omit_message: bool = ...) -> None: ...
+
+class ShapeQuery(_message.Message):
+    __slots__ = ("shape_type", "area", "perimeter", "within", "limit", "offset")
+    SHAPE_TYPE_FIELD_NUMBER: _ClassVar[int]
+    AREA_FIELD_NUMBER: _ClassVar[int]
+    PERIMETER_FIELD_NUMBER: _ClassVar[int]
+    WITHIN_FIELD_NUMBER: _ClassVar[int]
+    LIMIT_FIELD_NUMBER: _ClassVar[int]
+    OFFSET_FIELD_NUMBER: _ClassVar[int]
+    shape_type: str
+    area: MetricRange
+    perimeter: MetricRange
+    within: BoundingBox
+    limit: int
+    offset: int
+    def __init__(self, shape_type: _Optional[str] = ..., area: _Optional[_Union[MetricRange, _Mapping]] = ..., perimeter: _Optional[_Union[MetricRange, _Mapping]] = ..., within: _Optional[_Union[BoundingBox, _Mapping]] = ..., limit: _Optional[int] = ..., offset: _Optional[int] = ...) -> None: ...
+
+class MetricRange(_message.Message):
+    __slots__ = ("greater_than", "at_most")
+    GREATER_THAN_FIELD_NUMBER: _ClassVar[int]
+    AT_MOST_FIELD_NUMBER: _ClassVar[int]
+    greater_than: float
+    at_most: float
+    def __init__(self, greater_than: _Optional[float] = ..., at_most: _Optional[float] = ...) -> None: ...
+
+class BoundingBox(_message.Message):
+    __slots__ = ("min_x", "min_y", "max_x", "max_y")
+    MIN_X_FIELD_NUMBER: _ClassVar[int]
+    MIN_Y_FIELD_NUMBER: _ClassVar[int]
+    MAX_X_FIELD_NUMBER: _ClassVar[int]
+    MAX_Y_FIELD_NUMBER: _ClassVar[int]
+    min_x: int
+    min_y: int
+    max_x: int
+    max_y: int
+    def __init__(self, min_x: _Optional[int] = ..., min_y: _Optional[int] = ..., max_x: _Optional[int] = ..., max_y: _Optional[int] = ...) -> None: ...
 
 class ShapeType(_message.Message):
     __slots__ = ("shape_type",)
@@ -92,10 +357,32 @@ class ShapeType(_message.Message):
     def __init__(self, shape_type: _Optional[str] = ...) -> None: ...
 
 class ShapeId(_message.Message):
-    __slots__ = ("shape_id",)
+    __slots__ = ("shape_id", "page_size", "resume_token", "batch_size", "omit_message", "window", "unordered", "numeric_id")
     SHAPE_ID_FIELD_NUMBER: _ClassVar[int]
+    PAGE_SIZE_FIELD_NUMBER: _ClassVar[int]
+    RESUME_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    BATCH_SIZE_FIELD_NUMBER: _ClassVar[int]
+    OMIT_MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    WINDOW_FIELD_NUMBER: _ClassVar[int]
+    UNORDERED_FIELD_NUMBER: _ClassVar[int]
+    NUMERIC_ID_FIELD_NUMBER: _ClassVar[int]
     shape_id: str
-    def __init__(self, shape_id: _Optional[str] = ...) -> None: ...
+    page_size: int
+    resume_token: str
+    batch_size: int
+    omit_message: bool
+    window: int
+    unordered: bool
+    numeric_id: NumericShapeId
+    def __init__(self, shape_id: _Optional[str] = ..., page_size: _Optional[int] = ..., resume_token: _Optional[str] = ..., batch_size: _Optional[int] = ..., omit_message: bool = ..., window: _Optional[int] = ..., unordered: bool = ..., numeric_id: _Optional[_Union[NumericShapeId, _Mapping]] = ...) -> None: ...
+
+class NumericShapeId(_message.Message):
+    __slots__ = ("kind", "seq")
+    KIND_FIELD_NUMBER: _ClassVar[int]
+    SEQ_FIELD_NUMBER: _ClassVar[int]
+    kind: ShapeKind
+    seq: int
+    def __init__(self, kind: _Optional[_Union[ShapeKind, str]] = ..., seq: _Optional[int] = ...) -> None: ...
 
 class Shape(_message.Message):
     __slots__ = ("shape_id", "shape_type", "coords")
@@ -114,3 +401,15 @@ class ShapeCoord(_message.Message):
     x: int
     y: int
     def __init__(self, x: _Optional[int] = ..., y: _Optional[int] = ...) -> None: ...
+
+class ShapeV2(_message.Message):
+    __slots__ = ("shape_id", "shape_type", "xs", "ys")
+    SHAPE_ID_FIELD_NUMBER: _ClassVar[int]
+    SHAPE_TYPE_FIELD_NUMBER: _ClassVar[int]
+    XS_FIELD_NUMBER: _ClassVar[int]
+    YS_FIELD_NUMBER: _ClassVar[int]
+    shape_id: str
+    shape_type: str
+    xs: _containers.RepeatedScalarFieldContainer[int]
+    ys: _containers.RepeatedScalarFieldContainer[int]
+    def __init__(self, shape_id: _Optional[str] = ..., shape_type: _Optional[str] = ..., xs: _Optional[_Iterable[int]] = ..., ys: _Optional[_Iterable[int]] = ...) -> None: ...
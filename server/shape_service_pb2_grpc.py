@@ -59,6 +59,51 @@ class ShapeServiceStub(object):
                 request_serializer=shape__service__pb2.ShapeId.SerializeToString,
                 response_deserializer=shape__service__pb2.GetAreasResponse.FromString,
                 _registered_method=True)
+        self.BatchGetShapes = channel.unary_unary(
+                '/ShapeService/BatchGetShapes',
+                request_serializer=shape__service__pb2.BatchGetShapesRequest.SerializeToString,
+                response_deserializer=shape__service__pb2.BatchGetShapesResponse.FromString,
+                _registered_method=True)
+        self.BatchCreateShapes = channel.unary_unary(
+                '/ShapeService/BatchCreateShapes',
+                request_serializer=shape__service__pb2.BatchCreateShapesRequest.SerializeToString,
+                response_deserializer=shape__service__pb2.BatchCreateShapesResponse.FromString,
+                _registered_method=True)
+        self.IngestShapes = channel.stream_unary(
+                '/ShapeService/IngestShapes',
+                request_serializer=shape__service__pb2.ShapeType.SerializeToString,
+                response_deserializer=shape__service__pb2.IngestSummary.FromString,
+                _registered_method=True)
+        self.QueryShapes = channel.unary_stream(
+                '/ShapeService/QueryShapes',
+                request_serializer=shape__service__pb2.ShapeQuery.SerializeToString,
+                response_deserializer=shape__service__pb2.QueryShapesResponse.FromString,
+                _registered_method=True)
+        self.GetShapesIntersecting = channel.unary_stream(
+                '/ShapeService/GetShapesIntersecting',
+                request_serializer=shape__service__pb2.BoundingBox.SerializeToString,
+                response_deserializer=shape__service__pb2.GetShapesIntersectingResponse.FromString,
+                _registered_method=True)
+        self.GetShapesContaining = channel.unary_stream(
+                '/ShapeService/GetShapesContaining',
+                request_serializer=shape__service__pb2.ShapeCoord.SerializeToString,
+                response_deserializer=shape__service__pb2.GetShapesContainingResponse.FromString,
+                _registered_method=True)
+        self.GetPerimetersGreaterThanBatched = channel.unary_stream(
+                '/ShapeService/GetPerimetersGreaterThanBatched',
+                request_serializer=shape__service__pb2.MinPerimeter.SerializeToString,
+                response_deserializer=shape__service__pb2.GetPerimetersGreaterThanBatch.FromString,
+                _registered_method=True)
+        self.GetAreasBatched = channel.stream_stream(
+                '/ShapeService/GetAreasBatched',
+                request_serializer=shape__service__pb2.ShapeId.SerializeToString,
+                response_deserializer=shape__service__pb2.GetAreasBatch.FromString,
+                _registered_method=True)
+        self.GetMetrics = channel.unary_unary(
+                '/ShapeService/GetMetrics',
+                request_serializer=shape__service__pb2.GetMetricsRequest.SerializeToString,
+                response_deserializer=shape__service__pb2.GetMetricsResponse.FromString,
+                _registered_method=True)
 
 
 class ShapeServiceServicer(object):
@@ -94,6 +139,60 @@ class ShapeServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchGetShapes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchCreateShapes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def IngestShapes(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def QueryShapes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetShapesIntersecting(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetShapesContaining(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetPerimetersGreaterThanBatched(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetAreasBatched(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMetrics(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ShapeServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -122,6 +221,51 @@ def add_ShapeServiceServicer_to_server(servicer, server):
                     request_deserializer=shape__service__pb2.ShapeId.FromString,
                     response_serializer=shape__service__pb2.GetAreasResponse.SerializeToString,
             ),
+            'BatchGetShapes': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetShapes,
+                    request_deserializer=shape__service__pb2.BatchGetShapesRequest.FromString,
+                    response_serializer=shape__service__pb2.BatchGetShapesResponse.SerializeToString,
+            ),
+            'BatchCreateShapes': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchCreateShapes,
+                    request_deserializer=shape__service__pb2.BatchCreateShapesRequest.FromString,
+                    response_serializer=shape__service__pb2.BatchCreateShapesResponse.SerializeToString,
+            ),
+            'IngestShapes': grpc.stream_unary_rpc_method_handler(
+                    servicer.IngestShapes,
+                    request_deserializer=shape__service__pb2.ShapeType.FromString,
+                    response_serializer=shape__service__pb2.IngestSummary.SerializeToString,
+            ),
+            'QueryShapes': grpc.unary_stream_rpc_method_handler(
+                    servicer.QueryShapes,
+                    request_deserializer=shape__service__pb2.ShapeQuery.FromString,
+                    response_serializer=shape__service__pb2.QueryShapesResponse.SerializeToString,
+            ),
+            'GetShapesIntersecting': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetShapesIntersecting,
+                    request_deserializer=shape__service__pb2.BoundingBox.FromString,
+                    response_serializer=shape__service__pb2.GetShapesIntersectingResponse.SerializeToString,
+            ),
+            'GetShapesContaining': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetShapesContaining,
+                    request_deserializer=shape__service__pb2.ShapeCoord.FromString,
+                    response_serializer=shape__service__pb2.GetShapesContainingResponse.SerializeToString,
+            ),
+            'GetPerimetersGreaterThanBatched': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetPerimetersGreaterThanBatched,
+                    request_deserializer=shape__service__pb2.MinPerimeter.FromString,
+                    response_serializer=shape__service__pb2.GetPerimetersGreaterThanBatch.SerializeToString,
+            ),
+            'GetAreasBatched': grpc.stream_stream_rpc_method_handler(
+                    servicer.GetAreasBatched,
+                    request_deserializer=shape__service__pb2.ShapeId.FromString,
+                    response_serializer=shape__service__pb2.GetAreasBatch.SerializeToString,
+            ),
+            'GetMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMetrics,
+                    request_deserializer=shape__service__pb2.GetMetricsRequest.FromString,
+                    response_serializer=shape__service__pb2.GetMetricsResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'ShapeService', rpc_method_handlers)
@@ -267,3 +411,246 @@ class ShapeService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def BatchGetShapes(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ShapeService/BatchGetShapes',
+            shape__service__pb2.BatchGetShapesRequest.SerializeToString,
+            shape__service__pb2.BatchGetShapesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchCreateShapes(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ShapeService/BatchCreateShapes',
+            shape__service__pb2.BatchCreateShapesRequest.SerializeToString,
+            shape__service__pb2.BatchCreateShapesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def IngestShapes(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/ShapeService/IngestShapes',
+            shape__service__pb2.ShapeType.SerializeToString,
+            shape__service__pb2.IngestSummary.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def QueryShapes(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/ShapeService/QueryShapes',
+            shape__service__pb2.ShapeQuery.SerializeToString,
+            shape__service__pb2.QueryShapesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetShapesIntersecting(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/ShapeService/GetShapesIntersecting',
+            shape__service__pb2.BoundingBox.SerializeToString,
+            shape__service__pb2.GetShapesIntersectingResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetShapesContaining(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/ShapeService/GetShapesContaining',
+            shape__service__pb2.ShapeCoord.SerializeToString,
+            shape__service__pb2.GetShapesContainingResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetPerimetersGreaterThanBatched(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/ShapeService/GetPerimetersGreaterThanBatched',
+            shape__service__pb2.MinPerimeter.SerializeToString,
+            shape__service__pb2.GetPerimetersGreaterThanBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetAreasBatched(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/ShapeService/GetAreasBatched',
+            shape__service__pb2.ShapeId.SerializeToString,
+            shape__service__pb2.GetAreasBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ShapeService/GetMetrics',
+            shape__service__pb2.GetMetricsRequest.SerializeToString,
+            shape__service__pb2.GetMetricsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,80 @@
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+from typing import Optional, Tuple
+
+from lib.objects.shape_log import ShapeLog
+from lib.objects.shape_record import ShapeRecord
+from lib.functions.shape_id_codec import parse_shape_id
+from lib.repositories.shape_repository import ShapeRepository
+from lib.repositories.json_shape_repository import JsonShapeRepository
+from lib.repositories.binary_shape_repository import BinaryShapeRepository
+from lib.repositories.snapshot_converter import convert_json_to_snapshot
+from tests.benchmarks.shape_data import generate_shapes, to_database_json
+
+def time_start(open_repository, shape_id: str) -> Tuple[float, float]:
+    """
+    Opens a repository and looks up a shape of it
+
+    :return: (seconds to open the repository, seconds of the first lookup)
+    """
+    started: float = time.perf_counter()
+    repository: ShapeRepository = open_repository()
+    opened: float = time.perf_counter() - started
+
+    prefix, seq = parse_shape_id(shape_id)
+    started = time.perf_counter()
+    record: Optional[ShapeRecord] = repository.get(repository.id_prefixes[prefix], seq)
+    lookup: float = time.perf_counter() - started
+
+    assert record is not None and record.shape_id == shape_id
+    repository.close()
+
+    return opened, lookup
+
+if __name__ == "__main__":
+    # Measures how long the JSON and binary backends take to open a database of each size and answer a first lookup,
+    # e.g. run from the server directory:
+    # python -m tests.benchmarks.cold_start --sizes 10000 100000 1000000 --max-json-size 1000000
+    parser = argparse.ArgumentParser(description="Benchmark the cold start of the JSON and binary backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--max-json-size", type=int, default=100000, help="largest database opened as JSON")
+    args = parser.parse_args()
+
+    logger: logging.Logger = logging.getLogger("benchmark")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            json_path: str = os.path.join(directory, f"{size}.json")
+            snapshot_path: str = os.path.join(directory, f"{size}.shapes")
+            log_path: str = os.path.join(directory, f"{size}.log")
+
+            # The JSON backend writes its snapshot indented
+            with open(json_path, 'w') as json_file:
+                json.dump(to_database_json(generate_shapes(size)), json_file, indent=4)
+
+            convert_json_to_snapshot(json_path, snapshot_path)
+
+            # Look up the last triangle, which is at the far end of every column
+            shape_id: str = f"T-{(size + 2) // 3 - 1}"
+
+            opened, lookup = time_start(
+                lambda: BinaryShapeRepository(logger, snapshot_path, ShapeLog(log_path, ShapeLog.FSYNC_OS, 0, logger)),
+                shape_id
+            )
+
+            line: str = (f"shapes={size:>9,} json {os.path.getsize(json_path) / 1e6:6,.0f} MB "
+                         f"binary {os.path.getsize(snapshot_path) / 1e6:5,.0f} MB | "
+                         f"binary open {opened * 1e3:.2f}ms first get {lookup * 1e3:.3f}ms")
+
+            if size <= args.max_json_size:
+                opened, lookup = time_start(lambda: JsonShapeRepository(logger, json_path), shape_id)
+                line += f" | json open {opened:.2f}s"
+
+            print(line)
+
+            for path in (json_path, snapshot_path, log_path):
+                os.remove(path)
@@ -0,0 +1,112 @@
+import os
+import time
+import asyncio
+import logging
+import argparse
+import configparser
+import multiprocessing
+from typing import List
+from concurrent import futures
+
+import grpc
+
+import shape_service_pb2 as ShapeService
+import shape_service_pb2_grpc as ShapeServiceGrpc
+from lib.services.shape_service import ShapeServer
+from lib.services.async_shape_service import AsyncShapeServer
+from tests.benchmarks.shape_data import generate_shapes
+
+SERVER_DIR: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def serve(servicer_type: str, port: int, stream_delay: float, max_threads: int, ready: multiprocessing.Event,
+          stop: multiprocessing.Event):
+    """
+    Runs in the server process. Serves the servicer on an insecure port of a grpc.aio server, the way server.py does
+    without the interceptors, from an in-memory repository of generated shapes
+    """
+    config: configparser.ConfigParser = configparser.ConfigParser(interpolation=None)
+    config.read(os.path.join(SERVER_DIR, "config.ini"))
+
+    config['general']['servicer'] = servicer_type
+    config['general']['stream_delay'] = str(stream_delay)
+    config['storage']['backend'] = "memory"
+    config['compute']['processes'] = "0"
+    config['cache']['stats_interval'] = "0"
+
+    async def run():
+        server = grpc.aio.server(futures.ThreadPoolExecutor(max_workers=max_threads))
+        servicer_class = AsyncShapeServer if servicer_type == "async" else ShapeServer
+        servicer: ShapeServer = servicer_class(logging.getLogger("benchmark"), config)
+        servicer.repository.insert_many(generate_shapes(1000))
+
+        ShapeServiceGrpc.add_ShapeServiceServicer_to_server(servicer, server)
+        server.add_insecure_port(f"localhost:{port}")
+        await server.start()
+
+        ready.set()
+        await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+        await server.stop(grace=None)
+
+    asyncio.run(run())
+
+async def read_streams(port: int, streams: int, responses: int) -> List[float]:
+    """
+    Opens every stream at once and reads each to the end
+
+    :return: seconds each stream took, from opening it to its last response
+    """
+    async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+        stub = ShapeServiceGrpc.ShapeServiceStub(channel)
+        await channel.channel_ready()
+
+        async def read_stream() -> float:
+            started: float = time.perf_counter()
+            call = stub.GetPerimetersGreaterThan(ShapeService.MinPerimeter(min_perimeter=0, limit=responses),
+                                                 metadata=(("x-correlation-id", "benchmark"),))
+
+            async for _ in call:
+                pass
+
+            return time.perf_counter() - started
+
+        return list(await asyncio.gather(*[read_stream() for _ in range(streams)]))
+
+if __name__ == "__main__":
+    # Measures how long concurrent GetPerimetersGreaterThan streams take on the sync servicer, which holds a thread of
+    # the max_threads pool per stream, and on the async servicer, which serves every stream on the event loop, e.g. run
+    # from the server directory:
+    # python -m tests.benchmarks.concurrent_streams --streams 25 100 400 --stream-delay 0.01
+    parser = argparse.ArgumentParser(description="Benchmark concurrent streams on the sync and async servicers")
+    parser.add_argument("--streams", type=int, nargs="+", default=[25, 100, 400])
+    parser.add_argument("--responses", type=int, default=10, help="responses per stream")
+    parser.add_argument("--stream-delay", type=float, default=0.01, help="stream_delay of the servicer")
+    parser.add_argument("--max-threads", type=int, default=25, help="max_threads of the server")
+    parser.add_argument("--port", type=int, default=50072)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+
+    print(f"{args.responses} responses per stream, stream_delay={args.stream_delay}s, max_threads={args.max_threads}")
+
+    for servicer_type in ("sync", "async"):
+        ready = context.Event()
+        stop = context.Event()
+        server = context.Process(
+            target=serve, args=(servicer_type, args.port, args.stream_delay, args.max_threads, ready, stop)
+        )
+        server.start()
+        ready.wait(timeout=60)
+
+        try:
+            for streams in args.streams:
+                started: float = time.perf_counter()
+                durations: List[float] = sorted(asyncio.run(read_streams(args.port, streams, args.responses)))
+                elapsed: float = time.perf_counter() - started
+
+                print(f"servicer={servicer_type:<5} streams={streams:>4} total {elapsed:.2f}s "
+                      f"{streams / elapsed:,.0f} streams/s "
+                      f"p50 {durations[len(durations) // 2] * 1e3:.0f}ms "
+                      f"max {durations[-1] * 1e3:.0f}ms")
+        finally:
+            stop.set()
+            server.join()
@@ -0,0 +1,75 @@
+import math
+import time
+import argparse
+from typing import Callable, List, Tuple
+
+import shape_service_pb2 as ShapeService
+from lib.functions.geometry import get_area, get_perimeter
+from lib.objects.coordinate_batch import CoordinateBatch
+from tests.benchmarks.shape_data import generate_shapes
+
+def get_shape_area(shape: ShapeService.Shape) -> float:
+    """
+    Area of a Shape as the original server calculated it, vertex by vertex on the protobuf message
+    """
+    area: float = 0.0
+    n: int = len(shape.coords)
+
+    for i in range(n):
+        area += shape.coords[i].x * shape.coords[(i + 1) % n].y - shape.coords[(i + 1) % n].x * shape.coords[i].y
+
+    return abs(area) / 2
+
+def get_shape_perimeter(shape: ShapeService.Shape) -> float:
+    """
+    Perimeter of a Shape as the original server calculated it, vertex by vertex on the protobuf message
+    """
+    perimeter: float = 0.0
+    n: int = len(shape.coords)
+
+    for i in range(n):
+        perimeter += math.sqrt((shape.coords[(i + 1) % n].x - shape.coords[i].x) ** 2 +
+                               (shape.coords[(i + 1) % n].y - shape.coords[i].y) ** 2)
+
+    return perimeter
+
+def time_call(function: Callable[[], object]) -> Tuple[float, object]:
+    """
+    :return: (seconds the call took, result of the call)
+    """
+    started: float = time.perf_counter()
+    result: object = function()
+
+    return time.perf_counter() - started, result
+
+if __name__ == "__main__":
+    # Compares calculating the area and perimeter of every shape of a batch with the per-shape loops of the original
+    # server, the scalar functions of lib.functions.geometry and a vectorized CoordinateBatch, e.g. run from the server
+    # directory:
+    # python -m tests.benchmarks.geometry --sizes 1 1000 1000000
+    parser = argparse.ArgumentParser(description="Benchmark batch area and perimeter calculations")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1000, 1000000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        coords: List[List[Tuple[int, int]]] = [shape_coords for _, shape_coords in generate_shapes(size)]
+        shapes: List[ShapeService.Shape] = [
+            ShapeService.Shape(coords=[ShapeService.ShapeCoord(x=x, y=y) for x, y in shape_coords])
+            for shape_coords in coords
+        ]
+
+        original, expected = time_call(
+            lambda: [(get_shape_area(shape), get_shape_perimeter(shape)) for shape in shapes]
+        )
+        scalar, _ = time_call(lambda: [(get_area(vertices), get_perimeter(vertices)) for vertices in coords])
+        build, batch = time_call(lambda: CoordinateBatch.from_coords(coords))
+        vectorized, results = time_call(lambda: (batch.get_areas(), batch.get_perimeters()))
+
+        # The engines must agree before their times are compared
+        assert all(math.isclose(area, expected_area) and math.isclose(perimeter, expected_perimeter)
+                   for (expected_area, expected_perimeter), area, perimeter in zip(expected, *results))
+
+        print(f"shapes={size:>9,} per shape: original {original / size * 1e6:.2f}us "
+              f"scalar {scalar / size * 1e6:.2f}us "
+              f"batch {vectorized / size * 1e6:.3f}us ({(build + vectorized) / size * 1e6:.2f}us with building it) "
+              f"speedup {original / vectorized:,.1f}x")
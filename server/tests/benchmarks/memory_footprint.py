@@ -0,0 +1,96 @@
+import gc
+import json
+import time
+import random
+import logging
+import argparse
+import tracemalloc
+import multiprocessing
+from typing import Dict, List, Tuple
+
+from lib.objects.shape_record import ShapeRecord
+from lib.functions.shape_id_codec import parse_shape_id
+from lib.repositories.shape_repository import ShapeRepository
+from lib.repositories.memory_shape_repository import MemoryShapeRepository
+from lib.repositories.columnar_shape_repository import ColumnarShapeRepository
+from tests.benchmarks.shape_data import generate_shapes, to_database_json
+
+LAYOUTS: Tuple[str, ...] = ("json", "memory", "columnar")
+
+def measure(layout: str, count: int, lookups: int, results: multiprocessing.Queue):
+    """
+    Runs in a process of its own, so that every layout starts from the same heap. Loads the shapes into the layout and
+    reports the bytes it retains and the seconds a lookup takes, None for the json layout, which has no lookup by id
+    """
+    text: str = json.dumps(to_database_json(generate_shapes(count)))
+    logger: logging.Logger = logging.getLogger("benchmark")
+    gc.collect()
+
+    if layout == "json":
+        tracemalloc.start()
+        data: Dict[str, List[dict]] = json.loads(text)
+    else:
+        data: Dict[str, List[dict]] = json.loads(text)
+
+        # Only the repository is traced, the JSON it is loaded from is dropped once loaded
+        tracemalloc.start()
+
+        if layout == "memory":
+            repository: ShapeRepository = MemoryShapeRepository(logger)
+        else:
+            repository: ShapeRepository = ColumnarShapeRepository(logger)
+
+        for shape_key in list(data):
+            repository._add_many(ShapeRecord.from_json_many(data.pop(shape_key)))
+
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if layout == "json":
+        results.put((layout, retained, None))
+
+        return
+
+    rng: random.Random = random.Random(3)
+    keys: List[Tuple[str, int]] = []
+
+    for _ in range(lookups):
+        prefix, seq = parse_shape_id(f"{rng.choice('TRP')}-{rng.randrange(count // 3)}")
+        keys.append((repository.id_prefixes[prefix], seq))
+
+    started: float = time.perf_counter()
+
+    for shape_key, seq in keys:
+        repository.get(shape_key, seq)
+
+    results.put((layout, retained, (time.perf_counter() - started) / lookups))
+
+if __name__ == "__main__":
+    # Measures the memory retained by the shapes in the dict layout the original server loaded data.json into, in the
+    # MemoryShapeRepository and in the ColumnarShapeRepository, along with the cost of a lookup, e.g. run from the
+    # server directory:
+    # python -m tests.benchmarks.memory_footprint --shapes 1000000
+    parser = argparse.ArgumentParser(description="Benchmark the memory footprint of the in-memory shape layouts")
+    parser.add_argument("--shapes", type=int, default=1000000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+
+    print(f"shapes={args.shapes:,}")
+
+    for layout in LAYOUTS:
+        process = context.Process(target=measure, args=(layout, args.shapes, args.lookups, results))
+        process.start()
+
+        _, retained, lookup = results.get(timeout=3600)
+        process.join()
+
+        line: str = f"{layout:<8} {retained / 1e6:8,.1f} MB {retained // args.shapes:5} B/shape"
+
+        if lookup is not None:
+            line += f" get {lookup * 1e6:.2f}us"
+
+        print(line)
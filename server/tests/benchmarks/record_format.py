@@ -0,0 +1,91 @@
+import gc
+import time
+import argparse
+import tracemalloc
+from typing import Callable, List
+
+import shape_service_pb2 as ShapeService
+from lib.objects.shape_record import ShapeRecord
+from tests.benchmarks.shape_data import generate_shapes, to_database_json
+
+def get_retained_bytes(build: Callable[[], object]) -> int:
+    """
+    :return: bytes still allocated by the objects that build returns, once they are built
+    """
+    gc.collect()
+    tracemalloc.start()
+    built: object = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+
+    return retained
+
+def build_from_json(shape_json: dict) -> bytes:
+    """
+    Builds and serializes a GetShapeResponse as the original server did, rebuilding the Shape from its JSON with a
+    ShapeCoord per vertex
+    """
+    shape: ShapeService.Shape = ShapeService.Shape(shape_id=shape_json['shape_id'], shape_type=shape_json['shape_type'])
+    shape.coords.extend([ShapeService.ShapeCoord(x=int(c['x']), y=int(c['y'])) for c in shape_json['coords']])
+
+    return ShapeService.GetShapeResponse(status_code=ShapeService.Code.OK, shape=shape).SerializeToString()
+
+def build_from_record(record: ShapeRecord) -> bytes:
+    """
+    Builds and serializes a GetShapeResponse as the server does, from the Shape bytes stored in the record
+    """
+    response: ShapeService.GetShapeResponse = ShapeService.GetShapeResponse(status_code=ShapeService.Code.OK)
+    record.write_shape(response.shape)
+
+    return response.SerializeToString()
+
+def build_v2_from_record(record: ShapeRecord) -> bytes:
+    """
+    Same as build_from_record, for calls that send x-shape-format: v2
+    """
+    response: ShapeService.GetShapeResponse = ShapeService.GetShapeResponse(status_code=ShapeService.Code.OK)
+    record.write_shape_v2(response.shape_v2)
+
+    return response.SerializeToString()
+
+def time_responses(build: Callable[[object], bytes], shapes: List[object]) -> float:
+    """
+    :return: seconds per response built and serialized
+    """
+    started: float = time.perf_counter()
+
+    for shape in shapes:
+        build(shape)
+
+    return (time.perf_counter() - started) / len(shapes)
+
+if __name__ == "__main__":
+    # Compares the memory a shape takes and the cost of building and serializing its GetShapeResponse for the JSON
+    # objects of the original server and for ShapeRecords, e.g. run from the server directory:
+    # python -m tests.benchmarks.record_format --shapes 100000
+    parser = argparse.ArgumentParser(description="Benchmark the memory and read cost of the shape record formats")
+    parser.add_argument("--shapes", type=int, default=100000)
+    args = parser.parse_args()
+
+    shapes = generate_shapes(args.shapes)
+    shape_jsons: List[dict] = [shape_json for data in to_database_json(shapes).values() for shape_json in data]
+
+    json_bytes: int = get_retained_bytes(lambda: [
+        {**shape_json, "coords": [dict(c) for c in shape_json['coords']]} for shape_json in shape_jsons
+    ])
+    record_bytes: int = get_retained_bytes(lambda: ShapeRecord.from_json_many(shape_jsons))
+
+    records: List[ShapeRecord] = ShapeRecord.from_json_many(shape_jsons)
+
+    # Both formats must produce the same response before their costs are compared
+    assert all(build_from_json(shape_json) == build_from_record(record)
+               for shape_json, record in zip(shape_jsons[:1000], records))
+
+    print(f"shapes={args.shapes:,}")
+    print(f"json:   {json_bytes // args.shapes} B/shape, "
+          f"{time_responses(build_from_json, shape_jsons) * 1e6:.2f}us per GetShapeResponse")
+    print(f"record: {record_bytes // args.shapes} B/shape, "
+          f"{time_responses(build_from_record, records) * 1e6:.2f}us per GetShapeResponse, "
+          f"{time_responses(build_v2_from_record, records) * 1e6:.2f}us with shape_v2")
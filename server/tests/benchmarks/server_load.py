@@ -0,0 +1,193 @@
+import os
+import sys
+import time
+import signal
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import configparser
+import multiprocessing
+from typing import List, Tuple
+
+import grpc
+
+import shape_service_pb2 as ShapeService
+import shape_service_pb2_grpc as ShapeServiceGrpc
+from lib.functions.request_signature import format_signature, get_signing_key, sign_request
+
+SERVER_DIR: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ROOT_CERTIFICATE: str = os.path.join(SERVER_DIR, "..", "client", "credentials", "root.crt")
+
+KEY_ID: str = "shape-client"
+SECRET: str = "f2kg9cls0xlsk3"
+
+def get_metadata(signing_key: tuple, method: str) -> Tuple[Tuple[str, str], ...]:
+    timestamp: int = int(time.time())
+    nonce: str = os.urandom(16).hex()
+    signature: str = sign_request(signing_key, KEY_ID, timestamp, nonce, method)
+
+    return ("x-correlation-id", "load"), ("x-signature", format_signature(KEY_ID, timestamp, nonce, signature))
+
+def run_client(port: int, mode: str, concurrency: int, seconds: float, start: multiprocessing.Event,
+               results: multiprocessing.Queue):
+    """
+    Runs in a client process. Makes calls over a connection of its own, so that the kernel can hand the connections of
+    the clients to different workers, and reports the calls made and the shape_ids created
+    """
+    async def run() -> Tuple[int, List[str]]:
+        with open(ROOT_CERTIFICATE, 'rb') as certificate:
+            credentials = grpc.ssl_channel_credentials(certificate.read())
+
+        # A subchannel pool of its own keeps the connection from being shared with another channel of the process
+        channel = grpc.aio.secure_channel(f"localhost:{port}", credentials,
+                                          options=(("grpc.use_local_subchannel_pool", 1),))
+        stub = ShapeServiceGrpc.ShapeServiceStub(channel)
+        signing_key: tuple = get_signing_key(SECRET)
+        await channel.channel_ready()
+
+        calls: int = 0
+        created: List[str] = []
+        start.wait()
+        deadline: float = time.monotonic() + seconds
+
+        async def call_repeatedly():
+            nonlocal calls
+
+            while time.monotonic() < deadline:
+                if mode == "get":
+                    await stub.GetShape(ShapeService.ShapeId(shape_id=f"T-{calls % 50}"),
+                                        metadata=get_metadata(signing_key, "/ShapeService/GetShape"))
+                else:
+                    response = await stub.CreateShape(ShapeService.ShapeType(shape_type="Triangle"),
+                                                      metadata=get_metadata(signing_key, "/ShapeService/CreateShape"))
+                    created.append(response.shape.shape_id)
+
+                calls += 1
+
+        await asyncio.gather(*[call_repeatedly() for _ in range(concurrency)])
+        await channel.close()
+
+        return calls, created
+
+    results.put(asyncio.run(run()))
+
+def start_server(directory: str, port: int, workers: int) -> subprocess.Popen:
+    """
+    Starts server.py with the server config.ini changed to serve from the given number of workers on a SQLite database
+    in the directory, and waits for it to accept connections
+    """
+    config: configparser.ConfigParser = configparser.ConfigParser(interpolation=None)
+    config.read(os.path.join(SERVER_DIR, "config.ini"))
+
+    config['general']['workers'] = str(workers)
+    config['general']['grpc_port'] = str(port)
+    config['logging']['level'] = "WARNING"
+    config['storage']['backend'] = "sqlite"
+
+    for option in ("sqlite_path", "nonce_path"):
+        config['storage'][option] = os.path.join(directory, config['storage'][option])
+
+    with open(os.path.join(directory, "config.ini"), 'w') as config_file:
+        config.write(config_file)
+
+    server: subprocess.Popen = subprocess.Popen(
+        [sys.executable, os.path.join(SERVER_DIR, "server.py")], cwd=directory,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    with open(ROOT_CERTIFICATE, 'rb') as certificate:
+        channel = grpc.secure_channel(f"localhost:{port}", grpc.ssl_channel_credentials(certificate.read()))
+
+    grpc.channel_ready_future(channel).result(timeout=30)
+    channel.close()
+
+    # The first worker is ready, give the others time to bind the port as well
+    time.sleep(2)
+
+    return server
+
+def seed_shapes(port: int):
+    """
+    Creates the shapes read by the get load
+    """
+    with open(ROOT_CERTIFICATE, 'rb') as certificate:
+        channel = grpc.secure_channel(f"localhost:{port}", grpc.ssl_channel_credentials(certificate.read()))
+
+    stub = ShapeServiceGrpc.ShapeServiceStub(channel)
+    signing_key: tuple = get_signing_key(SECRET)
+
+    for _ in range(50):
+        stub.CreateShape(ShapeService.ShapeType(shape_type="Triangle"),
+                         metadata=get_metadata(signing_key, "/ShapeService/CreateShape"))
+
+    channel.close()
+
+def measure(port: int, workers: int, clients: int, concurrency: int, mode: str, seconds: float) -> Tuple[float, int, int]:
+    """
+    Serves the load of the clients from the given number of workers
+
+    :return: (calls per second, shape_ids created, unique shape_ids created)
+    """
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as directory:
+        server: subprocess.Popen = start_server(directory, port, workers)
+
+        try:
+            seed_shapes(port)
+
+            start = context.Event()
+            results = context.Queue()
+            processes = [
+                context.Process(target=run_client, args=(port, mode, concurrency, seconds, start, results))
+                for _ in range(clients)
+            ]
+
+            for process in processes:
+                process.start()
+
+            # Let every client connect before the load starts
+            time.sleep(2)
+            start.set()
+
+            reports = [results.get(timeout=seconds + 60) for _ in processes]
+
+            for process in processes:
+                process.join()
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+    created: List[str] = [shape_id for report in reports for shape_id in report[1]]
+
+    return sum(report[0] for report in reports) / seconds, len(created), len(set(created))
+
+if __name__ == "__main__":
+    # Measures the calls per second served by 1 to N workers, each run against a fresh SQLite database, e.g. run from
+    # the server directory:
+    # python -m tests.benchmarks.server_load --workers 1 2 4 --clients 8 --mode get
+    # Scaling needs at least as many free cores as workers, on top of the cores used by the client processes
+    parser = argparse.ArgumentParser(description="Load test the server with different numbers of workers")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=4, help="client processes, each with its own connection")
+    parser.add_argument("--concurrency", type=int, default=16, help="calls in flight per client process")
+    parser.add_argument("--mode", choices=("get", "create"), default="get")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=50071)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} cores, {args.clients} clients x {args.concurrency} calls in flight, {args.mode}")
+
+    baseline: float = 0.0
+
+    for workers in args.workers:
+        rps, created, unique = measure(args.port, workers, args.clients, args.concurrency, args.mode, args.seconds)
+        baseline = baseline or rps
+
+        line: str = f"workers={workers} rps={rps:,.0f} speedup={rps / baseline:.2f}x"
+
+        if args.mode == "create":
+            line += f" created={created} unique={unique}"
+
+        print(line)
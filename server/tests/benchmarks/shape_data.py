@@ -0,0 +1,45 @@
+import random
+from typing import Dict, List, Tuple
+
+from lib.repositories.shape_repository import ShapeRepository
+
+# Number of vertices of the shapes of each shape_type
+VERTICES: Dict[str, int] = {"Triangle": 3, "Rectangle": 4, "Pentagon": 5}
+
+def generate_shapes(count: int, seed: int = 1) -> List[Tuple[str, List[Tuple[int, int]]]]:
+    """
+    Generates shapes of every shape_type in turn, with random vertices in a 100 by 100 square, so that every benchmark
+    measures the same data
+
+    :param count: number of shapes to generate
+    :param seed: seed of the random vertices
+    :return: (shape_type, coords) of each shape, in the format taken by ShapeRepository.insert_many
+    """
+    rng: random.Random = random.Random(seed)
+    shape_types: List[str] = list(VERTICES)
+    shapes: List[Tuple[str, List[Tuple[int, int]]]] = []
+
+    for i in range(count):
+        shape_type: str = shape_types[i % len(shape_types)]
+        shapes.append((shape_type, [(rng.randint(0, 100), rng.randint(0, 100)) for _ in range(VERTICES[shape_type])]))
+
+    return shapes
+
+def to_database_json(shapes: List[Tuple[str, List[Tuple[int, int]]]]) -> Dict[str, List[dict]]:
+    """
+    Lays shapes out as the original server kept them in memory and in data.json, a list of shape objects per shape key
+
+    :param shapes: (shape_type, coords) of each shape
+    :return: database object
+    """
+    data: Dict[str, List[dict]] = {shape_key: [] for shape_key in ShapeRepository.SHAPE_KEYS.values()}
+
+    for shape_type, coords in shapes:
+        shape_key: str = ShapeRepository.SHAPE_KEYS[shape_type]
+        data[shape_key].append({
+            "shape_id": f"{shape_key[0]}-{len(data[shape_key])}",
+            "shape_type": shape_type,
+            "coords": [{"x": x, "y": y} for x, y in coords]
+        })
+
+    return data
@@ -0,0 +1,121 @@
+import os
+import time
+import random
+import logging
+import argparse
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+import shape_service_pb2 as ShapeService
+from lib.objects.shape_record import ShapeRecord
+from lib.functions.shape_id_codec import parse_shape_id
+from lib.repositories.shape_repository import ShapeRepository
+from lib.repositories.memory_shape_repository import MemoryShapeRepository
+from lib.repositories.columnar_shape_repository import ColumnarShapeRepository
+from lib.repositories.sqlite_shape_repository import SqliteShapeRepository
+from tests.benchmarks.shape_data import generate_shapes, to_database_json
+
+def scan_for_shape(data: Dict[str, List[dict]], shape_id: str) -> Optional[ShapeService.Shape]:
+    """
+    Looks a shape up the way the original server did, by walking every shape of its shape key and rebuilding the Shape
+    of the match from JSON
+    """
+    shape: Optional[ShapeService.Shape] = None
+
+    for key in data:
+        if key[0] == shape_id[0]:
+            for shape_json in data[key]:
+                if shape_json['shape_id'] == shape_id:
+                    shape = ShapeService.Shape(shape_id=shape_json['shape_id'], shape_type=shape_json['shape_type'])
+                    shape.coords.extend(
+                        [ShapeService.ShapeCoord(x=int(c['x']), y=int(c['y'])) for c in shape_json['coords']]
+                    )
+
+    return shape
+
+def open_repository(backend: str, sqlite_path: str, data: Dict[str, List[dict]]) -> ShapeRepository:
+    """
+    Creates a repository of the backend holding the shapes of the database object, in a new database at sqlite_path
+    for the sqlite backend
+    """
+    logger: logging.Logger = logging.getLogger("benchmark")
+
+    if backend == "sqlite":
+        repository: ShapeRepository = SqliteShapeRepository(logger, sqlite_path)
+
+        for shape_key, shape_jsons in data.items():
+            shape_type: str = ShapeRepository.KEY_SHAPE_TYPES[shape_key]
+
+            for start in range(0, len(shape_jsons), 10000):
+                repository.insert_many([
+                    (shape_type, [(c['x'], c['y']) for c in shape_json['coords']])
+                    for shape_json in shape_jsons[start:start + 10000]
+                ])
+
+        return repository
+
+    if backend == "memory":
+        repository: ShapeRepository = MemoryShapeRepository(logger)
+    else:
+        repository: ShapeRepository = ColumnarShapeRepository(logger)
+
+    for shape_jsons in data.values():
+        repository._add_many(ShapeRecord.from_json_many(shape_jsons))
+
+    return repository
+
+def time_lookups(repository: ShapeRepository, shape_ids: List[str]) -> float:
+    """
+    Looks up each shape_id as GetTotalArea and GetAreas do and writes it to a response
+
+    :return: seconds per lookup
+    """
+    keys: List[Tuple[str, int]] = []
+
+    for shape_id in shape_ids:
+        prefix, seq = parse_shape_id(shape_id)
+        keys.append((repository.id_prefixes[prefix], seq))
+
+    started: float = time.perf_counter()
+
+    for shape_key, seq in keys:
+        repository.get(shape_key, seq).write_shape(ShapeService.GetShapeResponse().shape)
+
+    return (time.perf_counter() - started) / len(keys)
+
+if __name__ == "__main__":
+    # Measures the cost of looking a shape_id up against the number of shapes stored, for each backend and for the
+    # scan of the original server, e.g. run from the server directory:
+    # python -m tests.benchmarks.shape_lookup --sizes 1000 10000 100000 1000000 --backends memory columnar
+    parser = argparse.ArgumentParser(description="Benchmark shape_id lookups against the number of shapes stored")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--backends", nargs="+", choices=("memory", "columnar", "sqlite"),
+                        default=["memory", "columnar", "sqlite"])
+    parser.add_argument("--lookups", type=int, default=10000, help="shape_ids looked up on each backend")
+    parser.add_argument("--scan-lookups", type=int, default=20, help="shape_ids looked up by the original scan")
+    args = parser.parse_args()
+
+    rng: random.Random = random.Random(2)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            data: Dict[str, List[dict]] = to_database_json(generate_shapes(size))
+            shape_ids: List[str] = [
+                rng.choice(data[shape_key])['shape_id'] for shape_key in rng.choices(list(data), k=args.lookups)
+            ]
+
+            line: str = f"shapes={size:>9,}"
+
+            for backend in args.backends:
+                repository: ShapeRepository = open_repository(backend, os.path.join(directory, f"{size}.db"), data)
+                line += f" {backend} {time_lookups(repository, shape_ids) * 1e6:6.2f}us"
+                repository.close()
+
+            started: float = time.perf_counter()
+
+            for shape_id in shape_ids[:args.scan_lookups]:
+                scan_for_shape(data, shape_id)
+
+            scan: float = (time.perf_counter() - started) / min(args.scan_lookups, len(shape_ids))
+
+            print(f"{line} scan {scan * 1e6:,.0f}us")
@@ -0,0 +1,128 @@
+import os
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+import multiprocessing
+from typing import List, Tuple
+
+import shape_service_pb2 as ShapeService
+from lib.objects.nonce_cache import NonceCache
+from lib.objects.sqlite_nonce_cache import SqliteNonceCache
+from lib.interceptors.method_registry import MethodRegistry
+from lib.interceptors.interceptor_chain import InterceptedCall
+from lib.interceptors.signature_validation_interceptor import SignatureValidationInterceptor
+from lib.repositories.sqlite_shape_repository import SqliteShapeRepository
+from lib.functions.request_signature import format_signature, get_signing_key, sign_request
+
+KEY_ID: str = "shape-client"
+SECRET: str = "f2kg9cls0xlsk3"
+METHOD: str = "/ShapeService/GetShape"
+TRIANGLE: List[Tuple[int, int]] = [(0, 0), (4, 0), (0, 3)]
+
+def check_calls(cache: str, nonce_path: str, worker: int, calls: int, start: multiprocessing.Event,
+                results: multiprocessing.Queue):
+    """
+    Runs in a worker process. Checks calls signed with unique nonces and reports the seconds each check took and the
+    status codes of the refused calls
+    """
+    registry: MethodRegistry = MethodRegistry((ShapeService.DESCRIPTOR.services_by_name['ShapeService'],))
+    nonce_cache: NonceCache = NonceCache(calls) if cache == "memory" else SqliteNonceCache(nonce_path, calls)
+    interceptor: SignatureValidationInterceptor = SignatureValidationInterceptor(
+        "x-signature", {KEY_ID: SECRET}, 30, calls, nonce_cache=nonce_cache
+    )
+
+    # Sign every call up front so that only the check is timed
+    signing_key: tuple = get_signing_key(SECRET)
+    timestamp: int = int(time.time())
+    signed: List[InterceptedCall] = []
+
+    for i in range(calls):
+        nonce: str = f"{worker}-{i}"
+        signature: str = sign_request(signing_key, KEY_ID, timestamp, nonce, METHOD)
+        signed.append(InterceptedCall(registry.get(METHOD), {
+            "x-signature": format_signature(KEY_ID, timestamp, nonce, signature)
+        }))
+
+    latencies: List[float] = []
+    refused: List[str] = []
+
+    start.wait()
+
+    for call in signed:
+        started: float = time.perf_counter()
+        status = interceptor.intercept(call)
+        latencies.append(time.perf_counter() - started)
+
+        if status is not None:
+            refused.append(status[0].name)
+
+    results.put((latencies, refused))
+
+def insert_shapes(sqlite_path: str, stop: multiprocessing.Event):
+    """
+    Runs in a writer process. Inserts shapes into the shape database until stopped, holding its write lock the way the
+    workers of a multi-process server do
+    """
+    repository: SqliteShapeRepository = SqliteShapeRepository(logging.getLogger("benchmark"), sqlite_path)
+
+    while not stop.is_set():
+        repository.insert_many([("Triangle", TRIANGLE)] * 50)
+
+    repository.close()
+
+if __name__ == "__main__":
+    # Measures the cost of checking a signed call in every worker of a multi-process server, while shapes are inserted
+    # by other processes, e.g. run from the server directory:
+    # python -m tests.benchmarks.signature_validation --cache sqlite --workers 4 --writers 1
+    parser = argparse.ArgumentParser(description="Benchmark the signature check of a multi-process server")
+    parser.add_argument("--cache", choices=("memory", "sqlite"), default="sqlite")
+    parser.add_argument("--workers", type=int, default=2, help="processes checking calls")
+    parser.add_argument("--writers", type=int, default=1, help="processes inserting shapes")
+    parser.add_argument("--calls", type=int, default=20000, help="calls checked by each worker")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as directory:
+        nonce_path: str = os.path.join(directory, "nonces.db")
+        sqlite_path: str = os.path.join(directory, "data.db")
+
+        # Create the databases once, as the supervisor of the server does
+        SqliteNonceCache(nonce_path, args.calls).close()
+
+        start = context.Event()
+        stop = context.Event()
+        results = context.Queue()
+
+        writers = [context.Process(target=insert_shapes, args=(sqlite_path, stop)) for _ in range(args.writers)]
+        workers = [
+            context.Process(target=check_calls, args=(args.cache, nonce_path, worker, args.calls, start, results))
+            for worker in range(args.workers)
+        ]
+
+        for process in writers + workers:
+            process.start()
+
+        started: float = time.perf_counter()
+        start.set()
+
+        reports = [results.get(timeout=600) for _ in workers]
+        elapsed: float = time.perf_counter() - started
+
+        stop.set()
+
+        for process in writers + workers:
+            process.join()
+
+    latencies: List[float] = sorted(latency for report in reports for latency in report[0])
+    refused: List[str] = [code for report in reports for code in report[1]]
+
+    print(f"cache={args.cache} workers={args.workers} writers={args.writers} calls={len(latencies)}")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} calls/s")
+    print(f"latency: mean {statistics.mean(latencies) * 1e6:.1f}us "
+          f"p50 {latencies[len(latencies) // 2] * 1e6:.1f}us "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.1f}us "
+          f"max {latencies[-1] * 1e3:.2f}ms")
+    print(f"refused: {len(refused)} {dict((code, refused.count(code)) for code in set(refused))}")
@@ -0,0 +1,47 @@
+import os
+import sys
+import logging
+import configparser
+
+import pytest
+
+SERVER_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The server imports shape_service_pb2 and lib as top level modules, so the tests run from the server directory
+sys.path.insert(0, SERVER_DIR)
+
+class FakeContext:
+    """
+    Stand-in for the context of a call, carrying the metadata every call is expected to have
+    """
+
+    def __init__(self, metadata: dict = None):
+        self.metadata: dict = {"x-correlation-id": "test", **(metadata or {})}
+
+    def invocation_metadata(self):
+        return list(self.metadata.items())
+
+@pytest.fixture
+def logger() -> logging.Logger:
+    return logging.getLogger("shape-server-tests")
+
+@pytest.fixture
+def config(tmp_path) -> configparser.ConfigParser:
+    """
+    The server config.ini with every storage file in a temporary directory, no geometry processes and no cache stats
+    """
+    config: configparser.ConfigParser = configparser.ConfigParser(interpolation=None)
+    config.read(os.path.join(SERVER_DIR, "config.ini"))
+
+    for option in ("log_path", "sqlite_path", "nonce_path", "snapshot_path"):
+        config['storage'][option] = str(tmp_path / config['storage'][option])
+
+    config['general']['json_path'] = str(tmp_path / config['general']['json_path'])
+    config['compute']['processes'] = "0"
+    config['cache']['stats_interval'] = "0"
+
+    return config
+
+@pytest.fixture
+def context() -> FakeContext:
+    return FakeContext()
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+import shape_service_pb2 as ShapeService
+from lib.services.async_shape_service import AsyncShapeServer
+
+@pytest.fixture
+def server(logger, config) -> AsyncShapeServer:
+    config['general']['ingest_group_size'] = "4"
+    server: AsyncShapeServer = AsyncShapeServer(logger, config)
+
+    yield server
+
+    server.storage_executor.shutdown()
+    server.repository.close()
+
+async def shape_types(count: int):
+    for _ in range(count):
+        yield ShapeService.ShapeType(shape_type="Triangle")
+
+def fail_writes(server: AsyncShapeServer):
+    def append_many(shapes):
+        raise IOError("disk full")
+
+    server.repository.shape_log.append_many = append_many
+
+def test_ingest_commits_in_groups(server, context):
+    summary: ShapeService.IngestSummary = asyncio.run(server.IngestShapes(shape_types(10), context))
+
+    assert (summary.received, summary.created, summary.failed, summary.commits) == (10, 10, 0, 3)
+    assert server.repository.count("Triangles") == 10
+
+def test_ingest_reports_storage_errors(server, context):
+    fail_writes(server)
+
+    summary: ShapeService.IngestSummary = asyncio.run(server.IngestShapes(shape_types(5), context))
+
+    assert (summary.received, summary.created, summary.failed) == (5, 0, 5)
+    assert {failure.status_code for failure in summary.failures} == {ShapeService.Code.STORAGE_ERROR}
+
+    # The failed shapes are not served and their shape_ids are given to the next shapes
+    assert server.repository.count("Triangles") == 0
+    del server.repository.shape_log.append_many
+
+    summary = asyncio.run(server.IngestShapes(shape_types(1), context))
+
+    assert summary.created == 1 and server.repository.get("Triangles", 0) is not None
+
+def test_create_shape_reports_storage_errors(server, context):
+    fail_writes(server)
+
+    response: ShapeService.CreateShapeResponse = asyncio.run(
+        server.CreateShape(ShapeService.ShapeType(shape_type="Pentagon"), context)
+    )
+
+    assert response.status_code == ShapeService.Code.STORAGE_ERROR
+    assert "disk full" in response.message
+
+def test_cancelled_ingest_stops_reading_the_request_stream(server, context):
+    async def endless_shape_types():
+        while True:
+            yield ShapeService.ShapeType(shape_type="Rectangle")
+
+    async def cancel_ingest():
+        ingest: asyncio.Task = asyncio.create_task(server.IngestShapes(endless_shape_types(), context))
+        await asyncio.sleep(0.05)
+
+        ingest.cancel()
+        await asyncio.wait([ingest], timeout=5)
+
+        assert ingest.cancelled()
+
+        # The reader was blocked on the full queue, and would be left pending if it were not cancelled
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(cancel_ingest()) == []
+
+def test_closed_pipelined_get_areas_leaves_no_tasks_behind(config, logger, context):
+    config['storage']['backend'] = "sqlite"
+    server: AsyncShapeServer = AsyncShapeServer(logger, config)
+    server.repository.insert_many([("Triangle", [(0, 0), (4, 0), (0, 3)])] * 8)
+
+    async def endless_shape_ids():
+        yield ShapeService.ShapeId(shape_id="T-0", window=4)
+
+        while True:
+            yield ShapeService.ShapeId(shape_id="T-1")
+
+    async def close_get_areas():
+        responses = server.GetAreas(endless_shape_ids(), context)
+
+        assert (await anext(responses)).status_code == ShapeService.Code.OK
+
+        # The client ends the call with lookups still running and the reader waiting for a free slot
+        await responses.aclose()
+
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    try:
+        assert asyncio.run(close_get_areas()) == []
+    finally:
+        server.storage_executor.shutdown()
+        server.repository.close()
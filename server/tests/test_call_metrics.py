@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+from lib.objects.call_metrics import LATENCY_BOUNDS, CallMetrics, format_prometheus, get_latency_quantile
+
+METHOD = "/ShapeService/GetShape"
+
+def test_finish_counts_status_codes_and_latency_buckets():
+    metrics: CallMetrics = CallMetrics()
+
+    for code, elapsed in (("OK", 0.0001), ("OK", 0.003), ("NOT_FOUND", 20.0)):
+        metrics.start(METHOD)
+        metrics.finish(METHOD, code, elapsed)
+
+    metrics.start(METHOD)
+
+    method = metrics.get_methods()[METHOD]
+
+    assert method.status_counts == {"OK": 2, "NOT_FOUND": 1}
+    assert (method.started, method.finished, method.in_flight) == (4, 3, 1)
+    assert method.latency_buckets[0] == 1
+    assert method.latency_buckets[LATENCY_BOUNDS.index(0.005)] == 1
+    assert method.latency_buckets[-1] == 1
+    assert method.latency_sum == pytest.approx(20.0031)
+
+def test_get_methods_merges_the_accumulators_of_every_thread():
+    metrics: CallMetrics = CallMetrics()
+
+    def record():
+        for _ in range(100):
+            metrics.start(METHOD)
+            metrics.get(METHOD).bytes_in += 10
+            metrics.finish(METHOD, "OK", 0.001)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    method = metrics.get_methods()[METHOD]
+
+    assert (method.started, method.status_counts, method.bytes_in) == (400, {"OK": 400}, 4000)
+    assert len(metrics._accumulators) == 4
+
+def test_get_latency_quantile():
+    buckets = [0] * (len(LATENCY_BOUNDS) + 1)
+
+    assert get_latency_quantile(buckets, 0.5) is None
+
+    buckets[0] = 90
+    buckets[LATENCY_BOUNDS.index(0.1)] = 9
+    buckets[-1] = 1
+
+    assert get_latency_quantile(buckets, 0.5) == LATENCY_BOUNDS[0]
+    assert get_latency_quantile(buckets, 0.95) == 0.1
+    assert get_latency_quantile(buckets, 1.0) == float('inf')
+
+def test_format_prometheus():
+    metrics: CallMetrics = CallMetrics()
+    metrics.start(METHOD)
+    metrics.get(METHOD).bytes_out += 42
+    metrics.finish(METHOD, "OK", 0.002)
+
+    text: str = format_prometheus("grpc_server", metrics.get_methods(), {"cache": {"hits": 3}})
+
+    assert text.endswith("\n")
+    assert f'grpc_server_calls_total{{method="{METHOD}",code="OK"}} 1' in text
+    assert f'grpc_server_in_flight{{method="{METHOD}"}} 0' in text
+    assert f'grpc_server_latency_seconds_bucket{{method="{METHOD}",le="0.001"}} 0' in text
+    assert f'grpc_server_latency_seconds_bucket{{method="{METHOD}",le="0.0025"}} 1' in text
+    assert f'grpc_server_latency_seconds_bucket{{method="{METHOD}",le="+Inf"}} 1' in text
+    assert f'grpc_server_latency_seconds_count{{method="{METHOD}"}} 1' in text
+    assert f'grpc_server_sent_bytes_total{{method="{METHOD}"}} 42' in text
+    assert "# TYPE grpc_server_cache_hits gauge\ngrpc_server_cache_hits 3" in text
@@ -0,0 +1,96 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import List
+
+import pytest
+
+from lib.objects import geometry_pool
+from lib.objects.geometry_pool import GeometryPool
+from lib.objects.shape_record import ShapeRecord
+from lib.functions.geometry import intersects_box
+
+BOX = (0, 0, 50, 50)
+
+def get_records(count: int) -> List[ShapeRecord]:
+    # Squares along the diagonal, the first ones inside BOX and the rest outside of it
+    return [
+        ShapeRecord(f"R-{i}", "Rectangle", [(i * 10, i * 10), (i * 10 + 5, i * 10), (i * 10 + 5, i * 10 + 5),
+                                            (i * 10, i * 10 + 5)])
+        for i in range(count)
+    ]
+
+@pytest.fixture
+def shared_memory_names(monkeypatch) -> List[str]:
+    """
+    Records the name of every shared memory the pool creates in this process
+    """
+    names: List[str] = []
+
+    class RecordingSharedMemory(SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            names.append(self.name)
+
+    monkeypatch.setattr(geometry_pool, "SharedMemory", RecordingSharedMemory)
+
+    return names
+
+@pytest.fixture(scope="module")
+def pool() -> GeometryPool:
+    pool: GeometryPool = GeometryPool(processes=1, batch_size=4, min_batch_size=2)
+
+    yield pool
+
+    pool.close()
+
+def assert_unlinked(names: List[str]):
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+def test_inline_pool_filters_without_shared_memory(shared_memory_names):
+    records: List[ShapeRecord] = get_records(10)
+    pool: GeometryPool = GeometryPool(processes=0, batch_size=4, min_batch_size=2)
+
+    assert not pool.enabled
+    assert [record.shape_id for record in pool.filter(records, intersects_box, *BOX)] == [
+        "R-0", "R-1", "R-2", "R-3", "R-4", "R-5"
+    ]
+    assert shared_memory_names == []
+
+    pool.close()
+
+def test_pool_matches_inline_filter_and_unlinks_shared_memory(pool, shared_memory_names):
+    records: List[ShapeRecord] = get_records(11)
+    expected: List[str] = [record.shape_id for record in records if intersects_box(record.coords, *BOX)]
+
+    assert [record.shape_id for record in pool.filter(records, intersects_box, *BOX)] == expected
+
+    # Batches of 4, 4 and 3 records are all large enough to go to the pool
+    assert len(shared_memory_names) == 3
+    assert_unlinked(shared_memory_names)
+
+def test_small_batches_are_checked_inline(pool, shared_memory_names):
+    records: List[ShapeRecord] = get_records(5)
+
+    assert [record.shape_id for record in pool.filter(records, intersects_box, *BOX)] == [
+        "R-0", "R-1", "R-2", "R-3", "R-4"
+    ]
+
+    # The last batch of a single record is below min_batch_size
+    assert len(shared_memory_names) == 1
+    assert_unlinked(shared_memory_names)
+
+def test_stream_closed_early_unlinks_pending_shared_memory(pool, shared_memory_names):
+    results = pool.filter(get_records(20), intersects_box, *BOX)
+
+    assert next(results).shape_id == "R-0"
+
+    # The second batch is submitted before the first one is collected, and is left pending when the stream is closed
+    results.close()
+
+    assert len(shared_memory_names) == 2
+    assert_unlinked(shared_memory_names)
+
+def test_negative_processes_are_rejected():
+    with pytest.raises(ValueError):
+        GeometryPool(processes=-1, batch_size=4, min_batch_size=2)
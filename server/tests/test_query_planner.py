@@ -0,0 +1,92 @@
+import json
+
+import shape_service_pb2 as ShapeService
+from lib.services.shape_service import ShapeServer
+from lib.objects.shape_filter import ShapeFilter
+from lib.objects.shape_record import ShapeRecord
+from lib.repositories.query_planner import QueryPlanner
+from lib.repositories.json_shape_repository import JsonShapeRepository
+from lib.repositories.memory_shape_repository import MemoryShapeRepository
+
+SQUARE = [(0, 0), (2, 0), (2, 2), (0, 2)]
+TRIANGLE = [(0, 0), (4, 0), (0, 3)]
+
+def test_filter_matches_shape_type_ignoring_case():
+    shape_filter: ShapeFilter = ShapeFilter(shape_type="Rectangle")
+
+    assert shape_filter.matches(ShapeRecord("R-0", "rectangle", SQUARE))
+    assert shape_filter.matches(ShapeRecord("R-0", "Rectangle", SQUARE))
+    assert not shape_filter.matches(ShapeRecord("T-0", "Triangle", TRIANGLE))
+
+def test_every_plan_returns_shapes_with_lower_case_shape_types(logger):
+    repository: MemoryShapeRepository = MemoryShapeRepository(logger)
+    repository._add_many([
+        ShapeRecord("R-0", "rectangle", SQUARE),
+        ShapeRecord("R-1", "rectangle", [(10, 10), (20, 10), (20, 20), (10, 20)]),
+        ShapeRecord("R-2", "rectangle", [(30, 30), (50, 30), (50, 50), (30, 50)])
+    ])
+    repository._add_many([ShapeRecord("T-0", "Triangle", TRIANGLE)])
+
+    planner: QueryPlanner = QueryPlanner(repository, logger)
+
+    # Partition plan
+    assert [record.shape_id for record in planner.execute(ShapeFilter(shape_type="Rectangle"))] == ["R-0", "R-1", "R-2"]
+
+    # An area range narrower than the partition is planned on the area index and still checks shape_type
+    area_filter: ShapeFilter = ShapeFilter(shape_type="Rectangle", area=(3.0, 5.0))
+    assert planner.plan(area_filter).index == "area"
+    assert [record.shape_id for record in planner.execute(area_filter)] == ["R-0"]
+
+    spatial_filter: ShapeFilter = ShapeFilter(shape_type="Rectangle", within=(-1, -1, 3, 3))
+    assert [record.shape_id for record in planner.execute(spatial_filter)] == ["R-0"]
+
+def test_query_baseline_database(tmp_path, logger):
+    json_path: str = str(tmp_path / "data.json")
+
+    with open(json_path, 'w') as json_file:
+        json.dump({
+            "Triangles": [],
+            "Rectangles": [
+                {"shape_id": "R-0", "shape_type": "rectangle", "coords": [{"x": x, "y": y} for x, y in SQUARE]}
+            ],
+            "Pentagons": []
+        }, json_file)
+
+    planner: QueryPlanner = QueryPlanner(JsonShapeRepository(logger, json_path), logger)
+    records = list(planner.execute(ShapeFilter(shape_type="Rectangle", perimeter=(None, 100.0))))
+
+    assert [(record.shape_id, record.shape_type) for record in records] == [("R-0", "Rectangle")]
+
+def test_pages_do_not_depend_on_the_plan(logger):
+    repository: MemoryShapeRepository = MemoryShapeRepository(logger)
+
+    # T-0 has the largest area, so the area index reads the shapes in the reverse order of their shape_ids
+    repository.insert_many([("Triangle", [(0, 0), (size, 0), (0, size)]) for size in range(20, 9, -1)])
+
+    planner: QueryPlanner = QueryPlanner(repository, logger)
+    partition_filter: ShapeFilter = ShapeFilter(shape_type="Triangle")
+    area_filter: ShapeFilter = ShapeFilter(area=(0.0, 1000.0))
+
+    assert (planner.plan(partition_filter).index, planner.plan(area_filter).index) == ("Triangles", "area")
+
+    for shape_filter in (partition_filter, area_filter):
+        pages = [[record.shape_id for record in planner.execute(shape_filter, 4, offset)] for offset in (0, 4, 8)]
+
+        assert pages == [["T-0", "T-1", "T-2", "T-3"], ["T-4", "T-5", "T-6", "T-7"], ["T-8", "T-9", "T-10"]]
+        assert [record.shape_id for record in planner.execute(shape_filter, offset=9)] == ["T-9", "T-10"]
+
+def test_query_shapes_accepts_any_case_of_shape_type(config, logger, context):
+    server: ShapeServer = ShapeServer(logger, config)
+    server.repository.insert_many([("Rectangle", SQUARE), ("Triangle", TRIANGLE)])
+
+    responses = list(server.QueryShapes(ShapeService.ShapeQuery(shape_type="rECTANGLE"), context))
+
+    assert [(response.status_code, response.shape.shape_id) for response in responses] == [
+        (ShapeService.Code.OK, "R-0")
+    ]
+
+    responses = list(server.QueryShapes(ShapeService.ShapeQuery(shape_type="Hexagon"), context))
+
+    assert [response.status_code for response in responses] == [ShapeService.Code.INVALID_SHAPE]
+
+    server.repository.close()
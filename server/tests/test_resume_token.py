@@ -0,0 +1,75 @@
+import base64
+import string
+
+import pytest
+
+import shape_service_pb2 as ShapeService
+from lib.services.shape_service import ShapeServer
+from lib.functions.resume_token import decode_resume_token, encode_resume_token
+
+SQUARE = [(0, 0), (2, 0), (2, 2), (0, 2)]
+LARGE_SQUARE = [(0, 0), (5, 0), (5, 5), (0, 5)]
+
+@pytest.fixture
+def server(logger, config) -> ShapeServer:
+    config['storage']['backend'] = "memory"
+    server: ShapeServer = ShapeServer(logger, config)
+
+    # Equal perimeters, so that pages end between shapes of the same perimeter
+    server.repository.insert_many([("Rectangle", SQUARE)] * 3 + [("Triangle", [(0, 0), (3, 0), (0, 4)])] +
+                                  [("Rectangle", LARGE_SQUARE)] * 2)
+
+    return server
+
+def read_pages(server: ShapeServer, page_size: int, **fields) -> list:
+    pages: list = []
+    resume_token: str = ""
+
+    while True:
+        request = ShapeService.MinPerimeter(page_size=page_size, resume_token=resume_token, **fields)
+        page = list(server._get_perimeter_responses(request))
+        pages.append(page)
+
+        if page[-1].status_code != ShapeService.Code.OK:
+            return pages
+
+        resume_token = page[-1].resume_token
+
+def test_token_round_trip():
+    token: str = encode_resume_token("GetAreas", {"position": 3})
+
+    assert decode_resume_token("GetAreas", token) == {"position": 3}
+    assert set(token) <= set(string.ascii_letters + string.digits + "-_=")
+
+def test_token_of_another_method_is_refused():
+    with pytest.raises(ValueError, match="not created by GetPerimetersGreaterThan"):
+        decode_resume_token("GetPerimetersGreaterThan", encode_resume_token("GetAreas", {"position": 3}))
+
+@pytest.mark.parametrize("token", ["not base64!", base64.urlsafe_b64encode(b"{}").decode(),
+                                   base64.urlsafe_b64encode(b'["GetAreas", 3]').decode(), "é"])
+def test_malformed_token_is_refused(token):
+    with pytest.raises(ValueError):
+        decode_resume_token("GetAreas", token)
+
+def test_pages_return_every_shape_once(server):
+    everything = [response.shape.shape_id for response in server._get_perimeter_responses(ShapeService.MinPerimeter())]
+    pages = read_pages(server, 2)
+
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    assert [response.shape.shape_id for page in pages[:-1] for response in page] == everything
+    assert pages[-1][0].status_code == ShapeService.Code.SHAPE_NOT_FOUND
+
+def test_limit_is_counted_over_every_page(server):
+    pages = read_pages(server, 2, limit=5)
+
+    assert [response.shape.shape_id for page in pages for response in page if response.HasField('shape')] == [
+        "R-0", "R-1", "R-2", "T-0", "R-3"
+    ]
+
+def test_token_of_another_min_perimeter_is_refused(server):
+    first = next(server._get_perimeter_responses(ShapeService.MinPerimeter(min_perimeter=1)))
+    responses = list(server._get_perimeter_responses(
+        ShapeService.MinPerimeter(min_perimeter=2, resume_token=first.resume_token)
+    ))
+
+    assert [response.status_code for response in responses] == [ShapeService.Code.INVALID_RESUME_TOKEN]
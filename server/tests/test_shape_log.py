@@ -0,0 +1,143 @@
+import json
+
+import pytest
+
+from lib.objects.shape_log import ShapeLog
+from lib.repositories.json_shape_repository import JsonShapeRepository
+from lib.repositories.binary_shape_repository import BinaryShapeRepository
+
+SQUARE = [(0, 0), (2, 0), (2, 2), (0, 2)]
+TRIANGLE = [(0, 0), (4, 0), (0, 3)]
+
+def read_lines(path: str) -> list:
+    with open(path, 'rb') as log_file:
+        return log_file.read().split(b"\n")
+
+@pytest.mark.parametrize("fsync_policy", ["always", "interval", "os"])
+def test_replay_returns_records_in_order(tmp_path, logger, fsync_policy):
+    shape_log: ShapeLog = ShapeLog(str(tmp_path / "shapes.log"), fsync_policy, 10, logger)
+    shape_log.append("Triangles", {"shape_id": "T-0"})
+    shape_log.append_many([("Rectangles", {"shape_id": "R-0"}), ("Triangles", {"shape_id": "T-1"})])
+
+    assert list(shape_log.replay()) == [
+        ("Triangles", {"shape_id": "T-0"}), ("Rectangles", {"shape_id": "R-0"}), ("Triangles", {"shape_id": "T-1"})
+    ]
+
+    shape_log.truncate()
+    assert list(shape_log.replay()) == []
+
+    shape_log.close()
+
+def test_replay_cuts_off_a_torn_record(tmp_path, logger):
+    path: str = str(tmp_path / "shapes.log")
+    shape_log: ShapeLog = ShapeLog(path, "always", 0, logger)
+    shape_log.append("Triangles", {"shape_id": "T-0"})
+
+    # A crash mid-write leaves part of a record at the end of the log
+    with open(path, 'a') as log_file:
+        log_file.write('{"key":"Triangles","shape":{"shape_')
+
+    assert [shape["shape_id"] for _, shape in shape_log.replay()] == ["T-0"]
+
+    # The next record starts on a line of its own, so it is read back
+    shape_log.append("Triangles", {"shape_id": "T-1"})
+    assert [shape["shape_id"] for _, shape in shape_log.replay()] == ["T-0", "T-1"]
+
+    shape_log.close()
+
+def test_replay_ends_a_record_missing_its_newline(tmp_path, logger):
+    path: str = str(tmp_path / "shapes.log")
+
+    with open(path, 'w') as log_file:
+        log_file.write('{"key":"Triangles","shape":{"shape_id":"T-0"}}')
+
+    shape_log: ShapeLog = ShapeLog(path, "os", 0, logger)
+    assert len(list(shape_log.replay())) == 1
+
+    shape_log.append("Triangles", {"shape_id": "T-1"})
+    assert [shape["shape_id"] for _, shape in shape_log.replay()] == ["T-0", "T-1"]
+    assert read_lines(path)[-1] == b""
+
+    shape_log.close()
+
+def test_json_repository_folds_the_log_into_the_snapshot(tmp_path, logger):
+    json_path: str = str(tmp_path / "data.json")
+    log_path: str = str(tmp_path / "shapes.log")
+
+    repository: JsonShapeRepository = JsonShapeRepository(logger, json_path, ShapeLog(log_path, "always", 0, logger))
+    repository.insert_many([("Triangle", TRIANGLE), ("Rectangle", SQUARE), ("Triangle", TRIANGLE)])
+    repository.close()
+
+    repository = JsonShapeRepository(logger, json_path, ShapeLog(log_path, "always", 0, logger))
+
+    assert [record.shape_id for record in repository.scan("Triangles")] == ["T-0", "T-1"]
+    assert repository.get("Rectangles", 0).coords == SQUARE
+    assert read_lines(log_path) == [b""]
+
+    with open(json_path, 'r') as json_file:
+        assert [shape["shape_id"] for shape in json.load(json_file)["Triangles"]] == ["T-0", "T-1"]
+
+    assert repository.insert("Triangle", TRIANGLE).shape_id == "T-2"
+    repository.close()
+
+def test_json_repository_skips_logged_shapes_already_in_the_snapshot(tmp_path, logger):
+    json_path: str = str(tmp_path / "data.json")
+    log_path: str = str(tmp_path / "shapes.log")
+
+    repository: JsonShapeRepository = JsonShapeRepository(logger, json_path, ShapeLog(log_path, "always", 0, logger))
+    repository.insert_many([("Triangle", TRIANGLE), ("Triangle", TRIANGLE)])
+    repository.close()
+
+    with open(log_path, 'rb') as log_file:
+        logged: bytes = log_file.read()
+
+    # Fold the log, then put its records back as if the process crashed before truncating it
+    JsonShapeRepository(logger, json_path, ShapeLog(log_path, "always", 0, logger)).close()
+
+    with open(log_path, 'ab') as log_file:
+        log_file.write(logged)
+        log_file.write(json.dumps({"key": "Triangles", "shape": {
+            "shape_id": "T-2", "shape_type": "Triangle", "coords": [{"x": x, "y": y} for x, y in TRIANGLE]
+        }}).encode() + b"\n")
+
+    repository = JsonShapeRepository(logger, json_path, ShapeLog(log_path, "always", 0, logger))
+
+    assert [record.shape_id for record in repository.scan("Triangles")] == ["T-0", "T-1", "T-2"]
+    assert read_lines(log_path) == [b""]
+
+    repository.close()
+
+def test_json_repository_appends_after_a_torn_record(tmp_path, logger):
+    json_path: str = str(tmp_path / "data.json")
+    log_path: str = str(tmp_path / "shapes.log")
+
+    with open(log_path, 'w') as log_file:
+        log_file.write('{"key":"Triangles","shape":{"shape_id":"T-0","shape_type":"Tri')
+
+    repository: JsonShapeRepository = JsonShapeRepository(logger, json_path, ShapeLog(log_path, "always", 0, logger))
+    assert repository.insert("Triangle", TRIANGLE).shape_id == "T-0"
+    repository.close()
+
+    repository = JsonShapeRepository(logger, json_path, ShapeLog(log_path, "always", 0, logger))
+    assert [record.shape_id for record in repository.scan("Triangles")] == ["T-0"]
+    repository.close()
+
+def test_binary_repository_replays_and_folds_the_log(tmp_path, logger):
+    snapshot_path: str = str(tmp_path / "data.shapes")
+    log_path: str = str(tmp_path / "shapes.log")
+
+    repository = BinaryShapeRepository(logger, snapshot_path, ShapeLog(log_path, "always", 0, logger))
+    repository.insert_many([("Triangle", TRIANGLE), ("Pentagon", [(0, 0), (2, 0), (3, 2), (1, 3), (-1, 2)])])
+
+    # Reopen without closing, as after a crash, so the shapes are only in the log
+    repository = BinaryShapeRepository(logger, snapshot_path, ShapeLog(log_path, "always", 0, logger))
+    assert repository.get("Pentagons", 0).shape_id == "P-0"
+    assert repository.insert("Triangle", TRIANGLE).shape_id == "T-1"
+    repository.close()
+
+    assert read_lines(log_path) == [b""]
+
+    repository = BinaryShapeRepository(logger, snapshot_path, ShapeLog(log_path, "always", 0, logger))
+    assert [record.shape_id for record in repository.scan("Triangles")] == ["T-0", "T-1"]
+    assert repository.get("Triangles", 1).coords == TRIANGLE
+    repository.close()
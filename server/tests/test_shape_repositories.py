@@ -0,0 +1,258 @@
+import os
+import errno
+import threading
+from typing import List
+
+import pytest
+
+import shape_service_pb2 as ShapeService
+from lib.objects.shape_log import ShapeLog
+from lib.services.shape_service import ShapeServer
+from lib.objects.shape_record import ShapeRecord
+from lib.functions.geometry import get_area, get_perimeter
+from lib.repositories.shape_repository import ShapeRepository
+from lib.repositories.repository_factory import get_shape_repository
+
+TRIANGLE = [(0, 0), (4, 0), (0, 3)]
+SQUARE = [(10, 10), (12, 10), (12, 12), (10, 12)]
+PENTAGON = [(20, 20), (22, 20), (23, 22), (21, 23), (19, 22)]
+LARGE_SQUARE = [(0, 0), (30, 0), (30, 30), (0, 30)]
+
+SHAPES = [("Triangle", TRIANGLE), ("Rectangle", SQUARE), ("Pentagon", PENTAGON), ("Rectangle", LARGE_SQUARE)]
+
+# Backends and the storage modes of the json backend
+BACKENDS = [("memory", None), ("columnar", None), ("json", "snapshot"), ("json", "log"), ("binary", None),
+            ("sqlite", None)]
+PERSISTENT_BACKENDS = [backend for backend in BACKENDS if backend[0] not in ("memory", "columnar")]
+
+def open_repository(config, logger, backend: str, mode: str) -> ShapeRepository:
+    config['storage']['backend'] = backend
+
+    if mode is not None:
+        config['storage']['mode'] = mode
+
+    return get_shape_repository(config, logger)
+
+@pytest.fixture(params=BACKENDS, ids=lambda backend: "-".join(filter(None, backend)))
+def repository(request, config, logger) -> ShapeRepository:
+    repository: ShapeRepository = open_repository(config, logger, *request.param)
+
+    yield repository
+
+    repository.close()
+
+def test_insert_assigns_shape_ids_per_shape_key(repository):
+    records = repository.insert_many(SHAPES)
+
+    assert [record.shape_id for record in records] == ["T-0", "R-0", "P-0", "R-1"]
+    assert repository.insert("Triangle", TRIANGLE).shape_id == "T-1"
+
+def test_get_returns_the_stored_shape(repository):
+    repository.insert_many(SHAPES)
+
+    record: ShapeRecord = repository.get("Pentagons", 0)
+
+    assert (record.shape_id, record.shape_type, record.coords) == ("P-0", "Pentagon", PENTAGON)
+    assert record.area == pytest.approx(get_area(PENTAGON))
+    assert record.perimeter == pytest.approx(get_perimeter(PENTAGON))
+    assert record.to_shape().shape_type == "Pentagon"
+
+    assert repository.get("Pentagons", 1) is None
+    assert repository.get_many([("Rectangles", 1), ("Triangles", 5)])[0].coords == LARGE_SQUARE
+
+def test_seq_too_large_for_a_database_integer_is_not_found(repository):
+    repository.insert_many(SHAPES)
+
+    assert repository.get("Triangles", 2 ** 63) is None
+    assert repository.get_many([("Triangles", 10 ** 20), ("Triangles", 0)])[1].shape_id == "T-0"
+
+def test_total_area_of_a_huge_seq_reports_it_as_not_found(config, logger, context):
+    config['storage']['backend'] = "sqlite"
+    server: ShapeServer = ShapeServer(logger, config)
+    server.repository.insert("Triangle", TRIANGLE)
+
+    shape_ids = [ShapeService.ShapeId(shape_id="T-0"), ShapeService.ShapeId(shape_id="T-99999999999999999999")]
+    response = server.GetTotalArea(iter(shape_ids), context)
+
+    assert response.total_area == pytest.approx(6.0)
+    assert len(response.invalid_ids) == 1
+
+    server.repository.close()
+
+def test_failed_sqlite_insert_releases_the_write_lock(config, logger):
+    repository: ShapeRepository = open_repository(config, logger, "sqlite", None)
+
+    # Coordinates that cannot be serialized fail inside the transaction with an error that is not a sqlite3.Error
+    with pytest.raises(TypeError):
+        repository.insert_many([("Triangle", TRIANGLE), ("Triangle", [(0, 0), (1, 0), (object(), 1)])])
+
+    # Another worker can still write, and the failed insert left nothing behind
+    other: ShapeRepository = open_repository(config, logger, "sqlite", None)
+    other.insert("Triangle", TRIANGLE)
+
+    assert [record.shape_id for record in repository.scan("Triangles")] == ["T-0"]
+
+    other.close()
+    repository.close()
+
+def test_scan_and_count(repository):
+    repository.insert_many(SHAPES)
+
+    assert [record.shape_id for record in repository.scan("Rectangles")] == ["R-0", "R-1"]
+    assert [repository.count(key) for key in ("Triangles", "Rectangles", "Pentagons")] == [1, 2, 1]
+
+def test_range_is_ordered_and_bounded(repository):
+    repository.insert_many(SHAPES)
+
+    areas = [record.area for record in repository.range("area")]
+    assert areas == sorted(areas) and len(areas) == 4
+
+    # Lower bounds are exclusive and upper bounds inclusive
+    assert [record.shape_id for record in repository.range("area", 4.0, 6.0)] == ["T-0"]
+    assert [record.shape_id for record in repository.range("area", 6.0)] == ["P-0", "R-1"]
+    assert repository.count_range("perimeter", None, 12.0) == 3
+    assert repository.count_range("perimeter", 8.0, 11.0) == 1
+
+    with pytest.raises(ValueError):
+        list(repository.range("volume"))
+
+def test_intersecting_returns_every_shape_touching_the_box(repository):
+    repository.insert_many(SHAPES)
+
+    candidates = {record.shape_id for record in repository.intersecting(11, 11, 11, 11)}
+
+    assert {"R-0", "R-1"} <= candidates
+    assert repository.count_intersecting(11, 11, 11, 11) >= 2
+
+def test_concurrent_inserts_get_unique_contiguous_shape_ids(repository):
+    writers: int = 8
+    batches: int = 10
+    inserted: List[str] = []
+    errors: List[BaseException] = []
+    done: threading.Event = threading.Event()
+
+    def write():
+        try:
+            for _ in range(batches):
+                records = repository.insert_many(SHAPES)
+                inserted.extend(record.shape_id for record in records)
+        except BaseException as e:
+            errors.append(e)
+
+    def read():
+        # Scans run across the inserts and must only ever see a contiguous prefix of each shape key
+        try:
+            while not done.is_set():
+                for shape_key in ("Triangles", "Rectangles"):
+                    shape_ids = [record.shape_id for record in repository.scan(shape_key)]
+                    assert shape_ids == [f"{shape_key[0]}-{seq}" for seq in range(len(shape_ids))]
+
+                areas = [record.area for record in repository.range("area")]
+                assert areas == sorted(areas)
+        except BaseException as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+
+    for thread in readers + threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    done.set()
+
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert len(inserted) == len(set(inserted)) == writers * batches * len(SHAPES)
+
+    for shape_key, count in (("Triangles", 1), ("Rectangles", 2), ("Pentagons", 1)):
+        expected: List[str] = [f"{shape_key[0]}-{seq}" for seq in range(writers * batches * count)]
+
+        assert [record.shape_id for record in repository.scan(shape_key)] == expected
+        assert repository.count(shape_key) == len(expected)
+
+    assert repository.count_range("area") == len(inserted)
+
+@pytest.mark.parametrize("backend", PERSISTENT_BACKENDS, ids=lambda backend: "-".join(filter(None, backend)))
+def test_shapes_survive_a_restart(config, logger, backend):
+    repository: ShapeRepository = open_repository(config, logger, *backend)
+    repository.insert_many(SHAPES)
+    repository.close()
+
+    repository = open_repository(config, logger, *backend)
+
+    assert [record.shape_id for record in repository.scan("Rectangles")] == ["R-0", "R-1"]
+    assert repository.get("Rectangles", 1).coords == LARGE_SQUARE
+    assert [record.shape_id for record in repository.range("area", 6.0)] == ["P-0", "R-1"]
+
+    # New shape_ids continue after the stored ones
+    assert repository.insert("Rectangle", SQUARE).shape_id == "R-2"
+    repository.close()
+
+    repository = open_repository(config, logger, *backend)
+    assert repository.count("Rectangles") == 3
+    repository.close()
+
+class FailingFile:
+    """
+    Log file whose next write stops halfway through and fails, as on a full disk
+    """
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, data: str):
+        self.file.write(data[:len(data) // 2])
+        self.file.flush()
+
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    def __getattr__(self, name: str):
+        return getattr(self.file, name)
+
+def fail_next_write(repository: ShapeRepository, config):
+    if repository.shape_log is not None:
+        repository.shape_log._file = FailingFile(repository.shape_log._file)
+    else:
+        # The snapshot is written to a temporary file first, which cannot be created over a directory
+        os.mkdir(f"{config['general']['json_path']}.tmp")
+
+@pytest.mark.parametrize("backend", [("json", "snapshot"), ("json", "log"), ("binary", None)],
+                         ids=lambda backend: "-".join(filter(None, backend)))
+def test_failed_write_is_not_stored(config, logger, backend):
+    repository: ShapeRepository = open_repository(config, logger, *backend)
+    repository.insert("Triangle", TRIANGLE)
+
+    fail_next_write(repository, config)
+
+    with pytest.raises(IOError):
+        repository.insert_many([("Triangle", [(0, 0), (8, 0), (0, 6)]), ("Rectangle", SQUARE)])
+
+    # The failed shapes are not served and their shape_ids are given to the next shapes
+    assert repository.get("Triangles", 1) is None
+    assert repository.count("Rectangles") == 0
+    assert [record.shape_id for record in repository.range("area")] == ["T-0"]
+
+    if repository.shape_log is None:
+        os.rmdir(f"{config['general']['json_path']}.tmp")
+
+    assert repository.insert("Triangle", TRIANGLE).shape_id == "T-1"
+    repository.close()
+
+    repository = open_repository(config, logger, *backend)
+
+    assert [record.shape_id for record in repository.scan("Triangles")] == ["T-0", "T-1"]
+    assert repository.get("Triangles", 1).coords == TRIANGLE
+    assert repository.count("Rectangles") == 0
+    repository.close()
+
+def test_invalid_backend_is_refused(config, logger):
+    with pytest.raises(ValueError, match="Invalid storage backend"):
+        open_repository(config, logger, "csv", None)
+
+    with pytest.raises(ValueError, match="Invalid storage mode"):
+        open_repository(config, logger, "json", "append")
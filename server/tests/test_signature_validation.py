@@ -0,0 +1,151 @@
+import time
+import sqlite3
+
+import grpc
+import pytest
+
+import shape_service_pb2 as ShapeService
+from lib.objects.nonce_cache import NonceCache
+from lib.objects.sqlite_nonce_cache import SqliteNonceCache
+from lib.interceptors.method_registry import MethodRegistry
+from lib.interceptors.interceptor_chain import InterceptedCall
+from lib.interceptors.signature_validation_interceptor import SignatureValidationInterceptor
+from lib.functions.request_signature import format_signature, get_signing_key, sign_request
+
+KEY_ID: str = "shape-client"
+SECRET: str = "f2kg9cls0xlsk3"
+WINDOW: int = 30
+
+REGISTRY: MethodRegistry = MethodRegistry((ShapeService.DESCRIPTOR.services_by_name['ShapeService'],))
+
+def signed_call(nonce: str, timestamp: int = None, method: str = "/ShapeService/GetShape") -> InterceptedCall:
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signature: str = sign_request(get_signing_key(SECRET), KEY_ID, timestamp, nonce, method)
+
+    return InterceptedCall(REGISTRY.get(method), {"x-signature": format_signature(KEY_ID, timestamp, nonce, signature)})
+
+def get_interceptor(nonce_cache: NonceCache = None) -> SignatureValidationInterceptor:
+    return SignatureValidationInterceptor("x-signature", {KEY_ID: SECRET}, WINDOW, 1000, nonce_cache=nonce_cache)
+
+def test_nonce_cache_rejects_replays():
+    nonce_cache: NonceCache = NonceCache(10)
+
+    assert not nonce_cache.seen(("a", "1"))
+    assert nonce_cache.add(("a", "1"), 100.0, 0.0)
+    assert nonce_cache.seen(("a", "1"))
+    assert not nonce_cache.add(("a", "1"), 100.0, 0.0)
+
+    # Nonces are kept per key id
+    assert nonce_cache.add(("b", "1"), 100.0, 0.0)
+    assert nonce_cache.get_stats() == {"entries": 2, "replays": 2, "evictions": 0}
+
+def test_nonce_cache_drops_expired_entries():
+    nonce_cache: NonceCache = NonceCache(10)
+    nonce_cache.add(("a", "1"), 10.0, 0.0)
+    nonce_cache.add(("a", "2"), 20.0, 5.0)
+
+    nonce_cache.add(("a", "3"), 30.0, 15.0)
+
+    assert not nonce_cache.seen(("a", "1"))
+    assert nonce_cache.seen(("a", "2"))
+    assert len(nonce_cache) == 2
+
+def test_nonce_cache_evicts_the_oldest_entries():
+    nonce_cache: NonceCache = NonceCache(2)
+
+    for nonce in "123":
+        nonce_cache.add(("a", nonce), 100.0, 0.0)
+
+    assert not nonce_cache.seen(("a", "1"))
+    assert nonce_cache.get_stats()["evictions"] == 1
+
+def test_replayed_signature_is_rejected():
+    interceptor: SignatureValidationInterceptor = get_interceptor()
+    call: InterceptedCall = signed_call("9f86d0")
+
+    assert interceptor.intercept(call) is None
+    assert interceptor.intercept(call) == (grpc.StatusCode.UNAUTHENTICATED, "Replayed signature")
+
+def test_invalid_and_expired_signatures_are_rejected():
+    interceptor: SignatureValidationInterceptor = get_interceptor()
+
+    expired: InterceptedCall = signed_call("1", timestamp=int(time.time()) - WINDOW - 5)
+    assert interceptor.intercept(expired) == (grpc.StatusCode.UNAUTHENTICATED, "Expired signature")
+
+    # A signature of one method cannot be used to call another
+    call: InterceptedCall = signed_call("2", method="/ShapeService/GetShape")
+    other: InterceptedCall = InterceptedCall(REGISTRY.get("/ShapeService/CreateShape"), call.metadata)
+    assert interceptor.intercept(other) == (grpc.StatusCode.UNAUTHENTICATED, "Invalid signature")
+
+@pytest.mark.parametrize("header", [None, "", "shape-client:abc:1:2", "unknown:1:2:3"])
+def test_malformed_signatures_are_rejected(header):
+    metadata: dict = {} if header is None else {"x-signature": header}
+    call: InterceptedCall = InterceptedCall(REGISTRY.get("/ShapeService/GetShape"), metadata)
+
+    assert get_interceptor().intercept(call) == (grpc.StatusCode.UNAUTHENTICATED, "Invalid signature")
+
+def test_replay_on_another_worker_is_rejected(tmp_path):
+    # Every worker opens its own SqliteNonceCache on the database the workers share
+    nonce_path: str = str(tmp_path / "nonces.db")
+    workers = [get_interceptor(SqliteNonceCache(nonce_path, 1000)) for _ in range(2)]
+    call: InterceptedCall = signed_call("5e884f")
+
+    assert workers[0].intercept(call) is None
+    assert workers[1].intercept(call) == (grpc.StatusCode.UNAUTHENTICATED, "Replayed signature")
+    assert workers[0].intercept(call) == (grpc.StatusCode.UNAUTHENTICATED, "Replayed signature")
+
+    workers[1].nonce_cache.expire(time.time())
+    assert workers[1].nonce_cache.get_stats() == {"entries": 1, "replays": 1, "evictions": 0}
+
+def test_sqlite_nonce_cache_replaces_and_deletes_expired_entries(tmp_path):
+    nonce_cache: SqliteNonceCache = SqliteNonceCache(str(tmp_path / "nonces.db"), 1000)
+    now: float = time.time()
+
+    assert nonce_cache.add(("a", "1"), now - 10, now - 40)
+    assert not nonce_cache.seen(("a", "1"))
+
+    # An expired nonce is replaced rather than counted as a replay
+    assert nonce_cache.add(("a", "1"), now + 30, now)
+    assert not nonce_cache.add(("a", "1"), now + 30, now)
+    assert nonce_cache.add(("a", "2"), now - 1, now - 31)
+
+    nonce_cache.expire(now)
+
+    assert len(nonce_cache) == 1
+    assert nonce_cache.get_stats() == {"entries": 1, "replays": 1, "evictions": 0}
+
+    nonce_cache.close()
+
+def test_sqlite_nonce_cache_expires_entries_in_the_background(tmp_path):
+    nonce_cache: SqliteNonceCache = SqliteNonceCache(str(tmp_path / "nonces.db"), 1000, expire_interval_s=0.01)
+    now: float = time.time()
+
+    nonce_cache.add(("a", "1"), now - 1, now - 31)
+    nonce_cache.add(("a", "2"), now + 30, now)
+
+    deadline: float = time.time() + 5
+
+    while nonce_cache.get_stats()["entries"] != 1 and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert nonce_cache.get_stats()["entries"] == 1
+
+    nonce_cache.close()
+
+def test_busy_nonce_database_refuses_the_call(tmp_path):
+    nonce_path: str = str(tmp_path / "nonces.db")
+    interceptor: SignatureValidationInterceptor = get_interceptor(SqliteNonceCache(nonce_path, 1000))
+
+    # Another worker holds the write lock for longer than the busy timeout
+    other: sqlite3.Connection = sqlite3.connect(nonce_path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    try:
+        assert interceptor.intercept(signed_call("1")) == (
+            grpc.StatusCode.UNAVAILABLE, "Could not check signature nonce"
+        )
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    assert interceptor.intercept(signed_call("1")) is None
@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from lib.objects.shape_log import ShapeLog
+from lib.objects.shape_columns import ShapeColumns
+from lib.objects.shape_snapshot import ShapeSnapshot
+from lib.repositories.binary_shape_repository import BinaryShapeRepository
+from lib.repositories.json_shape_repository import JsonShapeRepository
+from lib.repositories.snapshot_converter import convert_json_to_snapshot, convert_snapshot_to_json
+
+# Database as written before shape types were validated, with lower case shape types
+BASELINE_DATA: dict = {
+    "Triangles": [
+        {"shape_id": "T-0", "shape_type": "Triangle", "coords": [{"x": 0, "y": 0}, {"x": 4, "y": 0}, {"x": 0, "y": 3}]}
+    ],
+    "Rectangles": [
+        {"shape_id": "R-0", "shape_type": "rectangle",
+         "coords": [{"x": 0, "y": 0}, {"x": 2, "y": 0}, {"x": 2, "y": 2}, {"x": 0, "y": 2}]},
+        {"shape_id": "R-1", "shape_type": "rectangle",
+         "coords": [{"x": 1, "y": 1}, {"x": 4, "y": 1}, {"x": 4, "y": 3}, {"x": 1, "y": 3}]}
+    ],
+    "Pentagons": [
+        {"shape_id": "P-0", "shape_type": "pentagon",
+         "coords": [{"x": 0, "y": 0}, {"x": 2, "y": 0}, {"x": 3, "y": 2}, {"x": 1, "y": 3}, {"x": -1, "y": 2}]}
+    ]
+}
+
+@pytest.fixture
+def baseline_path(tmp_path) -> str:
+    path: str = str(tmp_path / "data.json")
+
+    with open(path, 'w') as json_file:
+        json.dump(BASELINE_DATA, json_file)
+
+    return path
+
+def test_convert_baseline_json_to_binary(tmp_path, logger, baseline_path):
+    snapshot_path: str = str(tmp_path / "data.shapes")
+
+    assert convert_json_to_snapshot(baseline_path, snapshot_path) == 4
+
+    snapshot: ShapeSnapshot = ShapeSnapshot(snapshot_path)
+    assert sorted(snapshot.types) == ["Pentagon", "Rectangle", "Triangle"]
+    snapshot.close()
+
+    repository = BinaryShapeRepository(logger, snapshot_path, ShapeLog(str(tmp_path / "shapes.log"), "os", 0, logger))
+
+    assert repository.get("Rectangles", 0).shape_type == "Rectangle"
+    assert repository.get("Rectangles", 1).coords == [(1, 1), (4, 1), (4, 3), (1, 3)]
+    assert repository.get("Pentagons", 0).shape_id == "P-0"
+
+    # New shapes continue after the converted ones rather than reusing their shape_ids
+    assert repository.insert("Rectangle", [(0, 0), (1, 0), (1, 1), (0, 1)]).shape_id == "R-2"
+    assert repository.insert("Pentagon", [(0, 0), (2, 0), (3, 2), (1, 3), (-1, 2)]).shape_id == "P-1"
+
+    repository.close()
+
+def test_convert_baseline_json_to_binary_and_back(tmp_path, logger, baseline_path):
+    snapshot_path: str = str(tmp_path / "data.shapes")
+    json_path: str = str(tmp_path / "converted.json")
+
+    convert_json_to_snapshot(baseline_path, snapshot_path)
+
+    assert convert_snapshot_to_json(snapshot_path, json_path) == 4
+
+    with open(json_path, 'r') as json_file:
+        data: dict = json.load(json_file)
+
+    assert [shape["shape_id"] for shape in data["Rectangles"]] == ["R-0", "R-1"]
+    assert {shape["shape_type"] for shape in data["Rectangles"]} == {"Rectangle"}
+    assert data["Pentagons"][0]["coords"] == BASELINE_DATA["Pentagons"][0]["coords"]
+
+def test_convert_legacy_snapshot_to_json(tmp_path, logger):
+    # Snapshot written with lower case shape types, e.g. by converting a baseline database before they were normalized
+    snapshot_path: str = str(tmp_path / "legacy.shapes")
+    json_path: str = str(tmp_path / "converted.json")
+
+    columns: ShapeColumns = ShapeColumns()
+    columns.append("rectangle", 0, [(0, 0), (2, 0), (2, 2), (0, 2)], 4.0, 8.0)
+    columns.append("pentagon", 0, [(0, 0), (2, 0), (3, 2), (1, 3), (-1, 2)], 7.0, 11.0)
+    ShapeSnapshot.write(snapshot_path, [columns])
+
+    assert convert_snapshot_to_json(snapshot_path, json_path) == 2
+
+    repository = JsonShapeRepository(logger, json_path)
+
+    assert repository.get("Rectangles", 0).shape_type == "Rectangle"
+    assert repository.get("Pentagons", 0).shape_type == "Pentagon"
+
+    # The binary backend reads the same snapshot
+    repository = BinaryShapeRepository(logger, snapshot_path, ShapeLog(str(tmp_path / "shapes.log"), "os", 0, logger))
+
+    assert repository.get("Rectangles", 0).shape_id == "R-0"
+    assert repository.insert("Rectangle", [(0, 0), (1, 0), (1, 1), (0, 1)]).shape_id == "R-1"
+
+    repository.close()
+
+    # Folding the new shape into the snapshot writes the supported shape_type for the old rows as well
+    snapshot: ShapeSnapshot = ShapeSnapshot(snapshot_path)
+    assert sorted(snapshot.types) == ["Pentagon", "Rectangle"]
+    assert snapshot.type_rows["Rectangle"][1] == 2
+    snapshot.close()
+
+def test_unsupported_shape_type_is_refused(tmp_path, logger):
+    snapshot_path: str = str(tmp_path / "hexagons.shapes")
+
+    columns: ShapeColumns = ShapeColumns()
+    columns.append("hexagon", 0, [(0, 0), (2, 0), (3, 1), (2, 2), (0, 2), (-1, 1)], 6.0, 9.0)
+    ShapeSnapshot.write(snapshot_path, [columns])
+
+    with pytest.raises(ValueError, match="Unsupported shape_type hexagon"):
+        convert_snapshot_to_json(snapshot_path, str(tmp_path / "converted.json"))
+
+    with pytest.raises(ValueError, match="Unsupported shape_type hexagon"):
+        BinaryShapeRepository(logger, snapshot_path, ShapeLog(str(tmp_path / "shapes.log"), "os", 0, logger))
+
+def test_json_repository_loads_baseline_shape_types(logger, baseline_path):
+    repository = JsonShapeRepository(logger, baseline_path)
+
+    assert [record.shape_type for record in repository.scan("Rectangles")] == ["Rectangle", "Rectangle"]
+    assert repository.get("Pentagons", 0).to_shape().shape_type == "Pentagon"
@@ -0,0 +1,78 @@
+import random
+from array import array
+
+from lib.objects.sorted_index import SortedIndex
+
+def test_range_bounds_and_order():
+    index: SortedIndex = SortedIndex("area", array('d'), array('q'))
+    index.merge([(3.0, 30), (1.0, 10), (2.0, 20), (2.0, 21)])
+
+    assert list(index.range()) == [10, 20, 21, 30]
+    assert list(index.range(1.0, 2.0)) == [20, 21]
+    assert list(index.range(None, 1.0)) == [10]
+    assert list(index.range(3.0)) == []
+    assert index.count(1.0, 3.0) == 3
+    assert len(index) == 4
+
+def test_range_keeps_the_version_it_started_on():
+    index: SortedIndex = SortedIndex("area", array('d'), array('q'))
+    index.merge([(1.0, 1), (3.0, 3)])
+
+    before = index.range()
+    assert next(before) == 1
+
+    # Writes publish a new version, the running range still reads the old one
+    index.merge([(2.0, 2), (0.5, 0)])
+
+    assert list(before) == [3]
+    assert list(index.range()) == [0, 1, 2, 3]
+
+def test_range_keeps_its_version_across_a_base_merge(monkeypatch):
+    monkeypatch.setattr(SortedIndex, "MIN_DELTA_SIZE", 4)
+
+    index: SortedIndex = SortedIndex("area", array('d'), array('q'))
+    index.merge([(float(value), value) for value in range(0, 20, 2)])
+
+    before = index.range()
+    assert next(before) == 0
+    first_version = index.version
+
+    # Enough new entries to merge the delta into a new base
+    index.merge([(float(value), value) for value in range(1, 20, 2)])
+
+    assert index.version[0] is not first_version[0]
+    assert len(index.version[2]) == 0
+    assert list(before) == list(range(2, 20, 2))
+    assert list(index.range()) == list(range(20))
+
+def test_equal_values_stay_in_the_order_they_were_added(monkeypatch):
+    monkeypatch.setattr(SortedIndex, "MIN_DELTA_SIZE", 8)
+
+    index: SortedIndex = SortedIndex("perimeter")
+    added = []
+
+    for batch in range(10):
+        entries = [(float(value % 3), f"{batch}-{value}") for value in range(5)]
+        index.merge(entries)
+        added.extend(entries)
+
+    assert list(index.range()) == [item for _, item in sorted(added, key=lambda entry: entry[0])]
+
+def test_matches_a_sorted_list(monkeypatch):
+    monkeypatch.setattr(SortedIndex, "MIN_DELTA_SIZE", 16)
+
+    generator: random.Random = random.Random(7)
+    index: SortedIndex = SortedIndex("area", array('d'), array('q'))
+    entries = []
+
+    # Batches of different sizes, so some only grow the delta and some merge it into the base
+    while len(entries) < 500:
+        batch = [(generator.uniform(0, 100), len(entries) + offset) for offset in range(generator.randint(1, 40))]
+        index.merge(batch)
+        entries.extend(batch)
+
+    expected = sorted(entries, key=lambda entry: entry[0])
+
+    assert list(index.range(25.0, 75.0)) == [item for value, item in expected if 25.0 < value <= 75.0]
+    assert index.count(25.0, 75.0) == sum(1 for value, _ in expected if 25.0 < value <= 75.0)
+    assert len(index) == len(entries)